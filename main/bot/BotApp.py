@@ -9,6 +9,8 @@ def start_bot():
     with open(path_finder('Token.txt'), 'r') as f:
         TOKEN = f.read()
 
+    check_db_profile()
+
     persistence = PicklePersistence(filename=os.path.join(get_resources_folder(), "BotPersistence"),
                                     store_callback_data=True)
 
@@ -24,6 +26,7 @@ def start_bot():
 
     dispatcher.add_handler(CommandHandler("test".casefold(), test))
     dispatcher.add_handler(CommandHandler("controller".casefold(), print_controller))
+    dispatcher.add_handler(CommandHandler("compact".casefold(), compact_database))
 
     dispatcher.add_handler(CommandHandler("help".casefold(), help_msg))
 
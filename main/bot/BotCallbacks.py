@@ -464,7 +464,7 @@ def join_game_name(update: Update, context: CallbackContext) -> int:
         update.message.delete()
         return ConversationHandler.END
 
-    game_of_user = query_game_of_user(update.message.chat_id, get_user_id(update))
+    game_of_user = controller.game_of_user(update.message.chat_id, get_user_id(update))
     if game_of_user is not None and game_of_user != query_game_ids(update.message.chat_id, update.message.text)[0]:
         auto_delete_message(update.message.reply_text(placeholders["2"].format(
             query_games_info(game_id=game_of_user)[0]["title"]),
@@ -852,7 +852,7 @@ def create_crew(update: Update, context: CallbackContext) -> int:
     """
     placeholders = get_lang(context, create_crew.__name__)
 
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(placeholders["1"])
         return end_conv(update, context)
 
@@ -1293,7 +1293,7 @@ def pc_selection(update: Update, context: CallbackContext) -> int:
     """
     placeholders = get_lang(context, pc_selection.__name__)
 
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(placeholders["1"])
         return end_conv(update, context)
 
@@ -1327,7 +1327,8 @@ def pc_selection_choice(update: Update, context: CallbackContext) -> int:
     context.user_data.setdefault("active_PCs", {})[update.effective_message.chat_id] = choice
 
     context.user_data["pc_selection"]["invocation_message"].reply_text(placeholders["0"].format(
-        query_games_info(game_id=query_game_of_user(update.effective_message.chat_id, get_user_id(update)))[0]["title"],
+        query_games_info(game_id=controller.game_of_user(
+            update.effective_message.chat_id, get_user_id(update)))[0]["title"],
         choice), parse_mode=ParseMode.HTML)
 
     return pc_selection_end(update, context)
@@ -1368,7 +1369,7 @@ def group_action(update: Update, context: CallbackContext) -> int:
 
         placeholders = get_lang(context, action_roll.__name__)
 
-        if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+        if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
             update.message.reply_text(placeholders["1"])
             return end_conv(update, context)
 
@@ -1476,7 +1477,7 @@ def action_roll(update: Update, context: CallbackContext) -> int:
 
         placeholders = get_lang(context, action_roll.__name__)
 
-        if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+        if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
             update.message.reply_text(placeholders["1"])
             return end_conv(update, context)
 
@@ -1669,7 +1670,7 @@ def action_roll_assistance(update: Update, context: CallbackContext) -> None:
     invoker_id = context.chat_data["action_roll"]["invoker"]
     pc_name = context.user_data["active_PCs"][chat_id]
     if user_id != invoker_id or (user_id == invoker_id and context.chat_data["action_roll"]["roll"]["pc"] != pc_name):
-        if query_game_of_user(chat_id, user_id) == query_game_of_user(chat_id, invoker_id):
+        if controller.game_of_user(chat_id, user_id) == controller.game_of_user(chat_id, invoker_id):
             if "active_PCs" in context.user_data and chat_id in context.user_data["active_PCs"]:
 
                 new_assistant = (user_id, context.user_data["active_PCs"][chat_id])
@@ -1714,7 +1715,7 @@ def group_action_participate(update: Update, context: CallbackContext) -> None:
     invoker_id = context.chat_data["action_roll"]["invoker"]
     pc_name = context.user_data["active_PCs"][chat_id]
     if user_id != invoker_id or (user_id == invoker_id and context.chat_data["action_roll"]["roll"]["pc"] != pc_name):
-        if query_game_of_user(chat_id, user_id) == query_game_of_user(chat_id, invoker_id):
+        if controller.game_of_user(chat_id, user_id) == controller.game_of_user(chat_id, invoker_id):
             if "active_PCs" in context.user_data and chat_id in context.user_data["active_PCs"]:
 
                 new_participant = {"id": user_id}
@@ -2094,11 +2095,11 @@ def change_state(update: Update, context: CallbackContext) -> int:
 
     context.user_data.setdefault("change_state", {})["invocation_message"] = update.message
 
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(text=placeholders["err1"])
         return end_conv(update, context)
 
-    game_id = query_game_of_user(update.message.chat_id, get_user_id(update))
+    game_id = controller.game_of_user(update.message.chat_id, get_user_id(update))
     curr_state = controller.get_game_state(game_id)
 
     if curr_state == 0:
@@ -2128,7 +2129,8 @@ def change_state_choice(update: Update, context: CallbackContext) -> int:
 
     choice = query.data.split("$")
 
-    controller.change_state(query_game_of_user(update.effective_message.chat_id, get_user_id(update)), int(choice[1]))
+    game_id = controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
+    controller.change_state(game_id, int(choice[1]))
     context.user_data["change_state"]["invocation_message"].reply_text(placeholders["0"].format(
         choice[0]), parse_mode=ParseMode.HTML)
 
@@ -2207,18 +2209,19 @@ def roll_dice(update: Update, context: CallbackContext, dice_to_roll: int = None
 def send_journal(update: Update, context: CallbackContext) -> None:
     placeholders = get_lang(context, send_journal.__name__)
 
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(placeholders["0"])
         return
 
-    journal = controller.get_journal_of_game(query_game_of_user(update.effective_message.chat_id, get_user_id(update)))
+    game_id = controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
+    journal = controller.get_journal_of_game(game_id)
     update.message.reply_document(document=journal[0], filename=journal[1], caption=placeholders["1"])
 
 
 def send_map(update: Update, context: CallbackContext) -> None:
     placeholders = get_lang(context, send_map.__name__)
 
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(placeholders["0"])
         return
 
@@ -2242,7 +2245,7 @@ def add_cohort(update: Update, context: CallbackContext) -> int:
     if is_game_in_wrong_phase(update, context, placeholders["err"]):
         return add_cohort_end(update, context)
 
-    if controller.get_crew_upgrade_points(query_game_of_user(update.message.chat_id, get_user_id(update))) < 2:
+    if controller.get_crew_upgrade_points(controller.game_of_user(update.message.chat_id, get_user_id(update))) < 2:
         message = update.message.reply_text(placeholders["err2"])
         auto_delete_message(message, 15)
         return add_cohort_end(update, context)
@@ -2328,7 +2331,7 @@ def add_cohort_edgflaw_num(update: Update, context: CallbackContext) -> int:
 
     if isinstance(num, int) and 0 <= num <= 4:
         if num == 0:
-            controller.add_cohort_in_crew(query_game_of_user(update.message.chat_id, get_user_id(update)),
+            controller.add_cohort_in_crew(controller.game_of_user(update.message.chat_id, get_user_id(update)),
                                           context.user_data["add_cohort"]["cohort"])
 
             return add_cohort_end(update, context)
@@ -2403,7 +2406,8 @@ def add_cohort_flaws(update: Update, context: CallbackContext) -> int:
     if len(context.user_data["add_cohort"]["cohort"]["flaws"]) == context.user_data["add_cohort"]["numEdgeFlaws"]:
 
         controller.add_cohort_in_crew(
-            query_game_of_user(update.message.chat_id, get_user_id(update)), context.user_data["add_cohort"]["cohort"])
+            controller.game_of_user(update.message.chat_id, get_user_id(update)),
+            context.user_data["add_cohort"]["cohort"])
 
         return add_cohort_end(update, context)
 
@@ -2567,7 +2571,8 @@ def create_clock_segments(update: Update, context: CallbackContext) -> int:
     if "[project]" in context.user_data["create_clock"]["clock"]["name"]:
         placeholders = get_lang(context, downtime_project_choice.__name__)
 
-        new_clock = controller.get_clocks_of_game(query_game_of_user(update.message.chat_id, get_user_id(update)), True)
+        game_id = controller.game_of_user(update.message.chat_id, get_user_id(update))
+        new_clock = controller.get_clocks_of_game(game_id, True)
         new_clock = new_clock[len(new_clock) - 1]
         name = new_clock.split(": ")[0]
 
@@ -2620,7 +2625,7 @@ def tick_clock(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["tick_clock", "invocation_message"], update.message)
 
-    clocks = controller.get_clocks_of_game(query_game_of_user(update.message.chat_id, get_user_id(update)))
+    clocks = controller.get_clocks_of_game(controller.game_of_user(update.message.chat_id, get_user_id(update)))
     if not clocks:
         update.message.reply_text(placeholders["err2"])
         return tick_clock_end(update, context)
@@ -2749,7 +2754,7 @@ def segments_clock(update: Update, context: CallbackContext) -> int:
     add_tag_in_telegram_data(context, ["segments_clock", "invocation_message"], update.message)
     chat_id = update.message.chat_id
 
-    clocks = controller.get_clocks_of_game(query_game_of_user(chat_id, get_user_id(update)))
+    clocks = controller.get_clocks_of_game(controller.game_of_user(chat_id, get_user_id(update)))
     try:
         clocks.append(
             controller.get_healing_clock(chat_id, get_user_id(update), context.user_data["active_PCs"][chat_id]))
@@ -2950,7 +2955,7 @@ def add_claim_name(update: Update, context: CallbackContext) -> int:
             add_tag_in_telegram_data(context, ["add_claim", "claim", "name"], choice)
             add_tag_in_telegram_data(context, ["add_claim", "claim", "description"], description)
 
-            controller.add_claim_to_game(query_game_of_user(update.effective_message.chat_id, get_user_id(update)),
+            controller.add_claim_to_game(controller.game_of_user(update.effective_message.chat_id, get_user_id(update)),
                                          context.user_data["add_claim"]["claim"])
 
             return add_claim_end(update, context)
@@ -3064,7 +3069,7 @@ def score_target(update: Update, context: CallbackContext) -> int:
 
     choice = query.data
     if choice == "NPC":
-        npcs = controller.get_npcs(query_game_of_user(chat_id, get_user_id(update)))
+        npcs = controller.get_npcs(controller.game_of_user(chat_id, get_user_id(update)))
 
         buttons_list = []
         buttons = []
@@ -3082,7 +3087,7 @@ def score_target(update: Update, context: CallbackContext) -> int:
             parse_mode=ParseMode.HTML,
             reply_markup=build_multi_page_kb(buttons_list[0]))
     elif choice == "Faction":
-        factions = controller.get_factions(query_game_of_user(chat_id, get_user_id(update)))
+        factions = controller.get_factions(controller.game_of_user(chat_id, get_user_id(update)))
 
         buttons_list = []
         buttons = []
@@ -3426,7 +3431,7 @@ def score_load(update: Update, context: CallbackContext):
     invoker_id = context.chat_data["score"]["invoker"]
 
     if user_id != invoker_id:
-        if query_game_of_user(chat_id, user_id) == query_game_of_user(chat_id, invoker_id):
+        if controller.game_of_user(chat_id, user_id) == controller.game_of_user(chat_id, invoker_id):
             if "active_PCs" in context.user_data and chat_id in context.user_data["active_PCs"]:
 
                 new_member = context.user_data["active_PCs"][chat_id]
@@ -3493,9 +3498,9 @@ def send_crew_sheet(update: Update, context: CallbackContext) -> None:
     if is_user_not_in_game(update, placeholders["err"]):
         return
 
-    if controller.game_has_crew(query_game_of_user(update.effective_message.chat_id, get_user_id(update))):
+    if controller.game_has_crew(controller.game_of_user(update.effective_message.chat_id, get_user_id(update))):
         chat_id = update.effective_message.chat_id
-        img_bytes, file_name = controller.get_crew_sheet_image(query_game_of_user(chat_id, get_user_id(update)))
+        img_bytes, file_name = controller.get_crew_sheet_image(controller.game_of_user(chat_id, get_user_id(update)))
         update.effective_message.reply_photo(photo=img_bytes, filename=file_name, caption=placeholders["1"])
     else:
         update.message.reply_text(placeholders["0"])
@@ -4233,7 +4238,7 @@ def entanglement(update: Update, context: CallbackContext) -> int:
 
     context.user_data["entanglement"].setdefault("info", {}).setdefault("secret", False)
 
-    game_id = query_game_of_user(update.message.chat_id, get_user_id(update))
+    game_id = controller.game_of_user(update.message.chat_id, get_user_id(update))
 
     heat_value = controller.get_crew_heat(game_id)
     wanted_level = controller.get_crew_wanted_level(game_id)
@@ -4325,7 +4330,7 @@ def entanglement_description(update: Update, context: CallbackContext) -> int:
         context.bot.send_message(chat_id, placeholders["public"].format(user_name, update.message.text), ParseMode.HTML)
 
     controller.commit_entanglement(
-        query_game_of_user(chat_id, get_user_id(update)), context.user_data["entanglement"]["info"])
+        controller.game_of_user(chat_id, get_user_id(update)), context.user_data["entanglement"]["info"])
 
     return entanglement_end(update, context)
 
@@ -4396,7 +4401,7 @@ def payoff_amount(update: Update, context: CallbackContext) -> int:
     add_tag_in_telegram_data(context, ["payoff", "info", "amount"], coins)
 
     can_divvy, can_store_in_vault = \
-        controller.can_store_coins(query_game_of_user(update.message.chat_id, get_user_id(update)), coins)
+        controller.can_store_coins(controller.game_of_user(update.message.chat_id, get_user_id(update)), coins)
 
     buttons = placeholders["keyboard"].copy()
     callbacks = placeholders["callbacks"].copy()
@@ -4462,7 +4467,7 @@ def payoff_notes(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["payoff", "info", "notes"], update.message.text)
 
-    controller.commit_payoff(query_game_of_user(update.message.chat_id, get_user_id(update)),
+    controller.commit_payoff(controller.game_of_user(update.message.chat_id, get_user_id(update)),
                              context.user_data["payoff"]["info"])
 
     return payoff_end(update, context)
@@ -4599,7 +4604,7 @@ def vault_capacity(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["vault_capacity", "capacity"],
                              controller.get_vault_capacity_of_crew(
-                                 query_game_of_user(update.effective_message.chat_id, get_user_id(update))))
+                                 controller.game_of_user(update.effective_message.chat_id, get_user_id(update))))
 
     placeholders = get_lang(context, "bonus_dice")
     query_menu = update.message.reply_text(placeholders["vault_capacity_message"],
@@ -4644,7 +4649,7 @@ def vault_capacity_kb(update: Update, context: CallbackContext) -> int:
                              button_tag="vault_capacity_button")
 
     elif choice == "DONE":
-        controller.modify_vault_capacity(query_game_of_user(update.effective_message.chat_id, get_user_id(update)),
+        controller.modify_vault_capacity(controller.game_of_user(update.effective_message.chat_id, get_user_id(update)),
                                          context.user_data["vault_capacity"]["capacity"])
         return vault_capacity_end(update, context)
 
@@ -4782,7 +4787,7 @@ def add_coin_amount(update: Update, context: CallbackContext) -> int:
         if choice.split(": ")[0].lower() == "vault":
             auto_delete_message(context.user_data["add_coin"]["invocation_message"].reply_text(
                 placeholders["vault"].format(
-                    controller.get_vault_capacity_of_crew(query_game_of_user(chat_id, get_user_id(update))))), 3)
+                    controller.get_vault_capacity_of_crew(controller.game_of_user(chat_id, get_user_id(update))))), 3)
         else:
             auto_delete_message(context.user_data["add_coin"]["invocation_message"].reply_text(
                 placeholders[choice.split(": ")[0].lower()]), 3)
@@ -4817,7 +4822,7 @@ def upgrade_crew(update: Update, context: CallbackContext) -> None:
     if is_game_in_wrong_phase(update, context, placeholders["err"]):
         return
 
-    hold, tier = controller.upgrade_crew(query_game_of_user(update.message.chat_id, get_user_id(update)))
+    hold, tier = controller.upgrade_crew(controller.game_of_user(update.message.chat_id, get_user_id(update)))
 
     auto_delete_message(update.message.reply_text(placeholders[str(hold)].format(tier), parse_mode=ParseMode.HTML))
 
@@ -4840,7 +4845,7 @@ def factions_status(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["factions_status", "invocation_message"], update.message)
 
-    factions = controller.get_factions(query_game_of_user(update.effective_message.chat_id, get_user_id(update)))
+    factions = controller.get_factions(controller.game_of_user(update.effective_message.chat_id, get_user_id(update)))
 
     buttons_list = []
     buttons = []
@@ -4895,8 +4900,8 @@ def factions_status_selection(update: Update, context: CallbackContext) -> int:
         context.user_data["factions_status"]["query_menu_index"] = index
     elif choice == "DONE":
         context.user_data["factions_status"]["query_menu"].delete()
-        controller.update_factions_status(query_game_of_user(update.effective_message.chat_id, get_user_id(update)),
-                                          context.user_data["factions_status"]["factions"])
+        game_id = controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
+        controller.update_factions_status(game_id, context.user_data["factions_status"]["factions"])
 
         return factions_status_end(update, context)
     else:
@@ -5027,7 +5032,7 @@ def use_item(update: Update, context: CallbackContext) -> int:
         user_id = get_user_id(update)
 
         add_tag_in_telegram_data(context, ["use_item", "info", "pc"], context.user_data["active_PCs"][chat_id])
-        items = controller.get_items_names(query_game_of_user(chat_id, user_id),
+        items = controller.get_items_names(controller.game_of_user(chat_id, user_id),
                                            controller.get_pc_class(chat_id,
                                                                    user_id,
                                                                    context.user_data["use_item"]["info"]["pc"]))
@@ -5131,7 +5136,8 @@ def use_item_description(update: Update, context: CallbackContext) -> int:
 
     chat_id = update.effective_message.chat_id
     user_id = get_user_id(update)
-    controller.commit_use_item(query_game_of_user(chat_id, user_id), user_id, context.user_data["use_item"]["info"])
+    controller.commit_use_item(controller.game_of_user(chat_id, user_id), user_id,
+                               context.user_data["use_item"]["info"])
 
     auto_delete_message(placeholders["0"], 8)
 
@@ -5411,7 +5417,7 @@ def fortune_roll_choice(update: Update, context: CallbackContext) -> int:
 
     # Item quality
     elif choice == 4:
-        items = controller.get_items_names(query_game_of_user(chat_id, get_user_id(update)),
+        items = controller.get_items_names(controller.game_of_user(chat_id, get_user_id(update)),
                                            controller.get_pc_class(chat_id, get_user_id(update), pc_name))
 
         items = ["{}: {}".format(item[0], item[1]) for item in items]
@@ -5437,14 +5443,14 @@ def fortune_roll_choice(update: Update, context: CallbackContext) -> int:
 
     # Crew tier
     elif choice == 5:
-        crew_tier = controller.get_crew_tier(query_game_of_user(chat_id, get_user_id(update)))
+        crew_tier = controller.get_crew_tier(controller.game_of_user(chat_id, get_user_id(update)))
         add_tag_in_telegram_data(context, ["fortune_roll", "roll", "what"], "Crew's tier: {}".format(crew_tier))
         add_tag_in_telegram_data(context, ["fortune_roll", "dice"], crew_tier)
         return send_fortune_roll_bonus_dice(context)
 
     # Faction tier
     elif choice == 6:
-        factions = controller.get_factions(query_game_of_user(chat_id, get_user_id(update)))
+        factions = controller.get_factions(controller.game_of_user(chat_id, get_user_id(update)))
 
         buttons_list = []
         buttons = []
@@ -5573,7 +5579,7 @@ def fortune_roll_notes(update: Update, context: CallbackContext) -> int:
         add_tag_in_telegram_data(context, ["fortune_roll", "roll", "pc"], "The GM")
     else:
         add_tag_in_telegram_data(context, ["fortune_roll", "roll", "pc"], context.user_data["active_PCs"][chat_id])
-    controller.commit_fortune_roll(query_game_of_user(chat_id, get_user_id(update)),
+    controller.commit_fortune_roll(controller.game_of_user(chat_id, get_user_id(update)),
                                    context.user_data["fortune_roll"]["roll"])
 
     return fortune_roll_end(update, context)
@@ -5885,11 +5891,11 @@ def add_upgrade(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["add_upgrade", "invocation_message"], update.message)
     add_tag_in_telegram_data(context, ["add_upgrade", "info", "upgrade_points"], controller.get_crew_upgrade_points(
-        query_game_of_user(update.effective_message.chat_id, get_user_id(update))
+        controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
     ))
 
     add_tag_in_telegram_data(context, ["add_upgrade", "info", "upgrades"], controller.get_crew_upgrades(
-        query_game_of_user(update.effective_message.chat_id, get_user_id(update))))
+        controller.game_of_user(update.effective_message.chat_id, get_user_id(update))))
 
     groups = query_upgrade_groups()
     groups.append("DONE")
@@ -5927,7 +5933,7 @@ def add_upgrade_group(update: Update, context: CallbackContext) -> int:
                                       context.user_data["add_upgrade"]["info"]["upgrade_points"])
         return add_upgrade_end(update, context)
     elif choice.lower() == "specific":
-        buttons = create_central_buttons_upgrades(upgrades, choice, controller.get_crew_type(query_game_of_user(
+        buttons = create_central_buttons_upgrades(upgrades, choice, controller.get_crew_type(controller.game_of_user(
             update.effective_message.chat_id, get_user_id(update))))
     else:
         buttons = create_central_buttons_upgrades(upgrades, choice)
@@ -5999,7 +6005,7 @@ def add_upgrade_selection(update: Update, context: CallbackContext) -> int:
         group = context.user_data["add_upgrade"]["info"]["group"]
 
         if group.lower() == "specific":
-            buttons = create_central_buttons_upgrades(upgrades, group, controller.get_crew_type(query_game_of_user(
+            buttons = create_central_buttons_upgrades(upgrades, group, controller.get_crew_type(controller.game_of_user(
                 update.effective_message.chat_id, get_user_id(update))))
         else:
             buttons = create_central_buttons_upgrades(upgrades, group)
@@ -6099,7 +6105,7 @@ def downtime_choice(update: Update, context: CallbackContext) -> Optional[int]:
     # Long term project
     elif choice == 3:
         add_tag_in_telegram_data(context, ["downtime", "info", "activity"], "long_term_project", "chat")
-        keyboard = controller.get_clocks_of_game(query_game_of_user(chat_id, get_user_id(update)), True)
+        keyboard = controller.get_clocks_of_game(controller.game_of_user(chat_id, get_user_id(update)), True)
         keyboard.append(placeholders["new"])
         message = context.chat_data["downtime"]["invocation_message"].reply_text(
             placeholders["3"], reply_markup=custom_kb(keyboard, True, 1))
@@ -6215,7 +6221,7 @@ def downtime_minimum_quality(update: Update, context: CallbackContext) -> Option
 
     add_tag_in_telegram_data(context, location="chat", tags=["downtime", "info", "minimum_quality"], value=quality)
     add_tag_in_telegram_data(context, location="chat", tags=["downtime", "dice"], value=controller.get_crew_tier(
-        query_game_of_user(update.message.chat_id, get_user_id(update))))
+        controller.game_of_user(update.message.chat_id, get_user_id(update))))
     add_tag_in_telegram_data(context, location="chat", tags=["downtime", "bonus_dice"], value=0)
 
     send_downtime_bonus_dice(context)
@@ -6298,7 +6304,7 @@ def downtime_bonus_dice(update: Update, context: CallbackContext) -> Optional[in
 
         else:
             outcome = context.chat_data["downtime"]["info"]["outcome"]
-            crew_tier = controller.get_crew_tier(query_game_of_user(
+            crew_tier = controller.get_crew_tier(controller.game_of_user(
                 update.effective_message.chat_id, get_user_id(update)))
             quality = crew_tier
             if isinstance(outcome, str):
@@ -6342,7 +6348,7 @@ def downtime_added_quality(update: Update, context: CallbackContext) -> Optional
 
     add_tag_in_telegram_data(context, location="chat", tags=["downtime", "info", "extra_quality"], value=extra_quality)
 
-    crew_tier = controller.get_crew_tier(query_game_of_user(chat_id, get_user_id(update)))
+    crew_tier = controller.get_crew_tier(controller.game_of_user(chat_id, get_user_id(update)))
     tot_quality = context.chat_data["downtime"]["info"]["quality"]
 
     if tot_quality + extra_quality < context.chat_data["downtime"]["info"]["minimum_quality"]:
@@ -6488,7 +6494,7 @@ def downtime_cohort_choice(update: Update, context: CallbackContext) -> int:
         callbacks = placeholders["callbacks"].copy()
 
         chat_id = update.effective_message.chat_id
-        coins = controller.get_crew_tier(query_game_of_user(chat_id, get_user_id(update))) + 2
+        coins = controller.get_crew_tier(controller.game_of_user(chat_id, get_user_id(update))) + 2
         can_pay_crew, can_pay_possession = controller.can_pay(
             chat_id, get_user_id(update), context.chat_data["downtime"]["info"]["pc"], coins)
         if not can_pay_possession:
@@ -6605,7 +6611,7 @@ def downtime_recover_choice(update: Update, context: CallbackContext) -> Optiona
 
     # NPC
     if choice == 1:
-        npcs = controller.get_npcs(query_game_of_user(chat_id, get_user_id(update)))
+        npcs = controller.get_npcs(controller.game_of_user(chat_id, get_user_id(update)))
         buttons_list = []
         buttons = []
         for i in range(len(npcs)):
@@ -6690,10 +6696,10 @@ def downtime_npc_selection(update: Update, context: CallbackContext) -> int:
             faction_name = faction_name.replace("[", "")
             faction_name = faction_name.replace("]", "")
             if faction_name != ' ':
-                faction_tier = controller.get_factions(query_game_of_user(
+                faction_tier = controller.get_factions(controller.game_of_user(
                     update.effective_message.chat_id, get_user_id(update)), faction_name)[0].split(": ")[1]
             else:
-                faction_tier = controller.get_crew_tier(query_game_of_user(
+                faction_tier = controller.get_crew_tier(controller.game_of_user(
                     update.effective_message.chat_id, get_user_id(update)))
             add_tag_in_telegram_data(context, ["downtime", "dice"], int(faction_tier), "chat")
             context.chat_data["downtime"]["query_menu"].delete()
@@ -6887,7 +6893,8 @@ def end_downtime(update: Update, context: CallbackContext):
     placeholders = get_lang(context, end_downtime.__name__)
     if is_game_in_wrong_phase(update, context, placeholders["err"], 2):
         return
-    trauma_suffers = controller.end_downtime(query_game_of_user(update.effective_message.chat_id, get_user_id(update)))
+    game_id = controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
+    trauma_suffers = controller.end_downtime(game_id)
 
     for pc in trauma_suffers.keys():
         auto_delete_message(update.effective_message.reply_text(placeholders["trauma"].format(pc, trauma_suffers[pc]),
@@ -7018,7 +7025,7 @@ def build_add_ability_buttons(update: Update, context: CallbackContext) -> Tuple
         pc_name = None
     buttons = []
     callbacks = []
-    if controller.get_crew_exp_points(query_game_of_user(chat_id, get_user_id(update))) > 0:
+    if controller.get_crew_exp_points(controller.game_of_user(chat_id, get_user_id(update))) > 0:
         buttons.append(placeholders["keyboard"][0])
         callbacks.append(placeholders["callbacks"][0])
     if pc_name:
@@ -7271,7 +7278,7 @@ def add_harm_cohort_level(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["harm_cohort", "info", "harm"], harm)
 
-    controller.commit_add_cohort_harm(query_game_of_user(update.message.chat_id, get_user_id(update)),
+    controller.commit_add_cohort_harm(controller.game_of_user(update.message.chat_id, get_user_id(update)),
                                       context.user_data["harm_cohort"]["info"])
     return add_harm_cohort_end(update, context)
 
@@ -7464,7 +7471,8 @@ def migrate_pc_selection(update: Update, context: CallbackContext) -> int:
         # enemies
         message = context.user_data["migrate_pc"]["invocation_message"].reply_text(
             placeholders[choice], parse_mode=ParseMode.HTML, reply_markup=custom_kb(
-                controller.get_game_npcs(query_game_of_user(update.effective_message.chat_id, get_user_id(update)))))
+                controller.get_game_npcs(controller.game_of_user(update.effective_message.chat_id,
+                                                                 get_user_id(update)))))
         add_tag_in_telegram_data(context, tags=["migrate_pc", "message"], value=message)
         add_tag_in_telegram_data(context, tags=["migrate_pc", "info", "ghost_enemies"], value=[])
         return 1
@@ -7495,7 +7503,7 @@ def migrate_pc_ghost_enemies(update: Update, context: CallbackContext) -> int:
     message = context.user_data["migrate_pc"]["invocation_message"].reply_text(
         placeholders["0"], parse_mode=ParseMode.HTML, reply_markup=custom_kb(
             controller.get_game_npcs(
-                query_game_of_user(
+                controller.game_of_user(
                     update.effective_message.chat_id,
                     get_user_id(update)))
         ))
@@ -7590,7 +7598,7 @@ def add_reputation(update: Update, context: CallbackContext) -> None:
     except (ValueError, IndexError, AttributeError):
         rep = 1
 
-    coins = controller.add_rep_to_crew(query_game_of_user(chat_id, get_user_id(update)), rep)
+    coins = controller.add_rep_to_crew(controller.game_of_user(chat_id, get_user_id(update)), rep)
 
     if coins is not None:
         auto_delete_message(update.message.reply_text(placeholders["0"].format(coins),
@@ -7679,7 +7687,7 @@ def add_armor_cohort_level(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["armor_cohort", "info", "armor"], armor)
 
-    controller.commit_add_cohort_armor(query_game_of_user(update.message.chat_id, get_user_id(update)),
+    controller.commit_add_cohort_armor(controller.game_of_user(update.message.chat_id, get_user_id(update)),
                                        context.user_data["armor_cohort"]["info"])
     return add_armor_cohort_end(update, context)
 
@@ -8097,7 +8105,7 @@ def incarceration_roll_choice(update: Update, context: CallbackContext) -> int:
     choice = query.data
 
     chat_id = update.effective_message.chat_id
-    game_id = query_game_of_user(chat_id, get_user_id(update))
+    game_id = controller.game_of_user(chat_id, get_user_id(update))
 
     crew_tier = controller.get_crew_tier(game_id)
     add_tag_in_telegram_data(context, ["incarceration", "tier"], crew_tier)
@@ -8262,8 +8270,8 @@ def incarceration_roll_notes(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["incarceration", "roll", "notes"], update.message.text)
 
-    return_dict = controller.commit_incarceration_roll(query_game_of_user(update.message.chat_id, get_user_id(update)),
-                                                       context.user_data["incarceration"]["roll"])
+    game_id = controller.game_of_user(update.message.chat_id, get_user_id(update))
+    return_dict = controller.commit_incarceration_roll(game_id, context.user_data["incarceration"]["roll"])
     for key in return_dict.keys():
         context.user_data["incarceration"]["invocation_message"].reply_text(
             placeholders[str(key)].format(return_dict[key]), ParseMode.HTML)
@@ -8556,7 +8564,7 @@ def end_game_notes(update: Update, context: CallbackContext) -> int:
     context.user_data["end_game"]["message"].delete()
 
     game_obj = controller.end_game(
-        query_game_of_user(update.effective_message.chat_id, get_user_id(update)), update.message.text)
+        controller.game_of_user(update.effective_message.chat_id, get_user_id(update)), update.message.text)
 
     context.user_data["end_game"]["invocation_message"].reply_text(placeholders["0"], ParseMode.HTML)
 
@@ -8677,7 +8685,7 @@ def add_type_cohort(update: Update, context: CallbackContext) -> int:
     if is_game_in_wrong_phase(update, context, placeholders["err"]):
         return add_type_cohort_end(update, context)
 
-    if controller.get_crew_upgrade_points(query_game_of_user(update.message.chat_id, get_user_id(update))) < 2:
+    if controller.get_crew_upgrade_points(controller.game_of_user(update.message.chat_id, get_user_id(update))) < 2:
         message = update.message.reply_text(placeholders["err2"])
         auto_delete_message(message, 15)
         return add_type_cohort_end(update, context)
@@ -8737,7 +8745,7 @@ def add_type_cohort_type(update: Update, context: CallbackContext) -> int:
 
     add_tag_in_telegram_data(context, ["type_cohort", "info", "type"], update.message.text)
 
-    controller.commit_add_cohort_type(query_game_of_user(update.message.chat_id, get_user_id(update)),
+    controller.commit_add_cohort_type(controller.game_of_user(update.message.chat_id, get_user_id(update)),
                                       context.user_data["type_cohort"]["info"])
     return add_type_cohort_end(update, context)
 
@@ -10678,7 +10686,7 @@ def change_lang_journal_choice(update: Update, context: CallbackContext) -> int:
     query.answer()
     choice = query.data
 
-    controller.change_journal_language(query_game_of_user(update.effective_message.chat_id, get_user_id(update)),
+    controller.change_journal_language(controller.game_of_user(update.effective_message.chat_id, get_user_id(update)),
                                        choice)
 
     return change_lang_journal_end(update, context)
@@ -10750,7 +10758,8 @@ def promote_cohort_choice(update: Update, context: CallbackContext) -> int:
     query.answer()
     choice = int(query.data) - 1
 
-    controller.promote_cohort_of_crew(query_game_of_user(update.effective_message.chat_id, get_user_id(update)), choice)
+    game_id = controller.game_of_user(update.effective_message.chat_id, get_user_id(update))
+    controller.promote_cohort_of_crew(game_id, choice)
 
     return add_armor_cohort_end(update, context)
 
@@ -10894,7 +10903,7 @@ def send_codex(update: Update, context: CallbackContext):
     if is_user_not_in_game(update, placeholders["404"]):
         return
 
-    codex = controller.get_codex(query_game_of_user(update.effective_message.chat_id, get_user_id(update)))
+    codex = controller.get_codex(controller.game_of_user(update.effective_message.chat_id, get_user_id(update)))
     update.message.reply_document(document=codex[0], filename=codex[1], caption=placeholders["0"])
 
 
@@ -8,6 +8,7 @@ from controller.DBreader import *
 from controller.DBwriter import *
 from utility.FilesManager import *
 from controller.Controller import Controller
+from utility.FilesLoader import hydration_stats
 
 # instantiates the Controller.
 controller = Controller()
@@ -134,7 +135,7 @@ def is_user_not_in_game(update: Update, message_text: str) -> bool:
     :param message_text: the error text to send the user if he is not in a game.
     :return: True if the user is NOT in a game, False otherwise.
     """
-    if query_game_of_user(update.message.chat_id, get_user_id(update)) is None:
+    if controller.game_of_user(update.message.chat_id, get_user_id(update)) is None:
         update.message.reply_text(message_text, parse_mode=ParseMode.HTML)
         return True
     return False
@@ -157,7 +158,7 @@ def is_game_in_wrong_phase(update: Update, context: CallbackContext, message_tex
     if is_user_not_in_game(update, message_text):
         return True
 
-    game_state = controller.get_game_state(query_game_of_user(update.message.chat_id, get_user_id(update)))
+    game_state = controller.get_game_state(controller.game_of_user(update.message.chat_id, get_user_id(update)))
     if game_state == phase or game_state == 0:
         update.message.reply_text(placeholders[str(game_state)].format(update.message.text), parse_mode=ParseMode.HTML)
         return True
@@ -200,9 +201,30 @@ def print_controller(update: Update, context: CallbackContext):
     update.message.reply_text("Controller printed")
     print("-----------------CONTROLLER----------------------------------------------------")
     print(controller)
+    print("-----------------LOCKS---------------------------------------------------------")
+    print(controller.locks.stats())
+    print("-----------------EVICTION------------------------------------------------------")
+    print(controller.eviction.stats())
+    print("-----------------HYDRATION-----------------------------------------------------")
+    print(hydration_stats.stats())
+    print("-----------------DATABASE------------------------------------------------------")
+    print(report_db_profile())
+    print("-----------------STORAGE-------------------------------------------------------")
+    print(query_storage_report())
     print("------------------------------------------------------------------------------")
 
 
+def compact_database(update: Update, context: CallbackContext):
+    update.message.reply_text("Compacting the database")
+    print("-----------------STORAGE BEFORE------------------------------------------------")
+    print(query_storage_report())
+    print("Rewritten values: {}".format(compact_storage()))
+    print("-----------------STORAGE AFTER-------------------------------------------------")
+    print(query_storage_report())
+    print("------------------------------------------------------------------------------")
+    update.message.reply_text("Database compacted")
+
+
 def custom_kb(buttons: List[str], inline: bool = False, split_row: int = None,
               callback_data: List[Any] = None,
               selective: bool = True, input_field_placeholder: str = None) -> ReplyMarkup:
@@ -117,7 +117,7 @@ class Hull(PC, ISavable):
         :return: Hull
         """
         temp = pc_from_json(data)
-        frame_features = list(map(SpecialAbility.from_json, data["frame_features"]))
+        frame_features = canon_catalog.abilities(data["frame_features"])
         pop_dict_items(data, ["frame_features"])
         return cls(**data, **temp, frame_features=frame_features)
 
@@ -1,6 +1,7 @@
 from abc import abstractmethod
 
 from character.Character import Character
+from controller.DBcanon import canon_catalog
 from utility.IDrawable import IDrawable
 from utility.ISavable import ISavable, pop_dict_items
 
@@ -81,6 +82,7 @@ class PC(Character, ISavable, IDrawable):
         if downtime_activities is None:
             downtime_activities = []
         self.downtime_activities = downtime_activities
+        self.char_id = None
 
     def add_stress(self, stress: int) -> int:
         """
@@ -332,6 +334,17 @@ class PC(Character, ISavable, IDrawable):
     def __repr__(self) -> str:
         return str(self.__dict__)
 
+    def save_to_dict(self) -> dict:
+        """
+        Reimplement save_to_dict method of ISavable removing the char_id, that is the key of the row where the PC is
+        stored in the database, and the canon text, that is referenced by its key.
+
+        :return: dictionary of the object
+        """
+        temp = super().save_to_dict()
+        temp.pop("char_id", None)
+        return canon_catalog.pack(temp)
+
     def __eq__(self, o: object) -> bool:
         return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
 
@@ -380,10 +393,12 @@ def pc_from_json(data: dict) -> dict:
     """
     Method used to create a dictionary where the values are the attributes of this class.
 
+    The canon text referenced by its key is put back and the canon SpecialAbility are shared.
+
     :param data: dictionary containing the dictionary of the attributes of this class
     :return: dictionary where each item has key = name of class attribute, value = object
     """
-
+    canon_catalog.unpack(data)
     dictionary = {}
 
     if "items" in data:
@@ -391,7 +406,7 @@ def pc_from_json(data: dict) -> dict:
     if "healing" in data:
         dictionary["healing"] = Clock.from_json(data["healing"])
     if "abilities" in data:
-        dictionary["abilities"] = list(map(SpecialAbility.from_json, data["abilities"]))
+        dictionary["abilities"] = canon_catalog.abilities(data["abilities"])
     if "playbook" in data:
         dictionary["playbook"] = Playbook.from_json(data["playbook"])
     if "attributes" in data:
@@ -120,7 +120,7 @@ class Vampire(Owner, ISavable):
         """
         temp = pc_from_json(data)
         dark_servants = list(map(NPC.from_json, data["dark_servants"]))
-        strictures = list(map(SpecialAbility.from_json, data["strictures"]))
+        strictures = canon_catalog.abilities(data["strictures"])
         pop_dict_items(data, ["vice", "dark_servants", "strictures"])
         return cls(**data, **temp, dark_servants=dark_servants, strictures=strictures)
 
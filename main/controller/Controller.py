@@ -1,5 +1,10 @@
 import copy
+import functools
+import html
+import inspect
 import threading
+import time
+import traceback
 
 from bs4 import BeautifulSoup
 
@@ -7,25 +12,90 @@ from character.Ghost import Ghost
 from character.Hull import Hull
 from character.Human import Human
 from character.Owner import Owner
+from character.PC import PC
 from character.Vampire import Vampire
 from component.Clock import Clock
 from controller.DBreader import *
 from controller.DBwriter import *
+from controller.GameEviction import GameEvictionPolicy
+from controller.GameLocks import GameLockManager
 from game.Game import Game
+from game.GameRegistry import GameRegistry
+from game.Journal import Journal
 from game.Player import Player
 from game.Score import Score
 from organization.Cohort import Cohort
 from organization.Crew import Crew
-from utility.FilesLoader import load_games
+from utility.FilesLoader import hydrate_games, hydration_stats, load_games, setup
+from utility.GameSnapshot import dump_snapshot, settings as snapshot_settings
 from utility.ISavable import save_to_json
 from utility.htmlFactory import MapFactory
 
+CODEX_TITLE = "\ue000codex-title\ue000"
+
+GAME_AGGREGATES: Dict[str, Tuple[str, Callable[[Game], str]]] = {
+    "crew": ("crew_json", lambda game: save_to_json(game.crew)),
+    "crafted_items": ("crafted_item_json", lambda game: save_to_json(game.crafted_items)),
+    "NPCs": ("npc_json", lambda game: save_to_json(game.NPCs)),
+    "factions": ("faction_json", lambda game: save_to_json(game.factions)),
+    "scores": ("score_json", lambda game: save_to_json(game.scores)),
+    "clocks": ("clock_json", lambda game: save_to_json(game.clocks))
+}
+
+
+def game_command(method: Callable) -> Callable:
+    """
+    Decorator that runs the decorated Controller command holding the lock of the game it works on, so the commands of
+    the same game are serialized. The game is found from the arguments of the command: game_id, the chat and the user
+    (chat_id and user_id or player_id) or the chat and the title of the game (chat_id and game_title).
+
+    :param method: the Controller method to decorate.
+    :return: the decorated method.
+    """
+    signature = inspect.signature(method)
+    parameters = signature.parameters
+    if "game_id" not in parameters and not ("chat_id" in parameters and (
+            "user_id" in parameters or "player_id" in parameters or "game_title" in parameters)):
+        raise TypeError("Cannot find the game of {}".format(method.__name__))
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        if "game_id" in arguments:
+            game_id = arguments["game_id"]
+        elif "game_title" in arguments:
+            game_ids = query_game_ids(arguments["chat_id"], arguments["game_title"])
+            game_id = game_ids[0] if game_ids else None
+        else:
+            game_id = self.game_of_user(arguments["chat_id"], arguments.get("user_id", arguments.get("player_id")))
+
+        if game_id is None:
+            return method(self, *args, **kwargs)
+        with self.locks.lock(game_id):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class Controller:
 
     def __init__(self) -> None:
-        self.games = load_games()
+        start = time.perf_counter()
+        self.games = GameRegistry(load_games(lazy=True))
+        hydration_stats.record_phase("headers", time.perf_counter() - start)
+        self.not_loaded = {game.identifier for game in self.games}
+        self.memberships: Dict[Tuple[int, int], int] = {}
+        for chat_id, user_id, game_id in query_memberships():
+            self.memberships.setdefault((chat_id, user_id), game_id)
         self.lock_add_game = threading.Lock()
+        self.lock_load_game = threading.Lock()
+        self.lock_memberships = threading.Lock()
+        self.locks = GameLockManager()
+        self.eviction = GameEvictionPolicy.from_json(load_section("eviction"))
+        self.codex_cache: Dict[str, Tuple[int, bytes]] = {}
+
+        startup = {"preload": 0, "workers": 4, **load_section("startup")}
+        if startup["preload"]:
+            self.preload_games(startup["preload"], startup["workers"])
 
     def get_game_by_id(self, game_id: int) -> Game:
         """
@@ -34,30 +104,275 @@ class Controller:
         :param game_id: the game's id.
         :return: the selected Game.
         """
-        for game in self.games:
-            if game.identifier == game_id:
-                return game
+        game = self.games.get(game_id)
+        if game is not None:
+            game = self.load_game(game)
+            self.eviction.touch(game_id)
+            if self.eviction.due():
+                after_commit(self.evict_games)
+        return game
+
+    def load_game(self, game: Game) -> Optional[Game]:
+        """
+        Reads from the database the content of the passed game, the first time it is used after the start of the bot
+        or after its eviction: at startup only the id, title, chat and state of the games are loaded.
+        The game is looked up again in the registry, since it may have been evicted (and replaced) since the passed
+        instance has been read: the instance loaded and returned is always the registered one.
+
+        :param game: the Game to load.
+        :return: the registered instance of the game, loaded; None if the game has been removed.
+        """
+        # the registry is read before not_loaded: an eviction in between is seen by the check
+        registered = self.games.get(game.identifier)
+        if registered is not None and game.identifier not in self.not_loaded:
+            return registered
+        with self.lock_load_game:
+            registered = self.games.get(game.identifier)
+            if registered is not None and game.identifier in self.not_loaded:
+                if not setup(registered) and snapshot_settings["enabled"]:
+                    self.save_snapshot(registered)
+                self.not_loaded.discard(game.identifier)
+                self.eviction.record_load(game.identifier)
+            return registered
+
+    def preload_games(self, limit: int, workers: int = 4) -> int:
+        """
+        Loads at once the content of the games not loaded yet, instead of waiting for their first use: their rows are
+        read with a single query and they are set up by a pool of threads. The time spent by each phase is recorded in
+        hydration_stats.
+
+        :param limit: the maximum number of games to load; it is also bounded by the games budget of the eviction
+            policy, if it has one.
+        :param workers: the number of threads setting up the games.
+        :return: the number of loaded games.
+        """
+        if self.eviction.max_games:
+            limit = min(limit, self.eviction.max_games)
+        with self.lock_load_game:
+            games = [game for game in self.games if game.identifier in self.not_loaded][:limit]
+            hydrated = hydrate_games(games, workers)
+            for game in games:
+                if game.identifier in hydrated:
+                    self.not_loaded.discard(game.identifier)
+                    self.eviction.touch(game.identifier)
+
+        start = time.perf_counter()
+        if snapshot_settings["enabled"]:
+            for game in games:
+                if hydrated.get(game.identifier) is False:
+                    with self.locks.lock(game.identifier):
+                        self.save_snapshot(game)
+        hydration_stats.record_phase("snapshots", time.perf_counter() - start)
+        return len(hydrated)
+
+    def evict_games(self) -> int:
+        """
+        Drops from memory the games chosen by the eviction policy: the idle ones and the least recently used ones
+        exceeding the budget. They are loaded again from the database the next time they are used.
+
+        :return: the number of evicted games.
+        """
+        return sum(self.evict_game(game_id) for game_id in self.eviction.candidates())
+
+    def evict_game(self, game_id: int) -> bool:
+        """
+        Replaces the passed game in the registry with a Game holding only its id, title, chat and state, so its content
+        can be garbage collected. The threads still using the old instance are not affected.
+        The game is skipped if one of its commands is running in another thread.
+
+        :param game_id: the id of the game.
+        :return: True if the game has been evicted, False otherwise.
+        """
+        lock = self.locks.get(game_id)
+        if not lock.acquire(blocking=False):
+            return False
+        try:
+            with self.lock_load_game:
+                game = self.games.get(game_id)
+                if game is None or game_id in self.not_loaded:
+                    self.eviction.forget(game_id)
+                    return False
+                write_behind.flush()
+                header = Game(identifier=game.identifier, title=game.title, chat_id=game.chat_id)
+                header.state = game.state
+                self.games.add(header)
+                self.not_loaded.add(game_id)
+                self.eviction.record_eviction(game_id)
+            return True
+        finally:
+            lock.release()
+
+    def game_of_user(self, chat_id: int, user_id: int) -> Optional[int]:
+        """
+        Gets the id of the game the user is playing in the specified chat, without querying the database.
+
+        :param chat_id: the Telegram chat id of the game.
+        :param user_id: the Telegram id of the user.
+        :return: the game_id (None if the user has not joined a game of the chat).
+        """
+        return self.memberships.get((chat_id, user_id))
+
+    def add_membership(self, chat_id: int, user_id: int, game_id: int) -> None:
+        """
+        Records in the membership index that the user has joined the game, once the change is committed.
+
+        :param chat_id: the Telegram chat id of the game.
+        :param user_id: the Telegram id of the user.
+        :param game_id: the id of the game.
+        """
+        def add():
+            with self.lock_memberships:
+                self.memberships.setdefault((chat_id, user_id), game_id)
+        after_commit(add)
+
+    def remove_memberships(self, game_id: int, user_id: int = None) -> None:
+        """
+        Removes from the membership index the user from the game, once the change is committed.
+        A removed user that still belongs to another game of the same chat is indexed again with that game, read from
+        the database.
+
+        :param game_id: the id of the game.
+        :param user_id: the Telegram id of the user; if None all the users of the game are removed.
+        """
+        def remove():
+            with self.lock_memberships:
+                removed = {key for key, value in self.memberships.items()
+                           if value == game_id and (user_id is None or key[1] == user_id)}
+                for key in removed:
+                    del self.memberships[key]
+            if not removed:
+                return
+            stored = query_memberships()
+            with self.lock_memberships:
+                for chat_id, member_id, other_id in stored:
+                    if (chat_id, member_id) in removed and other_id != game_id:
+                        self.memberships.setdefault((chat_id, member_id), other_id)
+        after_commit(remove)
+
+    def check_memberships(self) -> Dict[Tuple[int, int], Tuple[Optional[int], Optional[int]]]:
+        """
+        Compares the membership index with the memberships stored in the database.
+
+        :return: a dictionary with the (chat_id, user_id) pairs that differ: the values are tuples with the game_id in
+            the index and the one in the database (in this order). An empty dictionary if they all match.
+        """
+        stored = {}
+        for chat_id, user_id, game_id in query_memberships():
+            stored.setdefault((chat_id, user_id), game_id)
+        with self.lock_memberships:
+            indexed = dict(self.memberships)
+        return {key: (indexed.get(key), stored.get(key)) for key in indexed.keys() | stored.keys()
+                if indexed.get(key) != stored.get(key)}
+
+    @classmethod
+    def mark_dirty(cls, game: Game, *aggregates: str) -> None:
+        """
+        Records that the passed aggregates of the game have been modified: at the end of the command they are
+        serialized and stored with a single update of the game, however many times they have been modified.
+        The "journal" aggregate is stored appending its new entries, see save_journal().
+
+        :param game: the modified Game.
+        :param aggregates: the names of the modified aggregates (keys of GAME_AGGREGATES or "journal").
+        """
+        def flush(fields: Set[str]) -> None:
+            if "journal" in fields:
+                cls.save_journal(game)
+            columns = {GAME_AGGREGATES[field][0]: GAME_AGGREGATES[field][1](game)
+                       for field in fields if field in GAME_AGGREGATES}
+            if columns:
+                update_game_columns(game.identifier, **columns)
+        mark_dirty(("Game", game.identifier), flush, *aggregates)
+        # the journal is not in the snapshot
+        if any(aggregate != "journal" for aggregate in aggregates):
+            cls.schedule_snapshot(game)
+
+    @staticmethod
+    def save_journal(game: Game) -> None:
+        """
+        Appends to the database the entries written in the journal of the game since the last time it has been saved,
+        instead of its whole html. The entries are dropped from the journal only when they are committed, so they are
+        written again if the command is rolled back.
+
+        :param game: the Game whose journal has been modified.
+        """
+        entries = list(game.journal.entries)
+        if entries and insert_journal_entries(game.identifier, entries):
+            after_commit(lambda: game.journal.entries_stored(len(entries)))
+
+    def mark_pc_dirty(self, game_id: int, user_id: int, pc: PC) -> None:
+        """
+        Records that the passed PC has been modified: at the end of the command it is stored once with save_pc().
+
+        :param game_id: the game's id.
+        :param user_id: the Telegram id of the owner of the PC.
+        :param pc: the modified PC.
+        """
+        mark_dirty(("PC", id(pc)), lambda fields: self.save_pc(game_id, user_id, pc))
+        game = self.games.get(game_id)
+        if game is not None:
+            self.schedule_snapshot(game)
+
+    @classmethod
+    def schedule_snapshot(cls, game: Game) -> None:
+        """
+        Rewrites the snapshot of the passed game at the end of the command, after its modified aggregates and PCs.
+
+        :param game: the modified Game.
+        """
+        if snapshot_settings["enabled"]:
+            before_commit(("Snapshot", game.identifier), lambda: cls.save_snapshot(game))
+
+    @staticmethod
+    def save_snapshot(game: Game) -> None:
+        """
+        Stores the binary snapshot of the content of the passed game, used to load it faster than from the json columns.
+        If the game cannot be saved in a snapshot the stored one is dropped, so it is loaded from the json columns.
+
+        :param game: the Game to save.
+        """
+        try:
+            snapshot = dump_snapshot(game)
+        except Exception:
+            traceback.print_exc()
+            snapshot = None
+        update_game_columns(game.identifier, snapshot=snapshot)
+
+    def save_pc(self, game_id: int, user_id: int, pc: PC) -> None:
+        """
+        Stores in the database only the passed PC of the user: its row is updated if the PC has already been stored,
+        otherwise the PC is inserted and gets its char_id.
+
+        :param game_id: the game's id.
+        :param user_id: the Telegram id of the owner of the PC.
+        :param pc: the PC to store.
+        """
+        if pc.char_id is None:
+            pc.char_id = insert_character(user_id, game_id, save_to_json(pc))
+        else:
+            update_character(pc.char_id, save_to_json(pc))
 
     def add_game(self, chat_id: int, title: str = None) -> int:
         """
-        Creates a new Game and adds it to self.games
+        Creates a new Game and adds it to self.games, once it is committed in the Data Base.
 
         :param title: the title of the new Game
         :param chat_id: the id of the telegram chat where the game is created.
         :return: the id of the game in the Data Base
         """
-        self.lock_add_game.acquire()
-        new_game = Game(title=title, chat_id=chat_id)
+        # the lock is held until the commit, so the next game reads the id of this one as the last id
+        with self.lock_add_game, transaction():
+            new_game = Game(title=title, chat_id=chat_id)
 
-        insert_game(new_game.identifier, new_game.title, new_game.chat_id)
-        new_game.journal.write_title(title)
-        insert_journal(new_game.identifier, new_game.journal.get_log_string())
+            insert_game(new_game.identifier, new_game.title, new_game.chat_id)
+            new_game.journal.write_title(title)
+            self.mark_dirty(new_game, "journal")
 
-        self.games.append(new_game)
+            after_commit(lambda: self.games.add(new_game))
 
-        self.lock_add_game.release()
         return new_game.identifier
 
+    @game_command
+    @atomic
     def update_user_in_game(self, player_id: int, chat_id: int, game_title: str,
                             is_master: bool = False, pc: dict = None):
         """
@@ -91,44 +406,51 @@ class Controller:
                 if master is not None:
                     master.is_master = False
                     if not master.characters:
-                        game.users.remove(master)
+                        game.remove_player(master)
                         delete_user_game(master.player_id, game_id)
+                        self.remove_memberships(game_id, master.player_id)
                     else:
-                        insert_user_game(master.player_id, game_id, save_to_json(master.characters),
-                                         master.is_master)
+                        insert_user_game(master.player_id, game_id, master=master.is_master)
 
             # User already present
-            for user in game.users:
-                if user.player_id == player_id:
+            user = game.get_player_by_id(player_id)
+            if user is not None:
 
-                    if is_master:
-                        user.is_master = is_master
-                    if human is not None:
-                        friend = human.friend.name + ", " + human.friend.role
-                        enemy = human.enemy.name + ", " + human.enemy.role
-                        self.add_npc_to_game(friend, game)
-                        self.add_npc_to_game(enemy, game)
-                        user.characters.append(human)
+                if is_master:
+                    user.is_master = is_master
+                if human is not None:
+                    friend = human.friend.name + ", " + human.friend.role
+                    enemy = human.enemy.name + ", " + human.enemy.role
+                    self.add_npc_to_game(friend, game)
+                    self.add_npc_to_game(enemy, game)
+                    user.add_character(human)
 
-                    insert_npc_json(game_id, save_to_json(game.NPCs))
+                self.mark_dirty(game, "NPCs")
 
-                    insert_user_game(player_id, game_id, save_to_json(user.characters), user.is_master)
-                    return
+                insert_user_game(player_id, game_id, master=user.is_master)
+                if human is not None:
+                    self.mark_pc_dirty(game_id, player_id, human)
+                return
 
             # New user
             new_player = Player(query_users_names(player_id)[0], player_id, is_master)
             if human is not None:
-                new_player.characters.append(human)
+                new_player.add_character(human)
                 friend = human.friend.name + ", " + human.friend.role
                 enemy = human.enemy.name + ", " + human.enemy.role
                 self.add_npc_to_game(friend, game)
                 self.add_npc_to_game(enemy, game)
-                insert_npc_json(game_id, save_to_json(game.NPCs))
+                self.mark_dirty(game, "NPCs")
 
-            game.users.append(new_player)
+            game.add_player(new_player)
 
-            insert_user_game(player_id, game_id, save_to_json(new_player.characters), is_master)
+            insert_user_game(player_id, game_id, master=is_master)
+            self.add_membership(game.chat_id, player_id, game_id)
+            if human is not None:
+                self.mark_pc_dirty(game_id, player_id, human)
 
+    @game_command
+    @atomic
     def update_crew_in_game(self, player_id: int, chat_id: int, crew: dict):
         """
         Adds the new crew to the specified Game. If the crew was already present it is replaced.
@@ -138,7 +460,7 @@ class Controller:
         :param chat_id: identifier of the origin chat of the Game.
         :param crew: dict containing all the information about a crew.
         """
-        game_id = query_game_of_user(chat_id, player_id)
+        game_id = self.game_of_user(chat_id, player_id)
 
         upgrades = []
         if "upgrades" in crew:
@@ -165,8 +487,7 @@ class Controller:
         contact = game.crew.contact.name + ", " + game.crew.contact.role
         self.add_npc_to_game(contact, game)
 
-        insert_npc_json(game_id, save_to_json(game.NPCs))
-        insert_crew_json(game_id, save_to_json(game.crew))
+        self.mark_dirty(game, "NPCs", "crew")
 
     def get_game_state(self, game_id: int) -> int:
         """
@@ -190,6 +511,8 @@ class Controller:
             return True
         return False
 
+    @game_command
+    @atomic
     def change_state(self, game_id: int, new_state: int):
         """
         Changes the current state of the game to the selected one.
@@ -205,9 +528,11 @@ class Controller:
         for player in game.users:
             for pc in player.characters:
                 pc.clear_consumable()
+                self.mark_pc_dirty(game_id, player.player_id, pc)
 
         game.state = new_state
         game.journal.write_phase(new_state)
+        self.mark_dirty(game, "scores", "journal")
         insert_state(game_id, new_state)
 
     def get_user_characters_names(self, user_id: int, chat_id: int, all_users: bool = False) -> List[str]:
@@ -220,7 +545,7 @@ class Controller:
         :return: a list of strings containing all the names.
         """
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         user = None
         if not all_users:
             user = user_id
@@ -242,7 +567,7 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: a list of tuples with the name of the action and the action's rating in this order.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         ratings = []
         pcs = game.get_pcs_list()
@@ -279,13 +604,15 @@ class Controller:
         :param chat_id: the Telegram chat id of the user.
         :return: True if the user is the GM, False otherwise.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         master = game.get_master()
 
         if master.player_id == user_id:
             return True
         return False
 
+    @game_command
+    @atomic
     def commit_action(self, chat_id: int, user_id: int, action_roll: dict) -> List[Tuple[str, int]]:
         """
         Applies the effects of the passed action to the interested game:
@@ -299,7 +626,7 @@ class Controller:
         :return: a list of tuples with the names of the PCs and the numbers of their suffered trauma in this order.
         """
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         action_roll.pop("bonus_dice")
 
         trauma_victims = []
@@ -312,21 +639,23 @@ class Controller:
             pcs_names = []
             for assistant in assistants:
                 user = game.get_player_by_id(assistant[0])
-                traumas = user.get_character_by_name(assistant[1]).add_stress(1)
+                assistant_pc = user.get_character_by_name(assistant[1])
+                traumas = assistant_pc.add_stress(1)
                 pcs_names.append(assistant[1])
                 if traumas > 0:
                     trauma_victims.append((assistant[1], traumas))
-                update_user_characters(user.player_id, game.identifier, save_to_json(user.characters))
+                self.mark_pc_dirty(game.identifier, user.player_id, assistant_pc)
 
             action_roll["assistants"] = pcs_names
 
         # if Push +2 stress
         if action_roll["push"]:
             user = game.get_player_by_id(user_id)
-            traumas = user.get_character_by_name(action_roll["pc"]).add_stress(2)
+            pc = user.get_character_by_name(action_roll["pc"])
+            traumas = pc.add_stress(2)
             if traumas > 0:
                 trauma_victims.append((action_roll["pc"], traumas))
-            update_user_characters(user_id, game.identifier, save_to_json(user.characters))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
 
         # groupActionCohort
         if "cohort" in action_roll:
@@ -340,15 +669,17 @@ class Controller:
                 # if Push +2 stress
                 if participants[pc_name]["push"]:
                     user = game.get_player_by_id(participants[pc_name]["id"])
-                    traumas = user.get_character_by_name(pc_name).add_stress(2)
-                    update_user_characters(participants[pc_name]["id"], game.identifier, save_to_json(user.characters))
+                    participant = user.get_character_by_name(pc_name)
+                    traumas = participant.add_stress(2)
+                    self.mark_pc_dirty(game.identifier, user.player_id, participant)
                     if traumas > 0:
                         trauma_victims.append((pc_name, traumas))
                 # if outcome<4 +1 stress to the leader
                 if participants[pc_name]["outcome"] < 4 and participants[pc_name]["outcome"] != "CRIT":
                     user = game.get_player_by_id(user_id)
-                    traumas = user.get_character_by_name(action_roll["pc"]).add_stress(1)
-                    update_user_characters(user.player_id, game.identifier, save_to_json(user.characters))
+                    leader = user.get_character_by_name(action_roll["pc"])
+                    traumas = leader.add_stress(1)
+                    self.mark_pc_dirty(game.identifier, user.player_id, leader)
                     if traumas > 0:
                         trauma_victims.append((action_roll["pc"], traumas))
 
@@ -363,10 +694,11 @@ class Controller:
 
         game.journal.write_action(**action_roll)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
         return trauma_victims
 
+    @game_command
     def get_journal_of_game(self, game_id: int) -> Tuple[bytes, str]:
         """
         Retrieves the Journal's HTML file of the specified game as a bytes array
@@ -377,7 +709,15 @@ class Controller:
         """
         game = self.get_game_by_id(game_id)
 
-        return game.journal.read_journal(), ("Journal - " + game.title + ".html")
+        rendered = 0 if game.journal.entries else game.journal.stored_entries
+        journal = game.journal.read_journal()
+        # the html has been rendered anyway: it replaces the stored entries it is rendered from, so they are not
+        # replayed at the next load
+        if rendered and compact_journal(game_id, game.journal.get_log_string(), json.dumps(game.journal.get_anchor()),
+                                        rendered):
+            after_commit(lambda: game.journal.compacted(rendered))
+
+        return journal, ("Journal - " + game.title + ".html")
 
     def get_character_sheet_image(self, chat_id: int, user_id: int, pc_name: str) -> Tuple[bytes, str]:
         """
@@ -389,7 +729,7 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: a Tuple that contains the bytes of the file and a string that represents its name.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         kwargs = {}
         if game.crew is not None:
@@ -416,7 +756,7 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :return: a Tuple that contains the bytes of the file and a string that represents its name.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         players = game.users
         players_names = []
         for player in players:
@@ -424,6 +764,8 @@ class Controller:
 
         return MapFactory.modify(players_names), ("DoskvolMap.html")
 
+    @game_command
+    @atomic
     def add_cohort_in_crew(self, game_id: int, cohort: dict):
         """
         Adds the given cohort to the crew of the specified game and updates the crew in the Data Base.
@@ -431,14 +773,17 @@ class Controller:
         :param game_id: the game's id.
         :param cohort: aa dictionary representing with the parameters used to build a Cohort
         """
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+        crew = game.crew
 
         crew.add_cohort(Cohort(**cohort))
 
         crew.crew_exp.add_points(-1)
 
-        insert_crew_json(game_id, save_to_json(crew))
+        self.mark_dirty(game, "crew")
 
+    @game_command
+    @atomic
     def add_clock_to_game(self, chat_id: int, user_id: int, clock: dict):
         """
         Adds the given clock to the game's list of clock, updates the clocks in the Data Base
@@ -448,15 +793,13 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :param clock: a dictionary representing the parameters used to build a Clock
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         new_clock = game.create_clock(**clock)
 
-        insert_clock_json(game.identifier, save_to_json(game.clocks))
-
         game.journal.write_clock(query_users_names(user_id)[0], new_clock)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "clocks", "journal")
 
     def get_healing_clock(self,  chat_id: int, user_id: int, pc_name: str) -> str:
         """
@@ -467,7 +810,7 @@ class Controller:
         :param pc_name: the name of the active PC
         :return: the string representation of the healing clock
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         clock = game.get_player_by_id(user_id).get_character_by_name(pc_name).healing
         return "{}: {}/{}".format(clock.name, clock.progress, clock.segments)
 
@@ -486,6 +829,8 @@ class Controller:
             return ["{}: {}/{}".format(clock.name, clock.progress, clock.segments)
                     for clock in self.get_game_by_id(game_id).clocks]
 
+    @game_command
+    @atomic
     def tick_clock_of_game(self, chat_id: int, user_id: int, old_clock: dict, ticks: int, write: bool = True) \
             -> Tuple[bool, dict]:
         """
@@ -499,7 +844,7 @@ class Controller:
         :return: a tuple with a bool (True if the clock has been completed)
         and a dictionary representing the modified Clock.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         clock_to_tick = Clock(**old_clock)
 
@@ -508,31 +853,34 @@ class Controller:
         new_clock = copy.deepcopy(clock_to_tick)
         filled = new_clock.tick(ticks)
 
-        insert_clock_json(game.identifier, save_to_json(game.clocks))
+        self.mark_dirty(game, "clocks")
 
         if write:
             game.journal.write_clock(query_users_names(user_id)[0], new_clock, clock_to_tick)
 
-            insert_journal(game.identifier, game.journal.get_log_string())
+            self.mark_dirty(game, "journal")
 
         return filled, new_clock.__dict__
 
+    @game_command
+    @atomic
     def edit_clock_of_game(self, chat_id: int, user_id: int, pc_name: str, old_clock: dict, segments: int):
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         clock_to_edit = Clock(**old_clock)
 
         if "healing" in clock_to_edit.name.lower():
-            player = game.get_player_by_id(user_id)
-            player.get_character_by_name(pc_name).healing.edit(segments=segments)
-            update_user_characters(user_id, game.identifier, save_to_json(player.characters))
+            pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
+            pc.healing.edit(segments=segments)
+            self.mark_pc_dirty(game.identifier, user_id, pc)
         else:
-            for clock in game.clocks:
-                if clock_to_edit == clock:
-                    clock.edit(segments=segments)
-                    insert_clock_json(game.identifier, save_to_json(game.clocks))
-                    break
+            clock = game.get_clock(clock_to_edit)
+            if clock is not None:
+                clock.edit(segments=segments)
+                self.mark_dirty(game, "clocks")
 
+    @game_command
+    @atomic
     def add_claim_to_game(self, game_id: int, claim: dict):
         """
         Handles the addiction of a new Claim to the game's crew and write the information in the journal.
@@ -549,11 +897,9 @@ class Controller:
         else:
             game.crew.add_lair_claim(new_claim)
 
-        insert_crew_json(game_id, save_to_json(game.crew))
-
         game.journal.write_add_claim(**claim)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "crew", "journal")
 
     def game_has_crew(self, game_id: int) -> bool:
         """
@@ -576,7 +922,7 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :return: a list of tuple with a string representing the cohort's types and an int representing its quality
         """
-        crew = self.get_game_by_id(query_game_of_user(chat_id, user_id)).crew
+        crew = self.get_game_by_id(self.game_of_user(chat_id, user_id)).crew
 
         co = []
         for cohort in crew.cohorts:
@@ -607,7 +953,7 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: a list of tuples with the name of the attribute and the attribute's rating in this order.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         attributes_ratings = []
 
@@ -627,13 +973,15 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: None if the pc is not an owner, an int representing the lifestyle otherwise.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         if not isinstance(pc, Owner):
             return None
         return int(pc.stash / 10)
 
+    @game_command
+    @atomic
     def commit_resistance_roll(self, chat_id: int, user_id: int, resistance_roll: dict) -> Tuple[str, int]:
         """
         Applies the effects of the passed action to the interested game:
@@ -646,7 +994,7 @@ class Controller:
         :return: a list of tuples with the names of the PCs and the numbers of their suffered trauma in this order.
         """
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         resistance_roll.pop("bonus_dice")
 
         trauma_victim = ()
@@ -660,17 +1008,18 @@ class Controller:
                 traumas = pc.add_stress(stress)
                 if traumas != 0:
                     trauma_victim = (pc.name, traumas)
-
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+                self.mark_pc_dirty(game.identifier, user_id, pc)
 
         # journal
 
         game.journal.write_resistance_roll(**resistance_roll, stress=stress)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
         return trauma_victim
 
+    @game_command
+    @atomic
     def add_stress_to_pc(self, chat_id: int, user_id: int, pc_name: str, stress: int) -> Tuple[str, int]:
         """
         Adds the given stress to the selected pc of the user and updates the PCs in the DB.
@@ -681,7 +1030,7 @@ class Controller:
         :param stress: the amount of stress to add.
         :return: a list of tuples with the name of the attribute and the attribute's rating in this order.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         trauma_victim = ()
         for pc in game.get_pcs_list(user_id):
@@ -689,8 +1038,7 @@ class Controller:
                 traumas = pc.add_stress(stress)
                 if traumas != 0:
                     trauma_victim = (pc.name, traumas)
-
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+                self.mark_pc_dirty(game.identifier, user_id, pc)
 
         return trauma_victim
 
@@ -703,12 +1051,14 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: the name of the class
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         for pc in game.get_pcs_list(user_id):
             if pc.name.lower() == pc_name.lower():
                 return pc.__class__.__name__
 
+    @game_command
+    @atomic
     def add_trauma_to_pc(self, chat_id: int, user_id: int, pc_name: str, trauma: str) -> bool:
         """
         Adds the given trauma to the selected pc of the user and updates the PCs in the DB.
@@ -719,13 +1069,13 @@ class Controller:
         :param trauma: the trauma to add.
         :return: True if the pc has suffered 4 or more traumas, False otherwise
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         is_dead = False
         for pc in game.get_pcs_list(user_id):
             if pc.name.lower() == pc_name.lower():
                 is_dead = pc.add_trauma(trauma)
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+                self.mark_pc_dirty(game.identifier, user_id, pc)
         return is_dead
 
     def get_factions(self, game_id: int, faction_name: str = None) -> List[str]:
@@ -739,20 +1089,13 @@ class Controller:
         :return: a list of strings, each one composed by the actual status the players have with the faction, the name
             of the faction and the faction's tier level.
         """
-
-        def get_faction_by_name(name: str, factions_list: List[Faction]) -> Faction:
-            for elem in factions_list:
-                if elem.name.lower() == name.lower():
-                    return elem
-
         game = self.get_game_by_id(game_id)
 
-        game_factions = game.factions
         db_factions = query_factions(faction_name)
 
         # replacing the factions that already exist in the game
         for i in range(len(db_factions)):
-            existing_faction = get_faction_by_name(db_factions[i].name, game_factions)
+            existing_faction = game.get_faction_by_name(db_factions[i].name)
             if existing_faction is not None:
                 db_factions[i] = existing_faction
 
@@ -780,20 +1123,13 @@ class Controller:
         :return: a list of strings, each one composed by the NPC's Faction's name (if it has a faction), the name
             of the NPC and its role.
         """
-
-        def get_npcs_by_name_and_role(name: str, role: str, npcs_list: List[NPC]) -> NPC:
-            for elem in npcs_list:
-                if elem.name.lower() == name.lower() and elem.role.lower() == role.lower():
-                    return elem
-
         game = self.get_game_by_id(game_id)
 
-        game_npcs = game.NPCs
         db_npcs = query_npcs()
 
         # replacing the factions that already exist in the game
         for i in range(len(db_npcs)):
-            existing_npc = get_npcs_by_name_and_role(db_npcs[i].name, db_npcs[i].role, game_npcs)
+            existing_npc = game.get_npc_by_name_and_role(db_npcs[i].name, db_npcs[i].role)
             if existing_npc is not None:
                 db_npcs[i] = existing_npc
 
@@ -812,6 +1148,8 @@ class Controller:
 
         return npcs
 
+    @game_command
+    @atomic
     def add_new_score(self, chat_id: int, user_id: int, score: dict):
         """
         Adds a new score to the specified game's list. Calls the method to write the game's journal and updates the DB.
@@ -820,7 +1158,7 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :param score: dictionary containing all the score's information.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         pc_load = []
         participants = []
@@ -829,11 +1167,12 @@ class Controller:
                 pc = elem
                 load = score["members"][key][elem]
 
-                game.get_player_by_id(key).get_character_by_name(pc).load = load
+                member = game.get_player_by_id(key).get_character_by_name(pc)
+                member.load = load
                 pc_load.append((pc, load))
                 participants.append(pc)
 
-                update_user_characters(key, game.identifier, save_to_json(game.get_player_by_id(key).characters))
+                self.mark_pc_dirty(game.identifier, key, member)
         score.pop("members")
 
         if score["target"]["type"] == "NPC":
@@ -843,7 +1182,7 @@ class Controller:
             target = game.get_faction_by_name(faction_name)
             if target is None:
                 target = query_factions(faction_name)[0]
-                game.factions.append(target)
+                game.add_faction(target)
         else:
             target = score["target"]["name"]
 
@@ -851,15 +1190,13 @@ class Controller:
         new_score.calc_target_tier()
         game.scores.append(new_score)
 
-        insert_score_json(game.identifier, save_to_json(game.scores))
-
         score["target"] = score["target"]["name"]
 
         # journal
         game.journal.write_score(**score, pc_load=pc_load)
         # game.journal.indentation += 1
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "scores", "journal")
 
     def add_npc_to_game(self, npc: str, game: Game) -> NPC:
         """
@@ -878,11 +1215,13 @@ class Controller:
                 npc_faction = game.get_faction_by_name(target.faction)
                 if npc_faction is None:
                     npc_faction = query_factions(target.faction)[0]
-                    game.factions.append(npc_faction)
+                    game.add_faction(npc_faction)
                 target.faction = npc_faction
-            game.NPCs.append(target)
+            game.add_npc(target)
         return target
 
+    @game_command
+    @atomic
     def add_heat_to_crew(self, chat_id: int, user_id: int, heat: dict) -> int:
         """
         Applies the effect of the "heat" command to the game's crew and writes the new information in the journal.
@@ -892,14 +1231,12 @@ class Controller:
         :param heat: dictionary that contains the information needed.
         :return: the actual wanted level of the crew.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         wanted_level = game.crew.add_heat(heat["total_heat"])
 
-        insert_crew_json(game.identifier, save_to_json(game.crew))
-
         game.journal.write_heat(**heat, wanted=wanted_level)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "crew", "journal")
 
         return wanted_level
 
@@ -920,6 +1257,8 @@ class Controller:
 
         return self.get_game_by_id(game_id).crew.heat
 
+    @game_command
+    @atomic
     def commit_entanglement(self, game_id: int, entanglement: dict):
         """
         Writes in the journal of the specified game the new entanglement and updates the database.
@@ -936,7 +1275,7 @@ class Controller:
         else:
             game.journal.write_entanglement(**entanglement)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
     def exists_score(self, chat_id: int, user_id: int) -> bool:
         """
@@ -946,7 +1285,7 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :return: True if the game has at least one score, False otherwise.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         if game.scores:
             return True
         return False
@@ -959,7 +1298,7 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :return: the amount of Rep.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         if len(game.scores) > 1:
             score = game.scores[-1]
@@ -968,6 +1307,8 @@ class Controller:
 
         return game.crew.calc_rep(score.target_tier)
 
+    @game_command
+    @atomic
     def end_score(self, chat_id: int, user_id: int, end_score: dict) -> int:
         """
         Close the last added score by removing it from the game's scores list.
@@ -979,7 +1320,7 @@ class Controller:
         :return: the number of coin the players may spend to increase their crew's tier if they completed the Rep
                 progress bar.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         if len(game.scores) > 1:
             game.scores.pop(-1)
@@ -988,15 +1329,10 @@ class Controller:
 
         coin_to_pay = game.crew.add_rep(end_score["rep"])
 
-        insert_score_json(game.identifier, save_to_json(game.scores))
-        insert_crew_json(game.identifier, save_to_json(game.crew))
-        for u in game.users:
-            update_user_characters(u.player_id, game.identifier, save_to_json(u.characters))
-
         end_score.pop("rep")
         game.journal.write_end_score(**end_score)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "scores", "crew", "journal")
 
         return coin_to_pay if coin_to_pay is not None else 0
 
@@ -1032,6 +1368,8 @@ class Controller:
 
         return can_divvy, can_store_in_vault
 
+    @game_command
+    @atomic
     def commit_payoff(self, game_id: int, payoff: dict):
         """
         Stores the coins earned with the selected method, writes in the journal of the specified game the new payoff and
@@ -1055,15 +1393,18 @@ class Controller:
                 game.crew.add_coin(exceed)
 
                 for user in game.users:
-                    update_user_characters(user.player_id, game_id, save_to_json(user.characters))
+                    for owner in game.get_owners_list(user.player_id):
+                        self.mark_pc_dirty(game_id, user.player_id, owner)
             else:
                 game.crew.add_coin(coins)
 
-            insert_crew_json(game_id, save_to_json(game.crew))
+            self.mark_dirty(game, "crew")
 
         game.journal.write_payoff(**payoff)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
+    @game_command
+    @atomic
     def commit_armor_use(self, chat_id: int, user_id: int, armor_use: dict):
         """
         Calls use_armor method of the user's pc, commit the changes made to the journal and updates the database.
@@ -1072,15 +1413,16 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param armor_use: dictionary containing all the information about the use of the armor.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
-        game.get_player_by_id(user_id).get_character_by_name(armor_use["pc"]).use_armor(armor_use["armor_type"])
+        pc = game.get_player_by_id(user_id).get_character_by_name(armor_use["pc"])
+        pc.use_armor(armor_use["armor_type"])
 
         game.journal.write_armor_use(**armor_use)
 
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
     def get_player_coins(self, chat_id: int, user_id: int, pc_name: str) -> \
             Union[Tuple[None, None, int], Tuple[int, int, int]]:
@@ -1094,7 +1436,7 @@ class Controller:
             the coins of the pc's stash (None if the active pc is not an Owner)
             and the coins from the crew vault (in this order).
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         crew = game.crew
 
         if pc_name is None:
@@ -1146,7 +1488,7 @@ class Controller:
         :return: True if the payment was effected, False otherwise.
         """
         if self.can_pay(chat_id, user_id, pc_name, coins_to_pay)[1]:
-            game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+            game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
             pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
 
             if isinstance(pc, Owner):
@@ -1166,7 +1508,7 @@ class Controller:
         :return: True if the payment was effected, False otherwise.
         """
         if self.can_pay(chat_id, user_id, pc_name, coins_to_pay)[0]:
-            game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+            game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
             crew = game.crew
 
             for i in range(coins_to_pay):
@@ -1186,7 +1528,7 @@ class Controller:
         :param coins: the amount of coins to add
         :return: True if the coins can be added in the selected location, False otherwise
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         crew = game.crew
 
         if where == "vault":
@@ -1202,6 +1544,8 @@ class Controller:
 
         return False
 
+    @game_command
+    @atomic
     def commit_add_coin(self, chat_id: int, user_id: int, pc_name: str, add_coin: dict):
         """
         Adds (or remove) the selected amount of coins from the crew and/or the pc and updates the database.
@@ -1211,7 +1555,7 @@ class Controller:
         :param pc_name: the name of the user's active pc.
         :param add_coin: dictionary with the information used to modify the coins
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         crew = game.crew
         crew.add_coin(add_coin["vault"])
@@ -1221,9 +1565,8 @@ class Controller:
             if isinstance(pc, Owner):
                 pc.add_coins(add_coin["coins"])
                 pc.stash_coins(add_coin["stash"])
-                update_user_characters(user_id, game.identifier,
-                                       save_to_json(game.get_player_by_id(user_id).characters))
-        insert_crew_json(game.identifier, save_to_json(crew))
+                self.mark_pc_dirty(game.identifier, user_id, pc)
+        self.mark_dirty(game, "crew")
 
     def get_vault_capacity_of_crew(self, game_id: int) -> int:
         """
@@ -1236,6 +1579,8 @@ class Controller:
 
         return game.crew.vault_capacity
 
+    @game_command
+    @atomic
     def modify_vault_capacity(self, game_id: int, new_capacity: int):
         """
         Modifies the vault capacity of the specified game's crew by replacing the old value with the passed one.
@@ -1251,8 +1596,10 @@ class Controller:
         if crew.coins > new_capacity:
             crew.coins = new_capacity
 
-        insert_crew_json(game.identifier, save_to_json(crew))
+        self.mark_dirty(game, "crew")
 
+    @game_command
+    @atomic
     def upgrade_crew(self, game_id: int) -> Tuple[bool, int]:
         """
         Upgrades the crew increasing the tier by 1 or changing its hold.
@@ -1270,10 +1617,13 @@ class Controller:
                 for i in range(coins):
                     pc.stash_coins(1)
             for user in game.users:
-                update_user_characters(user.player_id, game_id, save_to_json(user.characters))
-        insert_crew_json(game.identifier, save_to_json(game.crew))
+                for owner in game.get_owners_list(user.player_id):
+                    self.mark_pc_dirty(game_id, user.player_id, owner)
+        self.mark_dirty(game, "crew")
         return game.crew.hold, game.crew.tier
 
+    @game_command
+    @atomic
     def update_factions_status(self, game_id: int, factions: dict):
         """
         Updates the game's factions' status. If the factions passed are not in the game list, their instances
@@ -1282,23 +1632,17 @@ class Controller:
         :param game_id: the game's id.
         :param factions: dictionary thet contains all the factions' names and their status to update.
         """
-
-        def get_faction_by_name(name: str, factions_list: List[Faction]) -> Faction:
-            for elem in factions_list:
-                if elem.name.lower() == name.lower():
-                    return elem
-
         game = self.get_game_by_id(game_id)
 
         for key in factions.keys():
-            faction = get_faction_by_name(key, game.factions)
+            faction = game.get_faction_by_name(key)
             if faction is None:
-                game.factions.append(query_factions(name=key)[0])
-                faction = get_faction_by_name(key, game.factions)
+                game.add_faction(query_factions(name=key)[0])
+                faction = game.get_faction_by_name(key)
 
             faction.status = factions[key]
 
-        insert_faction_json(game.identifier, save_to_json(game.factions))
+        self.mark_dirty(game, "factions")
 
     def get_pc_class(self, chat_id: int, user_id: int, pc_name: str) -> str:
         """
@@ -1309,7 +1653,7 @@ class Controller:
         :param pc_name: the name of the target PC.
         :return: the name of the class
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         if isinstance(pc, Human):
             return pc.pc_class
@@ -1375,24 +1719,32 @@ class Controller:
         :param item_name: name of the item .
         :return: str representing the description of the item.
         """
-        item = self.get_item_by_name(query_game_of_user(chat_id, user_id),
+        item = self.get_item_by_name(self.game_of_user(chat_id, user_id),
                                      self.get_pc_class(chat_id, user_id, pc_name), item_name)
         return item.description, item.weight, item.usages, item.quality
 
+    @game_command
+    @atomic
     def use_item(self, chat_id: int, user_id: int, use_item: dict) -> bool:
         """
-        Calls the method use_item of the pc.
+        Calls the method use_item of the pc and stores the pc, so the usage is kept even if the game is evicted before
+        commit_use_item is called.
 
         :param chat_id: the Telegram chat id of the user.
         :param user_id: the Telegram id of the user.
         :param use_item: dictionary containing all the information about the use of the armor.
         :return: True if the item is used, False otherwise
         """
-        game_id = query_game_of_user(chat_id, user_id)
+        game_id = self.game_of_user(chat_id, user_id)
         pc_class = self.get_pc_class(chat_id, user_id, use_item["pc"])
         pc = self.get_game_by_id(game_id).get_player_by_id(user_id).get_character_by_name(use_item["pc"])
-        return pc.use_item(self.get_item_by_name(game_id, pc_class, use_item["item_name"]))
+        used = pc.use_item(self.get_item_by_name(game_id, pc_class, use_item["item_name"]))
+        if used:
+            self.mark_pc_dirty(game_id, user_id, pc)
+        return used
 
+    @game_command
+    @atomic
     def commit_use_item(self, game_id: int, user_id: int, use_item: dict):
         """
         Calls write_use_item and updates the database.
@@ -1401,11 +1753,13 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param use_item: dictionary containing all the information about the use of the armor.
         """
-        self.get_game_by_id(game_id).journal.write_use_item(**use_item)
-        insert_journal(game_id, self.get_game_by_id(game_id).journal.get_log_string())
-        update_user_characters(user_id, game_id, save_to_json(
-            self.get_game_by_id(game_id).get_player_by_id(user_id).characters))
+        game = self.get_game_by_id(game_id)
+        game.journal.write_use_item(**use_item)
+        self.mark_dirty(game, "journal")
+        self.mark_pc_dirty(game_id, user_id, game.get_player_by_id(user_id).get_character_by_name(use_item["pc"]))
 
+    @game_command
+    @atomic
     def commit_fortune_roll(self, game_id: int, fortune_roll: dict):
         """
         Writes in the game's journal about the fortune roll, then updates the databse.
@@ -1416,7 +1770,7 @@ class Controller:
         game = self.get_game_by_id(game_id)
 
         game.journal.write_fortune_roll(**fortune_roll)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
     def get_exp(self, chat_id: int, user_id: int, pc_name: str = None, specific: str = None) -> Union[dict, int]:
         """
@@ -1428,7 +1782,7 @@ class Controller:
         :param specific: name of the attribute whose exp is needed.
         :return: a dict with all the exp from the model or just a single one
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         exp_dict = {"crew": game.crew.crew_exp.exp}
 
@@ -1453,7 +1807,7 @@ class Controller:
         :param attribute: name of the attribute whose exp limit is needed.
         :return: the exp limit for the requested attribute.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         if pc_name is None:
             return game.crew.crew_exp.exp_limit
@@ -1464,6 +1818,8 @@ class Controller:
             else:
                 return pc.get_attribute_by_name(attribute).exp_limit
 
+    @game_command
+    @atomic
     def commit_add_exp(self, chat_id: int, user_id: int, pc_name: str, add_exp: dict) -> List[Tuple[str, int]]:
         """
         Adds (or remove) the selected amount of exp from the crew and/or the pc and updates the database.
@@ -1474,7 +1830,7 @@ class Controller:
         :param add_exp: dictionary with the information used to modify the coins.
         :return: list of tuples containing the attributes whose points are increased and by how much.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         points = []
 
@@ -1491,8 +1847,8 @@ class Controller:
                 if attr:
                     if attr.add_exp(add_exp[key]):
                         points.append((key + "_points", attr.points))
-            update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
-        insert_crew_json(game.identifier, save_to_json(crew))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
+        self.mark_dirty(game, "crew")
 
         return points
 
@@ -1506,7 +1862,7 @@ class Controller:
         :return: a dictionary where the keys are "Playbook", "Insight", "Prowess" and "Resolve" and the values are their
                 available points.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
 
         points_dict = {"Playbook": pc.playbook.points}
@@ -1515,6 +1871,8 @@ class Controller:
 
         return points_dict
 
+    @game_command
+    @atomic
     def add_action_dots(self, chat_id: int, user_id: int, pc_name: str, new_actions_dict: dict, new_points_dict: dict):
         """
         Handles the addition and removal of the action dots of the specified PC. The new configuration of dots is
@@ -1527,7 +1885,7 @@ class Controller:
         :param new_actions_dict: represents the dictionary of all the PC's actions and their ratings.
         :param new_points_dict: represents the dictionary of all the PC's action points.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
 
         pc_action_dots = self.get_pc_actions_ratings(user_id, chat_id, pc_name)
@@ -1547,7 +1905,7 @@ class Controller:
                 if key.lower() == attribute.name.lower():
                     attribute.points = new_points_dict[key]
 
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
     def get_crew_type(self, game_id: int) -> str:
         """
@@ -1589,6 +1947,8 @@ class Controller:
             upgrades_dict.append({"name": upgrade.name, "quality": upgrade.quality, "tot_quality": upgrade.tot_quality})
         return upgrades_dict
 
+    @game_command
+    @atomic
     def commit_add_upgrade(self, chat_id: int, user_id: int, upgrades: List[dict], upgrade_points: int):
         """
         Commits the changes made in the model and updates the database.
@@ -1604,7 +1964,7 @@ class Controller:
                     return up_dict
             return None
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         crew = game.crew
 
         old_upgrades = self.get_crew_upgrades(game.identifier)
@@ -1629,7 +1989,7 @@ class Controller:
 
         crew.crew_exp.points = int(upgrade_points / 2)
 
-        insert_crew_json(game.identifier, save_to_json(crew))
+        self.mark_dirty(game, "crew")
 
     def has_pc_overindulged(self, chat_id: int, user_id: int, pc_name: str, roll_outcome: Union[int, str]) -> bool:
         """
@@ -1641,7 +2001,7 @@ class Controller:
         :param roll_outcome: the outcome of the roll during the downtime activity "indulge vice"
         :return: True if the pc has overindulged, False otherwise (or if he rolled a "CRIT")
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
 
         if isinstance(roll_outcome, int):
@@ -1649,6 +2009,8 @@ class Controller:
         else:
             return False
 
+    @game_command
+    @atomic
     def commit_downtime_activity(self, chat_id: int, user_id: int, downtime_info: dict) -> dict:
         """
         Applies the effects of the downtime activity passed: modifies the pc
@@ -1664,13 +2026,13 @@ class Controller:
             if "payment" in downtime_info:
                 if downtime_info["payment"] == 1:
                     self.pay_with_crew(chat_id, user_id, pc.name, coins)
-                    insert_crew_json(game.identifier, save_to_json(game.crew))
+                    self.mark_dirty(game, "crew")
                 elif downtime_info["payment"] == 2:
                     self.pay_with_possessions(chat_id, user_id, pc.name, coins)
 
                 downtime_info.pop("payment")
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         user = game.get_player_by_id(user_id)
         pc = user.get_character_by_name(downtime_info["pc"])
 
@@ -1688,7 +2050,7 @@ class Controller:
                 game.crafted_items.append(
                     Item(downtime_info["item"], downtime_info["item_description"],
                          quality=int(downtime_info["quality"]) + int(downtime_info["extra_quality"])))
-                insert_crafted_item_json(game.identifier, save_to_json(game.crafted_items))
+                self.mark_dirty(game, "crafted_items")
 
         elif activity == "long_term_project":
             ticks = self.calc_value_of_outcome(downtime_info["outcome"])
@@ -1705,7 +2067,7 @@ class Controller:
             traumas = 0
             if "npc" in downtime_info:
                 self.add_npc_to_game(downtime_info["npc"], game)
-                insert_npc_json(game.identifier, save_to_json(game.NPCs))
+                self.mark_dirty(game, "NPCs")
             elif "healer" in downtime_info:
                 if downtime_info["healer"].split(":")[0].lower() == downtime_info["pc"].lower():
                     traumas = pc.add_stress(2)
@@ -1726,7 +2088,7 @@ class Controller:
             heat = self.calc_value_of_outcome(downtime_info["outcome"])
             game.crew.add_heat(-heat)
             downtime_info["heat"] = heat
-            insert_crew_json(game.identifier, save_to_json(game.crew))
+            self.mark_dirty(game, "crew")
 
         elif activity == "train":
             points = 1 + (
@@ -1751,7 +2113,7 @@ class Controller:
                 downtime_info.pop("overindulge")
                 if consequence == "brag":
                     return_dict["wanted_level"] = game.crew.add_heat(2)
-                    insert_crew_json(game.identifier, save_to_json(game.crew))
+                    self.mark_dirty(game, "crew")
                 elif consequence == "lost":
                     pc.recover()
                 elif consequence == "tapped":
@@ -1769,7 +2131,7 @@ class Controller:
             cohort.add_harm(-2)
             downtime_info["cohort"] = self.get_cohorts_of_crew(chat_id, user_id)[downtime_info["cohort"]][0]
             downtime_info["harm"] = cohort.harm
-            insert_crew_json(game.identifier, save_to_json(game.crew))
+            self.mark_dirty(game, "crew")
 
         elif activity == "replace_cohort":
             cohorts_dead = []
@@ -1780,13 +2142,13 @@ class Controller:
             cohort.harm = 0
             downtime_info["cohort"] = self.get_cohorts_of_crew(chat_id, user_id)[downtime_info["cohort"]][0]
             payment(game.crew.tier + 2)
-            insert_crew_json(game.identifier, save_to_json(game.crew))
+            self.mark_dirty(game, "crew")
 
         pc.downtime_activities.append(activity)
-        update_user_characters(user_id, game.identifier, save_to_json(user.characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
         game.journal.write_activity(downtime_info)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
         return return_dict
 
     def calc_coins_acquire_asset(self, reached_quality: int, extra_quality: int, crew_tier: int) -> int:
@@ -1836,7 +2198,7 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :return: a list of str containing the names of the special abilities.
         """
-        crew = self.get_game_by_id(query_game_of_user(chat_id, user_id)).crew
+        crew = self.get_game_by_id(self.game_of_user(chat_id, user_id)).crew
         crew_abilities = crew.abilities
         abilities_dict = []
         for ab in crew_abilities:
@@ -1868,7 +2230,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: a list of str containing the names of the special abilities.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         abilities_dict = []
         for ab in pc.abilities:
@@ -1891,7 +2253,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: True if the character is a Vampire, False otherwise.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         return isinstance(pc, Vampire)
 
@@ -1904,7 +2266,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: True if the character is a Hull, False otherwise.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         return isinstance(pc, Hull)
 
@@ -1918,7 +2280,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: a list of str containing the names of the special abilities.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         if selection == 2:
             pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
             abilities = query_special_abilities(pc=True, canon=True, as_dict=True)
@@ -1945,7 +2307,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: a list of str containing the names of the strictures.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         abilities = query_special_abilities(stricture=True, as_dict=True)
         pc_abilities = []
@@ -1965,7 +2327,7 @@ class Controller:
         :param pc_name: name of the pc used to find the character sheet.
         :return: a list of str containing the names of the frame features.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
         abilities = []
         pc_abilities = []
@@ -1977,6 +2339,8 @@ class Controller:
             abilities_dict.append(ab.__dict__)
         return self.remove_duplicate_abilities(abilities, abilities_dict)
 
+    @game_command
+    @atomic
     def commit_add_ability(self, chat_id: int, user_id: int, add_ability: dict, pc_name: str = None):
         """
         Commits the changes made in the model and updates the database.
@@ -1986,7 +2350,7 @@ class Controller:
         :param add_ability: dict of the conversation.
         :param pc_name: name of the character to update the right pc from the model.
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         if add_ability["selection"] != 1:
             pc = game.get_player_by_id(user_id).get_character_by_name(pc_name)
@@ -1997,12 +2361,14 @@ class Controller:
                 pc.strictures.append(query_special_abilities(special_ability=add_ability["ability"])[0])
             elif isinstance(pc, Hull) and add_ability["selection"] == 4:
                 pc.frame_features.append(query_special_abilities(special_ability=add_ability["ability"])[0])
-            update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
         else:
             game.crew.abilities.append(query_special_abilities(special_ability=add_ability["ability"])[0])
             game.crew.crew_exp.points -= 1
-            insert_crew_json(game.identifier, save_to_json(game.crew))
+            self.mark_dirty(game, "crew")
 
+    @game_command
+    @atomic
     def commit_add_cohort_harm(self, game_id: int, cohort_harm_info: dict):
         """
         Adds the given harm to the selected cohort and updates the crew in the DB.
@@ -2011,7 +2377,9 @@ class Controller:
         :param cohort_harm_info: a dictionary with the info used to add the harm
         """
 
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+
+        crew = game.crew
 
         cohorts_alive = []
         for cohort in crew.cohorts:
@@ -2020,8 +2388,10 @@ class Controller:
         cohort = cohorts_alive[cohort_harm_info["cohort"]]
         cohort.add_harm(cohort_harm_info["harm"])
 
-        insert_crew_json(game_id, save_to_json(crew))
+        self.mark_dirty(game, "crew")
 
+    @game_command
+    @atomic
     def commit_add_harm(self, chat_id: int, user_id: int, harm_info: dict) -> Optional[int]:
         """
         Adds the given harm to the selected pc and updates it in the DB.
@@ -2031,17 +2401,19 @@ class Controller:
         :param harm_info: a dictionary with the info used to add the harm
         :return: an int representing the level where the harm is added if different from the one specified
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         user = game.get_player_by_id(user_id)
         pc = user.get_character_by_name(harm_info["pc"])
         harm_info.pop("pc")
         level = pc.add_harm(**harm_info)
 
-        update_user_characters(user_id, game.identifier, save_to_json(user.characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
         if level != harm_info["level"]:
             return level
 
+    @game_command
+    @atomic
     def end_downtime(self, game_id: int) -> Dict[str, int]:
         """
         Applies the effects of the closure of the downtime activities.
@@ -2061,14 +2433,16 @@ class Controller:
                     trauma = pc.add_stress(len(pc.traumas))
                     if trauma > 0:
                         trauma_suffers[pc.name] = trauma
-                        update_user_characters(player.player_id, game.identifier, save_to_json(player.characters))
+                    self.mark_pc_dirty(game.identifier, player.player_id, pc)
 
         game.journal.write_end_downtime()
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
         return trauma_suffers
 
+    @game_command
+    @atomic
     def change_vice_purveyor(self, chat_id: int, user_id: int, change_purveyor: Dict[str, str]):
         """
         Adds the new purveyor in to the vice of the pc of this user.
@@ -2077,17 +2451,18 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param change_purveyor: dictionary that contains all the information needed (the PC's name and the new purveyor)
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         pc = game.get_player_by_id(user_id).get_character_by_name(change_purveyor["pc"])
         if isinstance(pc, Human):
             pc.vice.add_purveyor(change_purveyor["new_purveyor"])
-
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
 
         game.journal.write_change_vice_purveyor(**change_purveyor)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
+    @game_command
+    @atomic
     def commit_pc_migration(self, chat_id: int, user_id: int, migration: Dict[str, str]):
         """
         Applies the effect of a PC migration to another type of Character.
@@ -2096,7 +2471,7 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param migration: dictionary that contains all the information needed (the PC's name and the migration type)
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         game.get_player_by_id(user_id).migrate_character_type(migration["pc"], migration["migration_pc"])
 
         pc = game.get_player_by_id(user_id).get_character_by_name(migration["pc"])
@@ -2107,17 +2482,23 @@ class Controller:
             pc.functions = migration["hull_functions"]
             migration.pop("hull_functions")
 
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
         game.journal.write_pc_migration(**migration)
+        self.mark_dirty(game, "journal")
 
+    @game_command
+    @atomic
     def add_rep_to_crew(self, game_id: int, reputation: int) -> Optional[int]:
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+        crew = game.crew
         coins = crew.add_rep(reputation)
 
-        insert_crew_json(game_id, save_to_json(crew))
+        self.mark_dirty(game, "crew")
         return coins
 
+    @game_command
+    @atomic
     def commit_add_cohort_armor(self, game_id: int, cohort_armor_info: dict):
         """
         Adds the given armor to the selected cohort and updates the crew in the DB.
@@ -2126,7 +2507,8 @@ class Controller:
         :param cohort_armor_info: a dictionary with the info used to add the harm
         """
         game = self.get_game_by_id(game_id)
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+        crew = game.crew
 
         cohorts_alive = []
         for cohort in crew.cohorts:
@@ -2135,9 +2517,10 @@ class Controller:
         cohort = cohorts_alive[cohort_armor_info["cohort"]]
         cohort.add_armor(cohort_armor_info["armor"])
 
-        insert_crew_json(game_id, save_to_json(crew))
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "crew", "journal")
 
+    @game_command
+    @atomic
     def commit_change_pc_class(self, chat_id: int, user_id: int, class_change: Dict[str, str]):
         """
         Applies the effect of a PC class change.
@@ -2146,15 +2529,17 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param class_change: dictionary that contains all the information needed (the PC's name and the new class)
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
-        game.get_player_by_id(user_id).change_character_class(class_change["pc"], class_change["new_class"])
-
-        update_user_characters(user_id, game.identifier, save_to_json(game.get_player_by_id(user_id).characters))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
+        player = game.get_player_by_id(user_id)
+        if player.change_character_class(class_change["pc"], class_change["new_class"]):
+            self.mark_pc_dirty(game.identifier, user_id, player.get_character_by_name(class_change["pc"]))
 
         game.journal.write_change_pc_class(**class_change)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
+    @game_command
+    @atomic
     def retire(self, chat_id: int, user_id: int, retire: dict):
         """
         Remove the selected pc from the model, adds a tag in the journal and updates it in the DB.
@@ -2163,16 +2548,20 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param retire: a dictionary with the info used to retire
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         player = game.get_player_by_id(user_id)
-        player.characters.remove(player.get_character_by_name(retire["pc"]))
+        pc = player.get_character_by_name(retire["pc"])
+        player.remove_character(pc)
 
         game.journal.write_retire(**retire)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
-        update_user_characters(user_id, game.identifier, save_to_json(player.characters))
+        if pc.char_id is not None:
+            delete_character(pc.char_id)
 
+    @game_command
+    @atomic
     def commit_flashback(self, chat_id: int, user_id: int, flashback: dict) -> Optional[int]:
         """
         Adds the stress to pay to the pc who is performing the flashback, then updates the database
@@ -2181,15 +2570,16 @@ class Controller:
         :param user_id: the Telegram chat id of the user.
         :param flashback: a dictionary with the info of the flashback
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         player = game.get_player_by_id(user_id)
 
-        traumas = player.get_character_by_name(flashback["pc"]).add_stress(flashback["stress"])
+        pc = player.get_character_by_name(flashback["pc"])
+        traumas = pc.add_stress(flashback["stress"])
 
-        update_user_characters(user_id, game.identifier, save_to_json(player.characters))
+        self.mark_pc_dirty(game.identifier, user_id, pc)
 
         game.journal.write_flashback(**flashback)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
         if traumas > 0:
             return traumas
@@ -2215,6 +2605,8 @@ class Controller:
 
         return list(contacts)
 
+    @game_command
+    @atomic
     def commit_incarceration_roll(self, game_id: int, incarceration: dict) -> dict:
         """
         Applies the effects of the incarceration roll to the game: clears the crew's heat, reduces its wanted level, and
@@ -2230,6 +2622,7 @@ class Controller:
 
         crew.clear_heat()
         crew.add_wanted_level(-1)
+        self.mark_dirty(game, "crew")
         return_dict = {}
 
         if isinstance(incarceration["outcome"], str):
@@ -2240,17 +2633,18 @@ class Controller:
         elif incarceration["outcome"] == 6:
             return_dict["prison_claim"] = 1
             return_dict["status"] = 1
-            insert_crew_json(game_id, save_to_json(crew))
         elif incarceration["outcome"] <= 3 and incarceration["type"] != "npc":
             return_dict["traumas"] = 1
 
         incarceration.pop("type")
 
         game.journal.write_incarceration(**incarceration)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
         return return_dict
 
+    @game_command
+    @atomic
     def commit_add_note(self, chat_id: int, user_id: int, add_note: dict):
         """
         Writes the new note in the journal and updates the database.
@@ -2259,10 +2653,10 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param add_note: dictionary that contains all the information needed (note title and text).
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         game.journal.write_note(**add_note)
 
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
     def get_note(self, chat_id: int, user_id: int, position: int) -> str:
         """
@@ -2273,10 +2667,12 @@ class Controller:
         :param position: position of the note.
         :return: the text of the note.
         """
-        soup = BeautifulSoup(self.get_game_by_id(query_game_of_user(chat_id, user_id)).journal.read_note(position),
+        soup = BeautifulSoup(self.get_game_by_id(self.game_of_user(chat_id, user_id)).journal.read_note(position),
                              'html.parser')
         return soup.get_text()
 
+    @game_command
+    @atomic
     def commit_edit_note(self, chat_id: int, user_id: int, edit_note: dict):
         """
         Modifies the note in the journal in the given position and updates the database.
@@ -2285,39 +2681,49 @@ class Controller:
         :param user_id: the Telegram id of the user.
         :param edit_note: dictionary that contains all the information needed (note position and new text).
         """
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
         game.journal.edit_note(**edit_note)
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "journal")
 
+    @game_command
     def end_game(self, game_id: int, notes: str) -> List[Tuple[bytes, str]]:
         """
         Writes the final notes in the journal, sends the game files to the users,
         then Removes a game from the list of games and deletes it from the database.
+        The write-behind queue is flushed first, outside the transaction of the deletion, since it commits on its own.
 
         :param game_id: id of the Game.
         :param notes: final notes to write in the journal.
         :return: a list of Tuples that contains the bytes of the files and a string that represents their names.
         """
-        game = self.get_game_by_id(game_id)
+        write_behind.flush()
+        with transaction():
+            game = self.get_game_by_id(game_id)
 
-        game.journal.write_end_game(notes)
-        insert_journal(game.identifier, game.journal.get_log_string())
+            # the game is deleted: its journal is only rendered, not stored
+            game.journal.write_end_game(notes)
 
-        game_obj = [self.get_journal_of_game(game_id)]
-        try:
-            game_obj.append(self.get_crew_sheet_image(game_id))
-        except:
-            pass
-        for user in game.users:
-            for pc in user.characters:
-                game_obj.append(self.get_character_sheet_image(game.chat_id, user.player_id, pc.name))
+            game_obj = [self.get_journal_of_game(game_id)]
+            try:
+                game_obj.append(self.get_crew_sheet_image(game_id))
+            except:
+                pass
+            for user in game.users:
+                for pc in user.characters:
+                    game_obj.append(self.get_character_sheet_image(game.chat_id, user.player_id, pc.name))
 
-        delete_game(game_id)
+            delete_game(game_id)
+            self.remove_memberships(game_id)
+            self.locks.discard(game_id)
+            self.eviction.forget(game_id)
+            hydration_stats.forget(game_id)
 
-        self.games.remove(game)
+            self.games.remove(game)
 
-        return game_obj
+            return game_obj
 
+    @game_command
+    @atomic
     def commit_change_frame_size(self, chat_id: int, user_id: int, pc_name: str, frame_size: str):
         """
         Changes thhe frame size of the selected pc.
@@ -2328,14 +2734,14 @@ class Controller:
         :param user_id: the Telegram id of the user.
         """
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         player = game.get_player_by_id(user_id)
         pc = player.get_character_by_name(pc_name)
 
         if isinstance(pc, Hull):
             pc.select_frame(frame_size)
-            update_user_characters(user_id, game.identifier, save_to_json(player.characters))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
 
     def is_pc_name_already_present(self, game_id: int, pc_name: str) -> bool:
         """
@@ -2351,6 +2757,8 @@ class Controller:
             return True
         return False
 
+    @game_command
+    @atomic
     def commit_add_cohort_type(self, game_id: int, cohort_type_info: dict):
         """
         Adds the given type to the selected cohort and updates the crew in the DB.
@@ -2359,7 +2767,8 @@ class Controller:
         :param cohort_type_info: a dictionary with the info used to add the harm
         """
         game = self.get_game_by_id(game_id)
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+        crew = game.crew
 
         cohorts_alive = []
         for cohort in crew.cohorts:
@@ -2370,8 +2779,7 @@ class Controller:
 
         crew.crew_exp.add_points(-1)
 
-        insert_crew_json(game_id, save_to_json(crew))
-        insert_journal(game.identifier, game.journal.get_log_string())
+        self.mark_dirty(game, "crew", "journal")
 
     def get_game_npcs(self, game_id: int) -> List[str]:
         """
@@ -2383,6 +2791,8 @@ class Controller:
         game = self.get_game_by_id(game_id)
         return [npc.name + ", " + npc.role for npc in game.NPCs]
 
+    @game_command
+    @atomic
     def add_servant(self, chat_id: int, user_id: int, info: dict):
         """
         Adds a new dark servant to the selected pc.
@@ -2392,7 +2802,7 @@ class Controller:
         :param user_id: the Telegram id of the user.
         """
 
-        game = self.get_game_by_id(query_game_of_user(chat_id, user_id))
+        game = self.get_game_by_id(self.game_of_user(chat_id, user_id))
 
         player = game.get_player_by_id(user_id)
         pc = player.get_character_by_name(info["pc"])
@@ -2400,10 +2810,12 @@ class Controller:
         servant = self.add_npc_to_game(info["servant"], game)
         if isinstance(pc, Vampire):
             pc.dark_servants.append(servant)
-            update_user_characters(user_id, game.identifier, save_to_json(player.characters))
+            self.mark_pc_dirty(game.identifier, user_id, pc)
 
-        insert_npc_json(game.identifier, save_to_json(game.NPCs))
+        self.mark_dirty(game, "NPCs")
 
+    @game_command
+    @atomic
     def change_journal_language(self, game_id: int, lang: str):
         """
         Changes the journal language of the selected game and updates the database
@@ -2417,6 +2829,8 @@ class Controller:
 
         insert_lang(game_id, lang)
 
+    @game_command
+    @atomic
     def promote_cohort_of_crew(self, game_id: int, cohort_index: int):
         """
         Set the selected cohort to elite and updates the database.
@@ -2424,7 +2838,8 @@ class Controller:
         :param game_id: the game's id
         :param cohort_index: int representing the cohort to promote
         """
-        crew = self.get_game_by_id(game_id).crew
+        game = self.get_game_by_id(game_id)
+        crew = game.crew
 
         not_elite_cohorts = []
         for cohort in crew.cohorts:
@@ -2433,7 +2848,7 @@ class Controller:
 
         not_elite_cohorts[cohort_index].elite = True
 
-        insert_crew_json(game_id, save_to_json(crew))
+        self.mark_dirty(game, "crew")
 
     def get_codex(self, game_id: int) -> Tuple[bytes, str]:
         """
@@ -2444,7 +2859,25 @@ class Controller:
         """
         game = self.get_game_by_id(game_id)
 
-        return game.journal.read_codex(game.title, query_codex()), ("Codex - " + game.title + ".html")
+        return self.read_codex(game.journal, game.title), ("Codex - " + game.title + ".html")
+
+    def read_codex(self, journal: Journal, title: str) -> bytes:
+        """
+        Gives the binary encoding of the Codex with the passed title.
+        The Codex depends only on the reference data of the database, so it is rendered once per language, with a
+        placeholder in place of the title, and rendered again only after the reference data have been written.
+        The title is escaped, so it is always shown as text.
+
+        :param journal: the Journal of the game.
+        :param title: the title of the game.
+        :return: bytes used to create the html document of the Codex.
+        """
+        generation = reference_cache.generation
+        cached = self.codex_cache.get(journal.language)
+        if cached is None or cached[0] != generation:
+            cached = (generation, journal.read_codex(CODEX_TITLE, query_codex()))
+            self.codex_cache[journal.language] = cached
+        return cached[1].replace(bytes(CODEX_TITLE, 'UTF-8'), bytes(html.escape(title, quote=False), 'UTF-8'))
 
     def __repr__(self) -> str:
         return str(self.games)
@@ -0,0 +1,181 @@
+import re
+import sqlite3
+import threading
+from sqlite3 import Connection, Cursor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+REFERENCE_TABLES = frozenset({
+    "SpecialAbility", "XpTrigger", "Action", "Vice", "Upgrade", "Item", "Claim", "Faction", "NPC", "Trauma",
+    "HuntingGround", "CharacterSheet", "CrewSheet",
+    "Char_Action", "Char_Friend", "Char_Item", "Char_SA", "Char_Xp",
+    "Crew_Contact", "Crew_HG", "Crew_SA", "Crew_StartingUpgrade", "Crew_Upgrade", "Crew_Xp", "Starting_Cohort"
+})
+
+_SOURCE = re.compile(r"\b(?:FROM|JOIN)\s+\(?\s*(\w+)", re.IGNORECASE)
+
+
+def referenced_tables(query: str) -> Optional[Set[str]]:
+    """
+    Finds the tables read by the passed query.
+
+    :param query: the SQL statement to analyze.
+    :return: the set of reference tables read by the query;
+        None if the query is not a SELECT or reads anything that is not a reference table.
+    """
+    if not query.lstrip().upper().startswith("SELECT"):
+        return None
+    tables = set(_SOURCE.findall(query))
+    if not tables or not tables <= REFERENCE_TABLES:
+        return None
+    return tables
+
+
+class ReferenceCache:
+    """
+    Read-through store of the canon tables of the database.
+    The first time a table is read it is copied, with its indexes, in an in-memory database, and the queries reading
+    only the copied tables are executed there. Their results are also indexed by query and parameters.
+    A table is copied again from the database the first time it is read after it has been written.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: Dict[Tuple[str, tuple], List[tuple]] = {}
+        self.__by_table: Dict[str, Set[Tuple[str, tuple]]] = {}
+        self.__store = sqlite3.connect(":memory:", check_same_thread=False)
+        self.__loaded: Set[str] = set()
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        # also serializes the use of the in-memory database and makes invalidate() wait for a copy in progress
+        self.__lock = threading.RLock()
+
+    def fetch(self, cursor: Cursor, query: str, parameters: Iterable = ()) -> List[tuple]:
+        """
+        Gets all the rows of the passed query, from the stored results or executing it on the in-memory copy of the
+        tables it reads, which are copied with the passed cursor if they are missing.
+        Queries that do not read exclusively reference tables are always executed with the passed cursor.
+
+        :param cursor: the cursor of the database.
+        :param query: the SQL statement.
+        :param parameters: the parameters of the statement.
+        :return: a new list with the resulting rows.
+        """
+        parameters = tuple(parameters)
+        tables = referenced_tables(query)
+        if tables is None:
+            cursor.execute(query, parameters)
+            return cursor.fetchall()
+
+        key = (query, parameters)
+        with self.__lock:
+            rows = self.__entries.get(key)
+            if rows is not None:
+                self.__hits += 1
+                return list(rows)
+            self.__misses += 1
+
+            if not all(self.__load(cursor, table) for table in tables - self.__loaded):
+                cursor.execute(query, parameters)
+                return cursor.fetchall()
+            rows = self.__store.execute(query, parameters).fetchall()
+            self.__entries[key] = rows
+            for table in tables:
+                self.__by_table.setdefault(table, set()).add(key)
+            return list(rows)
+
+    def __load(self, cursor: Cursor, table: str) -> bool:
+        """
+        Copies the passed table, its rows and its indexes, from the database to the in-memory database.
+
+        :param cursor: the cursor of the database.
+        :param table: the name of the table.
+        :return: True if the table has been copied, False if it is not in the database.
+        """
+        cursor.execute("""
+        SELECT sql
+        FROM sqlite_master
+        WHERE tbl_name = ? AND type IN ('table', 'index') AND sql IS NOT NULL
+        ORDER BY type = 'index'""", (table,))
+        schema = [row[0] for row in cursor.fetchall()]
+        if not schema:
+            return False
+        cursor.execute("SELECT * FROM {}".format(table))
+        rows = cursor.fetchall()
+
+        self.__store.execute("DROP TABLE IF EXISTS {}".format(table))
+        for statement in schema:
+            self.__store.execute(statement)
+        if rows:
+            self.__store.executemany("INSERT INTO {} VALUES ({})".format(table, ", ".join("?" * len(rows[0]))), rows)
+        self.__store.commit()
+        self.__loaded.add(table)
+        return True
+
+    def invalidate(self, *tables: str) -> None:
+        """
+        Discards the stored results read from the passed tables and their in-memory copy.
+
+        :param tables: the names of the written tables; if none is passed, everything is discarded.
+        """
+        with self.__lock:
+            self.__generation += 1
+            if not tables:
+                self.__entries.clear()
+                self.__by_table.clear()
+                self.__loaded.clear()
+                return
+            for table in tables:
+                self.__loaded.discard(table)
+                for key in self.__by_table.pop(table, ()):
+                    self.__entries.pop(key, None)
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter incremented by every invalidation: comparing two readings tells whether the cache has been written in
+        between.
+        """
+        return self.__generation
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cache.
+
+        :return: a dictionary with the keys "tables" (the tables copied in memory), "entries", "hits" and "misses".
+        """
+        with self.__lock:
+            return {"tables": len(self.__loaded), "entries": len(self.__entries), "hits": self.__hits,
+                    "misses": self.__misses}
+
+
+class CachedCursor:
+    """
+    Minimal cursor that serves the reference queries through a ReferenceCache.
+    It supports the execute(), fetchone() and fetchall() methods used by the DB modules.
+    """
+
+    def __init__(self, connection: Connection, cache: ReferenceCache) -> None:
+        """
+        Constructor of the cursor.
+
+        :param connection: the connection used when the cache has to read the database.
+        :param cache: the ReferenceCache to go through.
+        """
+        self.__cursor = connection.cursor()
+        self.__cache = cache
+        self.__rows: List[tuple] = []
+
+    def execute(self, query: str, parameters: Iterable = ()) -> "CachedCursor":
+        self.__rows = self.__cache.fetch(self.__cursor, query, parameters)
+        self.__rows.reverse()
+        return self
+
+    def fetchone(self) -> Optional[tuple]:
+        if self.__rows:
+            return self.__rows.pop()
+        return None
+
+    def fetchall(self) -> List[tuple]:
+        rows, self.__rows = self.__rows, []
+        rows.reverse()
+        return rows
@@ -0,0 +1,161 @@
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from component.SpecialAbility import SpecialAbility
+from controller.DBmanager import connect, reference_cursor
+
+
+class CanonCatalog:
+    """
+    Read-only copies of the canon rows of the reference tables (special abilities, items, vices, xp triggers and
+    actions), read once and shared by all the PCs and Crews of the bot.
+
+    The canon SpecialAbility objects are shared as they are, since nothing modifies them; the objects with a state of
+    their own (Items, Vices, Actions) share the canon strings and keep their own state (usages, quality, purveyor,
+    rating). In the json of PCs and Crews the canon text is replaced by its key: pack() removes it, unpack() puts it
+    back, and leaves untouched the json written before (full text) and the custom text (not canon).
+    """
+
+    def __init__(self) -> None:
+        self.__abilities: Dict[str, SpecialAbility] = {}
+        self.__items: Dict[str, str] = {}
+        self.__vices: Dict[str, str] = {}
+        self.__xp_ids: Dict[str, int] = {}
+        self.__xp_triggers: Dict[int, str] = {}
+        self.__actions: Dict[str, str] = {}
+        self.__loaded = False
+        self.__lock = threading.Lock()
+
+    def __load(self) -> None:
+        if self.__loaded:
+            return
+        with self.__lock:
+            if self.__loaded:
+                return
+            with connect() as connection:
+                cursor = reference_cursor(connection)
+                # only the canon rows: the custom ones can be modified by the users
+                cursor.execute("SELECT Name, Description FROM SpecialAbility WHERE Canon is True")
+                for name, description in cursor.fetchall():
+                    self.__abilities[name.lower()] = SpecialAbility(name, description)
+                cursor.execute("SELECT Name, Description FROM Item WHERE Canon is True")
+                self.__items = {name.lower(): description for name, description in cursor.fetchall()}
+                cursor.execute("SELECT Name, Description FROM Vice")
+                self.__vices = {name.lower(): description for name, description in cursor.fetchall()}
+                cursor.execute("SELECT XpID, Description FROM XpTrigger WHERE Canon is True")
+                for xp_id, description in cursor.fetchall():
+                    self.__xp_triggers[xp_id] = description
+                    self.__xp_ids.setdefault(description, xp_id)
+                cursor.execute("SELECT Name FROM Action")
+                self.__actions = {name.lower(): name.lower() for name, in cursor.fetchall()}
+            self.__loaded = True
+
+    def ability(self, data: dict) -> SpecialAbility:
+        """
+        Creates a SpecialAbility from its dictionary, getting the shared canon one when its text is the canon text or
+        it has been removed by pack().
+
+        :param data: dictionary of the SpecialAbility.
+        :return: the SpecialAbility.
+        """
+        self.__load()
+        canon = self.__abilities.get(data["name"].lower())
+        if canon is not None and data.get("description", canon.description) == canon.description:
+            return canon
+        return SpecialAbility(data["name"], data.get("description", ""))
+
+    def is_canon(self, ability: Any) -> bool:
+        """
+        Checks if the passed object is one of the shared canon SpecialAbility.
+
+        :param ability: the object to check.
+        :return: True if it is a shared canon SpecialAbility, False otherwise.
+        """
+        self.__load()
+        return isinstance(ability, SpecialAbility) and self.__abilities.get(ability.name.lower()) is ability
+
+    def ability_by_name(self, name: str) -> Optional[SpecialAbility]:
+        """
+        Gets the shared canon SpecialAbility with the passed name.
+
+        :param name: the name of the ability, regardless of the case.
+        :return: the SpecialAbility, None if it is not canon.
+        """
+        self.__load()
+        return self.__abilities.get(name.lower())
+
+    def pack(self, data: dict) -> dict:
+        """
+        Removes the canon text from the dictionary of a PC or a Crew, in place.
+
+        :param data: the dictionary of the PC or Crew, as returned by save_to_dict().
+        :return: the same dictionary.
+        """
+        self.__load()
+        for key in ("abilities", "strictures", "frame_features"):
+            for ability in data.get(key) or []:
+                canon = self.__abilities.get(ability["name"].lower())
+                if canon is not None and ability.get("description") == canon.description:
+                    del ability["description"]
+        for item in data.get("items") or []:
+            if item.get("description") == self.__items.get(item["name"].lower(), ()):
+                del item["description"]
+        vice = data.get("vice")
+        if isinstance(vice, dict) and vice.get("description") == self.__vices.get(str(vice.get("name")).lower(), ()):
+            del vice["description"]
+        if data.get("xp_triggers"):
+            data["xp_triggers"] = [self.__xp_ids.get(trigger, trigger) for trigger in data["xp_triggers"]]
+        return data
+
+    def unpack(self, data: dict) -> dict:
+        """
+        Puts back the canon text removed by pack() in the dictionary of a PC or a Crew, in place, using the shared
+        canon strings also for the text written in full.
+        The abilities are left as dictionaries: they are created by ability().
+
+        :param data: the dictionary of the PC or Crew, as read from the json.
+        :return: the same dictionary.
+        """
+        self.__load()
+        for item in data.get("items") or []:
+            description = self.__items.get(item["name"].lower())
+            if item.get("description", description) == description:
+                item["description"] = description if description is not None else ""
+        vice = data.get("vice")
+        if isinstance(vice, dict):
+            description = self.__vices.get(str(vice.get("name")).lower())
+            if vice.get("description", description) == description:
+                vice["description"] = description if description is not None else ""
+        if data.get("xp_triggers"):
+            data["xp_triggers"] = [self.__xp_trigger(trigger) for trigger in data["xp_triggers"]]
+        for attribute in data.get("attributes") or []:
+            for action in attribute.get("actions") or []:
+                action["name"] = self.__actions.get(action["name"], action["name"])
+        return data
+
+    def abilities(self, data: List[dict]) -> List[SpecialAbility]:
+        """
+        Creates the list of SpecialAbility from their dictionaries, see ability().
+
+        :param data: list of dictionaries of SpecialAbility.
+        :return: the list of SpecialAbility.
+        """
+        return [self.ability(elem) for elem in data]
+
+    def __xp_trigger(self, trigger: Union[int, str]) -> str:
+        if isinstance(trigger, int):
+            return self.__xp_triggers.get(trigger, str(trigger))
+        return self.__xp_triggers.get(self.__xp_ids.get(trigger), trigger)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the number of canon rows read.
+
+        :return: a dictionary with the keys "abilities", "items", "vices", "xp_triggers" and "actions".
+        """
+        self.__load()
+        return {"abilities": len(self.__abilities), "items": len(self.__items), "vices": len(self.__vices),
+                "xp_triggers": len(self.__xp_triggers), "actions": len(self.__actions)}
+
+
+canon_catalog = CanonCatalog()
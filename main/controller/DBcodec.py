@@ -0,0 +1,112 @@
+import lzma
+import zlib
+from typing import Any, Dict, Tuple
+
+MARKER = b"BitD"
+
+ALGORITHMS = {"none": None, "zlib": b"z", "lzma": b"x"}
+
+CODEC_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "Game": ("Crew_JSON", "Crafted_Item_JSON", "NPC_JSON", "Faction_JSON", "Score_JSON", "Clock_JSON", "Journal"),
+    "PC": ("Char_JSON",)
+}
+
+
+class StorageCodec:
+    """
+    Compresses the large TEXT values stored in the database.
+    A compressed value is stored as a BLOB made of MARKER, one byte identifying the algorithm and the compressed UTF-8
+    text; any other value (e.g. the uncompressed strings written before the codec existed) is read as it is.
+    """
+
+    def __init__(self, algorithm: str = "zlib", level: int = 6, threshold: int = 1024) -> None:
+        """
+        Constructor of the codec.
+
+        :param algorithm: the compression algorithm used to write the values (one of ALGORITHMS); "none" stores the
+            values uncompressed.
+        :param level: the compression level: 0-9 for zlib, 0-9 for lzma.
+        :param threshold: the values whose UTF-8 encoding is shorter than this number of bytes are not compressed.
+        """
+        algorithm = str(algorithm).lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown compression algorithm: {}".format(algorithm))
+        for name, value in (("level", level), ("threshold", threshold)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError("{} must be a non-negative integer".format(name))
+        if level > 9:
+            raise ValueError("level must be between 0 and 9")
+
+        self.algorithm = algorithm
+        self.level = level
+        self.threshold = threshold
+
+    def encode(self, value: Any) -> Any:
+        """
+        Prepares a value to be written in the database, compressing it if it is a long enough string.
+
+        :param value: the value to write.
+        :return: the compressed BLOB, or the value itself if it is not worth compressing.
+        """
+        if not isinstance(value, str) or self.algorithm == "none":
+            return value
+        data = value.encode("UTF-8")
+        if len(data) < self.threshold:
+            return value
+
+        if self.algorithm == "zlib":
+            compressed = zlib.compress(data, self.level)
+        else:
+            compressed = lzma.compress(data, preset=self.level)
+        encoded = MARKER + ALGORITHMS[self.algorithm] + compressed
+        if len(encoded) >= len(data):
+            return value
+        return encoded
+
+    @staticmethod
+    def decode(value: Any) -> Any:
+        """
+        Restores a value read from the database. The algorithm is read from the value, so the rows written with a
+        different configuration are still readable.
+
+        :param value: the value read.
+        :return: the decompressed string, or the value itself if it is not compressed.
+        """
+        if not isinstance(value, bytes) or not value.startswith(MARKER):
+            return value
+        algorithm, data = value[len(MARKER):len(MARKER) + 1], value[len(MARKER) + 1:]
+        if algorithm == ALGORITHMS["zlib"]:
+            return zlib.decompress(data).decode("UTF-8")
+        if algorithm == ALGORITHMS["lzma"]:
+            return lzma.decompress(data).decode("UTF-8")
+        raise ValueError("Unknown compression algorithm: {}".format(algorithm))
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Method used to create an instance of this object given a dictionary
+
+        :param data: dictionary of the object
+        :return: StorageCodec
+        """
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return str(self.__dict__)
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
+
+
+def stored_size(value: Any) -> int:
+    """
+    Gets the number of bytes a value takes in the database.
+
+    :param value: the stored value.
+    :return: the length of the BLOB or of the UTF-8 encoding of the text; 0 for NULL and the other types.
+    """
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("UTF-8"))
+    return 0
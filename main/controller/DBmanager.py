@@ -1,23 +1,318 @@
+import atexit
+import functools
 import json
 import os
 import sqlite3
+import threading
 import traceback
+from contextlib import contextmanager
 from pathlib import Path
 from sqlite3 import Connection
-from typing import Optional
+from typing import Any, Callable, ContextManager, Dict, Hashable, Iterator, Optional, Set, Tuple, TypeVar, Union
+
+from controller.DBcache import CachedCursor, ReferenceCache
+from controller.DBcodec import CODEC_COLUMNS, StorageCodec, stored_size
+from controller.DBmigrations import migrate, schema_version
+from controller.DBpool import ConnectionPool
+from controller.DBprofile import DBProfile, load_profile, load_section, read_settings
+from controller.DBqueue import WriteBehindQueue
+
+DB_PATH = os.path.join(Path(__file__).parent.parent.parent.resolve(), "resources", "BladesInTheDark.db")
+
+profile: DBProfile = load_profile()
+# settings of the profile found not active by check_db_profile(), reported by report_db_profile()
+_profile_mismatches: Dict[str, Tuple[Union[str, int], Union[str, int]]] = {}
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+# version of the schema and number of migrations applied by this process, reported by report_db_profile()
+_schema_status = {"version": 0, "migrated": 0}
 
 
 def establish_connection(foreign_key: bool = True) -> Connection:
-    root_dir = Path(__file__).parent.parent.parent.resolve()
-    root_dir = os.path.join(root_dir, "resources")
-    db_path = os.path.join(root_dir, 'BladesInTheDark.db')
-    connection = sqlite3.connect(db_path)
+    """
+    Opens a new connection to the BladesInTheDark database and applies the DB profile to it.
+    The first connection opened by the process also brings the schema up to date applying the pending migrations.
+    The connection can be shared between threads, as long as only one of them uses it at a time.
+
+    :param foreign_key: if True the foreign keys constraints are enforced.
+    :return: the new Connection.
+    """
+    connection = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=profile.busy_timeout / 1000)
+    profile.apply(connection)
     if foreign_key:
         connection.execute("PRAGMA foreign_keys = 1")
         connection.commit()
+    update_schema(connection)
     return connection
 
 
+def update_schema(connection: Connection) -> None:
+    """
+    Applies the pending migrations to the database, only the first time it is called by the process, and records the
+    resulting version of the schema.
+
+    :param connection: the connection used to migrate the database.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            applied = migrate(connection)
+            _schema_status["version"] = schema_version(connection)
+            _schema_status["migrated"] = len(applied)
+            _schema_ready = True
+
+
+pool = ConnectionPool(establish_connection)
+atexit.register(pool.close)
+
+reference_cache = ReferenceCache()
+
+codec = StorageCodec.from_json(load_section("codec"))
+
+
+def connect() -> ContextManager[Connection]:
+    """
+    Gets a pooled connection to the database, to be used in a with statement.
+    Nested calls made by the same thread share the same connection.
+
+    :return: a context manager yielding the Connection.
+    """
+    return pool.connection()
+
+
+write_behind = WriteBehindQueue(connect, **load_section("write_behind"))
+atexit.register(write_behind.stop)
+
+_unit_of_work = threading.local()
+
+T = TypeVar("T")
+
+
+@contextmanager
+def transaction() -> Iterator[Connection]:
+    """
+    Context manager that runs all the writes performed by the calling thread in its body as a single unit of work:
+    they are committed together when the outermost transaction exits, or rolled back together if it raises.
+    The objects registered with mark_dirty() are written once, just before the commit, followed by the callbacks
+    registered with before_commit().
+    The writes queued for the write-behind queue and the callbacks registered with after_commit() run only on commit.
+    Nested transactions join the outer one.
+
+    :return: an iterator yielding the Connection shared by the unit of work.
+    """
+    with connect() as connection:
+        if getattr(_unit_of_work, "depth", 0) > 0:
+            _unit_of_work.depth += 1
+            try:
+                yield connection
+            finally:
+                _unit_of_work.depth -= 1
+            return
+
+        _unit_of_work.depth = 1
+        _unit_of_work.deferred = []
+        _unit_of_work.dirty = {}
+        _unit_of_work.before = {}
+        generation = reference_cache.generation
+        try:
+            yield connection
+            _flush_dirty()
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            # the reference cache may hold rows read before the rollback
+            reference_cache.invalidate()
+            raise
+        finally:
+            deferred = _unit_of_work.deferred
+            _unit_of_work.depth = 0
+            _unit_of_work.deferred = []
+            _unit_of_work.dirty = {}
+            _unit_of_work.before = {}
+
+        for callback in deferred:
+            callback()
+        # readers of other connections may have cached the rows replaced by the transaction before it committed
+        if generation != reference_cache.generation:
+            reference_cache.invalidate()
+
+
+def atomic(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Decorator that runs the decorated function inside a transaction().
+
+    :param function: the function to decorate.
+    :return: the decorated function.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs) -> T:
+        with transaction():
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def in_transaction() -> bool:
+    """
+    Checks if the calling thread is inside a transaction().
+
+    :return: True if a unit of work is open, False otherwise.
+    """
+    return getattr(_unit_of_work, "depth", 0) > 0
+
+
+def commit(connection: Connection) -> None:
+    """
+    Commits the passed connection, unless the calling thread is inside a transaction(): in that case the commit is
+    left to the outermost transaction.
+
+    :param connection: the connection to commit.
+    """
+    if not in_transaction():
+        connection.commit()
+
+
+def write_failed() -> None:
+    """
+    Handles the error of a write caught by a DBwriter function, to be called in its except block: the error is printed
+    and, inside a transaction(), raised again, so the whole unit of work is rolled back instead of committing the other
+    writes of a command that failed halfway. Outside a transaction the caller reports the failure with its result.
+    """
+    traceback.print_exc()
+    if in_transaction():
+        raise
+
+
+def after_commit(callback: Callable[[], Any]) -> None:
+    """
+    Runs the passed callback once the writes performed so far are committed: immediately outside a transaction(), on
+    commit inside it. The callback is dropped if the transaction is rolled back.
+
+    :param callback: the function to call, without arguments.
+    """
+    if in_transaction():
+        _unit_of_work.deferred.append(callback)
+    else:
+        callback()
+
+
+def mark_dirty(key: Hashable, flush: Callable[[Set[str]], Any], *fields: str) -> None:
+    """
+    Records that the passed fields of an object have been modified. Inside a transaction() the object is written once,
+    just before the commit, calling flush with all the fields modified during the transaction; outside it flush is
+    called immediately.
+
+    :param key: the identifier of the modified object; the flush registered first for a key is the one called.
+    :param flush: the function that writes the object, given the set of the modified fields.
+    :param fields: the names of the modified fields.
+    """
+    if not in_transaction():
+        flush(set(fields))
+        return
+    entry = _unit_of_work.dirty.get(key)
+    if entry is None:
+        _unit_of_work.dirty[key] = (flush, set(fields))
+    else:
+        entry[1].update(fields)
+
+
+def before_commit(key: Hashable, callback: Callable[[], Any]) -> None:
+    """
+    Runs the passed callback at the end of the transaction(), after the objects registered with mark_dirty() have been
+    written and before the commit, so its writes are part of the transaction; outside it the callback runs immediately.
+
+    :param key: the identifier of the callback: the callbacks registered again with the same key are ignored.
+    :param callback: the function to call, without arguments.
+    """
+    if not in_transaction():
+        callback()
+        return
+    _unit_of_work.before.setdefault(key, callback)
+
+
+def _flush_dirty() -> None:
+    """
+    Writes the objects registered with mark_dirty() in the current transaction, in the order they have been modified
+    the first time, then runs the callbacks registered with before_commit(). The objects modified meanwhile are
+    written too.
+    """
+    dirty = _unit_of_work.dirty
+    before = _unit_of_work.before
+    while dirty or before:
+        while dirty:
+            key = next(iter(dirty))
+            flush, fields = dirty.pop(key)
+            flush(fields)
+        if before:
+            key = next(iter(before))
+            before.pop(key)()
+
+
+def defer_write(game_id: int, column: str, value: Any) -> bool:
+    """
+    Hands the write of a column of the Game table to the write-behind queue, if it is enabled.
+    Inside a transaction() the write reaches the queue only when the transaction commits.
+
+    :param game_id: the id of the game.
+    :param column: the name of the column.
+    :param value: the new value of the column.
+    :return: True if the write has been deferred, False if it has to be performed directly.
+    """
+    if not write_behind.enabled:
+        return False
+    if in_transaction():
+        _unit_of_work.deferred.append(functools.partial(write_behind.enqueue, game_id, column, value))
+        return True
+    return write_behind.enqueue(game_id, column, value)
+
+
+def reference_cursor(connection: Connection) -> CachedCursor:
+    """
+    Gets a cursor that serves the queries on the canon tables from the reference cache.
+
+    :param connection: the connection used when the cached rows are missing.
+    :return: the CachedCursor.
+    """
+    return CachedCursor(connection, reference_cache)
+
+
+def check_db_profile() -> Dict[str, Tuple[Union[str, int], Union[str, int]]]:
+    """
+    Verifies that the settings of the DB profile are actually active on the database connections and records the ones
+    that are not (e.g. WAL is not supported by the file system hosting the database), so report_db_profile() reports
+    them. It is meant to be called once at startup.
+
+    :return: a dictionary with the settings that differ, as returned by DBProfile.check().
+    """
+    with connect() as connection:
+        mismatches = profile.check(connection)
+    _profile_mismatches.clear()
+    _profile_mismatches.update(mismatches)
+    return mismatches
+
+
+def report_db_profile() -> Dict[str, Union[str, int]]:
+    """
+    Gets the settings of the DB profile active on the database connections, together with the version of the schema
+    and the statistics of the connection pool, of the reference cache and of the write-behind queue.
+
+    :return: a dictionary with the active settings, the expected value of the settings found not active by
+        check_db_profile() (prefixed by "expected_"), the schema's version and the number of migrations applied at
+        startup (prefixed by "schema_"), the pool's counters (prefixed by "pool_"), the cache's counters (prefixed by
+        "cache_") and the queue's counters (prefixed by "queue_").
+    """
+    with connect() as connection:
+        report = read_settings(connection)
+    report.update({"expected_" + name: expected for name, (expected, active) in _profile_mismatches.items()})
+    report.update({"schema_" + key: value for key, value in _schema_status.items()})
+    report.update({"pool_" + key: value for key, value in pool.stats().items()})
+    report.update({"cache_" + key: value for key, value in reference_cache.stats().items()})
+    report.update({"queue_" + key: value for key, value in write_behind.stats().items()})
+    return report
+
+
 def exists_character(sheet: str) -> bool:
     """
     Checks if the specified sheet has a matching value in the CharacterSheet table of the database
@@ -25,20 +320,20 @@ def exists_character(sheet: str) -> bool:
     :param sheet: is the character to check
     :return: True if the character exists, False otherwise
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-            SELECT *
-            FROM CharacterSheet
-            WHERE class = '{}'
-            """.format(sheet.lower().capitalize()))
+        cursor.execute("""
+                SELECT *
+                FROM CharacterSheet
+                WHERE class = '{}'
+                """.format(sheet.lower().capitalize()))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    if not rows:
-        return False
-    return True
+        if not rows:
+            return False
+        return True
 
 
 def exists_crew(sheet: str) -> bool:
@@ -48,20 +343,20 @@ def exists_crew(sheet: str) -> bool:
     :param sheet: is the crew to check
     :return: True if the crew exists, False otherwise
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-            SELECT *
-            FROM CrewSheet
-            WHERE type = '{}'
-            """.format(sheet.lower().capitalize()))
+        cursor.execute("""
+                SELECT *
+                FROM CrewSheet
+                WHERE type = '{}'
+                """.format(sheet.lower().capitalize()))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    if not rows:
-        return False
-    return True
+        if not rows:
+            return False
+        return True
 
 
 def exists_game(game_id: int) -> bool:
@@ -71,20 +366,20 @@ def exists_game(game_id: int) -> bool:
     :param game_id: is the game to check
     :return: True if the game exists, False otherwise
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-                SELECT *
-                FROM Game
-                WHERE Game_ID = '{}'
-                """.format(game_id))
+        cursor.execute("""
+                    SELECT *
+                    FROM Game
+                    WHERE Game_ID = '{}'
+                    """.format(game_id))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    if not rows:
-        return False
-    return True
+        if not rows:
+            return False
+        return True
 
 
 def exists_user(user_tel_id: int) -> bool:
@@ -94,20 +389,20 @@ def exists_user(user_tel_id: int) -> bool:
     :param user_tel_id: is the user to check
     :return: True if the user exists, False otherwise
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-                SELECT *
-                FROM User
-                WHERE Tel_ID = {}
-                """.format(user_tel_id))
+        cursor.execute("""
+                    SELECT *
+                    FROM User
+                    WHERE Tel_ID = {}
+                    """.format(user_tel_id))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    if not rows:
-        return False
-    return True
+        if not rows:
+            return False
+        return True
 
 
 def is_json(myjson) -> bool:
@@ -133,20 +428,20 @@ def exists_user_in_game(user_tel_id: int, game_id: int) -> bool:
     :param game_id: is the game to check
     :return: True if the user exists, False otherwise
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-                   SELECT *
-                   FROM User_Game
-                   WHERE User_ID = {} AND Game_ID = {}
-                   """.format(user_tel_id, game_id))
+        cursor.execute("""
+                       SELECT *
+                       FROM User_Game
+                       WHERE User_ID = {} AND Game_ID = {}
+                       """.format(user_tel_id, game_id))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    if not rows:
-        return False
-    return True
+        if not rows:
+            return False
+        return True
 
 
 def exists_upgrade(upgrade: str) -> Optional[str]:
@@ -156,17 +451,17 @@ def exists_upgrade(upgrade: str) -> Optional[str]:
     :param upgrade: the name of the upgrade
     :return: the complete name of the upgrade found. None if the upgrade is not in the database
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-                       SELECT Name
-                       FROM Upgrade
-                       WHERE name LIKE ? OR name = ?
-                       """, (upgrade + " (%", upgrade))
+        cursor.execute("""
+                           SELECT Name
+                           FROM Upgrade
+                           WHERE name LIKE ? OR name = ?
+                           """, (upgrade + " (%", upgrade))
 
-    rows = cursor.fetchone()
+        rows = cursor.fetchone()
 
-    if rows is not None:
-        rows = rows[0]
-    return rows
+        if rows is not None:
+            rows = rows[0]
+        return rows
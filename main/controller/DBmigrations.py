@@ -0,0 +1,79 @@
+import os
+import re
+import traceback
+from sqlite3 import Connection, DatabaseError
+from typing import List, Tuple
+
+from utility.FilesManager import get_resources_folder
+
+MIGRATIONS_FOLDER = os.path.join(get_resources_folder(), "migrations")
+
+_MIGRATION_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+def list_migrations(folder: str = MIGRATIONS_FOLDER) -> List[Tuple[int, str, str]]:
+    """
+    Lists the migration scripts of the passed folder. Each script is named "<version>_<name>.sql", where version is
+    a positive integer: the scripts are applied in ascending order of version.
+
+    :param folder: the folder containing the scripts.
+    :return: a list of tuples with the version, the name and the path of each script, sorted by version.
+    """
+    migrations = []
+    if not os.path.isdir(folder):
+        return migrations
+    for file_name in os.listdir(folder):
+        match = _MIGRATION_NAME.match(file_name)
+        if match is not None:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(folder, file_name)))
+    migrations.sort()
+
+    for i in range(1, len(migrations)):
+        if migrations[i][0] == migrations[i - 1][0]:
+            raise ValueError("Duplicated migration version: {}".format(migrations[i][0]))
+    return migrations
+
+
+def schema_version(connection: Connection) -> int:
+    """
+    Gets the version of the schema of the database, creating the schema_version table if it is missing.
+
+    :param connection: the connection to the database.
+    :return: the version of the last applied migration, 0 if no migration has been applied.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            Version INTEGER PRIMARY KEY,
+            Name TEXT NOT NULL,
+            Applied_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    connection.commit()
+    return connection.execute("SELECT IFNULL(MAX(Version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(connection: Connection, folder: str = MIGRATIONS_FOLDER) -> List[int]:
+    """
+    Applies, in order, all the migration scripts newer than the current version of the schema.
+    Every script runs in its own transaction together with the update of the schema_version table, so a failing
+    script leaves the database at the previous version.
+
+    :param connection: the connection to the database.
+    :param folder: the folder containing the scripts.
+    :return: the list of the applied versions.
+    """
+    current = schema_version(connection)
+    applied = []
+    for version, name, path in list_migrations(folder):
+        if version <= current:
+            continue
+        with open(path, 'r', encoding="utf8") as f:
+            script = f.read()
+        try:
+            connection.executescript("BEGIN;\n{}\n;INSERT INTO schema_version (Version, Name) VALUES ({}, '{}');\n"
+                                     "COMMIT;".format(script, version, name))
+        except DatabaseError:
+            traceback.print_exc()
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        applied.append(version)
+    return applied
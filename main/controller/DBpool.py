@@ -0,0 +1,177 @@
+import threading
+import time
+from contextlib import contextmanager
+from sqlite3 import Connection, OperationalError
+from typing import Callable, Dict, Iterator, List, Tuple
+
+
+class ConnectionPool:
+    """
+    Hands out reusable SQLite connections.
+    A thread keeps the same connection for all the nested acquisitions it performs and gives it back to the pool when
+    the outermost one is released, so the functions of the DB modules can call each other freely.
+    """
+
+    def __init__(self, factory: Callable[[], Connection], max_size: int = 8, idle_timeout: float = 300.0,
+                 acquire_timeout: float = 30.0) -> None:
+        """
+        Constructor of the pool.
+
+        :param factory: callable used to open a new connection.
+        :param max_size: maximum number of connections (idle and in use) the pool keeps open at the same time.
+        :param idle_timeout: seconds after which an unused connection is closed.
+        :param acquire_timeout: seconds a thread waits for a free connection before giving up.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.__idle: List[Tuple[Connection, float]] = []
+        self.__in_use = 0
+        self.__created = 0
+        self.__evicted = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__local = threading.local()
+
+    def acquire(self) -> Connection:
+        """
+        Gets a connection for the calling thread. If the thread already holds one, the same connection is returned.
+
+        :return: a Connection to the database.
+        """
+        local = self.__local
+        if getattr(local, "depth", 0) > 0:
+            local.depth += 1
+            return local.connection
+
+        connection = self.__checkout()
+        local.connection = connection
+        local.depth = 1
+        return connection
+
+    def release(self) -> None:
+        """
+        Releases the connection held by the calling thread. The connection goes back to the pool only when the
+        outermost acquisition is released; any transaction left open is rolled back.
+        """
+        local = self.__local
+        if getattr(local, "depth", 0) <= 0:
+            return
+        local.depth -= 1
+        if local.depth > 0:
+            return
+
+        connection = local.connection
+        local.connection = None
+        self.__checkin(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        Context manager that acquires a connection and releases it on exit.
+
+        :return: an iterator yielding the Connection.
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release()
+
+    def current(self) -> Connection:
+        """
+        Gets the connection currently held by the calling thread.
+
+        :return: the Connection, None if the thread does not hold any.
+        """
+        if getattr(self.__local, "depth", 0) > 0:
+            return self.__local.connection
+
+    def close_idle(self) -> int:
+        """
+        Closes all the connections that have been unused for longer than idle_timeout.
+
+        :return: the number of closed connections.
+        """
+        with self.__condition:
+            return self.__evict_idle()
+
+    def close(self) -> None:
+        """
+        Closes all the idle connections and makes the pool close the ones in use as soon as they are released.
+        """
+        with self.__condition:
+            self.__closed = True
+            for connection, _ in self.__idle:
+                connection.close()
+            self.__idle.clear()
+            self.__condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the pool.
+
+        :return: a dictionary with the keys "in_use", "idle", "created", "evicted" and "max_size".
+        """
+        with self.__condition:
+            return {"in_use": self.__in_use, "idle": len(self.__idle), "created": self.__created,
+                    "evicted": self.__evicted, "max_size": self.max_size}
+
+    def __checkout(self) -> Connection:
+        deadline = time.monotonic() + self.acquire_timeout
+        with self.__condition:
+            while True:
+                if self.__closed:
+                    raise OperationalError("The connection pool is closed")
+                self.__evict_idle()
+                if self.__idle:
+                    connection, _ = self.__idle.pop()
+                    self.__in_use += 1
+                    return connection
+                if self.__in_use < self.max_size:
+                    self.__in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise OperationalError("No database connection available")
+                self.__condition.wait(remaining)
+
+        try:
+            connection = self.factory()
+        except BaseException:
+            with self.__condition:
+                self.__in_use -= 1
+                self.__condition.notify()
+            raise
+
+        with self.__condition:
+            self.__created += 1
+        return connection
+
+    def __checkin(self, connection: Connection) -> None:
+        reusable = True
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            reusable = False
+
+        with self.__condition:
+            self.__in_use -= 1
+            if reusable and not self.__closed:
+                self.__idle.append((connection, time.monotonic()))
+            else:
+                connection.close()
+            self.__condition.notify()
+
+    def __evict_idle(self) -> int:
+        # The idle list is used as a stack, so the oldest connections are at its head.
+        limit = time.monotonic() - self.idle_timeout
+        evicted = 0
+        while self.__idle and self.__idle[0][1] <= limit:
+            connection, _ = self.__idle.pop(0)
+            connection.close()
+            evicted += 1
+        self.__evicted += evicted
+        return evicted
@@ -0,0 +1,141 @@
+import json
+from sqlite3 import Connection
+from typing import Dict, Tuple, Union
+
+from utility.FilesManager import path_finder
+
+JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SYNCHRONOUS_LEVELS = ("off", "normal", "full", "extra")
+TEMP_STORES = ("default", "file", "memory")
+
+
+class DBProfile:
+    """
+    Represents the set of SQLite settings applied to every connection opened towards the database.
+    """
+
+    def __init__(self, journal_mode: str = "wal", synchronous: str = "normal", cache_size: int = -16000,
+                 mmap_size: int = 67108864, temp_store: str = "memory", busy_timeout: int = 5000) -> None:
+        """
+        Constructor of the profile.
+
+        :param journal_mode: the journal mode of the database (one of JOURNAL_MODES).
+        :param synchronous: how often SQLite waits for the data to reach the disk (one of SYNCHRONOUS_LEVELS).
+        :param cache_size: the page cache size: pages if positive, KiB if negative.
+        :param mmap_size: the maximum number of bytes of the database file mapped in memory (0 disables it).
+        :param temp_store: where temporary tables and indices are kept (one of TEMP_STORES).
+        :param busy_timeout: milliseconds a connection waits on a locked database before failing.
+        """
+        journal_mode = str(journal_mode).lower()
+        synchronous = str(synchronous).lower()
+        temp_store = str(temp_store).lower()
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError("Unknown journal mode: {}".format(journal_mode))
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError("Unknown synchronous level: {}".format(synchronous))
+        if temp_store not in TEMP_STORES:
+            raise ValueError("Unknown temp store: {}".format(temp_store))
+        for name, value in (("cache_size", cache_size), ("mmap_size", mmap_size), ("busy_timeout", busy_timeout)):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError("{} must be an integer".format(name))
+
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.temp_store = temp_store
+        self.busy_timeout = busy_timeout
+
+    def apply(self, connection: Connection) -> None:
+        """
+        Applies the profile to the passed connection. It must be called before any transaction is opened.
+
+        :param connection: the target connection.
+        """
+        connection.execute("PRAGMA busy_timeout = {}".format(self.busy_timeout))
+        connection.execute("PRAGMA journal_mode = {}".format(self.journal_mode))
+        connection.execute("PRAGMA synchronous = {}".format(self.synchronous))
+        connection.execute("PRAGMA cache_size = {}".format(self.cache_size))
+        connection.execute("PRAGMA mmap_size = {}".format(self.mmap_size))
+        connection.execute("PRAGMA temp_store = {}".format(self.temp_store))
+
+    def check(self, connection: Connection) -> Dict[str, Tuple[Union[str, int], Union[str, int]]]:
+        """
+        Compares the settings active on the passed connection with the ones of this profile.
+
+        :param connection: the connection to inspect.
+        :return: a dictionary with the settings that differ: the keys are the names of the settings and the values are
+            tuples with the expected and the active value (in this order). An empty dictionary if they all match.
+        """
+        active = read_settings(connection)
+        mismatches = {}
+        for name, expected in self.__dict__.items():
+            # SQLite may silently cap the memory map to its compile-time limit
+            if name == "mmap_size" and 0 < active[name] <= expected:
+                continue
+            if active[name] != expected:
+                mismatches[name] = (expected, active[name])
+        return mismatches
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Method used to create an instance of this object given a dictionary
+
+        :param data: dictionary of the object
+        :return: DBProfile
+        """
+        return cls(**data)
+
+    def __repr__(self) -> str:
+        return str(self.__dict__)
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
+
+
+def read_settings(connection: Connection) -> Dict[str, Union[str, int]]:
+    """
+    Reads the settings of the profile that are active on the passed connection.
+
+    :param connection: the connection to inspect.
+    :return: a dictionary with the same keys of a DBProfile.
+    """
+    def pragma(name: str):
+        return connection.execute("PRAGMA {}".format(name)).fetchone()[0]
+
+    return {
+        "journal_mode": str(pragma("journal_mode")).lower(),
+        "synchronous": SYNCHRONOUS_LEVELS[pragma("synchronous")],
+        "cache_size": pragma("cache_size"),
+        "mmap_size": pragma("mmap_size"),
+        "temp_store": TEMP_STORES[pragma("temp_store")],
+        "busy_timeout": pragma("busy_timeout")
+    }
+
+
+def load_section(section: str, file_name: str = "DBconfig.json") -> dict:
+    """
+    Loads a section of the passed configuration file in the resources' folder.
+
+    :param section: the name of the section.
+    :param file_name: name of the configuration file.
+    :return: the dictionary of the section; an empty dictionary if the file or the section are missing.
+    """
+    path = path_finder(file_name)
+    if path is None:
+        return {}
+    with open(path, 'r', encoding="utf8") as f:
+        data = json.load(f)
+    return data.get(section, {})
+
+
+def load_profile(file_name: str = "DBconfig.json") -> DBProfile:
+    """
+    Loads the DB profile from the "profile" section of the passed configuration file in the resources' folder.
+    The default profile is returned if the file or the section are missing.
+
+    :param file_name: name of the configuration file.
+    :return: the DBProfile to use.
+    """
+    return DBProfile.from_json(load_section("profile", file_name))
@@ -0,0 +1,150 @@
+import threading
+import traceback
+from collections import OrderedDict
+from sqlite3 import Connection, DatabaseError, OperationalError
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple
+
+
+class WriteBehindQueue:
+    """
+    Defers the writes of the columns of the Game table to a single background thread.
+    The pending writes are indexed by game and column: a newer value for the same column replaces the queued one, so
+    only the last state of each blob reaches the database. Every interval the queue is flushed in one transaction.
+    """
+
+    def __init__(self, connect: Callable[[], ContextManager[Connection]], enabled: bool = False,
+                 interval: float = 1.0) -> None:
+        """
+        Constructor of the queue.
+
+        :param connect: callable returning a context manager that yields the connection used to flush the queue.
+        :param enabled: if False enqueue() refuses every write, which must then be performed directly.
+        :param interval: seconds between two flushes of the background thread.
+        """
+        if not isinstance(interval, (int, float)) or isinstance(interval, bool) or interval <= 0:
+            raise ValueError("interval must be a positive number")
+        self.connect = connect
+        self.enabled = enabled
+        self.interval = interval
+        self.__pending: Dict[Tuple[int, str], Any] = OrderedDict()
+        self.__enqueued = 0
+        self.__coalesced = 0
+        self.__flushed = 0
+        self.__flushes = 0
+        self.__errors = 0
+        self.__max_depth = 0
+        self.__lock = threading.Lock()
+        self.__flush_lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def enqueue(self, game_id: int, column: str, value: Any) -> bool:
+        """
+        Queues the write of a column of a game, replacing the value already queued for the same column.
+
+        :param game_id: the id of the game.
+        :param column: the name of the column of the Game table.
+        :param value: the new value of the column.
+        :return: True if the write has been queued, False if the queue is disabled.
+        """
+        if not self.enabled:
+            return False
+        with self.__lock:
+            key = (game_id, column)
+            if key in self.__pending:
+                self.__coalesced += 1
+                del self.__pending[key]
+            self.__pending[key] = value
+            self.__enqueued += 1
+            self.__max_depth = max(self.__max_depth, len(self.__pending))
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__stop.clear()
+                self.__thread = threading.Thread(target=self.__run, name="write-behind", daemon=True)
+                self.__thread.start()
+        return True
+
+    def discard(self, game_id: int) -> int:
+        """
+        Drops the writes queued for the passed game, e.g. because the game is being deleted.
+        A flush in progress is waited for, so no write of the game can reach the database after this call.
+
+        :param game_id: the id of the game.
+        :return: the number of discarded writes.
+        """
+        with self.__flush_lock, self.__lock:
+            keys = [key for key in self.__pending if key[0] == game_id]
+            for key in keys:
+                del self.__pending[key]
+            return len(keys)
+
+    def flush(self) -> int:
+        """
+        Writes all the queued values in a single transaction. If the database is busy the writes go back in the
+        queue (unless a newer value has been queued in the meantime) and are retried by the next flush.
+
+        :return: the number of written columns.
+        """
+        with self.__flush_lock:
+            with self.__lock:
+                batch, self.__pending = self.__pending, OrderedDict()
+            if not batch:
+                return 0
+
+            games: Dict[int, Dict[str, Any]] = OrderedDict()
+            for (game_id, column), value in batch.items():
+                games.setdefault(game_id, OrderedDict())[column] = value
+
+            try:
+                with self.connect() as connection:
+                    try:
+                        for game_id, columns in games.items():
+                            connection.execute("UPDATE Game SET {} WHERE Game_ID = ?".format(
+                                ", ".join("{} = ?".format(column) for column in columns)),
+                                (*columns.values(), game_id))
+                        connection.commit()
+                    except DatabaseError:
+                        connection.rollback()
+                        raise
+            except DatabaseError as e:
+                traceback.print_exc()
+                with self.__lock:
+                    self.__errors += 1
+                    if isinstance(e, OperationalError):
+                        for key, value in batch.items():
+                            if key not in self.__pending:
+                                self.__pending[key] = value
+                return 0
+
+            with self.__lock:
+                self.__flushed += len(batch)
+                self.__flushes += 1
+            return len(batch)
+
+    def stop(self) -> None:
+        """
+        Stops the background thread and flushes the writes still queued. It is meant to be called on shutdown.
+        """
+        self.__stop.set()
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the queue.
+
+        :return: a dictionary with the keys "depth" (writes waiting to be flushed), "max_depth", "enqueued",
+            "coalesced" (writes replaced by a newer value before being flushed), "flushed", "flushes" and "errors".
+        """
+        with self.__lock:
+            return {"depth": len(self.__pending), "max_depth": self.__max_depth, "enqueued": self.__enqueued,
+                    "coalesced": self.__coalesced, "flushed": self.__flushed, "flushes": self.__flushes,
+                    "errors": self.__errors}
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc()
@@ -20,21 +20,38 @@ def query_game_of_user(tel_chat_id: int, user_id: int) -> Optional[int]:
     :param user_id: telegram id of the user
     :return: the game_id (None if there are no correspondences in the DB)
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        query = """
+            SELECT G.Game_ID
+            FROM Game G JOIN User_Game UG ON G.Game_ID = UG.Game_ID
+            WHERE G.Tel_Chat_ID = {} AND UG.User_ID = {}""".format(tel_chat_id, user_id)
+
+        cursor.execute(query)
+
+        result = cursor.fetchone()
+        if result is None:
+            return result
+        else:
+            return result[0]
 
-    query = """
-        SELECT G.Game_ID
-        FROM Game G JOIN User_Game UG ON G.Game_ID = UG.Game_ID
-        WHERE G.Tel_Chat_ID = {} AND UG.User_ID = {}""".format(tel_chat_id, user_id)
 
-    cursor.execute(query)
+def query_memberships() -> List[Tuple[int, int, int]]:
+    """
+    Gets all the memberships of the users to the games.
+
+    :return: a list of tuples with the chat_id of the game, the user_id and the game_id, sorted by game_id.
+    """
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    result = cursor.fetchone()
-    if result is None:
-        return result
-    else:
-        return result[0]
+        cursor.execute("""
+            SELECT G.Tel_Chat_ID, UG.User_ID, G.Game_ID
+            FROM Game G JOIN User_Game UG ON G.Game_ID = UG.Game_ID
+            ORDER BY G.Game_ID""")
+
+        return cursor.fetchall()
 
 
 def query_special_abilities(sheet: str = None, peculiar: bool = None, special_ability: str = None, pc: bool = None,
@@ -55,85 +72,85 @@ def query_special_abilities(sheet: str = None, peculiar: bool = None, special_ab
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of SpecialAbility objects
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    query = "SELECT Name, Description\n"
-    if special_ability is not None:
-        query += """FROM SpecialAbility WHERE Name = ?"""
-        cursor.execute(query, (special_ability,))
-    elif sheet is not None and peculiar is not None:
-        if exists_crew(sheet):
-            query += "FROM SpecialAbility JOIN Crew_SA ON Name = SpecialAbility\nWHERE Crew = ? AND Peculiar is ?"
-        elif exists_character(sheet):
-            query += """FROM SpecialAbility JOIN Char_SA ON Name = SpecialAbility
-            WHERE Character = ? AND Peculiar is ?"""
-        else:
-            return []
-        cursor.execute(query, (sheet, peculiar))
-    elif sheet is not None:
-        if exists_crew(sheet):
-            query += "FROM SpecialAbility JOIN Crew_SA ON Name = SpecialAbility WHERE Crew = ?"
-        elif exists_character(sheet):
-            query += """FROM SpecialAbility JOIN Char_SA ON Name = SpecialAbility
-            WHERE Character = ? AND FrameFeature = 'N' AND Stricture is False"""
-        else:
-            return []
-        cursor.execute(query, (sheet,))
-    elif peculiar is not None:
-        query += """FROM (SpecialAbility S LEFT JOIN Crew_SA CREW ON S.Name = CREW.SpecialAbility) 
-        LEFT JOIN
-        Char_SA CHAR ON S.Name = CHAR.SpecialAbility
-        WHERE CREW.peculiar is ? OR CHAR.peculiar is ?"""
-        cursor.execute(query, (peculiar, peculiar))
-    elif pc is not None:
-        if canon is None:
-            if pc:
-                query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility 
-                WHERE CHAR.Character not in (SELECT Class FROM CharacterSheet WHERE Spirit is True)"""
-            elif not pc:
-                query += """FROM Crew_SA CREW LEFT JOIN SpecialAbility S on S.Name = CREW.SpecialAbility"""
-        else:
-            if pc:
-                query = """SELECT Name, Description
-                FROM Char_SA CHAR JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility 
-                WHERE CHAR.Character not in (SELECT Class FROM CharacterSheet WHERE Spirit is True)
-                UNION
-                Select Name, Description
-                From SpecialAbility
-                WHERE Canon is False"""
-            elif not pc:
-                query = """SELECT Name, Description
-                FROM Crew_SA CREW LEFT JOIN SpecialAbility S on S.Name = CREW.SpecialAbility
-                UNION
-                Select Name, Description
-                From SpecialAbility
-                WHERE Canon is False"""
+    with connect() as connection:
+        cursor = reference_cursor(connection)
+
+        query = "SELECT Name, Description\n"
+        if special_ability is not None:
+            query += """FROM SpecialAbility WHERE Name = ?"""
+            cursor.execute(query, (special_ability,))
+        elif sheet is not None and peculiar is not None:
+            if exists_crew(sheet):
+                query += "FROM SpecialAbility JOIN Crew_SA ON Name = SpecialAbility\nWHERE Crew = ? AND Peculiar is ?"
+            elif exists_character(sheet):
+                query += """FROM SpecialAbility JOIN Char_SA ON Name = SpecialAbility
+                WHERE Character = ? AND Peculiar is ?"""
+            else:
+                return []
+            cursor.execute(query, (sheet, peculiar))
+        elif sheet is not None:
+            if exists_crew(sheet):
+                query += "FROM SpecialAbility JOIN Crew_SA ON Name = SpecialAbility WHERE Crew = ?"
+            elif exists_character(sheet):
+                query += """FROM SpecialAbility JOIN Char_SA ON Name = SpecialAbility
+                WHERE Character = ? AND FrameFeature = 'N' AND Stricture is False"""
+            else:
+                return []
+            cursor.execute(query, (sheet,))
+        elif peculiar is not None:
+            query += """FROM (SpecialAbility S LEFT JOIN Crew_SA CREW ON S.Name = CREW.SpecialAbility) 
+            LEFT JOIN
+            Char_SA CHAR ON S.Name = CHAR.SpecialAbility
+            WHERE CREW.peculiar is ? OR CHAR.peculiar is ?"""
+            cursor.execute(query, (peculiar, peculiar))
+        elif pc is not None:
+            if canon is None:
+                if pc:
+                    query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility 
+                    WHERE CHAR.Character not in (SELECT Class FROM CharacterSheet WHERE Spirit is True)"""
+                elif not pc:
+                    query += """FROM Crew_SA CREW LEFT JOIN SpecialAbility S on S.Name = CREW.SpecialAbility"""
+            else:
+                if pc:
+                    query = """SELECT Name, Description
+                    FROM Char_SA CHAR JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility 
+                    WHERE CHAR.Character not in (SELECT Class FROM CharacterSheet WHERE Spirit is True)
+                    UNION
+                    Select Name, Description
+                    From SpecialAbility
+                    WHERE Canon is False"""
+                elif not pc:
+                    query = """SELECT Name, Description
+                    FROM Crew_SA CREW LEFT JOIN SpecialAbility S on S.Name = CREW.SpecialAbility
+                    UNION
+                    Select Name, Description
+                    From SpecialAbility
+                    WHERE Canon is False"""
 
-        cursor.execute(query)
-    elif frame_feature is not None:
-        query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility
-        WHERE S.FrameFeature = 'E' OR S.FrameFeature = ?"""
-        cursor.execute(query, (frame_feature,))
-    elif stricture is not None:
-        query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility
-        WHERE S.Stricture is ?"""
-        cursor.execute(query, (stricture,))
-    else:
-        query += """FROM SpecialAbility"""
-        cursor.execute(query)
+            cursor.execute(query)
+        elif frame_feature is not None:
+            query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility
+            WHERE S.FrameFeature = 'E' OR S.FrameFeature = ?"""
+            cursor.execute(query, (frame_feature,))
+        elif stricture is not None:
+            query += """FROM Char_SA CHAR LEFT JOIN SpecialAbility S on S.Name = CHAR.SpecialAbility
+            WHERE S.Stricture is ?"""
+            cursor.execute(query, (stricture,))
+        else:
+            query += """FROM SpecialAbility"""
+            cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    abilities = []
-    for elem in rows:
-        abilities.append({"name": elem[0], "description": elem[1]})
+        abilities = []
+        for elem in rows:
+            abilities.append({"name": elem[0], "description": elem[1]})
 
-    if not as_dict:
-        for i in range(len(abilities)):
-            abilities[i] = SpecialAbility(**abilities[i])
+        if not as_dict:
+            for i in range(len(abilities)):
+                abilities[i] = SpecialAbility(**abilities[i])
 
-    return abilities
+        return abilities
 
 
 def query_xp_triggers_id_description(xp_id: int = None, crew: bool = False) -> List[Tuple[int, str]]:
@@ -144,21 +161,21 @@ def query_xp_triggers_id_description(xp_id: int = None, crew: bool = False) -> L
     :param crew: True if the target Xp Triggers belong to a crew, False if they belong to a PC.
     :return: a list of tuples that contains the ID of the trigger and its description.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = "SELECT XpID, Description\n"
-    if xp_id is not None:
-        query += """FROM XpTrigger\nWHERE XpID = ?"""
-        cursor.execute(query, (xp_id,))
-    else:
-        if crew:
-            query += "FROM XpTrigger NATURAL JOIN Crew_Xp\nWHERE Peculiar is True OR Canon is False"
-            cursor.execute(query)
+        query = "SELECT XpID, Description\n"
+        if xp_id is not None:
+            query += """FROM XpTrigger\nWHERE XpID = ?"""
+            cursor.execute(query, (xp_id,))
         else:
-            query += "FROM XpTrigger NATURAL JOIN Char_Xp\nWHERE Peculiar is True OR Canon is False"
-            cursor.execute(query)
-    return cursor.fetchall()
+            if crew:
+                query += "FROM XpTrigger NATURAL JOIN Crew_Xp\nWHERE Peculiar is True OR Canon is False"
+                cursor.execute(query)
+            else:
+                query += "FROM XpTrigger NATURAL JOIN Char_Xp\nWHERE Peculiar is True OR Canon is False"
+                cursor.execute(query)
+        return cursor.fetchall()
 
 
 def query_xp_triggers(sheet: str = None, peculiar: bool = None) -> List[str]:
@@ -171,51 +188,51 @@ def query_xp_triggers(sheet: str = None, peculiar: bool = None) -> List[str]:
     :param peculiar: True if only the peculiar triggers are the targets, False if all the triggers are the targets
     :return: a list of strings, representing the xp triggers
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    q_select = "SELECT Description"
+        q_select = "SELECT Description"
 
-    q_from = "\nFROM XpTrigger"
+        q_from = "\nFROM XpTrigger"
 
-    q_where = "\n"
+        q_where = "\n"
 
-    query = q_select + q_from + q_where
+        query = q_select + q_from + q_where
 
-    if sheet is not None:
-        if exists_crew(sheet):
-            q_from += " NATURAL JOIN Crew_Xp"
-            q_where += "WHERE Crew = '{}' ".format(sheet)
+        if sheet is not None:
+            if exists_crew(sheet):
+                q_from += " NATURAL JOIN Crew_Xp"
+                q_where += "WHERE Crew = '{}' ".format(sheet)
 
-        elif exists_character(sheet):
-            q_from += " NATURAL JOIN Char_Xp"
-            q_where += "WHERE Character = '{}' ".format(sheet)
+            elif exists_character(sheet):
+                q_from += " NATURAL JOIN Char_Xp"
+                q_where += "WHERE Character = '{}' ".format(sheet)
 
-        else:
-            return []
+            else:
+                return []
 
-        if peculiar is not None:
-            q_where += "and Peculiar is {}".format(peculiar)
-        query = q_select + q_from + q_where
-    else:
-        if peculiar is not None:
-            query = """
-            SELECT Description
-            FROM XpTrigger NATURAL JOIN Crew_Xp 
-            WHERE Peculiar is {}
-            UNION
-            SELECT Description
-            FROM XpTrigger NATURAL JOIN Char_Xp 
-            WHERE Peculiar is {}""".format(peculiar, peculiar)
+            if peculiar is not None:
+                q_where += "and Peculiar is {}".format(peculiar)
+            query = q_select + q_from + q_where
+        else:
+            if peculiar is not None:
+                query = """
+                SELECT Description
+                FROM XpTrigger NATURAL JOIN Crew_Xp 
+                WHERE Peculiar is {}
+                UNION
+                SELECT Description
+                FROM XpTrigger NATURAL JOIN Char_Xp 
+                WHERE Peculiar is {}""".format(peculiar, peculiar)
 
-    cursor.execute(query)
-    rows = cursor.fetchall()
+        cursor.execute(query)
+        rows = cursor.fetchall()
 
-    xp_triggers = []
-    for trigger in rows:
-        xp_triggers.append(trigger[0])
+        xp_triggers = []
+        for trigger in rows:
+            xp_triggers.append(trigger[0])
 
-    return xp_triggers
+        return xp_triggers
 
 
 def query_action_list(attr: str = None, as_list: bool = False) -> Union[List[Action], List[str]]:
@@ -226,28 +243,28 @@ def query_action_list(attr: str = None, as_list: bool = False) -> Union[List[Act
     :param as_list: if True the result objects will be returned as a list of strings.
     :return: a list of Actions
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-    SELECT name
-    FROM Action"""
+        query = """
+        SELECT name
+        FROM Action"""
 
-    if attr is not None:
-        query += "\nWHERE attribute = '{}'".format(attr)
+        if attr is not None:
+            query += "\nWHERE attribute = '{}'".format(attr)
 
-    cursor.execute(query)
+        cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    actions = []
-    for action in rows:
-        if as_list:
-            actions.append(str(action[0]).lower())
-        else:
-            actions.append(Action(str(action[0]).lower()))
+        actions = []
+        for action in rows:
+            if as_list:
+                actions.append(str(action[0]).lower())
+            else:
+                actions.append(Action(str(action[0]).lower()))
 
-    return actions
+        return actions
 
 
 def query_vice(vice: str = None, character_class: str = None,
@@ -260,33 +277,33 @@ def query_vice(vice: str = None, character_class: str = None,
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of Vices
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    q_select = "SELECT name, description"
-    q_from = "\nFROM Vice"
-    q_where = "\n"
+        q_select = "SELECT name, description"
+        q_from = "\nFROM Vice"
+        q_where = "\n"
 
-    if vice is not None:
-        q_where += "WHERE name = '{}'".format(vice)
+        if vice is not None:
+            q_where += "WHERE name = '{}'".format(vice)
 
-    else:
-        if character_class is not None:
-            q_where += "WHERE class = '{}'".format(str(character_class).capitalize())
+        else:
+            if character_class is not None:
+                q_where += "WHERE class = '{}'".format(str(character_class).capitalize())
 
-    cursor.execute(q_select + q_from + q_where)
+        cursor.execute(q_select + q_from + q_where)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    vices = []
-    for elem in rows:
-        vices.append({"name": elem[0], "description": elem[1]})
+        vices = []
+        for elem in rows:
+            vices.append({"name": elem[0], "description": elem[1]})
 
-    if not as_dict:
-        for i in range(len(vices)):
-            vices[i] = Vice(**vices[i])
+        if not as_dict:
+            for i in range(len(vices)):
+                vices[i] = Vice(**vices[i])
 
-    return vices
+        return vices
 
 
 def query_character_sheets(canon: bool = None, spirit: bool = None) -> List[str]:
@@ -298,31 +315,31 @@ def query_character_sheets(canon: bool = None, spirit: bool = None) -> List[str]
     :param spirit: if True the targets are all the spirit sheets; if False the targets are all the non-spirit sheets
     :return: list of the required sheets
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    q_select = "SELECT class"
-    q_from = "\nFROM CharacterSheet"
-    q_where = "\n"
+        q_select = "SELECT class"
+        q_from = "\nFROM CharacterSheet"
+        q_where = "\n"
 
-    if canon is not None:
-        q_where += "WHERE canon IS {}".format(canon)
+        if canon is not None:
+            q_where += "WHERE canon IS {}".format(canon)
 
-        if spirit is not None:
-            q_where += " AND spirit IS {}".format(spirit)
+            if spirit is not None:
+                q_where += " AND spirit IS {}".format(spirit)
 
-    elif spirit is not None:
-        q_where += "WHERE spirit IS {}".format(spirit)
+        elif spirit is not None:
+            q_where += "WHERE spirit IS {}".format(spirit)
 
-    cursor.execute(q_select + q_from + q_where)
+        cursor.execute(q_select + q_from + q_where)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    sheets = []
-    for elem in rows:
-        sheets.append(elem[0])
+        sheets = []
+        for elem in rows:
+            sheets.append(elem[0])
 
-    return sheets
+        return sheets
 
 
 def query_sheet_descriptions(sheet: str = None) -> List[str]:
@@ -332,37 +349,37 @@ def query_sheet_descriptions(sheet: str = None) -> List[str]:
     :param sheet: represents the target sheet. If not passed, all the descriptions are retrieved.
     :return: a list of strings containing the sheets descriptions.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    if sheet is not None:
-        if exists_crew(sheet):
-            query = """SELECT Description
-                    FROM CrewSheet
-                    WHERE type = ?"""
-        elif exists_character(sheet):
-            query = """SELECT Description
-                         FROM CharacterSheet
-                         WHERE class = ?"""
-        else:
-            return []
+    with connect() as connection:
+        cursor = reference_cursor(connection)
+
+        if sheet is not None:
+            if exists_crew(sheet):
+                query = """SELECT Description
+                        FROM CrewSheet
+                        WHERE type = ?"""
+            elif exists_character(sheet):
+                query = """SELECT Description
+                             FROM CharacterSheet
+                             WHERE class = ?"""
+            else:
+                return []
 
-        cursor.execute(query, (sheet,))
-        rows = cursor.fetchall()
-    else:
-        cursor.execute("""SELECT Description
-                            FROM CharacterSheet""")
-        rows = cursor.fetchall()
+            cursor.execute(query, (sheet,))
+            rows = cursor.fetchall()
+        else:
+            cursor.execute("""SELECT Description
+                                FROM CharacterSheet""")
+            rows = cursor.fetchall()
 
-        cursor.execute("""SELECT Description
-                                FROM CrewSheet""")
-        rows.extend(cursor.fetchall())
+            cursor.execute("""SELECT Description
+                                    FROM CrewSheet""")
+            rows.extend(cursor.fetchall())
 
-    descriptions = []
-    for elem in rows:
-        descriptions.append(elem[0])
+        descriptions = []
+        for elem in rows:
+            descriptions.append(elem[0])
 
-    return descriptions
+        return descriptions
 
 
 def query_crew_sheets(canon: bool = None) -> List[str]:
@@ -373,25 +390,25 @@ def query_crew_sheets(canon: bool = None) -> List[str]:
     :param canon: if True the targets are all the canon sheets; if False the targets are all the non-canon sheets
     :return: list of the required sheets
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    q_select = "SELECT Type"
-    q_from = "\nFROM CrewSheet"
-    q_where = "\n"
+        q_select = "SELECT Type"
+        q_from = "\nFROM CrewSheet"
+        q_where = "\n"
 
-    if canon is not None:
-        q_where += "WHERE canon IS {}".format(canon)
+        if canon is not None:
+            q_where += "WHERE canon IS {}".format(canon)
 
-    cursor.execute(q_select + q_from + q_where)
+        cursor.execute(q_select + q_from + q_where)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    sheets = []
-    for elem in rows:
-        sheets.append(elem[0])
+        sheets = []
+        for elem in rows:
+            sheets.append(elem[0])
 
-    return sheets
+        return sheets
 
 
 def query_attributes(only_names: bool = False) -> Union[List[Attribute], List[str]]:
@@ -400,26 +417,26 @@ def query_attributes(only_names: bool = False) -> Union[List[Attribute], List[st
 
     :return: a list of Attributes with all the corresponding Actions
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-    SELECT DISTINCT attribute
-    FROM Action
-    ORDER BY attribute
-    """)
+        cursor.execute("""
+        SELECT DISTINCT attribute
+        FROM Action
+        ORDER BY attribute
+        """)
 
-    attribute_names = []
-    for elem in cursor.fetchall():
-        attribute_names.append(elem[0])
+        attribute_names = []
+        for elem in cursor.fetchall():
+            attribute_names.append(elem[0])
 
-    if not only_names:
-        attributes = []
-        for i in range(len(attribute_names)):
-            attributes.append(Attribute(attribute_names[i], query_action_list(attribute_names[i])))
+        if not only_names:
+            attributes = []
+            for i in range(len(attribute_names)):
+                attributes.append(Attribute(attribute_names[i], query_action_list(attribute_names[i])))
 
-        return attributes
-    return attribute_names
+            return attributes
+        return attribute_names
 
 
 def query_initial_dots(sheet: str) -> List[Tuple[str, int]]:
@@ -429,16 +446,16 @@ def query_initial_dots(sheet: str) -> List[Tuple[str, int]]:
     :param sheet: is the character sheet of interest
     :return: a list of tuples: each one contains the name of the action and its initial dots
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-    SELECT Action, Dots
-    FROM Char_Action 
-    WHERE Character = '{}'  
-    """.format(sheet))
+        cursor.execute("""
+        SELECT Action, Dots
+        FROM Char_Action 
+        WHERE Character = '{}'  
+        """.format(sheet))
 
-    return cursor.fetchall()
+        return cursor.fetchall()
 
 
 def query_last_game_id() -> int:
@@ -447,19 +464,19 @@ def query_last_game_id() -> int:
 
     :return: the maximum id value of game present in the DataBase. If there is no game, it returns 0.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-    SELECT Max(Game_ID)
-    FROM Game
-    """)
+        cursor.execute("""
+        SELECT Max(Game_ID)
+        FROM Game
+        """)
 
-    result = cursor.fetchone()[0]
-    if result is not None:
-        return result
-    else:
-        return 0
+        result = cursor.fetchone()[0]
+        if result is not None:
+            return result
+        else:
+            return 0
 
 
 def query_game_json(game_id: int, files: List = None) -> dict:
@@ -470,37 +487,37 @@ def query_game_json(game_id: int, files: List = None) -> dict:
     :param files: list of files to retrieve from the table. If the list is None it will retrieve all the files.
     :return: dictionary containing the json strings got from the DataBase
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    q_select = "SELECT "
-    if files is None:
-        cursor.execute("""
-        SELECT name
-        FROM PRAGMA_TABLE_INFO('Game')
-        WHERE name LIKE '%JSON%' or name = 'Journal' or name = 'State' or name = 'Language'""")
+        q_select = "SELECT "
+        if files is None:
+            cursor.execute("""
+            SELECT name
+            FROM PRAGMA_TABLE_INFO('Game')
+            WHERE name LIKE '%JSON%' or name = 'Journal' or name = 'State' or name = 'Language'""")
 
-        rows = cursor.fetchall()
+            rows = cursor.fetchall()
 
-        files = []
-        for el in rows:
-            files.append(el[0])
+            files = []
+            for el in rows:
+                files.append(el[0])
 
-    for i in range(len(files) - 1):
-        q_select += files[i] + ", "
-    q_select += files[len(files) - 1]
+        for i in range(len(files) - 1):
+            q_select += files[i] + ", "
+        q_select += files[len(files) - 1]
 
-    query = q_select + """
-    FROM Game
-    WHERE Game_ID = {}""".format(game_id)
+        query = q_select + """
+        FROM Game
+        WHERE Game_ID = {}""".format(game_id)
 
-    cursor.execute(query)
-    rows = cursor.fetchall()
+        cursor.execute(query)
+        rows = cursor.fetchall()
 
-    dict_json = {}
-    for i in range(len(files)):
-        dict_json[files[i]] = rows[0][i]
-    return dict_json
+        dict_json = {}
+        for i in range(len(files)):
+            dict_json[files[i]] = codec.decode(rows[0][i])
+        return dict_json
 
 
 def query_users_from_game(game_id: int) -> List[Tuple[str, int, bool]]:
@@ -510,37 +527,41 @@ def query_users_from_game(game_id: int) -> List[Tuple[str, int, bool]]:
     :param game_id: int representing the specific Game_ID
     :return: list of tuples containing Tel_ID and Name of the users
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-    SELECT Name, Tel_ID, Master 
-    FROM User JOIN User_Game ON Tel_ID = User_ID
-    WHERE Game_ID = {}""".format(game_id))
-    return cursor.fetchall()
+        cursor.execute("""
+        SELECT Name, Tel_ID, Master 
+        FROM User JOIN User_Game ON Tel_ID = User_ID
+        WHERE Game_ID = {}""".format(game_id))
+        return cursor.fetchall()
 
 
-def query_pc_json(game_id: int) -> dict:
+def query_pc_json(game_id: int) -> Dict[int, List[Tuple[int, str]]]:
     """
-    Retrieve all Users_ID and Char_JSON of a specific Game_ID.
+    Retrieve all the PCs of a specific Game_ID, grouped by user.
 
     :param game_id: int representing the specific Game_ID
-    :return: dictionary containing all json files with their respective user
+    :return: dictionary where the keys are the User_IDs of the users in the game and the values are lists of tuples
+        with the Char_ID and the json of each of their PCs, sorted by Char_ID (the lists of users without PCs are empty)
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-    SELECT User_ID, Char_JSON
-    FROM User_Game
-    WHERE Game_ID = {}""".format(game_id))
+        cursor.execute("""
+        SELECT UG.User_ID, P.Char_ID, P.Char_JSON
+        FROM User_Game UG LEFT JOIN PC P ON P.Game_ID = UG.Game_ID AND P.User_ID = UG.User_ID
+        WHERE UG.Game_ID = ?
+        ORDER BY P.Char_ID""", (game_id,))
 
-    dict_json = {}
-    rows = cursor.fetchall()
+        dict_json = {}
+        rows = cursor.fetchall()
 
-    for t in rows:
-        dict_json[t[0]] = t[1]
-    return dict_json
+        for t in rows:
+            characters = dict_json.setdefault(t[0], [])
+            if t[1] is not None:
+                characters.append((t[1], codec.decode(t[2])))
+        return dict_json
 
 
 def query_lang(game_id: int) -> str:
@@ -550,15 +571,15 @@ def query_lang(game_id: int) -> str:
     :param game_id: int representing the specific Game
     :return: str representing the language
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("""
-    SELECT Language
-    FROM Game
-    WHERE Game_ID = {}""".format(game_id))
+        cursor.execute("""
+        SELECT Language
+        FROM Game
+        WHERE Game_ID = {}""".format(game_id))
 
-    return cursor.fetchone()[0]
+        return cursor.fetchone()[0]
 
 
 def query_games_info(chat_id: int = None, game_id: int = None) -> List[Dict[str, Union[str, int]]]:
@@ -570,28 +591,232 @@ def query_games_info(chat_id: int = None, game_id: int = None) -> List[Dict[str,
     :return: a list of dictionaries with the keys: "identifier", "title", "chat_id".
         An empty list if no results are found
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    query = """
-       SELECT Game_ID, Title, Tel_Chat_ID
-       FROM Game"""
+        query = """
+           SELECT Game_ID, Title, Tel_Chat_ID
+           FROM Game"""
 
-    if chat_id is not None:
-        query += "\nWHERE Tel_Chat_ID = {}".format(chat_id)
+        if chat_id is not None:
+            query += "\nWHERE Tel_Chat_ID = {}".format(chat_id)
 
-    elif game_id is not None:
-        query += "\nWHERE Game_ID = {}".format(game_id)
+        elif game_id is not None:
+            query += "\nWHERE Game_ID = {}".format(game_id)
 
-    cursor.execute(query)
+        cursor.execute(query + "\nORDER BY Game_ID")
 
-    games_info = []
-    rows = cursor.fetchall()
+        games_info = []
+        rows = cursor.fetchall()
 
-    if rows:
-        for t in rows:
-            games_info.append({"identifier": t[0], "title": t[1], "chat_id": t[2]})
-    return games_info
+        if rows:
+            for t in rows:
+                games_info.append({"identifier": t[0], "title": t[1], "chat_id": t[2]})
+        return games_info
+
+
+def query_games_headers() -> List[Dict[str, int]]:
+    """
+    Retrieves the Game_ID, Title, Tel_Chat_ID and State of all the games stored in the Data Base, without reading
+    their JSON columns and journal.
+
+    :return: a list of dictionaries with the keys: "identifier", "title", "chat_id", "state".
+        An empty list if no results are found
+    """
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("""
+        SELECT Game_ID, Title, Tel_Chat_ID, State
+        FROM Game INDEXED BY Game_Header_Index
+        ORDER BY Game_ID""")
+
+        return [{"identifier": t[0], "title": t[1], "chat_id": t[2], "state": t[3]} for t in cursor.fetchall()]
+
+
+def query_game_snapshot(game_id: int) -> Optional[bytes]:
+    """
+    Retrieves the binary snapshot of the content of a game.
+
+    :param game_id: int representing the ID of the specific Game
+    :return: the bytes of the snapshot, None if the game has no valid snapshot or does not exist
+    """
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("""
+        SELECT Snapshot
+        FROM Game
+        WHERE Game_ID = ?""", (game_id,))
+
+        row = cursor.fetchone()
+        return row[0] if row is not None else None
+
+
+GAME_ROW_COLUMNS = ("Crew_JSON", "Crafted_Item_JSON", "NPC_JSON", "Faction_JSON", "Score_JSON", "Clock_JSON", "Journal",
+                    "Journal_Anchor_JSON", "State", "Language", "Snapshot")
+
+
+def games_filter(column: str, game_ids: Optional[List[int]]) -> Tuple[str, tuple]:
+    """
+    Builds the WHERE clause that restricts a query to the passed games with a single parameter, whatever their number.
+
+    :param column: the column holding the Game_ID.
+    :param game_ids: the ids of the games; if it is None the query is not restricted.
+    :return: a tuple with the clause (an empty string if game_ids is None) and its parameters.
+    """
+    if game_ids is None:
+        return "", ()
+    return "\nWHERE {} IN (SELECT value FROM json_each(?))".format(column), (json.dumps(list(game_ids)),)
+
+
+def iter_games_rows(game_ids: List[int] = None) -> Iterator[Tuple[int, dict]]:
+    """
+    Streams with a single query the json strings, journal, state, language and snapshot of many games, e.g. to load
+    them all at startup: each row is decoded only when it is reached.
+
+    :param game_ids: the ids of the games to retrieve; if it is None all the games are retrieved.
+    :return: an iterator yielding tuples with the Game_ID and a dictionary with the same keys of query_game_json() plus
+        "Snapshot"
+    """
+    where, parameters = games_filter("Game_ID", game_ids)
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT Game_ID, {}\nFROM Game".format(", ".join(GAME_ROW_COLUMNS)) + where, parameters)
+
+        for row in cursor:
+            yield row[0], {column: codec.decode(value) if column in CODEC_COLUMNS["Game"] else value
+                           for column, value in zip(GAME_ROW_COLUMNS, row[1:])}
+
+
+def query_games_rows(game_ids: List[int] = None) -> Dict[int, dict]:
+    """
+    Retrieves with a single query the json strings, journal, state, language and snapshot of many games.
+
+    :param game_ids: the ids of the games to retrieve; if it is None all the games are retrieved.
+    :return: dictionary where the keys are the Game_IDs and the values are dictionaries with the same keys of
+        query_game_json() plus "Snapshot"
+    """
+    return dict(iter_games_rows(game_ids))
+
+
+def query_games_without_snapshot(game_ids: List[int] = None) -> List[int]:
+    """
+    Retrieves the ids of the games that have no binary snapshot.
+
+    :param game_ids: the ids of the games to check; if it is None all the games are checked.
+    :return: the list of the Game_IDs without snapshot
+    """
+    where, parameters = games_filter("Game_ID", game_ids)
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT Game_ID\nFROM Game" + (where + " AND " if where else "\nWHERE ") + "Snapshot IS NULL",
+                       parameters)
+        return [row[0] for row in cursor]
+
+
+def query_games_users(game_ids: List[int] = None) -> Dict[int, List[Tuple[str, int, bool]]]:
+    """
+    Retrieves with a single query the users of many games, like query_users_from_game() does for one game.
+
+    :param game_ids: the ids of the games; if it is None the users of all the games are retrieved.
+    :return: dictionary where the keys are the Game_IDs and the values are lists of tuples containing Name, Tel_ID and
+        Master of the users (the games without users are missing)
+    """
+    where, parameters = games_filter("UG.Game_ID", game_ids)
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("""
+        SELECT UG.Game_ID, Name, Tel_ID, Master
+        FROM User JOIN User_Game UG ON Tel_ID = User_ID""" + where + """
+        ORDER BY UG.Game_ID, UG.rowid""", parameters)
+
+        users = {}
+        for row in cursor:
+            users.setdefault(row[0], []).append(row[1:])
+        return users
+
+
+def query_games_pc_json(game_ids: List[int] = None) -> Dict[int, Dict[int, List[Tuple[int, str]]]]:
+    """
+    Retrieves with a single query the PCs of many games, like query_pc_json() does for one game.
+
+    :param game_ids: the ids of the games; if it is None the PCs of all the games are retrieved.
+    :return: dictionary where the keys are the Game_IDs and the values are the dictionaries returned by
+        query_pc_json() (the games without users are missing)
+    """
+    where, parameters = games_filter("UG.Game_ID", game_ids)
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("""
+        SELECT UG.Game_ID, UG.User_ID, P.Char_ID, P.Char_JSON
+        FROM User_Game UG LEFT JOIN PC P ON P.Game_ID = UG.Game_ID AND P.User_ID = UG.User_ID""" + where + """
+        ORDER BY UG.Game_ID, P.Char_ID""", parameters)
+
+        games = {}
+        for row in cursor:
+            characters = games.setdefault(row[0], {}).setdefault(row[1], [])
+            if row[2] is not None:
+                characters.append((row[2], codec.decode(row[3])))
+        return games
+
+
+JOURNAL_ENTRY_COLUMNS = ("Method", "Args_JSON", "Language", "Indentation", "Phase", "Score")
+
+
+def journal_entry_from_row(row: tuple) -> dict:
+    """
+    Converts a row of the Journal_Entry table into the dictionary of the entry used by the Journal.
+
+    :param row: the values of the JOURNAL_ENTRY_COLUMNS.
+    :return: a dictionary with the keys "method", "args", "language", "indentation", "phase" and "score"
+    """
+    return {"method": row[0], "args": json.loads(row[1]), "language": row[2], "indentation": row[3], "phase": row[4],
+            "score": row[5]}
+
+
+def query_journal_entries(game_id: int) -> List[dict]:
+    """
+    Retrieves the entries appended to the journal of the specified game since it has been compacted last time.
+
+    :param game_id: int representing the ID of the specific Game
+    :return: the list of the entries, in the order they have been written, as returned by journal_entry_from_row()
+    """
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("""
+        SELECT {}
+        FROM Journal_Entry
+        WHERE Game_ID = ?
+        ORDER BY Entry_ID""".format(", ".join(JOURNAL_ENTRY_COLUMNS)), (game_id,))
+
+        return [journal_entry_from_row(row) for row in cursor]
+
+
+def query_games_journal_entries(game_ids: List[int] = None) -> Dict[int, List[dict]]:
+    """
+    Retrieves with a single query the journal entries of many games, like query_journal_entries() does for one game.
+
+    :param game_ids: the ids of the games; if it is None the entries of all the games are retrieved.
+    :return: dictionary where the keys are the Game_IDs and the values are the lists returned by
+        query_journal_entries() (the games without entries are missing)
+    """
+    where, parameters = games_filter("Game_ID", game_ids)
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT Game_ID, {}\nFROM Journal_Entry".format(", ".join(JOURNAL_ENTRY_COLUMNS)) + where +
+                       "\nORDER BY Game_ID, Entry_ID", parameters)
+
+        games = {}
+        for row in cursor:
+            games.setdefault(row[0], []).append(journal_entry_from_row(row[1:]))
+        return games
 
 
 def query_users_names(user_id: int = None) -> List[str]:
@@ -602,24 +827,24 @@ def query_users_names(user_id: int = None) -> List[str]:
     :return: a list of usernames
     """
 
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    query = """
-    SELECT Name
-    FROM User"""
+        query = """
+        SELECT Name
+        FROM User"""
 
-    if user_id is not None:
-        query += "\nWHERE Tel_ID = {}".format(user_id)
+        if user_id is not None:
+            query += "\nWHERE Tel_ID = {}".format(user_id)
 
-    cursor.execute(query)
+        cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    usernames = []
-    for user in rows:
-        usernames.append(user[0])
-    return usernames
+        usernames = []
+        for user in rows:
+            usernames.append(user[0])
+        return usernames
 
 
 def query_game_ids(tel_chat_id: int = None, title: str = None) -> List[int]:
@@ -631,35 +856,36 @@ def query_game_ids(tel_chat_id: int = None, title: str = None) -> List[int]:
     :param title: The title of the games of interest.
     :return: a list of int IDs.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    if tel_chat_id is not None and title is not None:
-        cursor.execute("""
-        SELECT Game_ID
-        FROM Game
-        WHERE (Tel_Chat_ID, Title) = (?, ?)""", (tel_chat_id, title))
-
-    elif tel_chat_id is not None:
-        cursor.execute("""
-                SELECT Game_ID
-                FROM Game
-                WHERE Tel_Chat_ID = ?""", (tel_chat_id,))
-    elif title is not None:
-        cursor.execute("""
-                       SELECT Game_ID
-                       FROM Game
-                       WHERE Title = ?""", (title,))
-    else:
-        cursor.execute("""SELECT Game_ID
-                          FROM Game""")
+    with connect() as connection:
+        cursor = connection.cursor()
+
+        if tel_chat_id is not None and title is not None:
+            cursor.execute("""
+            SELECT Game_ID
+            FROM Game
+            WHERE (Tel_Chat_ID, Title) = (?, ?)""", (tel_chat_id, title))
+
+        elif tel_chat_id is not None:
+            cursor.execute("""
+                    SELECT Game_ID
+                    FROM Game
+                    WHERE Tel_Chat_ID = ?""", (tel_chat_id,))
+        elif title is not None:
+            cursor.execute("""
+                           SELECT Game_ID
+                           FROM Game
+                           WHERE Title = ?""", (title,))
+        else:
+            cursor.execute("""SELECT Game_ID
+                              FROM Game
+                              ORDER BY Game_ID""")
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    ids = []
-    for elem in rows:
-        ids.append(elem[0])
-    return ids
+        ids = []
+        for elem in rows:
+            ids.append(elem[0])
+        return ids
 
 
 def query_char_strange_friends(pc_class: str = None, strange_friend: str = None,
@@ -672,26 +898,26 @@ def query_char_strange_friends(pc_class: str = None, strange_friend: str = None,
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of NPCs or a list of their dictionary
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-    SELECT Name, Role
-    FROM Char_Friend JOIN NPC ON NPC = NpcID"""
+        query = """
+        SELECT Name, Role
+        FROM Char_Friend JOIN NPC ON NPC = NpcID"""
 
-    if pc_class is not None and strange_friend is not None:
-        query += "\nWHERE Character = ? AND Name = ?"
-        cursor.execute(query, (pc_class, strange_friend))
-    elif pc_class is not None:
-        query += "\nWHERE Character = ?".format(pc_class)
-        cursor.execute(query, (pc_class,))
-    elif strange_friend is not None:
-        query += "\nWHERE Name = ?"
-        cursor.execute(query, (strange_friend,))
+        if pc_class is not None and strange_friend is not None:
+            query += "\nWHERE Character = ? AND Name = ?"
+            cursor.execute(query, (pc_class, strange_friend))
+        elif pc_class is not None:
+            query += "\nWHERE Character = ?".format(pc_class)
+            cursor.execute(query, (pc_class,))
+        elif strange_friend is not None:
+            query += "\nWHERE Name = ?"
+            cursor.execute(query, (strange_friend,))
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    return result_npcs(rows, as_dict)
+        return result_npcs(rows, as_dict)
 
 
 def query_crew_contacts(crew_type: str = None, contact: str = None,
@@ -704,25 +930,25 @@ def query_crew_contacts(crew_type: str = None, contact: str = None,
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of NPCs or a list of their dictionary
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-    SELECT Name, Role
-    FROM Crew_Contact JOIN NPC ON NPC = NpcID"""
+        query = """
+        SELECT Name, Role
+        FROM Crew_Contact JOIN NPC ON NPC = NpcID"""
 
-    if crew_type is not None and contact is not None:
-        query += "\nWHERE Crew = '{}' AND Name = '{}'".format(crew_type, contact)
-    elif crew_type is not None:
-        query += "\nWHERE Crew = '{}'".format(crew_type)
-    elif contact is not None:
-        query += "\nWHERE Name = '{}'".format(contact)
+        if crew_type is not None and contact is not None:
+            query += "\nWHERE Crew = '{}' AND Name = '{}'".format(crew_type, contact)
+        elif crew_type is not None:
+            query += "\nWHERE Crew = '{}'".format(crew_type)
+        elif contact is not None:
+            query += "\nWHERE Name = '{}'".format(contact)
 
-    cursor.execute(query)
+        cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    return result_npcs(rows, as_dict)
+        return result_npcs(rows, as_dict)
 
 
 def result_npcs(rows: List[Tuple[str, str]], as_dict: bool) -> Union[List[NPC], List[Dict[str, str]]]:
@@ -754,21 +980,21 @@ def query_actions(action: str = None, attribute: str = None) -> List[Tuple[str,
             (in this order)
     """
 
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-    SELECT *
-    FROM Action"""
+        query = """
+        SELECT *
+        FROM Action"""
 
-    if action is not None:
-        query += "\nWHERE Name = '{}'".format(action)
-    elif attribute is not None:
-        query += "\nWHERE Attribute = '{}'".format(attribute)
+        if action is not None:
+            query += "\nWHERE Name = '{}'".format(action)
+        elif attribute is not None:
+            query += "\nWHERE Attribute = '{}'".format(attribute)
 
-    cursor.execute(query)
+        cursor.execute(query)
 
-    return cursor.fetchall()
+        return cursor.fetchall()
 
 
 def query_upgrade_groups() -> List[str]:
@@ -777,22 +1003,22 @@ def query_upgrade_groups() -> List[str]:
 
     :return: a list of the groups.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-        SELECT DISTINCT "group"
-        FROM Upgrade 
-        ORDER BY "group"
-        """)
+        cursor.execute("""
+            SELECT DISTINCT "group"
+            FROM Upgrade 
+            ORDER BY "group"
+            """)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    groups = []
-    for elem in rows:
-        groups.append(elem[0])
+        groups = []
+        for elem in rows:
+            groups.append(elem[0])
 
-    return groups
+        return groups
 
 
 def query_upgrades(upgrade: str = None, crew_sheet: str = None, group: str = None,
@@ -810,55 +1036,55 @@ def query_upgrades(upgrade: str = None, crew_sheet: str = None, group: str = Non
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of dictionaries containing the keys: "name", "description" and "tot_quality"
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    q_select = "SELECT Name, Description, TotQuality"
-    q_from = "\nFROM Upgrade"
-    q_where = "\n "
+        q_select = "SELECT Name, Description, TotQuality"
+        q_from = "\nFROM Upgrade"
+        q_where = "\n "
 
-    if upgrade is not None:
-        q_where += "WHERE name LIKE ?"
+        if upgrade is not None:
+            q_where += "WHERE name LIKE ?"
 
-        cursor.execute(q_select + q_from + q_where, (upgrade + "%",))
+            cursor.execute(q_select + q_from + q_where, (upgrade + "%",))
 
-    else:
-        if crew_sheet is not None:
-            q_from += " JOIN Crew_Upgrade ON name=upgrade"
-            q_where += "WHERE crew = ?"
+        else:
+            if crew_sheet is not None:
+                q_from += " JOIN Crew_Upgrade ON name=upgrade"
+                q_where += "WHERE crew = ?"
 
-            cursor.execute(q_select + q_from + q_where, (crew_sheet,))
+                cursor.execute(q_select + q_from + q_where, (crew_sheet,))
 
-        else:
-            if common:
-                q_where += """WHERE "group" != "Specific" """
-                cursor.execute(q_select + q_from + q_where)
             else:
-                if canon is not None and group is not None:
-                    q_where += """WHERE "group" = ? AND canon = ? """
-                    cursor.execute(q_select + q_from + q_where, (group, canon))
+                if common:
+                    q_where += """WHERE "group" != "Specific" """
+                    cursor.execute(q_select + q_from + q_where)
+                else:
+                    if canon is not None and group is not None:
+                        q_where += """WHERE "group" = ? AND canon = ? """
+                        cursor.execute(q_select + q_from + q_where, (group, canon))
 
-                elif canon is not None:
-                    q_where += """WHERE canon = ? """
-                    cursor.execute(q_select + q_from + q_where, (canon,))
+                    elif canon is not None:
+                        q_where += """WHERE canon = ? """
+                        cursor.execute(q_select + q_from + q_where, (canon,))
 
-                elif group is not None:
-                    q_where += """WHERE "group" = ? """
-                    cursor.execute(q_select + q_from + q_where, (group,))
+                    elif group is not None:
+                        q_where += """WHERE "group" = ? """
+                        cursor.execute(q_select + q_from + q_where, (group,))
 
-                else:
-                    cursor.execute(q_select + q_from)
+                    else:
+                        cursor.execute(q_select + q_from)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    upgrades = []
-    for elem in rows:
-        if as_dict:
-            upgrades.append({"name": elem[0], "description": elem[1], "tot_quality": int(elem[2])})
-        else:
-            upgrades.append(Upgrade(elem[0], 0, int(elem[2])))
+        upgrades = []
+        for elem in rows:
+            if as_dict:
+                upgrades.append({"name": elem[0], "description": elem[1], "tot_quality": int(elem[2])})
+            else:
+                upgrades.append(Upgrade(elem[0], 0, int(elem[2])))
 
-    return upgrades
+        return upgrades
 
 
 def query_starting_upgrades_and_cohorts(crew_sheet: str) -> \
@@ -870,30 +1096,30 @@ def query_starting_upgrades_and_cohorts(crew_sheet: str) -> \
     :return: a tuple of two lists: the first one containing dictionaries representing the upgrades ("name", "quality"),
     the second one containing dictionaries representing the upgrades ("type", "expert").
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    cursor.execute("""
-    SELECT Name, Quality
-    FROM Upgrade JOIN Crew_StartingUpgrade ON Name = Upgrade
-    WHERE Crew = ? 
-    """, (crew_sheet,))
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    upgrades = []
-    for elem in cursor.fetchall():
-        upgrades.append({"name": elem[0], "quality": int(elem[1])})
-
-    cursor.execute("""
-        SELECT Type, Expert
-        FROM Starting_Cohort
+        cursor.execute("""
+        SELECT Name, Quality
+        FROM Upgrade JOIN Crew_StartingUpgrade ON Name = Upgrade
         WHERE Crew = ? 
         """, (crew_sheet,))
 
-    cohorts = []
-    for elem in cursor.fetchall():
-        cohorts.append({"type": elem[0], "expert": bool(elem[1])})
+        upgrades = []
+        for elem in cursor.fetchall():
+            upgrades.append({"name": elem[0], "quality": int(elem[1])})
+
+        cursor.execute("""
+            SELECT Type, Expert
+            FROM Starting_Cohort
+            WHERE Crew = ? 
+            """, (crew_sheet,))
+
+        cohorts = []
+        for elem in cursor.fetchall():
+            cohorts.append({"type": elem[0], "expert": bool(elem[1])})
 
-    return upgrades, cohorts
+        return upgrades, cohorts
 
 
 def query_frame_features(feature: str = None, group: str = None,
@@ -908,44 +1134,44 @@ def query_frame_features(feature: str = None, group: str = None,
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of SpecialAbility
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    if feature is not None:
-        query = """
-        SELECT Name, Description
-        FROM SpecialAbility
-        WHERE FrameFeature != 'N' AND Name = ?
-        """
-
-        cursor.execute(query, (feature,))
-    else:
-        if group is not None:
+        if feature is not None:
             query = """
             SELECT Name, Description
             FROM SpecialAbility
-            WHERE FrameFeature = ?"""
+            WHERE FrameFeature != 'N' AND Name = ?
+            """
 
-            cursor.execute(query, (group,))
+            cursor.execute(query, (feature,))
         else:
-            query = """
-                    SELECT Name, Description
-                    FROM SpecialAbility
-                    WHERE FrameFeature != 'N'
-                    """
-            cursor.execute(query)
+            if group is not None:
+                query = """
+                SELECT Name, Description
+                FROM SpecialAbility
+                WHERE FrameFeature = ?"""
+
+                cursor.execute(query, (group,))
+            else:
+                query = """
+                        SELECT Name, Description
+                        FROM SpecialAbility
+                        WHERE FrameFeature != 'N'
+                        """
+                cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    frame_features = []
-    for elem in rows:
-        frame_features.append({"name": elem[0], "description": elem[1]})
+        frame_features = []
+        for elem in rows:
+            frame_features.append({"name": elem[0], "description": elem[1]})
 
-    if not as_dict:
-        for i in range(len(frame_features)):
-            frame_features[i] = SpecialAbility(**frame_features[i])
+        if not as_dict:
+            for i in range(len(frame_features)):
+                frame_features[i] = SpecialAbility(**frame_features[i])
 
-    return frame_features
+        return frame_features
 
 
 def query_items(item_name: str = None, common_items: bool = False, pc_class: str = None, canon: bool = None,
@@ -962,68 +1188,68 @@ def query_items(item_name: str = None, common_items: bool = False, pc_class: str
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of Item.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    if item_name is not None:
-        query = """
-        SELECT Name, Description, Weight, Usages
-        FROM Item
-        WHERE Name = ?"""
-        cursor.execute(query, (item_name,))
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    elif common_items:
-        query = """
-                SELECT Name, Description, Weight, Usages
-                FROM Item
-                WHERE Canon = True AND Name NOT IN (SELECT Item
-                                  FROM Char_Item)"""
-
-        cursor.execute(query)
-
-    else:
-        if pc_class is not None and canon is not None:
-            query = """SELECT Name, Description, Weight, Usages
-                       FROM Item JOIN Char_Item ON Name = Item
-                       WHERE Character = ? AND Canon = ?"""
-            cursor.execute(query, (pc_class, canon))
+        if item_name is not None:
+            query = """
+            SELECT Name, Description, Weight, Usages
+            FROM Item
+            WHERE Name = ?"""
+            cursor.execute(query, (item_name,))
 
-        elif pc_class is not None:
+        elif common_items:
             query = """
                     SELECT Name, Description, Weight, Usages
-                    FROM Item JOIN Char_Item ON Name = Item
-                    WHERE Character = ?"""
-            cursor.execute(query, (pc_class,))
+                    FROM Item
+                    WHERE Canon = True AND Name NOT IN (SELECT Item
+                                      FROM Char_Item)"""
 
-        elif canon is not None:
-            query = """SELECT Name, Description, Weight, Usages
-                       FROM Item
-                       WHERE Canon = ?"""
-            cursor.execute(query, (canon,))
-
-        elif specific:
-            query = """SELECT DISTINCT Name, Description, Weight, Usages
-                       FROM Item
-                       WHERE Canon is False or Name in (SELECT Item FROM Char_Item)"""
             cursor.execute(query)
 
         else:
-            query = """SELECT Name, Description, Weight, Usages
-                       FROM Item
-                       """
-            cursor.execute(query)
+            if pc_class is not None and canon is not None:
+                query = """SELECT Name, Description, Weight, Usages
+                           FROM Item JOIN Char_Item ON Name = Item
+                           WHERE Character = ? AND Canon = ?"""
+                cursor.execute(query, (pc_class, canon))
+
+            elif pc_class is not None:
+                query = """
+                        SELECT Name, Description, Weight, Usages
+                        FROM Item JOIN Char_Item ON Name = Item
+                        WHERE Character = ?"""
+                cursor.execute(query, (pc_class,))
+
+            elif canon is not None:
+                query = """SELECT Name, Description, Weight, Usages
+                           FROM Item
+                           WHERE Canon = ?"""
+                cursor.execute(query, (canon,))
+
+            elif specific:
+                query = """SELECT DISTINCT Name, Description, Weight, Usages
+                           FROM Item
+                           WHERE Canon is False or Name in (SELECT Item FROM Char_Item)"""
+                cursor.execute(query)
 
-    rows = cursor.fetchall()
+            else:
+                query = """SELECT Name, Description, Weight, Usages
+                           FROM Item
+                           """
+                cursor.execute(query)
 
-    items = []
-    for elem in rows:
-        items.append({"name": elem[0], "description": elem[1], "weight": elem[2], "usages": elem[3]})
+        rows = cursor.fetchall()
 
-    if not as_dict:
-        for i in range(len(items)):
-            items[i] = Item(**items[i])
+        items = []
+        for elem in rows:
+            items.append({"name": elem[0], "description": elem[1], "weight": elem[2], "usages": elem[3]})
+
+        if not as_dict:
+            for i in range(len(items)):
+                items[i] = Item(**items[i])
 
-    return items
+        return items
 
 
 def query_hunting_grounds(hunting_ground: str = None, crew_type: str = None, canon: bool = None,
@@ -1039,53 +1265,53 @@ def query_hunting_grounds(hunting_ground: str = None, crew_type: str = None, can
     :param only_names: True if only the hunting grounds' names should be returned, False otherwise.
     :return: a list of string composed with name and description of the hunting grounds.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    if hunting_ground is not None:
-        query = """
-                SELECT Name, Description
-                FROM HuntingGround
-                WHERE Name = ?"""
-        cursor.execute(query, (hunting_ground,))
-    else:
-        if crew_type is not None and canon is not None:
-            query = """
-                    SELECT Name, Description
-                    FROM HuntingGround JOIN Crew_HG ON Name = HuntingGround
-                    WHERE Crew = ? AND Canon = ?"""
-            cursor.execute(query, (crew_type, canon))
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-        elif crew_type is not None:
-            query = """
-                    SELECT Name, Description
-                    FROM HuntingGround JOIN Crew_HG ON Name = HuntingGround
-                    WHERE Crew = ?"""
-            cursor.execute(query, (crew_type,))
-
-        elif canon is not None:
+        if hunting_ground is not None:
             query = """
                     SELECT Name, Description
                     FROM HuntingGround
-                    WHERE Canon = ?"""
-            cursor.execute(query, (canon,))
-
+                    WHERE Name = ?"""
+            cursor.execute(query, (hunting_ground,))
         else:
-            query = """
-                    SELECT Name, Description
-                    FROM HuntingGround"""
-            cursor.execute(query)
+            if crew_type is not None and canon is not None:
+                query = """
+                        SELECT Name, Description
+                        FROM HuntingGround JOIN Crew_HG ON Name = HuntingGround
+                        WHERE Crew = ? AND Canon = ?"""
+                cursor.execute(query, (crew_type, canon))
+
+            elif crew_type is not None:
+                query = """
+                        SELECT Name, Description
+                        FROM HuntingGround JOIN Crew_HG ON Name = HuntingGround
+                        WHERE Crew = ?"""
+                cursor.execute(query, (crew_type,))
+
+            elif canon is not None:
+                query = """
+                        SELECT Name, Description
+                        FROM HuntingGround
+                        WHERE Canon = ?"""
+                cursor.execute(query, (canon,))
 
-    rows = cursor.fetchall()
+            else:
+                query = """
+                        SELECT Name, Description
+                        FROM HuntingGround"""
+                cursor.execute(query)
 
-    hg = []
-    for elem in rows:
-        if only_names:
-            hg.append(elem[0])
-        else:
-            hg.append(elem[0] + ": " + elem[1])
+        rows = cursor.fetchall()
 
-    return hg
+        hg = []
+        for elem in rows:
+            if only_names:
+                hg.append(elem[0])
+            else:
+                hg.append(elem[0] + ": " + elem[1])
+
+        return hg
 
 
 def query_claims(name: str = None, prison: bool = None, canon: bool = None,
@@ -1100,49 +1326,49 @@ def query_claims(name: str = None, prison: bool = None, canon: bool = None,
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of Claim.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    query = """
-            SELECT Name, Description
-            FROM Claim \n"""
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    if name is not None:
-        query += "WHERE Name = ?"
-        query += "\nORDER BY Canon DESC"
+        query = """
+                SELECT Name, Description
+                FROM Claim \n"""
 
-        cursor.execute(query, (name,))
-    else:
-        if prison is not None and canon is not None:
-            query += "WHERE Prison is ? AND Canon is ?"
+        if name is not None:
+            query += "WHERE Name = ?"
             query += "\nORDER BY Canon DESC"
 
-            cursor.execute(query, (prison, canon))
-        elif prison is not None:
-            query += "WHERE Prison is ?"
-            query += "\nORDER BY Canon DESC"
+            cursor.execute(query, (name,))
+        else:
+            if prison is not None and canon is not None:
+                query += "WHERE Prison is ? AND Canon is ?"
+                query += "\nORDER BY Canon DESC"
 
-            cursor.execute(query, (prison,))
-        elif canon is not None:
-            query += "WHERE Canon is ?"
-            query += "\nORDER BY Canon DESC"
+                cursor.execute(query, (prison, canon))
+            elif prison is not None:
+                query += "WHERE Prison is ?"
+                query += "\nORDER BY Canon DESC"
 
-            cursor.execute(query, (canon,))
-        else:
-            query += "\nORDER BY Canon DESC"
-            cursor.execute(query)
+                cursor.execute(query, (prison,))
+            elif canon is not None:
+                query += "WHERE Canon is ?"
+                query += "\nORDER BY Canon DESC"
 
-    rows = cursor.fetchall()
+                cursor.execute(query, (canon,))
+            else:
+                query += "\nORDER BY Canon DESC"
+                cursor.execute(query)
 
-    claims = []
-    for elem in rows:
-        claims.append({"name": elem[0], "description": elem[1]})
+        rows = cursor.fetchall()
 
-    if not as_dict:
-        for i in range(len(claims)):
-            claims[i] = Claim(**claims[i])
+        claims = []
+        for elem in rows:
+            claims.append({"name": elem[0], "description": elem[1]})
+
+        if not as_dict:
+            for i in range(len(claims)):
+                claims[i] = Claim(**claims[i])
 
-    return claims
+        return claims
 
 
 def query_traumas(name: str = None, pc_class: str = None) -> List[Tuple[str, str]]:
@@ -1153,25 +1379,25 @@ def query_traumas(name: str = None, pc_class: str = None) -> List[Tuple[str, str
     :param pc_class: the name of the class; if passed all the traumas of that class are retrieved.
     :return: a list of tuple containing the traumas' name and description (in this order).
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-                SELECT Name, Description
-                FROM Trauma \n"""
+        query = """
+                    SELECT Name, Description
+                    FROM Trauma \n"""
 
-    if name is not None:
-        query += "WHERE Name = ?"
-        cursor.execute(query, (name, ))
+        if name is not None:
+            query += "WHERE Name = ?"
+            cursor.execute(query, (name, ))
 
-    elif pc_class is not None:
-        query += "WHERE Class = ?"
-        cursor.execute(query, (pc_class,))
+        elif pc_class is not None:
+            query += "WHERE Class = ?"
+            cursor.execute(query, (pc_class,))
 
-    else:
-        cursor.execute(query)
+        else:
+            cursor.execute(query)
 
-    return cursor.fetchall()
+        return cursor.fetchall()
 
 
 def query_factions(name: str = None, category: str = None, tier: int = None, hold: bool = None,
@@ -1187,61 +1413,61 @@ def query_factions(name: str = None, category: str = None, tier: int = None, hol
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of Claim.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-            SELECT Name, Description, Tier, Hold
-            FROM Faction \n"""
+        query = """
+                SELECT Name, Description, Tier, Hold
+                FROM Faction \n"""
 
-    if name is not None:
-        query += "WHERE Name = ?"
+        if name is not None:
+            query += "WHERE Name = ?"
 
-        cursor.execute(query, (name,))
-    else:
-        if category is not None and tier is not None and hold is not None:
-            query += "WHERE Category = ? AND Tier = ? AND hold is ?"
+            cursor.execute(query, (name,))
+        else:
+            if category is not None and tier is not None and hold is not None:
+                query += "WHERE Category = ? AND Tier = ? AND hold is ?"
 
-            cursor.execute(query, (category, tier, hold))
-        elif category is not None and tier is not None:
-            query += "WHERE Category = ? AND Tier = ?"
+                cursor.execute(query, (category, tier, hold))
+            elif category is not None and tier is not None:
+                query += "WHERE Category = ? AND Tier = ?"
 
-            cursor.execute(query, (category, tier))
-        elif tier is not None and hold is not None:
-            query += "WHERE Tier = ? AND hold is ?"
+                cursor.execute(query, (category, tier))
+            elif tier is not None and hold is not None:
+                query += "WHERE Tier = ? AND hold is ?"
 
-            cursor.execute(query, (tier, hold))
-        elif category is not None and hold is not None:
-            query += "WHERE Category = ? AND hold is ?"
+                cursor.execute(query, (tier, hold))
+            elif category is not None and hold is not None:
+                query += "WHERE Category = ? AND hold is ?"
 
-            cursor.execute(query, (category, hold))
-        elif category is not None:
-            query += "WHERE Category = ?"
+                cursor.execute(query, (category, hold))
+            elif category is not None:
+                query += "WHERE Category = ?"
 
-            cursor.execute(query, (category,))
-        elif tier is not None:
-            query += "WHERE Tier = ?"
+                cursor.execute(query, (category,))
+            elif tier is not None:
+                query += "WHERE Tier = ?"
 
-            cursor.execute(query, (tier,))
-        elif hold is not None:
-            query += "WHERE Hold is ?"
+                cursor.execute(query, (tier,))
+            elif hold is not None:
+                query += "WHERE Hold is ?"
 
-            cursor.execute(query, (hold,))
-        else:
-            cursor.execute(query)
+                cursor.execute(query, (hold,))
+            else:
+                cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    factions = []
-    for elem in rows:
-        factions.append({"name": elem[0], "description": elem[1], "tier": elem[2], "hold": elem[3]})
+        factions = []
+        for elem in rows:
+            factions.append({"name": elem[0], "description": elem[1], "tier": elem[2], "hold": elem[3]})
 
-    if not as_dict:
-        for i in range(len(factions)):
-            factions[i].pop("description")
-            factions[i] = Faction(**factions[i])
+        if not as_dict:
+            for i in range(len(factions)):
+                factions[i].pop("description")
+                factions[i] = Faction(**factions[i])
 
-    return factions
+        return factions
 
 
 def query_npc_id(name: str, role: str) -> int:
@@ -1252,15 +1478,15 @@ def query_npc_id(name: str, role: str) -> int:
     :param role: represents the role of the NPC.
     :return: the ID of the NPC.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    cursor.execute("""
-                    SELECT NpcID
-                    FROM NPC
-                    WHERE (Name, Role) = (?, ?)""", (name, role))
+        cursor.execute("""
+                        SELECT NpcID
+                        FROM NPC
+                        WHERE (Name, Role) = (?, ?)""", (name, role))
 
-    return cursor.fetchone()[0]
+        return cursor.fetchone()[0]
 
 
 def query_npcs(npc_id: int = None, name: str = None, role: str = None, faction: str = None, canon: bool = None,
@@ -1278,91 +1504,91 @@ def query_npcs(npc_id: int = None, name: str = None, role: str = None, faction:
     :param as_dict: if True the result objects will be returned as dictionaries.
     :return: a list of NPC or a list of Dictionaries
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
 
-    query = """
-                SELECT Name, Role, Faction, Description
-                FROM NPC \n"""
+        query = """
+                    SELECT Name, Role, Faction, Description
+                    FROM NPC \n"""
 
-    if npc_id is not None:
-        query += "WHERE NpcID = ?"
+        if npc_id is not None:
+            query += "WHERE NpcID = ?"
 
-        cursor.execute(query, (npc_id,))
-    elif name is not None and role is not None and faction is not None and canon is not None:
-        query += "WHERE Name = ? AND Role = ? AND Faction = ? AND Canon is ?"
+            cursor.execute(query, (npc_id,))
+        elif name is not None and role is not None and faction is not None and canon is not None:
+            query += "WHERE Name = ? AND Role = ? AND Faction = ? AND Canon is ?"
 
-        cursor.execute(query, (name, role, faction, canon))
-    elif name is not None and role is not None and faction is not None:
-        query += "WHERE Name = ? AND Role = ? AND Faction = ?"
+            cursor.execute(query, (name, role, faction, canon))
+        elif name is not None and role is not None and faction is not None:
+            query += "WHERE Name = ? AND Role = ? AND Faction = ?"
 
-        cursor.execute(query, (name, role, faction))
-    elif name is not None and role is not None and canon is not None:
-        query += "WHERE Name = ? AND Role = ? AND Canon is ?"
+            cursor.execute(query, (name, role, faction))
+        elif name is not None and role is not None and canon is not None:
+            query += "WHERE Name = ? AND Role = ? AND Canon is ?"
 
-        cursor.execute(query, (name, role, canon))
-    elif name is not None and faction is not None and canon is not None:
-        query += "WHERE Name = ? AND Faction = ? AND Canon is ?"
+            cursor.execute(query, (name, role, canon))
+        elif name is not None and faction is not None and canon is not None:
+            query += "WHERE Name = ? AND Faction = ? AND Canon is ?"
 
-        cursor.execute(query, (name, faction, canon))
-    elif name is not None and role is not None and canon is not None:
-        query += "WHERE Name = ? AND Role = ? AND Canon is ?"
+            cursor.execute(query, (name, faction, canon))
+        elif name is not None and role is not None and canon is not None:
+            query += "WHERE Name = ? AND Role = ? AND Canon is ?"
 
-        cursor.execute(query, (name, role, canon))
-    elif name is not None and role is not None:
-        query += "WHERE Name = ? AND Role = ?"
+            cursor.execute(query, (name, role, canon))
+        elif name is not None and role is not None:
+            query += "WHERE Name = ? AND Role = ?"
 
-        cursor.execute(query, (name, role))
-    elif name is not None and faction is not None:
-        query += "WHERE Name = ? AND Faction = ?"
+            cursor.execute(query, (name, role))
+        elif name is not None and faction is not None:
+            query += "WHERE Name = ? AND Faction = ?"
 
-        cursor.execute(query, (name, faction))
-    elif name is not None and canon is not None:
-        query += "WHERE Name = ? AND Canon = ?"
+            cursor.execute(query, (name, faction))
+        elif name is not None and canon is not None:
+            query += "WHERE Name = ? AND Canon = ?"
 
-        cursor.execute(query, (name, canon))
-    elif role is not None and faction is not None:
-        query += "WHERE Role = ? AND Faction = ?"
+            cursor.execute(query, (name, canon))
+        elif role is not None and faction is not None:
+            query += "WHERE Role = ? AND Faction = ?"
 
-        cursor.execute(query, (role, faction))
-    elif role is not None and canon is not None:
-        query += "WHERE Role = ? AND Canon is ?"
+            cursor.execute(query, (role, faction))
+        elif role is not None and canon is not None:
+            query += "WHERE Role = ? AND Canon is ?"
 
-        cursor.execute(query, (role, canon))
-    elif faction is not None and canon is not None:
-        query += "WHERE Faction = ? AND Canon is ?"
+            cursor.execute(query, (role, canon))
+        elif faction is not None and canon is not None:
+            query += "WHERE Faction = ? AND Canon is ?"
 
-        cursor.execute(query, (faction, canon))
-    elif name is not None:
-        query += "WHERE Name = ?"
+            cursor.execute(query, (faction, canon))
+        elif name is not None:
+            query += "WHERE Name = ?"
 
-        cursor.execute(query, (name, ))
-    elif role is not None:
-        query += "WHERE Role = ?"
+            cursor.execute(query, (name, ))
+        elif role is not None:
+            query += "WHERE Role = ?"
 
-        cursor.execute(query, (role, ))
-    elif faction is not None:
-        query += "WHERE Faction = ?"
+            cursor.execute(query, (role, ))
+        elif faction is not None:
+            query += "WHERE Faction = ?"
 
-        cursor.execute(query, (faction, ))
-    elif canon is not None:
-        query += "WHERE Canon is ?"
+            cursor.execute(query, (faction, ))
+        elif canon is not None:
+            query += "WHERE Canon is ?"
 
-        cursor.execute(query, (canon, ))
-    else:
-        cursor.execute(query)
+            cursor.execute(query, (canon, ))
+        else:
+            cursor.execute(query)
 
-    rows = cursor.fetchall()
+        rows = cursor.fetchall()
 
-    npcs = []
-    for elem in rows:
-        npcs.append({"name": elem[0], "role": elem[1], "faction": elem[2], "description": elem[3]})
+        npcs = []
+        for elem in rows:
+            npcs.append({"name": elem[0], "role": elem[1], "faction": elem[2], "description": elem[3]})
 
-    if not as_dict:
-        for i in range(len(npcs)):
-            npcs[i] = NPC(**npcs[i])
+        if not as_dict:
+            for i in range(len(npcs)):
+                npcs[i] = NPC(**npcs[i])
 
-    return npcs
+        return npcs
 
 
 def query_codex() -> Dict[str, List[Tuple]]:
@@ -1371,144 +1597,174 @@ def query_codex() -> Dict[str, List[Tuple]]:
 
     :return: a dict containing all the information
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    # NPCs, Factions
-    info = {
-        "FACTIONS": [("Name", "Description", "Category", "Tier", "Hold")],
-        "NPCs": [("Name", "Role", "Faction", "Description")],
-        "ACTIONS": [("Name", "Description", "Attribute")],
-        "TRAUMAS": [("Name", "Description", "Character")],
-        "VICES": [("Name", "Character", "Description")],
-        "HUNTING GROUNDS": [("Name", "Description")],
-        "ITEMS": [("Name", "Description", "Weight", "Usages")],
-        "UPGRADES": [("Name", "Description", "Maximum Quality", "Group")],
-        "CLAIMS": [("Name", "Description", "Prison")],
-        "SPECIAL ABILITIES": [("Name", "Description")],
-        "STRICTURES": [("Name", "Description")],
-        "FRAME FEATURES": [("Name", "Description")],
-        "CHARACTER SHEETS": [("Name", "Description", "Spirit")],
-        "CHARACTER ACTIONS": [("Character", "Action", "Amount")],
-        "CHARACTER FRIENDS": [("Character", "Friend")],
-        "CHARACTER ITEMS": [("Character", "Item")],
-        "CHARACTER SPECIAL ABILITIES": [("Character", "Special Ability", "Peculiar of the class")],
-        "CHARACTER XP TRIGGERS": [("Character", "Xp Trigger", "Peculiar of the class")],
-        "CREW SHEETS": [("Name", "Description")],
-        "CREW CONTACTS": [("Crew", "Contact")],
-        "CREW HUNTING GROUNDS": [("Crew", "Name")],
-        "CREW SPECIAL ABILITIES": [("Crew", "Special Ability", "Peculiar of the class")],
-        "CREW STARTING UPGRADES": ["Crew", "Upgrade", "Initial Quality"],
-        "CREW UPGRADES": ["Crew", "Upgrade"],
-        "CREW STARTING COHORTS": [("Crew", "Cohort")],
-        "CREW XP TRIGGERS": [("Crew", "Xp Trigger", "Peculiar of the class")]
-    }
-
-    query = "SELECT Type, Description FROM CrewSheet"
-    cursor.execute(query)
-    info["CREW SHEETS"] += cursor.fetchall()
-
-    query = "SELECT Class, Description, Spirit FROM CharacterSheet"
-    cursor.execute(query)
-    info["CHARACTER SHEETS"] += cursor.fetchall()
-
-    query = "SELECT Name, Role, Faction, Description FROM NPC"
-    cursor.execute(query)
-    info["NPCs"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, Category, Tier, Hold FROM Faction"
-    cursor.execute(query)
-    info["FACTIONS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, Attribute FROM Action"
-    cursor.execute(query)
-    info["ACTIONS"] += cursor.fetchall()
-
-    query = "SELECT Character, Action, Dots FROM Char_Action"
-    cursor.execute(query)
-    info["CHARACTER ACTIONS"] += cursor.fetchall()
-
-    query = "SELECT Character, Name FROM NPC JOIN Char_Friend ON NpcID = NPC"
-    cursor.execute(query)
-    info["CHARACTER FRIENDS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, Weight, Usages FROM Item"
-    cursor.execute(query)
-    info["ITEMS"] += cursor.fetchall()
-
-    query = "SELECT Character, Item FROM Char_Item"
-    cursor.execute(query)
-    info["CHARACTER ITEMS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, Prison FROM Claim"
-    cursor.execute(query)
-    info["CLAIMS"] += cursor.fetchall()
-
-    query = "SELECT Crew, Name FROM NPC JOIN Crew_Contact ON NpcID = NPC"
-    cursor.execute(query)
-    info["CREW CONTACTS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description FROM HuntingGround"
-    cursor.execute(query)
-    info["HUNTING GROUNDS"] += cursor.fetchall()
-
-    query = "SELECT Crew, HuntingGround FROM Crew_HG"
-    cursor.execute(query)
-    info["CREW HUNTING GROUNDS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, Class FROM Trauma"
-    cursor.execute(query)
-    info["TRAUMAS"] += cursor.fetchall()
-
-    query = "SELECT Name, Description, TotQuality, 'Group' FROM Upgrade"
-    cursor.execute(query)
-    info["UPGRADES"] += cursor.fetchall()
-
-    query = "SELECT Name, Class, Description FROM Vice"
-    cursor.execute(query)
-    info["VICES"] += cursor.fetchall()
-
-    query = "SELECT Name, Description FROM SpecialAbility"
-    cursor.execute(query)
-    info["SPECIAL ABILITIES"] += cursor.fetchall()
-
-    query = "SELECT Name, Description FROM SpecialAbility WHERE Stricture is true"
-    cursor.execute(query)
-    info["STRICTURES"] += cursor.fetchall()
-
-    query = "SELECT Name, Description FROM SpecialAbility WHERE FrameFeature != 'N'"
-    cursor.execute(query)
-    info["FRAME FEATURES"] += cursor.fetchall()
-
-    query = """SELECT C.Character, C.SpecialAbility, C.Peculiar 
-               FROM Char_SA C JOIN SpecialAbility S on  C.SpecialAbility = S.Name
-               WHERE S.Name NOT IN (
-               SELECT Name FROM SpecialAbility WHERE FrameFeature != 'N' AND Stricture is true)"""
-    cursor.execute(query)
-    info["CHARACTER SPECIAL ABILITIES"] += cursor.fetchall()
-
-    query = "SELECT Crew, SpecialAbility, Peculiar FROM Crew_SA"
-    cursor.execute(query)
-    info["CREW SPECIAL ABILITIES"] += cursor.fetchall()
-
-    query = "SELECT Crew, Upgrade, Quality FROM Crew_StartingUpgrade"
-    cursor.execute(query)
-    info["CREW STARTING UPGRADES"] += cursor.fetchall()
-
-    query = "SELECT Crew, Upgrade FROM Crew_Upgrade"
-    cursor.execute(query)
-    info["CREW UPGRADES"] += cursor.fetchall()
-
-    query = "SELECT Crew, Type FROM Starting_Cohort"
-    cursor.execute(query)
-    info["CREW STARTING COHORTS"] += cursor.fetchall()
+    with connect() as connection:
+        cursor = reference_cursor(connection)
+
+        # NPCs, Factions
+        info = {
+            "FACTIONS": [("Name", "Description", "Category", "Tier", "Hold")],
+            "NPCs": [("Name", "Role", "Faction", "Description")],
+            "ACTIONS": [("Name", "Description", "Attribute")],
+            "TRAUMAS": [("Name", "Description", "Character")],
+            "VICES": [("Name", "Character", "Description")],
+            "HUNTING GROUNDS": [("Name", "Description")],
+            "ITEMS": [("Name", "Description", "Weight", "Usages")],
+            "UPGRADES": [("Name", "Description", "Maximum Quality", "Group")],
+            "CLAIMS": [("Name", "Description", "Prison")],
+            "SPECIAL ABILITIES": [("Name", "Description")],
+            "STRICTURES": [("Name", "Description")],
+            "FRAME FEATURES": [("Name", "Description")],
+            "CHARACTER SHEETS": [("Name", "Description", "Spirit")],
+            "CHARACTER ACTIONS": [("Character", "Action", "Amount")],
+            "CHARACTER FRIENDS": [("Character", "Friend")],
+            "CHARACTER ITEMS": [("Character", "Item")],
+            "CHARACTER SPECIAL ABILITIES": [("Character", "Special Ability", "Peculiar of the class")],
+            "CHARACTER XP TRIGGERS": [("Character", "Xp Trigger", "Peculiar of the class")],
+            "CREW SHEETS": [("Name", "Description")],
+            "CREW CONTACTS": [("Crew", "Contact")],
+            "CREW HUNTING GROUNDS": [("Crew", "Name")],
+            "CREW SPECIAL ABILITIES": [("Crew", "Special Ability", "Peculiar of the class")],
+            "CREW STARTING UPGRADES": ["Crew", "Upgrade", "Initial Quality"],
+            "CREW UPGRADES": ["Crew", "Upgrade"],
+            "CREW STARTING COHORTS": [("Crew", "Cohort")],
+            "CREW XP TRIGGERS": [("Crew", "Xp Trigger", "Peculiar of the class")]
+        }
+
+        query = "SELECT Type, Description FROM CrewSheet"
+        cursor.execute(query)
+        info["CREW SHEETS"] += cursor.fetchall()
+
+        query = "SELECT Class, Description, Spirit FROM CharacterSheet"
+        cursor.execute(query)
+        info["CHARACTER SHEETS"] += cursor.fetchall()
+
+        query = "SELECT Name, Role, Faction, Description FROM NPC"
+        cursor.execute(query)
+        info["NPCs"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, Category, Tier, Hold FROM Faction"
+        cursor.execute(query)
+        info["FACTIONS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, Attribute FROM Action"
+        cursor.execute(query)
+        info["ACTIONS"] += cursor.fetchall()
+
+        query = "SELECT Character, Action, Dots FROM Char_Action"
+        cursor.execute(query)
+        info["CHARACTER ACTIONS"] += cursor.fetchall()
+
+        query = "SELECT Character, Name FROM NPC JOIN Char_Friend ON NpcID = NPC"
+        cursor.execute(query)
+        info["CHARACTER FRIENDS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, Weight, Usages FROM Item"
+        cursor.execute(query)
+        info["ITEMS"] += cursor.fetchall()
+
+        query = "SELECT Character, Item FROM Char_Item"
+        cursor.execute(query)
+        info["CHARACTER ITEMS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, Prison FROM Claim"
+        cursor.execute(query)
+        info["CLAIMS"] += cursor.fetchall()
+
+        query = "SELECT Crew, Name FROM NPC JOIN Crew_Contact ON NpcID = NPC"
+        cursor.execute(query)
+        info["CREW CONTACTS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description FROM HuntingGround"
+        cursor.execute(query)
+        info["HUNTING GROUNDS"] += cursor.fetchall()
+
+        query = "SELECT Crew, HuntingGround FROM Crew_HG"
+        cursor.execute(query)
+        info["CREW HUNTING GROUNDS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, Class FROM Trauma"
+        cursor.execute(query)
+        info["TRAUMAS"] += cursor.fetchall()
+
+        query = "SELECT Name, Description, TotQuality, 'Group' FROM Upgrade"
+        cursor.execute(query)
+        info["UPGRADES"] += cursor.fetchall()
+
+        query = "SELECT Name, Class, Description FROM Vice"
+        cursor.execute(query)
+        info["VICES"] += cursor.fetchall()
+
+        query = "SELECT Name, Description FROM SpecialAbility"
+        cursor.execute(query)
+        info["SPECIAL ABILITIES"] += cursor.fetchall()
+
+        query = "SELECT Name, Description FROM SpecialAbility WHERE Stricture is true"
+        cursor.execute(query)
+        info["STRICTURES"] += cursor.fetchall()
+
+        query = "SELECT Name, Description FROM SpecialAbility WHERE FrameFeature != 'N'"
+        cursor.execute(query)
+        info["FRAME FEATURES"] += cursor.fetchall()
+
+        query = """SELECT C.Character, C.SpecialAbility, C.Peculiar 
+                   FROM Char_SA C JOIN SpecialAbility S on  C.SpecialAbility = S.Name
+                   WHERE S.Name NOT IN (
+                   SELECT Name FROM SpecialAbility WHERE FrameFeature != 'N' AND Stricture is true)"""
+        cursor.execute(query)
+        info["CHARACTER SPECIAL ABILITIES"] += cursor.fetchall()
+
+        query = "SELECT Crew, SpecialAbility, Peculiar FROM Crew_SA"
+        cursor.execute(query)
+        info["CREW SPECIAL ABILITIES"] += cursor.fetchall()
+
+        query = "SELECT Crew, Upgrade, Quality FROM Crew_StartingUpgrade"
+        cursor.execute(query)
+        info["CREW STARTING UPGRADES"] += cursor.fetchall()
+
+        query = "SELECT Crew, Upgrade FROM Crew_Upgrade"
+        cursor.execute(query)
+        info["CREW UPGRADES"] += cursor.fetchall()
+
+        query = "SELECT Crew, Type FROM Starting_Cohort"
+        cursor.execute(query)
+        info["CREW STARTING COHORTS"] += cursor.fetchall()
+
+        query = "SELECT Character, Description, Peculiar FROM Char_Xp NATURAL JOIN XpTrigger"
+        cursor.execute(query)
+        info["CHARACTER XP TRIGGERS"] += cursor.fetchall()
+
+        query = "SELECT Crew, Description, Peculiar FROM Crew_Xp NATURAL JOIN XpTrigger"
+        cursor.execute(query)
+        info["CREW XP TRIGGERS"] += cursor.fetchall()
+
+        return info
+
+
+def query_storage_report() -> Dict[str, Dict[str, int]]:
+    """
+    Measures the space taken by the columns stored through the storage codec.
 
-    query = "SELECT Character, Description, Peculiar FROM Char_Xp NATURAL JOIN XpTrigger"
-    cursor.execute(query)
-    info["CHARACTER XP TRIGGERS"] += cursor.fetchall()
+    :return: a dictionary where the keys are "<table>.<column>" and the values are dictionaries with the keys "rows"
+        (the non-NULL values), "compressed" (the compressed values), "stored" (bytes taken in the database), "raw"
+        (bytes the values would take uncompressed) and "saved" (the difference between raw and stored).
+    """
+    report = {}
+    with connect() as connection:
+        cursor = connection.cursor()
 
-    query = "SELECT Crew, Description, Peculiar FROM Crew_Xp NATURAL JOIN XpTrigger"
-    cursor.execute(query)
-    info["CREW XP TRIGGERS"] += cursor.fetchall()
+        for table, columns in CODEC_COLUMNS.items():
+            for column in columns:
+                cursor.execute("""
+                SELECT {0}
+                FROM {1}
+                WHERE {0} IS NOT NULL""".format(column, table))
 
-    return info
+                entry = {"rows": 0, "compressed": 0, "stored": 0, "raw": 0}
+                for (value,) in cursor:
+                    entry["rows"] += 1
+                    entry["compressed"] += isinstance(value, bytes)
+                    entry["stored"] += stored_size(value)
+                    entry["raw"] += stored_size(codec.decode(value))
+                entry["saved"] = entry["raw"] - entry["stored"]
+                report["{}.{}".format(table, column)] = entry
+    return report
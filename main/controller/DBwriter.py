@@ -1,4 +1,5 @@
 from sqlite3 import DatabaseError
+from typing import List
 
 from controller.DBmanager import *
 
@@ -14,53 +15,96 @@ def insert_game(game_id: int, game_title: str, tel_chat_id: int) -> bool:
     """
     if isinstance(game_id, int) and isinstance(game_title, str) and isinstance(tel_chat_id, int):
 
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO Game (Game_ID, Title, Tel_Chat_ID)
-            VALUES (?, ?, ?)
-            """, (game_id, game_title, tel_chat_id))
+            try:
+                cursor.execute("""
+                INSERT INTO Game (Game_ID, Title, Tel_Chat_ID)
+                VALUES (?, ?, ?)
+                """, (game_id, game_title, tel_chat_id))
 
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
-def insert_crew_json(game_id: int, crew_json: str) -> bool:
+GAME_COLUMNS = {
+    "crew_json": ("Crew_JSON", is_json),
+    "crafted_item_json": ("Crafted_Item_JSON", is_json),
+    "npc_json": ("NPC_JSON", is_json),
+    "faction_json": ("Faction_JSON", is_json),
+    "score_json": ("Score_JSON", is_json),
+    "clock_json": ("Clock_JSON", is_json),
+    "journal": ("Journal", lambda value: isinstance(value, str)),
+    "journal_anchor_json": ("Journal_Anchor_JSON", lambda value: value is None or is_json(value)),
+    "state": ("State", lambda value: isinstance(value, int)),
+    "lang": ("Language", lambda value: isinstance(value, str)),
+    "snapshot": ("Snapshot", lambda value: value is None or isinstance(value, bytes))
+}
+
+
+def update_game_columns(game_id: int, **columns) -> bool:
     """
-    Insert json string in Crew_JSON attribute in Game table in BladesInTheDark Database
+    Updates any subset of the columns of a game in the Game table in BladesInTheDark Database with a single statement.
+    The accepted keywords are the keys of GAME_COLUMNS: crew_json, crafted_item_json, npc_json, faction_json,
+    score_json and clock_json must be json strings, journal and lang strings, state an int, journal_anchor_json a json
+    string or None and snapshot bytes or None.
+    The json strings and the journal are stored through the storage codec.
 
     :param game_id: int representing the identifier of the game
-    :param crew_json: string representing json string
-    :return: True if the json string is added, False otherwise
+    :param columns: the new values of the columns to update
+    :return: True if all the columns have been updated, False if any value is not valid or the game does not exist
     """
-    if isinstance(game_id, int) and is_json(crew_json):
+    if not isinstance(game_id, int) or not columns:
+        return False
+    for keyword, value in columns.items():
+        if keyword not in GAME_COLUMNS or not GAME_COLUMNS[keyword][1](value):
+            return False
+    values = {}
+    for keyword, value in columns.items():
+        column = GAME_COLUMNS[keyword][0]
+        values[column] = codec.encode(value) if column in CODEC_COLUMNS["Game"] else value
 
-        connection = establish_connection()
+    with connect() as connection:
         cursor = connection.cursor()
 
         try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
+            if write_behind.enabled:
+                if not exists_game(game_id):
+                    raise DatabaseError("Wrong game selected")
+                for column, value in values.items():
+                    defer_write(game_id, column, value)
+                return True
 
             cursor.execute("""
             UPDATE Game
-            SET Crew_JSON = ?
-            WHERE Game_ID = ?
-            """, (crew_json, game_id))
+            SET {}
+            WHERE Game_ID = ?""".format(", ".join("{} = ?".format(column) for column in values)),
+                           (*values.values(), game_id))
 
-            connection.commit()
+            if cursor.rowcount != 1:
+                raise DatabaseError("Wrong game selected")
+
+            commit(connection)
         except DatabaseError:
-            traceback.print_exc()
+            write_failed()
             return False
         return True
-    return False
+
+
+def insert_crew_json(game_id: int, crew_json: str) -> bool:
+    """
+    Insert json string in Crew_JSON attribute in Game table in BladesInTheDark Database
+
+    :param game_id: int representing the identifier of the game
+    :param crew_json: string representing json string
+    :return: True if the json string is added, False otherwise
+    """
+    return update_game_columns(game_id, crew_json=crew_json)
 
 
 def insert_crafted_item_json(game_id: int, crafted_item_json: str) -> bool:
@@ -71,28 +115,7 @@ def insert_crafted_item_json(game_id: int, crafted_item_json: str) -> bool:
     :param crafted_item_json: string representing json string
     :return: True if the json string is added, False otherwise
     """
-    if isinstance(game_id, int) and is_json(crafted_item_json):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET Crafted_Item_JSON = ?
-            WHERE Game_ID = ?
-            """, (crafted_item_json, game_id))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, crafted_item_json=crafted_item_json)
 
 
 def insert_npc_json(game_id: int, npc_json: str) -> bool:
@@ -103,28 +126,7 @@ def insert_npc_json(game_id: int, npc_json: str) -> bool:
     :param npc_json: string representing json string
     :return: True if the json string is added, False otherwise
     """
-    if isinstance(game_id, int) and is_json(npc_json):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET NPC_JSON = ?
-            WHERE Game_ID = ?
-            """, (npc_json, game_id))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, npc_json=npc_json)
 
 
 def insert_faction_json(game_id: int, faction_json: str) -> bool:
@@ -135,28 +137,7 @@ def insert_faction_json(game_id: int, faction_json: str) -> bool:
     :param faction_json: string representing json string
     :return: True if the json string is added, False otherwise
     """
-    if isinstance(game_id, int) and is_json(faction_json):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET Faction_JSON = ?
-            WHERE Game_ID = ?
-            """, (faction_json, game_id))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, faction_json=faction_json)
 
 
 def insert_score_json(game_id: int, score_json: str) -> bool:
@@ -167,27 +148,7 @@ def insert_score_json(game_id: int, score_json: str) -> bool:
     :param score_json: string representing json string
     :return: True if the json string is added, False otherwise
     """
-    if isinstance(game_id, int) and is_json(score_json):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET Score_JSON = ?
-            WHERE Game_ID = ?
-            """, (score_json, game_id))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, score_json=score_json)
 
 
 def insert_clock_json(game_id: int, clock_json: str) -> bool:
@@ -198,28 +159,7 @@ def insert_clock_json(game_id: int, clock_json: str) -> bool:
     :param clock_json: string representing json string
     :return: True if the json string is added, False otherwise
     """
-    if isinstance(game_id, int) and is_json(clock_json):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET Clock_JSON = ?
-            WHERE Game_ID = ?
-            """, (clock_json, game_id))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, clock_json=clock_json)
 
 
 def insert_journal(game_id: int, journal: str) -> bool:
@@ -230,60 +170,101 @@ def insert_journal(game_id: int, journal: str) -> bool:
     :param journal: string representing the journal
     :return: True if the journal has been added, False otherwise
     """
-    if isinstance(game_id, int) and isinstance(journal, str):
+    return update_game_columns(game_id, journal=journal)
 
-        connection = establish_connection()
-        cursor = connection.cursor()
 
-        try:
+def insert_journal_entries(game_id: int, entries: List[dict]) -> bool:
+    """
+    Appends the passed entries to the journal of the game in Journal_Entry table in BladesInTheDark Database.
+    An entry that cannot be encoded is printed and skipped, so it does not prevent the others from being stored.
 
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
+    :param game_id: int representing the identifier of the game
+    :param entries: the entries recorded by the Journal, dictionaries with the keys "method", "args" (json
+        serializable), "language", "indentation", "phase" and "score"
+    :return: True if the valid entries have been added, False otherwise
+    """
+    if not isinstance(game_id, int) or not isinstance(entries, list):
+        return False
+    rows = []
+    for entry in entries:
+        try:
+            rows.append((game_id, entry["method"], json.dumps(entry["args"]), entry["language"], entry["indentation"],
+                         entry.get("phase"), entry.get("score")))
+        except (KeyError, TypeError, ValueError):
+            traceback.print_exc()
+    with connect() as connection:
+        cursor = connection.cursor()
 
-            cursor.execute("""
-            UPDATE Game
-            SET Journal = ?
-            WHERE Game_ID = ?
-            """, (journal, game_id))
+        try:
+            cursor.executemany("""
+            INSERT INTO Journal_Entry (Game_ID, Method, Args_JSON, Language, Indentation, Phase, Score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""", rows)
 
-            connection.commit()
+            commit(connection)
         except DatabaseError:
-            traceback.print_exc()
+            write_failed()
             return False
         return True
-    return False
 
 
-def insert_state(game_id: int, state: int) -> bool:
+def compact_journal(game_id: int, journal: str, anchor_json: str = None, entries: int = None) -> bool:
     """
-    Insert the current state inside Game table in BladesInTheDark Database.
+    Replaces the entries of the journal of the game with its html, rendered from them, in Game table in
+    BladesInTheDark Database: the Journal and Journal_Anchor_JSON columns are updated and the entries are deleted with
+    a single commit.
+    Only the first entries, the ones the html has been rendered from, are deleted: the entries appended meanwhile are
+    kept, so they are replayed on the html at the next load.
+    The write bypasses the write-behind queue, so the entries are never deleted before the html is stored.
 
     :param game_id: int representing the identifier of the game
-    :param state: int representing the current state
-    :return: True if the state has been added, False otherwise
-    """
-    if isinstance(game_id, int) and isinstance(state, int):
-
-        connection = establish_connection()
+    :param journal: string representing the html of the journal
+    :param anchor_json: json string of the position of the current score in the html (see Journal.get_anchor()),
+        None if it is unknown
+    :param entries: the number of entries the html has been rendered from; if it is None all the entries are deleted
+    :return: True if the journal has been compacted, False otherwise
+    """
+    if not isinstance(game_id, int) or not isinstance(journal, str) or \
+            (anchor_json is not None and not is_json(anchor_json)) or \
+            (entries is not None and (not isinstance(entries, int) or entries < 0)):
+        return False
+    with connect() as connection:
         cursor = connection.cursor()
 
         try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
             cursor.execute("""
             UPDATE Game
-            SET State = ?
-            WHERE Game_ID = ?""", (state, game_id))
-
-            connection.commit()
-
+            SET Journal = ?, Journal_Anchor_JSON = ?
+            WHERE Game_ID = ?""", (codec.encode(journal), anchor_json, game_id))
+            if cursor.rowcount != 1:
+                raise DatabaseError("Wrong game selected")
+            cursor.execute("""
+            DELETE FROM Journal_Entry
+            WHERE Entry_ID IN (
+                SELECT Entry_ID
+                FROM Journal_Entry
+                WHERE Game_ID = ?
+                ORDER BY Entry_ID
+                LIMIT ?)""", (game_id, -1 if entries is None else entries))
+
+            commit(connection)
         except DatabaseError:
-            traceback.print_exc()
+            # the update must not be committed without the deletion of the entries
+            if not in_transaction():
+                connection.rollback()
+            write_failed()
             return False
         return True
-    return False
+
+
+def insert_state(game_id: int, state: int) -> bool:
+    """
+    Insert the current state inside Game table in BladesInTheDark Database.
+
+    :param game_id: int representing the identifier of the game
+    :param state: int representing the current state
+    :return: True if the state has been added, False otherwise
+    """
+    return update_game_columns(game_id, state=state)
 
 
 def insert_lang(game_id: int, lang: str = "ENG.json") -> bool:
@@ -294,29 +275,7 @@ def insert_lang(game_id: int, lang: str = "ENG.json") -> bool:
     :param lang: str representing the language
     :return: True if the language has been added, False otherwise
     """
-    if isinstance(game_id, int) and isinstance(lang, str):
-
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-
-            if not exists_game(game_id):
-                raise DatabaseError("Wrong game selected")
-
-            cursor.execute("""
-            UPDATE Game
-            SET Language = ?
-            WHERE Game_ID = ?
-            """, (lang, game_id))
-
-            connection.commit()
-
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
-    return False
+    return update_game_columns(game_id, lang=lang)
 
 
 def insert_user(user_id: int, name: str) -> bool:
@@ -329,58 +288,63 @@ def insert_user(user_id: int, name: str) -> bool:
     """
     if isinstance(user_id, int) and isinstance(name, str):
 
-        connection = establish_connection()
-        cursor = connection.cursor()
-        try:
-            cursor.execute("""
-            INSERT INTO User
-            VALUES (?, ?)
-            ON CONFLICT (Tel_ID)
-            DO UPDATE SET name = ?
-            """, (user_id, name, name))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+        with connect() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("""
+                INSERT INTO User
+                VALUES (?, ?)
+                ON CONFLICT (Tel_ID)
+                DO UPDATE SET name = ?
+                """, (user_id, name, name))
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
 def insert_user_game(user_id: int, game_id: int, char_json: str = None, master: bool = False) -> bool:
     """
-    Insert a new row in User_Game table in BladesInTheDark Database.
+    Insert a new row in User_Game table in BladesInTheDark Database. If the row is already present its Master flag is
+    updated.
 
     :param user_id: int representing the id of the player
     :param game_id: int representing the id of the game
-    :param char_json: string representing json string
+    :param char_json: json string with the list of the user's PCs, that replace the stored ones;
+        if it is None the stored PCs are left untouched.
     :param master: bool representing if the player is master or not
     :return: True if the row has been added, False otherwise
     """
     if isinstance(user_id, int) and isinstance(game_id, int) and (char_json is None or is_json(char_json)) \
             and isinstance(master, int) and (master == 0 or master == 1):
-        connection = establish_connection()
-        cursor = connection.cursor()
-
-        try:
-            cursor.execute("""
-                        INSERT INTO User_Game
-                        VALUES (?, ?, ?, ?)
-                        ON CONFLICT (User_ID, Game_ID) DO 
-                        UPDATE SET (Char_JSON, Master) = (?, ?)""",
-                           (user_id, game_id, char_json, master, char_json, master))
-
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+        with connect() as connection:
+            cursor = connection.cursor()
+
+            try:
+                cursor.execute("""
+                            INSERT INTO User_Game (User_ID, Game_ID, Master)
+                            VALUES (?, ?, ?)
+                            ON CONFLICT (User_ID, Game_ID) DO 
+                            UPDATE SET Master = ?""",
+                               (user_id, game_id, master, master))
+                if char_json is not None:
+                    replace_characters(user_id, game_id, char_json, connection)
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
 def update_user_characters(user_id: int, game_id: int, char_json: str = None) -> bool:
     """
-    Updates the Char_JSON of the specified user in the specified game in User_Game table in DB.
+    Replaces all the PCs of the specified user in the specified game in PC table in DB.
+    The replaced PCs get new Char_IDs: use update_character() to save a single PC.
 
     :param user_id: int representing the id of the player.
     :param game_id: int representing the id of the game.
@@ -388,20 +352,112 @@ def update_user_characters(user_id: int, game_id: int, char_json: str = None) ->
     :return: True if the update is successful, false otherwise.
     """
     if isinstance(user_id, int) and isinstance(game_id, int) and (char_json is None or is_json(char_json)):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            try:
+                replace_characters(user_id, game_id, char_json, connection)
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
+    return False
 
-        try:
-            cursor.execute("""
-            UPDATE User_Game
-            SET Char_JSON = ?
-            WHERE User_ID = ? AND Game_ID = ?""", (char_json, user_id, game_id))
 
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+def replace_characters(user_id: int, game_id: int, char_json: Optional[str], connection: Connection) -> None:
+    """
+    Deletes the PCs of the specified user in the specified game and inserts the passed ones, without committing.
+
+    :param user_id: int representing the id of the player.
+    :param game_id: int representing the id of the game.
+    :param char_json: json string with the list of the PCs (a single json object is considered as one PC).
+    :param connection: connection used to execute the queries.
+    """
+    characters = [] if char_json is None else json.loads(char_json)
+    if isinstance(characters, dict):
+        characters = [characters]
+
+    cursor = connection.cursor()
+    cursor.execute("""
+    DELETE FROM PC
+    WHERE User_ID = ? AND Game_ID = ?""", (user_id, game_id))
+    cursor.executemany("""
+    INSERT INTO PC (User_ID, Game_ID, Char_JSON)
+    VALUES (?, ?, ?)""", [(user_id, game_id, codec.encode(json.dumps(character))) for character in characters])
+
+
+def insert_character(user_id: int, game_id: int, char_json: str) -> Optional[int]:
+    """
+    Insert a new PC of the specified user in the specified game in PC table in BladesInTheDark Database.
+
+    :param user_id: int representing the id of the player.
+    :param game_id: int representing the id of the game.
+    :param char_json: json string of the PC.
+    :return: the Char_ID of the new PC, None if it has not been added.
+    """
+    if isinstance(user_id, int) and isinstance(game_id, int) and isinstance(char_json, str) and is_json(char_json):
+        with connect() as connection:
+            cursor = connection.cursor()
+
+            try:
+                cursor.execute("""
+                INSERT INTO PC (User_ID, Game_ID, Char_JSON)
+                VALUES (?, ?, ?)""", (user_id, game_id, codec.encode(char_json)))
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return None
+            return cursor.lastrowid
+    return None
+
+
+def update_character(char_id: int, char_json: str) -> bool:
+    """
+    Updates the json of the specified PC in PC table in DB.
+
+    :param char_id: int representing the id of the PC.
+    :param char_json: json string of the PC.
+    :return: True if the PC has been updated, False otherwise.
+    """
+    if isinstance(char_id, int) and isinstance(char_json, str) and is_json(char_json):
+        with connect() as connection:
+            cursor = connection.cursor()
+
+            try:
+                cursor.execute("""
+                UPDATE PC
+                SET Char_JSON = ?
+                WHERE Char_ID = ?""", (codec.encode(char_json), char_id))
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return cursor.rowcount == 1
+    return False
+
+
+def delete_character(char_id: int) -> bool:
+    """
+    Deletes the specified PC from PC table in DB.
+
+    :param char_id: int representing the id of the PC.
+    :return: True if the PC has been deleted, False otherwise.
+    """
+    if isinstance(char_id, int):
+        with connect() as connection:
+            cursor = connection.cursor()
+
+            try:
+                cursor.execute("""
+                DELETE FROM PC WHERE Char_ID = ?""", (char_id,))
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return cursor.rowcount == 1
     return False
 
 
@@ -421,6 +477,9 @@ def insert_character_sheet(char_class: str, description: str, connection: Connec
             cursor.execute("""
             INSERT INTO CharacterSheet (Class, Description)
             VALUES (?, ?)""", (char_class, description))
+            # inside a transaction the cached rows are dropped when it commits; outside it the caller, which commits
+            # the connection, drops them again afterwards
+            after_commit(lambda: reference_cache.invalidate("CharacterSheet"))
 
         except DatabaseError:
             traceback.print_exc()
@@ -440,20 +499,22 @@ def insert_claim(name: str, description: str, prison: bool) -> bool:
     """
     if isinstance(name, str) and isinstance(description, str) and isinstance(prison, int) \
             and (prison == 0 or prison == 1):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO Claim (Name, Description, Prison)
-            VALUES (?, ?, ?)""", (name, description, prison))
+            try:
+                cursor.execute("""
+                INSERT INTO Claim (Name, Description, Prison)
+                VALUES (?, ?, ?)""", (name, description, prison))
 
-            connection.commit()
+                commit(connection)
 
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                after_commit(lambda: reference_cache.invalidate("Claim"))
+
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -473,6 +534,9 @@ def insert_crew_sheet(crew_type: str, description: str, connection: Connection)
             cursor.execute("""
             INSERT INTO CrewSheet (Type, Description)
             VALUES (?, ?)""", (crew_type, description))
+            # inside a transaction the cached rows are dropped when it commits; outside it the caller, which commits
+            # the connection, drops them again afterwards
+            after_commit(lambda: reference_cache.invalidate("CrewSheet"))
 
         except DatabaseError:
             traceback.print_exc()
@@ -490,20 +554,22 @@ def insert_hunting_ground(name: str, description: str) -> bool:
     :return: True if the hunting ground is added, False otherwise
     """
     if isinstance(name, str) and isinstance(description, str):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO HuntingGround (Name, Description)
-            VALUES (?, ?)""", (name, description))
+            try:
+                cursor.execute("""
+                INSERT INTO HuntingGround (Name, Description)
+                VALUES (?, ?)""", (name, description))
 
-            connection.commit()
+                commit(connection)
 
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                after_commit(lambda: reference_cache.invalidate("HuntingGround"))
+
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -518,20 +584,22 @@ def insert_item(name: str, description: str, weight: int, usages: int):
     :return: True if the item is added, False otherwise
     """
     if isinstance(name, str) and isinstance(description, str) and isinstance(weight, int) and isinstance(usages, int):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO Item (Name, Description, Weight, Usages)
-            VALUES (?, ?, ?, ?)""", (name, description, weight, usages))
+            try:
+                cursor.execute("""
+                INSERT INTO Item (Name, Description, Weight, Usages)
+                VALUES (?, ?, ?, ?)""", (name, description, weight, usages))
 
-            connection.commit()
+                commit(connection)
 
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                after_commit(lambda: reference_cache.invalidate("Item"))
+
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -546,20 +614,22 @@ def insert_npc(name: str, role: str, faction: str, description: str) -> bool:
     :return: True if the npc is added, False otherwise
     """
     if isinstance(name, str) and isinstance(role, str) and isinstance(faction, str) and isinstance(description, str):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO NPC (Name, Role, Faction, Description)
-            VALUES (?, ?, ?, ?)""", (name, role, faction, description))
+            try:
+                cursor.execute("""
+                INSERT INTO NPC (Name, Role, Faction, Description)
+                VALUES (?, ?, ?, ?)""", (name, role, faction, description))
 
-            connection.commit()
+                commit(connection)
 
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                after_commit(lambda: reference_cache.invalidate("NPC"))
+
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -572,19 +642,21 @@ def insert_special_ability(name: str, description: str) -> bool:
     :return: True if the special ability is added, False otherwise
     """
     if isinstance(name, str) and isinstance(description, str):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO SpecialAbility (Name, Description)
-            VALUES (?, ?)""", (name, description))
+            try:
+                cursor.execute("""
+                INSERT INTO SpecialAbility (Name, Description)
+                VALUES (?, ?)""", (name, description))
 
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                commit(connection)
+
+                after_commit(lambda: reference_cache.invalidate("SpecialAbility"))
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -598,19 +670,21 @@ def insert_upgrade(name: str, quality: int, description: str) -> bool:
     :return: True if the upgrade is added, False otherwise
     """
     if isinstance(name, str) and isinstance(quality, int) and isinstance(description, str):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO Upgrade (Name, TotQuality, Description)
-            VALUES (?, ?, ?)""", (name, quality, description))
+            try:
+                cursor.execute("""
+                INSERT INTO Upgrade (Name, TotQuality, Description)
+                VALUES (?, ?, ?)""", (name, quality, description))
 
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                commit(connection)
+
+                after_commit(lambda: reference_cache.invalidate("Upgrade"))
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -623,19 +697,21 @@ def insert_xp_trigger(description: str, crew_char: bool) -> bool:
     :return: True if the xp trigger is added, False otherwise
     """
     if isinstance(description, str) and isinstance(crew_char, int) and (crew_char == 0 or crew_char == 1):
-        connection = establish_connection()
-        cursor = connection.cursor()
+        with connect() as connection:
+            cursor = connection.cursor()
 
-        try:
-            cursor.execute("""
-            INSERT INTO XpTrigger (Description, Crew_Char)
-            VALUES (?, ?)""", (description, crew_char))
+            try:
+                cursor.execute("""
+                INSERT INTO XpTrigger (Description, Crew_Char)
+                VALUES (?, ?)""", (description, crew_char))
 
-            connection.commit()
-        except DatabaseError:
-            traceback.print_exc()
-            return False
-        return True
+                commit(connection)
+
+                after_commit(lambda: reference_cache.invalidate("XpTrigger"))
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
     return False
 
 
@@ -652,15 +728,18 @@ def insert_simple_relation(table: str, first_column, second_column, commit: bool
     :return: True if the simple relation is added, raise a DataBase error if it's not added.
     """
     if connection is None:
-        connection = establish_connection()
+        with connect() as connection:
+            return insert_simple_relation(table, first_column, second_column, commit, connection)
     cursor = connection.cursor()
 
     try:
         cursor.execute("""
         INSERT INTO {}
         VALUES (?,?)""".format(table), (first_column, second_column))
-        if commit:
+        if commit and not in_transaction():
             connection.commit()
+        # dropped after the commit, so the other connections cannot cache the old rows again meanwhile
+        after_commit(lambda: reference_cache.invalidate(table))
     except DatabaseError:
         traceback.print_exc()
         raise DatabaseError
@@ -681,16 +760,18 @@ def insert_complex_relation(table: str, first_column, second_column, third_colum
     :return: True if the peculiar relation is added, raise a DataBase error if it's not added.
     """
     if connection is None:
-        connection = establish_connection()
+        with connect() as connection:
+            return insert_complex_relation(table, first_column, second_column, third_column, commit, connection)
     cursor = connection.cursor()
 
     try:
         cursor.execute("""
             INSERT INTO {}
             VALUES (?,?,?)""".format(table), (first_column, second_column, third_column))
-
-        if commit:
+        if commit and not in_transaction():
             connection.commit()
+        # dropped after the commit, so the other connections cannot cache the old rows again meanwhile
+        after_commit(lambda: reference_cache.invalidate(table))
     except DatabaseError:
         traceback.print_exc()
         raise DatabaseError
@@ -883,28 +964,29 @@ def insert_char_info(info: dict) -> bool:
     :param info: dictionary containing all the information needed to add the class
     :return: True if character has been added properly, False otherwise
     """
-    connection = establish_connection()
-    sheet_name = info["name"]
-    try:
-        insert_character_sheet(sheet_name, **info["CharacterSheet"], connection=connection)
-        for key in info["Char_Action"]["action_dots"].keys():
-            insert_char_action(sheet_name, key, info["Char_Action"]["action_dots"][key], connection)
-        for npc in info["Char_Friend"]["NPCs"]:
-            insert_char_friend(sheet_name, npc, connection)
-        for item in info["Char_Item"]["items"]:
-            insert_char_item(sheet_name, item, connection)
-        insert_char_sa(sheet_name, info["Char_Sa"]["sas"][0], connection, True)
-        info["Char_Sa"]["sas"].pop(0)
-        for special_ability in info["Char_Sa"]["sas"]:
-            insert_char_sa(sheet_name, special_ability, connection)
-        for i in range(1, 4):
-            insert_char_xp(sheet_name, i, False, connection)
-        insert_char_xp(sheet_name, info["Char_Xp"]["xp_id"], True, connection)
-    except:
-        traceback.print_exc()
-        return False
-    connection.commit()
-    return True
+    with connect() as connection:
+        sheet_name = info["name"]
+        try:
+            insert_character_sheet(sheet_name, **info["CharacterSheet"], connection=connection)
+            for key in info["Char_Action"]["action_dots"].keys():
+                insert_char_action(sheet_name, key, info["Char_Action"]["action_dots"][key], connection)
+            for npc in info["Char_Friend"]["NPCs"]:
+                insert_char_friend(sheet_name, npc, connection)
+            for item in info["Char_Item"]["items"]:
+                insert_char_item(sheet_name, item, connection)
+            insert_char_sa(sheet_name, info["Char_Sa"]["sas"][0], connection, True)
+            info["Char_Sa"]["sas"].pop(0)
+            for special_ability in info["Char_Sa"]["sas"]:
+                insert_char_sa(sheet_name, special_ability, connection)
+            for i in range(1, 4):
+                insert_char_xp(sheet_name, i, False, connection)
+            insert_char_xp(sheet_name, info["Char_Xp"]["xp_id"], True, connection)
+        except:
+            write_failed()
+            return False
+        commit(connection)
+        after_commit(reference_cache.invalidate)
+        return True
 
 
 def insert_crew_info(info: dict) -> bool:
@@ -914,30 +996,31 @@ def insert_crew_info(info: dict) -> bool:
         :param info: dictionary containing all the information needed to add the class
         :return: True if crew has been added properly, False otherwise
         """
-    connection = establish_connection()
-    sheet_name = info["crew_type"]
-    try:
-        insert_crew_sheet(sheet_name, **info["CrewSheet"], connection=connection)
-        for npc in info["Crew_Contact"]["contacts"]:
-            insert_crew_contact(sheet_name, npc, connection)
-        for upgrade in info["Crew_Upgrade"]["upgrades"]:
-            insert_crew_upgrade(sheet_name, upgrade, connection)
-        for upgrade in info["Crew_StartingUpgrade"]["upgrades"]:
-            insert_crew_starting_upgrade(sheet_name, upgrade[0], upgrade[1], connection)
-        for hg in info["Crew_Hg"]["hgs"]:
-            insert_crew_hg(hg, sheet_name, connection)
-        insert_crew_sa(sheet_name, info["Crew_Sa"]["sas"][0], True, connection)
-        info["Crew_Sa"]["sas"].pop(0)
-        for special_ability in info["Crew_Sa"]["sas"]:
-            insert_crew_sa(sheet_name, special_ability, False, connection)
-        for i in range(16, 19):
-            insert_crew_xp(sheet_name, i, False, connection)
-        insert_crew_xp(sheet_name, info["Crew_Xp"]["xp_id"], True, connection)
-    except:
-        traceback.print_exc()
-        return False
-    connection.commit()
-    return True
+    with connect() as connection:
+        sheet_name = info["crew_type"]
+        try:
+            insert_crew_sheet(sheet_name, **info["CrewSheet"], connection=connection)
+            for npc in info["Crew_Contact"]["contacts"]:
+                insert_crew_contact(sheet_name, npc, connection)
+            for upgrade in info["Crew_Upgrade"]["upgrades"]:
+                insert_crew_upgrade(sheet_name, upgrade, connection)
+            for upgrade in info["Crew_StartingUpgrade"]["upgrades"]:
+                insert_crew_starting_upgrade(sheet_name, upgrade[0], upgrade[1], connection)
+            for hg in info["Crew_Hg"]["hgs"]:
+                insert_crew_hg(hg, sheet_name, connection)
+            insert_crew_sa(sheet_name, info["Crew_Sa"]["sas"][0], True, connection)
+            info["Crew_Sa"]["sas"].pop(0)
+            for special_ability in info["Crew_Sa"]["sas"]:
+                insert_crew_sa(sheet_name, special_ability, False, connection)
+            for i in range(16, 19):
+                insert_crew_xp(sheet_name, i, False, connection)
+            insert_crew_xp(sheet_name, info["Crew_Xp"]["xp_id"], True, connection)
+        except:
+            write_failed()
+            return False
+        commit(connection)
+        after_commit(reference_cache.invalidate)
+        return True
 
 
 def delete_user_game(user_id: int, game_id: int) -> bool:
@@ -949,38 +1032,81 @@ def delete_user_game(user_id: int, game_id: int) -> bool:
     :return: True if the operation is successful, False otherwise
     """
     if isinstance(user_id, int) and isinstance(game_id, int):
-        connection = establish_connection()
+        with connect() as connection:
+            cursor = connection.cursor()
+
+            try:
+                cursor.execute("""
+                DELETE FROM User_Game WHERE (User_ID, Game_ID) = (?, ?)
+                """, (user_id, game_id))
+
+                commit(connection)
+            except DatabaseError:
+                write_failed()
+                return False
+            return True
+    return False
+
+
+def delete_game(game_id: int) -> bool:
+    """
+    Deletes the selected game from the database
+
+    :param game_id: the id of the game to delete.
+    :return: True if the operation is successful, False otherwise
+    """
+    write_behind.discard(game_id)
+    with connect() as connection:
         cursor = connection.cursor()
 
         try:
             cursor.execute("""
-            DELETE FROM User_Game WHERE (User_ID, Game_ID) = (?, ?)
-            """, (user_id, game_id))
+            DELETE FROM Game WHERE Game_ID == ?""", (game_id,))
 
-            connection.commit()
+            commit(connection)
         except DatabaseError:
-            traceback.print_exc()
+            write_failed()
             return False
         return True
-    return False
 
 
-def delete_game(game_id: int) -> bool:
+def compact_storage(vacuum: bool = True) -> int:
     """
-    Deletes the selected game from the database
+    Rewrites all the values of the columns stored through the storage codec with its current configuration: the
+    uncompressed legacy values are compressed and, if the algorithm is "none", the compressed values are restored.
 
-    :param game_id: the id of the game to delete.
-    :return: True if the operation is successful, False otherwise
+    :param vacuum: if True the database file is rebuilt afterwards to give the freed pages back to the file system
+        (skipped inside a transaction).
+    :return: the number of rewritten values, -1 if the operation failed.
     """
-    connection = establish_connection()
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute("""
-        DELETE FROM Game WHERE Game_ID == ?""", (game_id,))
+    rewritten = 0
+    with connect() as connection:
+        cursor = connection.cursor()
 
-        connection.commit()
-    except DatabaseError:
-        traceback.print_exc()
-        return False
-    return True
+        try:
+            for table, columns in CODEC_COLUMNS.items():
+                for column in columns:
+                    cursor.execute("""
+                    SELECT rowid, {0}
+                    FROM {1}
+                    WHERE {0} IS NOT NULL""".format(column, table))
+
+                    updates = []
+                    for rowid, value in cursor.fetchall():
+                        encoded = codec.encode(codec.decode(value))
+                        if encoded != value:
+                            updates.append((encoded, rowid))
+
+                    cursor.executemany("""
+                    UPDATE {}
+                    SET {} = ?
+                    WHERE rowid = ?""".format(table, column), updates)
+                    rewritten += len(updates)
+
+            commit(connection)
+            if vacuum and not in_transaction():
+                cursor.execute("VACUUM")
+        except DatabaseError:
+            write_failed()
+            return -1
+        return rewritten
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Set
+
+
+class GameEvictionPolicy:
+    """
+    Tracks when the loaded games have been used last and chooses which ones have to be dropped from memory: the games
+    idle for longer than the idle timeout and, when more games than the budget are loaded, the least recently used.
+    """
+
+    def __init__(self, max_games: int = 500, idle_timeout: float = 86400, interval: float = 600) -> None:
+        """
+        Constructor of the policy.
+
+        :param max_games: maximum number of games kept loaded; 0 means no limit.
+        :param idle_timeout: seconds after which an unused game is evicted; 0 means never.
+        :param interval: minimum number of seconds between two sweeps for idle games.
+        """
+        for name, value in (("max_games", max_games), ("idle_timeout", idle_timeout), ("interval", interval)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise ValueError("{} must be a non-negative number".format(name))
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self.interval = interval
+        self.__last_used: Dict[int, float] = OrderedDict()
+        self.__last_sweep = time.monotonic()
+        self.__evicted_ids: Set[int] = set()
+        self.__evicted = 0
+        self.__reloaded = 0
+        self.__lock = threading.Lock()
+
+    def touch(self, game_id: int) -> None:
+        """
+        Records that the passed loaded game has just been used.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            self.__last_used.pop(game_id, None)
+            self.__last_used[game_id] = time.monotonic()
+
+    def forget(self, game_id: int) -> None:
+        """
+        Stops tracking the passed game, e.g. because it has been evicted or ended.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            self.__last_used.pop(game_id, None)
+            self.__evicted_ids.discard(game_id)
+
+    def due(self) -> bool:
+        """
+        Checks if the game budget is exceeded or if a sweep for idle games is due.
+
+        :return: True if candidates() should be called.
+        """
+        with self.__lock:
+            if self.max_games and len(self.__last_used) > self.max_games:
+                return True
+            return bool(self.idle_timeout) and time.monotonic() - self.__last_sweep >= self.interval
+
+    def candidates(self) -> List[int]:
+        """
+        Gets the games to evict, from the least recently used one.
+
+        :return: the list of the ids of the idle games and of the games exceeding the budget.
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__last_sweep = now
+            overflow = max(0, len(self.__last_used) - self.max_games) if self.max_games else 0
+            candidates = []
+            for game_id, last_used in self.__last_used.items():
+                if overflow > 0:
+                    overflow -= 1
+                elif not self.idle_timeout or now - last_used < self.idle_timeout:
+                    break
+                candidates.append(game_id)
+            return candidates
+
+    def record_eviction(self, game_id: int) -> None:
+        """
+        Records that the passed game has been dropped from memory.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            self.__last_used.pop(game_id, None)
+            self.__evicted_ids.add(game_id)
+            self.__evicted += 1
+
+    def record_load(self, game_id: int) -> None:
+        """
+        Records that the content of the passed game has been read from the database.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            if game_id in self.__evicted_ids:
+                self.__evicted_ids.discard(game_id)
+                self.__reloaded += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the policy.
+
+        :return: a dictionary with the keys "loaded" (the tracked games), "max_games", "evicted" and "reloaded" (the
+            evicted games loaded again).
+        """
+        with self.__lock:
+            return {"loaded": len(self.__last_used), "max_games": self.max_games, "evicted": self.__evicted,
+                    "reloaded": self.__reloaded}
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Method used to create an instance of this object given a dictionary
+
+        :param data: dictionary of the object
+        :return: GameEvictionPolicy
+        """
+        return cls(**data)
@@ -0,0 +1,78 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Union
+
+
+class GameLockManager:
+    """
+    Hands out one reentrant lock per game, so the commands of different games run in parallel while the commands of
+    the same game are serialized. It also measures how long the threads wait for the locks.
+    """
+
+    def __init__(self) -> None:
+        self.__locks: Dict[int, threading.RLock] = {}
+        self.__lock = threading.Lock()
+        self.__acquisitions = 0
+        self.__contended = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+
+    def get(self, game_id: int) -> threading.RLock:
+        """
+        Gets the lock of the passed game, creating it if missing.
+
+        :param game_id: the id of the game.
+        :return: the RLock of the game.
+        """
+        with self.__lock:
+            lock = self.__locks.get(game_id)
+            if lock is None:
+                lock = self.__locks[game_id] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def lock(self, game_id: int) -> Iterator[None]:
+        """
+        Context manager that holds the lock of the passed game. The same thread can acquire it again while holding it.
+
+        :param game_id: the id of the game.
+        """
+        lock = self.get(game_id)
+        wait = 0.0
+        contended = not lock.acquire(blocking=False)
+        if contended:
+            start = time.perf_counter()
+            lock.acquire()
+            wait = time.perf_counter() - start
+        with self.__lock:
+            self.__acquisitions += 1
+            if contended:
+                self.__contended += 1
+                self.__wait_total += wait
+                self.__wait_max = max(self.__wait_max, wait)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def discard(self, game_id: int) -> None:
+        """
+        Forgets the lock of the passed game, e.g. because the game has ended. The threads already holding or waiting
+        for it are not affected.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            self.__locks.pop(game_id, None)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Gets the counters of the locks.
+
+        :return: a dictionary with the keys "locks" (games with a lock), "acquisitions", "contended" (acquisitions
+            that had to wait), "wait_total_ms" and "wait_max_ms".
+        """
+        with self.__lock:
+            return {"locks": len(self.__locks), "acquisitions": self.__acquisitions, "contended": self.__contended,
+                    "wait_total_ms": round(self.__wait_total * 1000, 3), "wait_max_ms": round(self.__wait_max * 1000, 3)}
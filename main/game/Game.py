@@ -11,6 +11,7 @@ from game.Player import Player
 from game.Score import Score
 from organization.Crew import Crew
 from organization.Faction import Faction
+from utility.NameIndex import NameIndex, name_key, name_role_key, player_id_key, without_indexes
 
 INIT, FREE_PLAY, SCORE_PHASE, DOWNTIME_PHASE = range(4)
 
@@ -22,7 +23,7 @@ class Game:
     def __init__(self, identifier: int = None, title: str = None,
                  users: List[Player] = None, NPCs: List[NPC] = None, crew: Crew = None,
                  factions: List[Faction] = None, clocks: List[Clock] = None, scores: List[Score] = None,
-                 crafted_items: List[Item] = None, journal: Journal = Journal(), state: int = INIT,
+                 crafted_items: List[Item] = None, journal: Journal = None, state: int = INIT,
                  chat_id: int = None) -> None:
         """
         Constructor of the Game.
@@ -36,7 +37,7 @@ class Game:
         :param clocks: list of Clocks that have been started during the Game.
         :param scores: list of the active Scores.
         :param crafted_items: list of Items that have been created during the Game.
-        :param journal: Journal of this Game.
+        :param journal: Journal of this Game. If None a new Journal is created.
         :param state: is the current state of this Game. When the game is created the state is set to INIT.
                       (The possible states are INIT, FREE_PLAY, SCORE_PHASE, DOWNTIME_PHASE).
         :param chat_id: id of the telegram chat that has started the game
@@ -66,12 +67,19 @@ class Game:
         if crafted_items is None:
             crafted_items = []
         self.crafted_items = crafted_items
+        if journal is None:
+            journal = Journal()
         self.journal = journal
         self.n_clock = 100 * identifier
         if state < 0 or state > 2:
             state = FREE_PLAY
         self.state = state
         self.chat_id = chat_id
+        self.__players = NameIndex(player_id_key)
+        self.__factions = NameIndex(name_key)
+        self.__npcs = NameIndex(name_role_key)
+        self.__npcs_by_name = NameIndex(name_key)
+        self.__clocks = NameIndex(name_key)
 
     def get_project_clocks(self) -> List[Clock]:
         """
@@ -97,8 +105,24 @@ class Game:
             self.n_clock += 1
             name = "Clock" + str(self.n_clock)
         self.clocks.append(Clock(name, segments))
+        self.__clocks.add(self.clocks, self.clocks[-1])
         return self.clocks[-1]
 
+    def get_clock(self, clock: Clock) -> Clock:
+        """
+        Finds the Clock of the game equal to the passed one (same name, segments and progress).
+
+        :param clock: the Clock to search.
+        :return: the Clock of the game, None if it is not found.
+        """
+        found = self.__clocks.find(self.clocks, clock.name.lower())
+        if found is None or found == clock:
+            return found
+        # more clocks with the same name
+        for c in self.clocks:
+            if c == clock:
+                return c
+
     def tick_clock(self, clock: Clock, ticks: int) -> Clock:
         """
         Ticks the given Clock by the specified number of ticks.
@@ -108,11 +132,12 @@ class Game:
         :param ticks: is the number of ticks
         :return: the Clock ticked if found, None otherwise
         """
-        for c in self.clocks:
-            if c == clock:
-                if c.tick(ticks):
-                    self.clocks.remove(c)
-                return c
+        c = self.get_clock(clock)
+        if c is not None:
+            if c.tick(ticks):
+                self.clocks.remove(c)
+                self.__clocks.remove(self.clocks, c)
+            return c
 
     def see_clocks(self, names: List[str] = None) -> List[Clock]:
         """
@@ -191,9 +216,25 @@ class Game:
         :param user_id: is the ID to search
         :return: a Player object.
         """
-        for player in self.users:
-            if player.player_id == user_id:
-                return player
+        return self.__players.find(self.users, user_id)
+
+    def add_player(self, player: Player) -> None:
+        """
+        Adds the passed Player to the users of the game.
+
+        :param player: the Player to add.
+        """
+        self.users.append(player)
+        self.__players.add(self.users, player)
+
+    def remove_player(self, player: Player) -> None:
+        """
+        Removes the passed Player from the users of the game.
+
+        :param player: the Player to remove.
+        """
+        self.users.remove(player)
+        self.__players.remove(self.users, player)
 
     def get_faction_by_name(self, name: str) -> Faction:
         """
@@ -202,9 +243,16 @@ class Game:
         :param name: is the name to search.
         :return: a Faction object.
         """
-        for elem in self.factions:
-            if elem.name.lower() == name.lower():
-                return elem
+        return self.__factions.find(self.factions, name.lower())
+
+    def add_faction(self, faction: Faction) -> None:
+        """
+        Adds the passed Faction to the factions of the game.
+
+        :param faction: the Faction to add.
+        """
+        self.factions.append(faction)
+        self.__factions.add(self.factions, faction)
 
     def get_npc_by_name_and_role(self, name: str, role: str) -> NPC:
         """
@@ -214,13 +262,30 @@ class Game:
         :param role: is the role to search.
         :return: a NPC object.
         """
-        for npc in self.NPCs:
-            if npc.name.lower() == name.lower() and npc.role.lower() == role.lower():
-                return npc
+        return self.__npcs.find(self.NPCs, (name.lower(), role.lower()))
+
+    def get_npc_by_name(self, name: str) -> NPC:
+        """
+        Returns the first NPC with the passed name, whatever its role.
+
+        :param name: is the name to search.
+        :return: a NPC object.
+        """
+        return self.__npcs_by_name.find(self.NPCs, name.lower())
+
+    def add_npc(self, npc: NPC) -> None:
+        """
+        Adds the passed NPC to the NPCs of the game.
+
+        :param npc: the NPC to add.
+        """
+        self.NPCs.append(npc)
+        self.__npcs.add(self.NPCs, npc)
+        self.__npcs_by_name.add(self.NPCs, npc)
 
     def __eq__(self, o: object) -> bool:
         return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
 
     def __repr__(self) -> str:
-        return str(self.__dict__)
+        return str(without_indexes(self.__dict__))
 
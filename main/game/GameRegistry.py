@@ -0,0 +1,88 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from game.Game import Game
+
+
+class GameRegistry:
+    """
+    Keeps the live games indexed by their id and by the Telegram chat they are played in.
+    All the operations are thread-safe; the iteration works on a snapshot, so the registry can be changed meanwhile.
+    """
+
+    def __init__(self, games: Iterable[Game] = None) -> None:
+        """
+        Constructor of the registry.
+
+        :param games: the games to register.
+        """
+        self.__by_id: Dict[int, Game] = {}
+        self.__by_chat: Dict[int, Dict[int, Game]] = {}
+        self.__lock = threading.RLock()
+        if games is not None:
+            for game in games:
+                self.add(game)
+
+    def add(self, game: Game) -> None:
+        """
+        Registers the passed game, replacing the one with the same id if present.
+
+        :param game: the Game to register.
+        """
+        with self.__lock:
+            self.remove(game.identifier)
+            self.__by_id[game.identifier] = game
+            self.__by_chat.setdefault(game.chat_id, {})[game.identifier] = game
+
+    def remove(self, game: Union[Game, int]) -> Optional[Game]:
+        """
+        Unregisters the passed game.
+
+        :param game: the Game or its id.
+        :return: the removed Game, None if it was not registered.
+        """
+        game_id = game.identifier if isinstance(game, Game) else game
+        with self.__lock:
+            removed = self.__by_id.pop(game_id, None)
+            if removed is not None:
+                chat = self.__by_chat.get(removed.chat_id, {})
+                chat.pop(game_id, None)
+                if not chat:
+                    self.__by_chat.pop(removed.chat_id, None)
+            return removed
+
+    def get(self, game_id: int) -> Optional[Game]:
+        """
+        Gets the game with the passed id.
+
+        :param game_id: the id of the game.
+        :return: the Game, None if it is not registered.
+        """
+        return self.__by_id.get(game_id)
+
+    def by_chat(self, chat_id: int) -> List[Game]:
+        """
+        Gets the games played in the passed chat.
+
+        :param chat_id: the Telegram chat id.
+        :return: the list of the Games of the chat, sorted by id.
+        """
+        with self.__lock:
+            games = self.__by_chat.get(chat_id, {})
+            return [games[game_id] for game_id in sorted(games)]
+
+    def __len__(self) -> int:
+        return len(self.__by_id)
+
+    def __contains__(self, game: object) -> bool:
+        if isinstance(game, Game):
+            return self.__by_id.get(game.identifier) is game
+        return game in self.__by_id
+
+    def __iter__(self) -> Iterator[Game]:
+        with self.__lock:
+            games = list(self.__by_id.values())
+        return iter(games)
+
+    def __repr__(self) -> str:
+        return str(list(self))
@@ -1,30 +1,226 @@
+import functools
+import inspect
 import json
 import math
-from typing import List, Union, Tuple, Dict
+import traceback
+from typing import Any, Callable, Iterable, List, Optional, Union, Tuple, Dict
 
 from bs4.element import Doctype
 from bs4 import *
 
 from component.Clock import Clock
 from utility.FilesManager import path_finder
+from utility.ISavable import to_plain
 from utility.htmlFactory.HtmlParser import MyHTMLParser
 
+CLOCK_KEY = "__clock__"
+
+
+def encode_argument(value: Any) -> Any:
+    """
+    Converts an argument of a write method of the Journal into a json serializable value: the Clocks become
+    dictionaries marked with CLOCK_KEY, the tuples become lists. The passed value is not modified.
+
+    :param value: the argument to convert.
+    :return: the converted argument.
+    """
+    if isinstance(value, Clock):
+        return {CLOCK_KEY: to_plain(value)}
+    if isinstance(value, dict):
+        return {key: encode_argument(elem) for key, elem in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_argument(elem) for elem in value]
+    return value
+
+
+def decode_argument(value: Any) -> Any:
+    """
+    Converts back an argument converted by encode_argument().
+
+    :param value: the converted argument, as read from the json.
+    :return: the argument, with its Clocks.
+    """
+    if isinstance(value, dict):
+        if len(value) == 1 and CLOCK_KEY in value:
+            return Clock.from_json(value[CLOCK_KEY])
+        return {key: decode_argument(elem) for key, elem in value.items()}
+    if isinstance(value, list):
+        return [decode_argument(elem) for elem in value]
+    return value
+
+
+def journal_entry(method: Callable) -> Callable:
+    """
+    Decorator that records each call of the decorated write method of the Journal as an entry, appended to
+    Journal.entries, besides writing its tag: the entries are what is stored in the database, and the journal is
+    rebuilt calling the methods again with Journal.replay().
+    A call whose arguments cannot be encoded in json is printed and not recorded.
+    An entry is a dictionary with the keys "method", "args" (the arguments encoded by encode_argument()),
+    "language" and "indentation" (the ones used to write the tag), "phase" and "score" (the title of the score the
+    event happened in, None if it happened outside a score).
+
+    :param method: the write method to decorate.
+    :return: the decorated method.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.replaying:
+            return method(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        arguments.pop("self")
+        # the arguments are encoded before the call, since some methods modify them
+        try:
+            encoded = encode_argument(dict(arguments))
+            json.dumps(encoded)
+        except (AttributeError, TypeError, ValueError):
+            # the tag is written anyway, but it cannot be stored: an entry that cannot be saved would block the others
+            traceback.print_exc()
+            return method(self, *args, **kwargs)
+        entry = {"method": method.__name__, "args": encoded, "language": self.language,
+                 "indentation": self.indentation}
+        result = method(self, *args, **kwargs)
+        entry["phase"] = self.phase
+        entry["score"] = self.open_scores[-1] if self.open_scores else None
+        self.entries.append(entry)
+        return result
+    return wrapper
+
 
 class Journal:
     """
     Keeps track of what happens in the game by writing it in a text file.
+    Every call of a write method is also recorded as an entry (see journal_entry()), so the journal is stored appending
+    its new entries instead of its whole html.
+    The html document (log) is built only when it is first read or written: until then the journal keeps the html
+    string and the entries it has been loaded with (see load()).
     """
 
     def __init__(self, notes: List[str] = None, indentation: int = 0, lang: str = "ENG") -> None:
         if notes is None:
             notes = []
         self.notes = notes
-        self.indentation = indentation
-        with open(path_finder("{}.json".format(lang.upper())), 'r', encoding="utf8") as f:
+        self.language = "{}.json".format(lang.upper())
+        with open(path_finder(self.language), 'r', encoding="utf8") as f:
             self.lang = json.load(f)["Journal"]
-        self.log = BeautifulSoup("", 'html.parser')
-        self.score_tag = None
-        self.write_heading("Journal", self.log)
+        self.__log: Optional[BeautifulSoup] = None
+        self.__source: Optional[str] = None
+        self.__anchor: Optional[dict] = None
+        self.__unparsed_entries: List[dict] = []
+        self.__score_tag = None
+        self.__indentation = indentation
+        self.phase: Optional[int] = None
+        self.open_scores: List[str] = []
+        self.entries: List[dict] = []
+        self.stored_entries = 0
+        self.replaying = False
+
+    @property
+    def log(self) -> BeautifulSoup:
+        """
+        The html document of the journal, parsed from the loaded html string the first time it is used.
+        """
+        self.__parse()
+        return self.__log
+
+    @log.setter
+    def log(self, log: BeautifulSoup) -> None:
+        self.__parse()
+        self.__log = log
+
+    @property
+    def score_tag(self):
+        """
+        The div tag of the current score, None if no score has been written.
+        """
+        self.__parse()
+        return self.__score_tag
+
+    @score_tag.setter
+    def score_tag(self, score_tag) -> None:
+        self.__parse()
+        self.__score_tag = score_tag
+
+    @property
+    def indentation(self) -> int:
+        """
+        The indentation level of the next tag, i.e. the number of open scores.
+        """
+        self.__parse()
+        return self.__indentation
+
+    @indentation.setter
+    def indentation(self, indentation: int) -> None:
+        self.__parse()
+        self.__indentation = indentation
+
+    def load(self, source: Optional[str], anchor: dict = None, entries: List[dict] = None,
+             indentation: int = 0) -> None:
+        """
+        Sets the content of the journal read from the database, without parsing it: the html is parsed and the entries
+        are replayed on it when the journal is first read or written.
+
+        :param source: the html of the journal, None to start from an empty journal.
+        :param anchor: the position of the current score and the indentation of the html, as returned by
+            get_anchor() when it has been stored; if it is None the current score is the last one of the html.
+        :param entries: the entries appended to the journal after the html, as recorded by the write methods.
+        :param indentation: the indentation of the html, used if the anchor is None.
+        """
+        if entries is None:
+            entries = []
+        self.__log = None
+        self.__source = source
+        self.__anchor = anchor
+        self.__unparsed_entries = list(entries)
+        self.__score_tag = None
+        self.__indentation = indentation if anchor is None else anchor["indentation"]
+        if anchor is not None:
+            self.phase = anchor.get("phase")
+            self.open_scores = list(anchor.get("open_scores", []))
+        self.stored_entries = len(entries)
+
+    def is_parsed(self) -> bool:
+        """
+        Checks if the html document of the journal has been built.
+
+        :return: True if the journal has been read or written since it has been created or loaded, False otherwise.
+        """
+        return self.__log is not None
+
+    def get_anchor(self) -> dict:
+        """
+        Gets the position of the current score in the html of the journal, stored with the html so that the current
+        score is found without searching it when the journal is loaded.
+
+        :return: a dictionary with the keys "score" (the index of the div tag of the current score among the score
+            tags, None if there is none), "indentation", "phase" and "open_scores".
+        """
+        score = None
+        if self.score_tag is not None:
+            scores = self.log.find_all("div", attrs={"class": "score"}, recursive=True)
+            score = next((i for i, tag in enumerate(scores) if tag is self.score_tag), None)
+        return {"score": score, "indentation": self.indentation, "phase": self.phase,
+                "open_scores": list(self.open_scores)}
+
+    def __parse(self) -> None:
+        if self.__log is not None:
+            return
+        self.__log = BeautifulSoup(self.__source or "", 'html.parser')
+        if self.__source is None:
+            self.write_heading("Journal", self.__log)
+        elif self.__anchor is None:
+            scores = self.__log.find_all("div", attrs={"class": "score"}, recursive=True)
+            self.__score_tag = scores[-1] if scores else None
+        elif self.__anchor["score"] is not None:
+            scores = self.__log.find_all("div", attrs={"class": "score"}, recursive=True)
+            self.__score_tag = scores[self.__anchor["score"]] if self.__anchor["score"] < len(scores) else None
+        self.__source = None
+        self.__anchor = None
+
+        entries, self.__unparsed_entries = self.__unparsed_entries, []
+        if entries:
+            self.replay(entries)
 
     def change_lang(self, lang: str):
         """
@@ -34,6 +230,7 @@ class Journal:
         """
         with open(path_finder(lang), 'r', encoding="utf8") as f:
             self.lang = json.load(f)["Journal"]
+        self.language = lang
 
     def get_note(self, number: int):
         """
@@ -59,6 +256,7 @@ class Journal:
         note = self.get_note(number)
         return note.text
 
+    @journal_entry
     def edit_note(self, new_note: str, number: int = 1):
         """
         Allows to change a specified note, depending on its position inside the list of description.
@@ -91,6 +289,48 @@ class Journal:
         """
         return str(self.log)
 
+    def replay(self, entries: Iterable[dict]) -> None:
+        """
+        Writes again in the journal the passed entries, recorded by the write methods (see journal_entry()), with the
+        language and the indentation they have been written with. The replayed entries are not recorded again.
+        An entry that cannot be written is printed and skipped.
+
+        :param entries: the entries to write, in the order they have been recorded.
+        """
+        language = self.language
+        self.replaying = True
+        try:
+            for entry in entries:
+                if entry["language"] != self.language:
+                    self.change_lang(entry["language"])
+                self.indentation = entry["indentation"]
+                try:
+                    getattr(self, entry["method"])(**decode_argument(entry["args"]))
+                except Exception:
+                    traceback.print_exc()
+        finally:
+            self.replaying = False
+        if self.language != language:
+            self.change_lang(language)
+
+    def entries_stored(self, number: int) -> None:
+        """
+        Drops the first entries of the list of the entries not stored yet, once they have been stored.
+
+        :param number: the number of stored entries.
+        """
+        del self.entries[:number]
+        self.stored_entries += number
+
+    def compacted(self, number: int) -> None:
+        """
+        Records that the first stored entries have been replaced in the database by the html of the journal they are
+        rendered in.
+
+        :param number: the number of replaced entries.
+        """
+        self.stored_entries -= number
+
     def get_lang(self, method: str) -> dict:
         """
         Extracts the user's language preference dictionary.
@@ -101,10 +341,10 @@ class Journal:
         try:
             return self.lang[method]
         except:
-            lang = self.lang
+            lang, language = self.lang, self.language
             self.change_lang("ENG.json")
             lang_to_return = self.lang[method]
-            self.lang = lang
+            self.lang, self.language = lang, language
             return lang_to_return
 
     def get_codex(self, game_name: str, info: Dict[str, List[Tuple]]) -> str:
@@ -202,6 +442,7 @@ class Journal:
         """
         return self.create_h4_tag(phase_name, {"class": "state"})
 
+    @journal_entry
     def write_phase(self, new_state: int):
         """
         Method used to write new phase heading in the attribute journal representing the html file of the journal.
@@ -210,6 +451,7 @@ class Journal:
         h4_tag = self.create_phase_tag(placeholder[str(new_state)])
 
         self.log.select_one("body").append(h4_tag)
+        self.phase = new_state
 
     def create_note_tag(self, title: str, text: str):
         """
@@ -1356,6 +1598,7 @@ class Journal:
         else:
             self.log.select_one("body").append(tag)
 
+    @journal_entry
     def write_title(self, game_name: str):
         """
         Method used to write the title of the game in the attribute journal representing the html file of the journal.
@@ -1364,6 +1607,7 @@ class Journal:
         """
         self.log.select_one("body").append(self.create_title_tag(game_name))
 
+    @journal_entry
     def write_note(self, title: str, text: str):
         """
         Method used to write general notes in the attribute journal representing the html file of the journal.
@@ -1375,6 +1619,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_fortune_roll(self, pc: str, what: str, goal: str, outcome: int, notes: str):
         """
         Method used to write a fortune roll in the attribute journal representing the html file of the journal.
@@ -1389,6 +1634,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_score(self, title: str, category: str, plan_type: str, target: str, plan_details: str,
                     pc_load: List[Tuple[str, int]], outcome: Union[str, int], notes: str):
         """
@@ -1408,7 +1654,9 @@ class Journal:
         self.write_general(tag)
 
         self.score_tag = tag
+        self.open_scores.append(title)
 
+    @journal_entry
     def write_action(self, pc: str, goal: str, action: str, position: str, effect: str, outcome: Union[int, str],
                      notes: str, participants: List[dict] = None, cohort: str = None, assistants: List[str] = None,
                      push: bool = False, devil_bargain: str = None):
@@ -1433,6 +1681,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_end_score(self, outcome: str, notes: str):
         """
         Method used to write the end of the score in the attribute journal representing the html file of the journal.
@@ -1445,7 +1694,10 @@ class Journal:
         self.write_general(tag)
 
         self.score_tag = self.score_tag.parent
+        if self.open_scores:
+            self.open_scores.pop()
 
+    @journal_entry
     def write_payoff(self, amount: int, notes: str, distributed: bool = None):
         """
         Method used to write the payoff in the attribute journal representing the html file of the journal.
@@ -1459,6 +1711,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_heat(self, score_nature: str, famous_target: bool, hostility: bool, war: bool,
                    bodies: bool, total_heat: int, wanted: int):
         """
@@ -1477,6 +1730,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_entanglement(self, name: str, description: str):
         """
         Method used to write the entanglement in the attribute journal representing the html file of the journal.
@@ -1488,6 +1742,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_secret_entanglement(self, name: str, description: str):
         """
         Method used to write a secret entanglement in the attribute journal representing the html file of the journal.
@@ -1499,6 +1754,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_activity(self, activity_dict: dict):
         """
         Method used to write a downtime activity in the attribute journal representing the html file of the journal.
@@ -1516,6 +1772,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_add_claim(self, prison: bool, name: str, description: str):
         """
         Method used to write add claim in the attribute journal representing the html file of the journal.
@@ -1528,6 +1785,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_incarceration(self, pc: str, outcome: Union[str, int], notes: str):
         """
         Method used to write the incarceration in the attribute journal representing the html file of the journal.
@@ -1540,6 +1798,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_flashback(self, pc: str, goal: str, stress: int, entail: bool = None):
         """
         Method used to write the flashback in the attribute journal representing
@@ -1554,6 +1813,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_resistance_roll(self, pc: str, description: str, damage: str, attribute: str, outcome: Union[str, int],
                               notes: str, stress: int = 0):
         """
@@ -1571,6 +1831,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_clock(self, pc: str, new_clock: Clock, old_clock: Clock = None):
         """
         Method used to write a clock in the attribute journal representing the html file of the journal.
@@ -1583,6 +1844,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_armor_use(self, pc: str, armor_type: str, notes: str):
         """
         Method used to write the use of an armor in the attribute journal representing the html file of the journal.
@@ -1595,6 +1857,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_use_item(self, pc: str, item_name: str, notes: str):
         """
         Method used to write the use of an item in the attribute journal representing the html file of the journal.
@@ -1607,6 +1870,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_end_downtime(self):
         """
         Method used to write the end of downtime in the attribute journal representing the html file of the journal.
@@ -1615,6 +1879,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_change_vice_purveyor(self, pc: str, new_purveyor: str):
         """
         Method used to write the changing of a vice purveyor in the attribute journal representing
@@ -1627,6 +1892,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_pc_migration(self, pc: str, migration_pc: str):
         """
         Method used to write the migration of a PC's type in the attribute journal representing
@@ -1639,6 +1905,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_change_pc_class(self, pc: str, new_class: str):
         """
         Method used to write the change of a PC's class in the attribute journal representing
@@ -1651,6 +1918,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_retire(self, pc: str, description: str, choice: str):
         """
         Method used to write the retirement or death of a pc in the attribute journal representing
@@ -1664,6 +1932,7 @@ class Journal:
 
         self.write_general(tag)
 
+    @journal_entry
     def write_end_game(self, notes: str):
         """
         Method used to write the description of the end of the game in the attribute journal representing
@@ -1676,4 +1945,10 @@ class Journal:
         self.write_general(tag)
 
     def __eq__(self, o: object) -> bool:
-        return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
+        if not isinstance(o, self.__class__):
+            return False
+        # the documents are compared once both are parsed, the other attributes as they are
+        private = "_{}__".format(Journal.__name__)
+        return o.log == self.log and o.score_tag == self.score_tag and o.indentation == self.indentation and \
+            {key: value for key, value in o.__dict__.items() if not key.startswith(private)} == \
+            {key: value for key, value in self.__dict__.items() if not key.startswith(private)}
@@ -5,6 +5,7 @@ from character.Ghost import Ghost
 from character.Hull import Hull
 from character.Vampire import Vampire
 from controller.DBreader import exists_character
+from utility.NameIndex import NameIndex, name_key, without_indexes
 
 
 class Player:
@@ -19,6 +20,7 @@ class Player:
         if characters is None:
             characters = []
         self.characters = characters
+        self.__characters = NameIndex(name_key)
 
     def migrate_character_type(self, name: str, new_type: str) -> bool:
         """
@@ -37,7 +39,9 @@ class Player:
                 new_c = Vampire(migrating_character=c)
             if new_type.lower() == "hull":
                 new_c = Hull(migrating_character=c)
+            new_c.char_id = c.char_id
             self.characters[self.characters.index(c)] = new_c
+            self.__characters.replace(self.characters, c, new_c)
             return True
         return False
 
@@ -62,12 +66,28 @@ class Player:
         :param name: the name of the character
         :return: the selected character, None otherwise
         """
-        for c in self.characters:
-            if c.name.lower() == name.lower():
-                return c
+        return self.__characters.find(self.characters, name.lower())
+
+    def add_character(self, character: PC) -> None:
+        """
+        Adds the passed character to the ones of the player.
+
+        :param character: the PC to add.
+        """
+        self.characters.append(character)
+        self.__characters.add(self.characters, character)
+
+    def remove_character(self, character: PC) -> None:
+        """
+        Removes the passed character from the ones of the player.
+
+        :param character: the PC to remove.
+        """
+        self.characters.remove(character)
+        self.__characters.remove(self.characters, character)
 
     def __repr__(self) -> str:
-        return str(self.__dict__)
+        return str(without_indexes(self.__dict__))
 
     def __eq__(self, o: object) -> bool:
         return isinstance(o, self.__class__) and o.__dict__ == self.__dict__
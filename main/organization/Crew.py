@@ -1,3 +1,4 @@
+from controller.DBcanon import canon_catalog
 from organization.Organization import Organization
 from utility.IDrawable import IDrawable, image_to_bytes
 from utility.ISavable import ISavable, pop_dict_items
@@ -286,6 +287,7 @@ class Crew(Organization, ISavable, IDrawable):
         :param data: dictionary of the object
         :return: Crew
         """
+        canon_catalog.unpack(data)
         dictionary = {}
 
         lair = Lair.from_json(data["lair"])
@@ -295,7 +297,7 @@ class Crew(Organization, ISavable, IDrawable):
 
         contact = NPC.from_json(data["contact"])
 
-        abilities = list(map(SpecialAbility.from_json, data["abilities"]))
+        abilities = canon_catalog.abilities(data["abilities"])
 
         if "cohorts" in data:
             dictionary["cohorts"] = list(map(Cohort.from_json, data["cohorts"]))
@@ -314,13 +316,13 @@ class Crew(Organization, ISavable, IDrawable):
     def save_to_dict(self) -> dict:
         """
         Reimplement save_to_dict method of ISavable by changing the value of the item "contact" using the save_to_dict
-        method in the NPC class
+        method in the NPC class and removing the canon text, that is referenced by its key.
 
         :return: dictionary of the object
         """
         temp = super().save_to_dict()
         temp["contact"] = self.contact.save_to_dict()
-        return temp
+        return canon_catalog.pack(temp)
 
     def draw_image(self, **kwargs) -> bytes:
         """
@@ -1,6 +1,7 @@
-import copy
-
-from bs4 import BeautifulSoup
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
 
 from character.Ghost import Ghost
 from character.Hull import Hull
@@ -13,6 +14,10 @@ from game.Player import Player
 from game.Score import Score
 from organization.Crew import Crew
 from organization.Faction import Faction
+from utility.GameSnapshot import load_snapshot, settings as snapshot_settings
+from utility.HydrationStats import HydrationStats
+
+hydration_stats = HydrationStats()
 
 
 def crew_from_json(crew: str):
@@ -58,22 +63,49 @@ def characters_from_json(characters: str):
     data = json.loads(characters)
     characters = []
     for d in data:
-        if d["Class"] == "Human":
-            d.pop("Class")
-            characters.append(Human.from_json(d))
-        elif d["Class"] == "Vampire":
-            d.pop("Class")
-            characters.append(Vampire.from_json(d))
-        elif d["Class"] == "Ghost":
-            d.pop("Class")
-            d.pop("need")
-            characters.append(Ghost.from_json(d))
-        elif d["Class"] == "Hull":
-            d.pop("Class")
-            characters.append(Hull.from_json(d))
+        pc = pc_from_dict(d)
+        if pc is not None:
+            characters.append(pc)
     return characters
 
 
+def pc_from_json(character: str, char_id: int = None):
+    """
+    This method is used to load a single PC from a json string.
+
+    :param character: string with json syntax
+    :param char_id: the id of the PC in the database
+    :return: the PC, None if its Class is unknown
+    """
+    pc = pc_from_dict(json.loads(character))
+    if pc is not None:
+        pc.char_id = char_id
+    return pc
+
+
+def pc_from_dict(d: dict):
+    """
+    This method is used to load a PC from its dictionary. Depending on the Class attribute it will load a Human,
+    a Vampire, a Hull or a Ghost
+
+    :param d: dictionary of the PC
+    :return: the PC, None if its Class is unknown
+    """
+    if d["Class"] == "Human":
+        d.pop("Class")
+        return Human.from_json(d)
+    elif d["Class"] == "Vampire":
+        d.pop("Class")
+        return Vampire.from_json(d)
+    elif d["Class"] == "Ghost":
+        d.pop("Class")
+        d.pop("need")
+        return Ghost.from_json(d)
+    elif d["Class"] == "Hull":
+        d.pop("Class")
+        return Hull.from_json(d)
+
+
 def scores_from_json(scores: str):
     """
     This method is used to load a list of Scores from a json string
@@ -107,33 +139,149 @@ def items_from_json(items: str):
     return list(map(Item.from_json, data))
 
 
-def load_games() -> List[Game]:
+def load_games(lazy: bool = False) -> List[Game]:
     """
     Fetches from the Data Base all the stored Games and proceeds calling the setup() for all of them.
 
+    :param lazy: if True only the id, title, chat and state of the Games are read and setup() is not called: it has to
+        be called before the Game is used.
     :return: a list of Games
     """
-    games_info = query_games_info()
     games = []
-    if games_info:
-        for elem in games_info:
+    if lazy:
+        for elem in query_games_headers():
+            state = elem.pop("state")
             game = Game(**elem)
-            setup(game)
+            game.state = state
             games.append(game)
+        return games
+
+    games_info = query_games_info()
+    if games_info:
+        for elem in games_info:
+            games.append(Game(**elem))
+        hydrate_games(games, workers=1)
 
     return games
 
 
-def setup(game: Game) -> None:
+def hydrate_games(games: List[Game], workers: int = 4) -> Dict[int, bool]:
+    """
+    Calls setup() for all the passed Games reading the database with a fixed number of queries: the users and the PCs
+    of the Games without snapshot and the journal entries are read first, then the rows of the Games are streamed and
+    each one is set up as soon as it is read, spreading the setups over a pool of threads.
+    The time spent by the phases is recorded in hydration_stats ("fetch" and "hydrate").
+    A Game that fails is printed and skipped, so it can be loaded again later.
+
+    :param games: the Games to set up, e.g. the ones loaded with load_games(lazy=True).
+    :param workers: the number of threads; with 1 or less the Games are set up by the calling thread.
+    :return: dictionary where the keys are the ids of the Games set up and the values are the results of setup()
+    """
+    by_id = {game.identifier: game for game in games}
+
+    start = time.perf_counter()
+    game_ids = list(by_id)
+    if snapshot_settings["enabled"]:
+        game_ids = query_games_without_snapshot(game_ids)
+    users = query_games_users(game_ids)
+    characters = query_games_pc_json(game_ids)
+    # the journal is not in the snapshot
+    entries = query_games_journal_entries(list(by_id))
+    hydration_stats.record_phase("fetch", time.perf_counter() - start)
+
+    fetched = set(game_ids)
+
+    def hydrate(game: Game, row: dict):
+        try:
+            journal_entries = entries.get(game.identifier, [])
+            if game.identifier in fetched:
+                return setup(game, row, users.get(game.identifier, []), characters.get(game.identifier, {}),
+                             journal_entries)
+            # the users and PCs of a Game with an unreadable snapshot are read by setup()
+            return setup(game, row, entries=journal_entries)
+        except Exception:
+            traceback.print_exc()
+            return None
+
+    start = time.perf_counter()
+    results = {}
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hydration") as pool:
+            futures = {game_id: pool.submit(hydrate, by_id[game_id], row)
+                       for game_id, row in iter_games_rows(list(by_id))}
+        for game_id, future in futures.items():
+            results[game_id] = future.result()
+    else:
+        for game_id, row in iter_games_rows(list(by_id)):
+            results[game_id] = hydrate(by_id[game_id], row)
+    hydration_stats.record_phase("hydrate", time.perf_counter() - start)
+
+    return {game_id: result for game_id, result in results.items() if result is not None}
+
+
+def setup(game: Game, row: dict = None, users: List[Tuple[str, int, bool]] = None,
+          characters: Dict[int, List[Tuple[int, str]]] = None, entries: List[dict] = None) -> bool:
     """
     This method is used to set all the Game's attribute contained in the DataBase via json strings.
+    If the game has a valid binary snapshot its content is read from it instead of the json strings.
+    The journal keeps its html and the entries appended afterwards as they are read: it is rebuilt when it is used.
+    The time spent is recorded in hydration_stats.
 
     :param game: Game whose attributes will be set
+    :param row: the row of the game already read by iter_games_rows(); if it is None the row is read by setup().
+    :param users: the users of the game already read by query_games_users(); if it is None they are read when needed.
+    :param characters: the PCs of the game already read by query_games_pc_json(); if it is None they are read when
+        needed.
+    :param entries: the journal entries of the game already read by query_games_journal_entries(); if it is None they
+        are read.
+    :return: True if the content has been read from the snapshot, False if it has been read from the json strings.
+    """
+    start = time.perf_counter()
+    snapshot = None
+    if snapshot_settings["enabled"]:
+        snapshot = load_snapshot(row["Snapshot"] if row is not None else query_game_snapshot(game.identifier))
+
+    if snapshot is not None:
+        db_game = row if row is not None else query_game_json(game.identifier, ["Journal", "Journal_Anchor_JSON",
+                                                                                "State", "Language"])
+        for name, value in snapshot.items():
+            setattr(game, name, value)
+    else:
+        db_game = row if row is not None else query_game_json(game.identifier)
+        setup_content(game, db_game, users, characters)
+
+    if entries is None:
+        entries = query_journal_entries(game.identifier)
+    # the html is parsed and the entries replayed only when the journal is used
+    anchor = db_game["Journal_Anchor_JSON"]
+    game.journal.load(db_game["Journal"], json.loads(anchor) if anchor is not None else None, entries,
+                      len(game.scores) if db_game["Journal"] is not None else 0)
+
+    if db_game["Language"] is not None:
+        game.journal.change_lang(db_game["Language"])
+
+    if db_game["State"] is not None:
+        game.state = db_game["State"]
+
+    hydration_stats.record(game.identifier, time.perf_counter() - start, snapshot is not None)
+    return snapshot is not None
+
+
+def setup_content(game: Game, db_game: dict, users: List[Tuple[str, int, bool]] = None,
+                  characters: Dict[int, List[Tuple[int, str]]] = None) -> None:
     """
-    db_game = query_game_json(game.identifier)
+    Sets the players, PCs, crew, NPCs, factions, clocks, scores and crafted items of the Game from the json strings,
+    linking the objects that refer to each other by name through indexes built once: the linked objects are the ones
+    of the Game, not copies.
 
+    :param game: Game whose attributes will be set
+    :param db_game: dictionary of the json strings of the game, as returned by query_game_json
+    :param users: the users of the game, as returned by query_users_from_game; if it is None they are read.
+    :param characters: the PCs of the game, as returned by query_pc_json; if it is None they are read.
+    """
     if db_game["Faction_JSON"] is not None:
         game.factions = factions_from_json(db_game["Faction_JSON"])
+    factions = index_by_name(game.factions)
 
     if db_game["Clock_JSON"] is not None:
         game.clocks = clocks_from_json(db_game["Clock_JSON"])
@@ -141,71 +289,78 @@ def setup(game: Game) -> None:
     if db_game["NPC_JSON"] is not None:
         game.NPCs = npcs_from_json(db_game["NPC_JSON"])
         for npc in game.NPCs:
-            npc.faction = find_obj(npc.faction, game.factions)
+            npc.faction = find_obj(npc.faction, factions)
+    npcs = index_by_name(game.NPCs)
 
     if db_game["Crew_JSON"] is not None:
         crew = crew_from_json(db_game["Crew_JSON"])
-        crew.contact = find_obj(crew.contact, game.NPCs)
+        crew.contact = find_obj(crew.contact, npcs)
         game.crew = crew
 
     if db_game["Score_JSON"] is not None:
-        temp = copy.deepcopy(game.factions)
-        temp += game.NPCs
+        # a faction is found before an NPC with the same name
+        targets = {**npcs, **factions}
         scores = scores_from_json(db_game["Score_JSON"])
         for score in scores:
-            score.target = find_obj(score.target, temp)
+            score.target = find_obj(score.target, targets)
         game.scores = scores
 
     if db_game["Crafted_Item_JSON"] is not None:
         game.crafted_items = items_from_json(db_game["Crafted_Item_JSON"])
 
-    if db_game["Journal"] is not None:
-        game.journal.log = BeautifulSoup(db_game["Journal"], 'html.parser')
-        scores = game.journal.log.find_all("div", attrs={"class": "score"}, recursive=True)
-        if scores is not None and len(scores) > 0:
-            game.journal.score_tag = scores[len(scores) - 1]
-        else:
-            game.journal.score_tag = None
-        game.journal.indentation = len(game.scores)
+    if users is None:
+        users = query_users_from_game(game.identifier)
+    players = [Player(*t) for t in users]
 
-        game.journal.change_lang(db_game["Language"])
+    if characters is None:
+        characters = query_pc_json(game.identifier)
 
-    if db_game["State"] is not None:
-        game.state = db_game["State"]
+    for u in players:
+        pcs = []
+        for char_id, char_json in characters.get(u.player_id, []):
+            c = pc_from_json(char_json, char_id)
+            if c is None:
+                continue
+            pcs.append(c)
+            if isinstance(c, Human):
+                c.friend = find_obj(c.friend, npcs)
+                c.enemy = find_obj(c.enemy, npcs)
+            elif isinstance(c, Vampire):
+                c.dark_servants = [find_obj(servant, npcs) for servant in c.dark_servants]
+        u.characters = pcs
 
-    users = []
-    users_tuple = query_users_from_game(game.identifier)
-    for t in users_tuple:
-        users.append(Player(*t))
+    game.users = players
 
-    characters_dict = query_pc_json(game.identifier)
 
-    for u in users:
-        characters = characters_from_json(characters_dict[u.player_id])
-        for c in characters:
-            if isinstance(c, Human):
-                c.friend = find_obj(c.friend, game.NPCs)
-                c.enemy = find_obj(c.enemy, game.NPCs)
-            elif isinstance(c, Vampire):
-                servants = []
-                for servant in c.dark_servants:
-                    servant = find_obj(servant, game.NPCs)
-                    servants.append(servant)
-                c.dark_servants = servants
-        u.characters = characters
+def index_by_name(objects: Iterable) -> Dict[str, Any]:
+    """
+    Builds the dictionary used by find_obj() to find the objects by name.
 
-    game.users = users
+    :param objects: objects that have an attribute name
+    :return: dictionary with key = name, value = the first object with that name
+    """
+    index = {}
+    for obj in objects:
+        index.setdefault(obj.name, obj)
+    return index
 
 
-def find_obj(name: str, to_search: List):
+def find_obj(name: str, to_search: Union[List, Dict[str, Any], Callable[[str], Any]]):
     """
-    Method used to find an object in a list given its name
+    Method used to find an object in a list given its name. In a list or a dictionary the name must match exactly,
+    case included.
 
     :param name: string with the name of the object
-    :param to_search: list of object that have an attribute name
+    :param to_search: list of object that have an attribute name, a dictionary built by index_by_name() or a function
+        that finds the object given its name (e.g. one of the lookups of Game backed by a NameIndex)
     :return: object with matching name
     """
-    for obj in to_search:
-        if obj.name == name:
-            return obj
-    return name
+    if not isinstance(name, str):
+        return name
+    if isinstance(to_search, dict):
+        obj = to_search.get(name)
+    elif callable(to_search):
+        obj = to_search(name)
+    else:
+        obj = next((elem for elem in to_search if elem.name == name), None)
+    return name if obj is None else obj
@@ -0,0 +1,92 @@
+import io
+import pickle
+import struct
+import traceback
+from typing import Any, Dict, Optional
+
+from controller.DBcanon import canon_catalog
+from controller.DBprofile import load_section
+
+MAGIC = b"BitG"
+SNAPSHOT_VERSION = 2
+HEADER = struct.Struct(">4sH")
+
+SNAPSHOT_ATTRIBUTES = ("users", "NPCs", "crew", "factions", "clocks", "scores", "crafted_items")
+
+ALLOWED_PACKAGES = ("character", "component", "organization")
+ALLOWED_MODULES = ("game.Player", "game.Score", "utility.NameIndex")
+
+settings = {"enabled": True, **load_section("snapshot")}
+
+
+class SnapshotPickler(pickle.Pickler):
+    """
+    Pickler that stores the shared canon SpecialAbility objects by name, so they are shared again when loaded.
+    """
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        if canon_catalog.is_canon(obj):
+            return "ability", obj.name
+        return None
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickler that only rebuilds the classes of the model of the game (and the key functions of the NameIndex), so a
+    snapshot cannot make the bot import or call anything else.
+    """
+
+    def find_class(self, module: str, name: str) -> Any:
+        package = module[len("main."):] if module.startswith("main.") else module
+        if package.split(".")[0] in ALLOWED_PACKAGES or package in ALLOWED_MODULES:
+            obj = super().find_class(module, name)
+            if getattr(obj, "__module__", None) == module and (isinstance(obj, type) or package == "utility.NameIndex"):
+                return obj
+        raise pickle.UnpicklingError("{}.{} is not allowed in a game snapshot".format(module, name))
+
+    def persistent_load(self, pid: Any) -> Any:
+        if isinstance(pid, tuple) and len(pid) == 2 and pid[0] == "ability":
+            ability = canon_catalog.ability_by_name(pid[1])
+            if ability is not None:
+                return ability
+        raise pickle.UnpicklingError("{} is not a canon object".format(pid))
+
+
+def dump_snapshot(game) -> bytes:
+    """
+    Builds the snapshot of the content of the passed game: its players with their PCs, crew, NPCs, factions, clocks,
+    scores and crafted items, keeping the references between them and to the shared canon objects. The journal, the
+    state and the language are not part of it.
+
+    :param game: the Game to save.
+    :return: the bytes of the snapshot: MAGIC, SNAPSHOT_VERSION and the pickle (protocol 5) of the attributes, where
+        the canon SpecialAbility are stored by name.
+    """
+    attributes = {name: getattr(game, name) for name in SNAPSHOT_ATTRIBUTES}
+    buffer = io.BytesIO()
+    buffer.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION))
+    SnapshotPickler(buffer, protocol=5).dump(attributes)
+    return buffer.getvalue()
+
+
+def load_snapshot(data: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """
+    Reads a snapshot built by dump_snapshot().
+
+    :param data: the bytes of the snapshot.
+    :return: the dictionary of the attributes of the game; None if data is missing, has been written by another
+        version or cannot be read, so the game has to be loaded from the json columns.
+    """
+    if not isinstance(data, bytes) or len(data) < HEADER.size:
+        return None
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version != SNAPSHOT_VERSION:
+        return None
+    try:
+        attributes = SnapshotUnpickler(io.BytesIO(memoryview(data)[HEADER.size:])).load()
+    except Exception:
+        traceback.print_exc()
+        return None
+    if not isinstance(attributes, dict) or set(attributes) != set(SNAPSHOT_ATTRIBUTES):
+        return None
+    return attributes
@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Optional, Union
+
+
+class HydrationStats:
+    """
+    Collects the time spent to read the content of each game from the database and to rebuild its objects (hydration),
+    and the time spent by the phases of the startup of the bot.
+    """
+
+    def __init__(self) -> None:
+        self.__times: Dict[int, float] = {}
+        self.__games = 0
+        self.__from_snapshot = 0
+        self.__total = 0.0
+        self.__max = 0.0
+        self.__slowest: Optional[int] = None
+        self.__phases: Dict[str, float] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, game_id: int, seconds: float, snapshot: bool) -> None:
+        """
+        Records the hydration of a game.
+
+        :param game_id: the id of the game.
+        :param seconds: the time spent by the hydration.
+        :param snapshot: True if the game has been read from its snapshot, False if from the json columns.
+        """
+        with self.__lock:
+            self.__times[game_id] = seconds
+            self.__games += 1
+            self.__from_snapshot += snapshot
+            self.__total += seconds
+            if seconds >= self.__max:
+                self.__max = seconds
+                self.__slowest = game_id
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """
+        Records the time spent by a phase of the startup.
+
+        :param phase: the name of the phase, e.g. "fetch".
+        :param seconds: the time spent by the phase.
+        """
+        with self.__lock:
+            self.__phases[phase] = seconds
+
+    def last(self, game_id: int) -> Optional[float]:
+        """
+        Gets the time spent by the last hydration of the passed game.
+
+        :param game_id: the id of the game.
+        :return: the seconds, None if the game has not been hydrated.
+        """
+        with self.__lock:
+            return self.__times.get(game_id)
+
+    def forget(self, game_id: int) -> None:
+        """
+        Drops the time of the passed game, e.g. because it has been ended.
+
+        :param game_id: the id of the game.
+        """
+        with self.__lock:
+            self.__times.pop(game_id, None)
+
+    def stats(self) -> Dict[str, Union[int, float, None, Dict[str, float]]]:
+        """
+        Gets the counters of the hydrations.
+
+        :return: a dictionary with the keys "games" (the hydrations), "from_snapshot", "total_ms", "mean_ms", "max_ms",
+            "slowest" (the id of the game with the slowest hydration) and "phases" (the milliseconds of each phase of
+            the startup).
+        """
+        with self.__lock:
+            return {"games": self.__games, "from_snapshot": self.__from_snapshot,
+                    "total_ms": round(self.__total * 1000, 3),
+                    "mean_ms": round(self.__total * 1000 / self.__games, 3) if self.__games else 0.0,
+                    "max_ms": round(self.__max * 1000, 3), "slowest": self.__slowest,
+                    "phases": {phase: round(seconds * 1000, 3) for phase, seconds in self.__phases.items()}}
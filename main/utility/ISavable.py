@@ -1,6 +1,5 @@
-import copy
 import json
-from typing import List, Union
+from typing import Any, List, Union
 
 
 class ISavable:
@@ -12,7 +11,38 @@ class ISavable:
         This method is used to get the dictionary of the object that can then be saved in json format
         :return:
         """
-        return json.loads(json.dumps(copy.deepcopy(self), default=lambda o: o.__dict__, indent=5))
+        return to_plain(self.__dict__)
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Converts a value into the structure of dictionaries, lists and scalars that json would produce dumping it with
+    default=lambda o: o.__dict__ and loading it back, without copying the value or encoding it: the objects become
+    the dictionaries of their attributes (their save_to_dict is not called), the tuples become lists and the keys of
+    the dictionaries become strings.
+
+    :param value: the value to convert.
+    :return: the converted value, made only of new containers.
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {_plain_key(key): to_plain(elem) for key, elem in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(elem) for elem in value]
+    return to_plain(value.__dict__)
+
+
+def _plain_key(key: Any) -> str:
+    """
+    Converts the key of a dictionary like json does.
+
+    :param key: a key of str, int, float, bool or None type.
+    :return: the string used as key by json.
+    """
+    if isinstance(key, str):
+        return key
+    return json.dumps(key)
 
 
 def pop_dict_items(data: dict, items: List[str]):
@@ -31,12 +61,9 @@ def save_to_json(to_save: Union[List[ISavable], ISavable]) -> str:
     This method is used to save an object or a list of object in a string with json syntax
 
     :param to_save: is either an object or a list of object that inherit from ISavable
-    :return: string with json syntax
+    :return: compact string with json syntax
     """
     if isinstance(to_save, ISavable):
-        return json.dumps(to_save.save_to_dict(), indent=5)
+        return json.dumps(to_save.save_to_dict(), separators=(",", ":"))
     else:
-        temp = []
-        for i in range(len(to_save)):
-            temp.append(to_save[i].save_to_dict())
-        return json.dumps(temp, indent=5)
+        return json.dumps([elem.save_to_dict() for elem in to_save], separators=(",", ":"))
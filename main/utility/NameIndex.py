@@ -0,0 +1,142 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+def name_key(obj: Any) -> str:
+    """
+    Key of the objects indexed by their name, regardless of the case.
+
+    :param obj: an object with the attribute name.
+    :return: the lowercase name.
+    """
+    return obj.name.lower()
+
+
+def name_role_key(obj: Any) -> tuple:
+    """
+    Key of the NPCs indexed by their name and role, regardless of the case.
+
+    :param obj: an object with the attributes name and role.
+    :return: a tuple with the lowercase name and role.
+    """
+    return obj.name.lower(), obj.role.lower()
+
+
+def player_id_key(obj: Any) -> int:
+    """
+    Key of the Players indexed by their Telegram id.
+
+    :param obj: a Player.
+    :return: the player_id.
+    """
+    return obj.player_id
+
+
+class NameIndex:
+    """
+    Dictionary that finds the objects of a list by a key (e.g. their lowercase name) without scanning it.
+    When more objects have the same key the first one in the list is found, like a linear search would.
+
+    The owner of the list keeps the index in sync calling add(), remove() and replace() after changing the list.
+    As a safety net the index is rebuilt when the list is replaced or its length is not the expected one, and when
+    the key of the found object has changed; after a rename invalidate() has to be called, so the new key is found.
+    """
+
+    def __init__(self, key: Callable[[Any], Hashable]) -> None:
+        """
+        Constructor of the index.
+
+        :param key: the module-level function that computes the key of an object.
+        """
+        self.__key = key
+        self.__items: Optional[List] = None
+        self.__size = 0
+        self.__map: Dict[Hashable, Any] = {}
+
+    def find(self, items: List, key: Hashable) -> Any:
+        """
+        Finds the first object of the list with the passed key.
+
+        :param items: the indexed list.
+        :param key: the key to search.
+        :return: the object, None if it is not found.
+        """
+        if not self.__synced(items):
+            self.__rebuild(items)
+        obj = self.__map.get(key)
+        if obj is not None and self.__key(obj) != key:
+            self.__rebuild(items)
+            obj = self.__map.get(key)
+        return obj
+
+    def add(self, items: List, obj: Any) -> None:
+        """
+        Updates the index after obj has been appended to the list.
+
+        :param items: the indexed list.
+        :param obj: the appended object.
+        """
+        if self.__items is items and self.__size == len(items) - 1:
+            self.__map.setdefault(self.__key(obj), obj)
+            self.__size += 1
+        else:
+            self.__items = None
+
+    def remove(self, items: List, obj: Any) -> None:
+        """
+        Updates the index after obj has been removed from the list.
+
+        :param items: the indexed list.
+        :param obj: the removed object.
+        """
+        if self.__items is items and self.__size == len(items) + 1 and self.__map.get(self.__key(obj)) is not obj:
+            self.__size -= 1
+        else:
+            # another object with the same key may have to take its place
+            self.__items = None
+
+    def replace(self, items: List, old: Any, new: Any) -> None:
+        """
+        Updates the index after old has been replaced by new in the list.
+
+        :param items: the indexed list.
+        :param old: the replaced object.
+        :param new: the new object.
+        """
+        key = self.__key(new)
+        if self.__items is items and self.__key(old) == key and self.__map.get(key) is old:
+            self.__map[key] = new
+        else:
+            self.__items = None
+
+    def invalidate(self) -> None:
+        """
+        Forces the rebuild of the index at the next search, e.g. after an object has been renamed.
+        """
+        self.__items = None
+
+    def __synced(self, items: List) -> bool:
+        return self.__items is items and self.__size == len(items)
+
+    def __rebuild(self, items: List) -> None:
+        self.__map = {}
+        for obj in items:
+            self.__map.setdefault(self.__key(obj), obj)
+        self.__items = items
+        self.__size = len(items)
+
+    def __eq__(self, o: object) -> bool:
+        # the index is derived from the list, so it never makes two owners different
+        return isinstance(o, self.__class__)
+
+    def __repr__(self) -> str:
+        return "NameIndex({})".format(self.__key.__name__)
+
+
+def without_indexes(attributes: dict) -> dict:
+    """
+    Filters the NameIndex objects out of the attributes of an object, e.g. to print it.
+
+    :param attributes: the __dict__ of the object.
+    :return: a new dictionary without the indexes.
+    """
+    return {name: value for name, value in attributes.items() if not isinstance(value, NameIndex)}
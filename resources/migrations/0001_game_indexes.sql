@@ -0,0 +1,3 @@
+-- Games are looked up by the chat they are played in, users by the games they joined.
+CREATE INDEX IF NOT EXISTS Game_Chat_Index ON Game (Tel_Chat_ID, Title);
+CREATE INDEX IF NOT EXISTS User_Game_Game_Index ON User_Game (Game_ID, User_ID, Master);
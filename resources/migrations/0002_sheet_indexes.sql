@@ -0,0 +1,11 @@
+-- Covering indexes for the lookups of the special abilities, xp triggers and upgrades of a sheet,
+-- plus the reverse access paths used when the relation tables are joined from the canon side.
+CREATE INDEX IF NOT EXISTS Char_SA_Character_Index ON Char_SA (Character, Peculiar, SpecialAbility);
+CREATE INDEX IF NOT EXISTS Char_SA_Ability_Index ON Char_SA (SpecialAbility, Character);
+CREATE INDEX IF NOT EXISTS Crew_SA_Crew_Index ON Crew_SA (Crew, Peculiar, SpecialAbility);
+CREATE INDEX IF NOT EXISTS Crew_SA_Ability_Index ON Crew_SA (SpecialAbility, Crew);
+CREATE INDEX IF NOT EXISTS Char_Xp_Character_Index ON Char_Xp (Character, Peculiar, XpID);
+CREATE INDEX IF NOT EXISTS Char_Xp_Trigger_Index ON Char_Xp (XpID, Peculiar);
+CREATE INDEX IF NOT EXISTS Crew_Xp_Crew_Index ON Crew_Xp (Crew, Peculiar, XpID);
+CREATE INDEX IF NOT EXISTS Crew_Xp_Trigger_Index ON Crew_Xp (XpID, Peculiar);
+CREATE INDEX IF NOT EXISTS Crew_Upgrade_Upgrade_Index ON Crew_Upgrade (Upgrade, Crew);
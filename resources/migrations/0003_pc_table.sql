@@ -0,0 +1,19 @@
+-- Every PC is stored in its own row, identified by a stable Char_ID, instead of the User_Game.Char_JSON list.
+CREATE TABLE IF NOT EXISTS PC (
+    Char_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    User_ID INTEGER NOT NULL,
+    Game_ID INTEGER NOT NULL,
+    Char_JSON TEXT NOT NULL,
+    FOREIGN KEY (User_ID, Game_ID) REFERENCES User_Game (User_ID, Game_ID) ON DELETE CASCADE ON UPDATE CASCADE);
+CREATE INDEX IF NOT EXISTS PC_Game_Index ON PC (Game_ID, User_ID);
+
+-- Split the existing lists, keeping the order of the PCs of each user.
+INSERT INTO PC (User_ID, Game_ID, Char_JSON)
+SELECT UG.User_ID, UG.Game_ID, J.value
+FROM User_Game UG, json_each(UG.Char_JSON) J
+WHERE json_valid(UG.Char_JSON) AND json_type(UG.Char_JSON) = 'array'
+ORDER BY UG.Game_ID, UG.User_ID, J.key;
+
+UPDATE User_Game
+SET Char_JSON = NULL
+WHERE json_valid(Char_JSON) AND json_type(Char_JSON) = 'array';
@@ -0,0 +1,3 @@
+-- The games are loaded at startup from their headers only: State is stored after the blobs of the row, so reading it
+-- from the table would walk the overflow pages of the journal.
+CREATE INDEX IF NOT EXISTS Game_Header_Index ON Game (Game_ID, Title, Tel_Chat_ID, State);
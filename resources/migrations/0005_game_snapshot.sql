@@ -0,0 +1,42 @@
+-- Binary snapshot of the content of a game (players, PCs, crew, NPCs, factions, clocks, scores and crafted items), read
+-- instead of the json columns when it is present. The triggers drop it as soon as any of the data it was built from
+-- changes, so a stale snapshot is never loaded whatever the path of the write (the names of the players are covered by
+-- 0008_user_snapshot.sql).
+ALTER TABLE Game ADD COLUMN Snapshot BLOB;
+
+CREATE TRIGGER IF NOT EXISTS Game_Snapshot_Stale
+AFTER UPDATE OF Crew_JSON, Crafted_Item_JSON, NPC_JSON, Faction_JSON, Score_JSON, Clock_JSON ON Game
+WHEN NEW.Snapshot IS NOT NULL AND NEW.Snapshot IS OLD.Snapshot
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID = NEW.Game_ID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS PC_Insert_Snapshot_Stale AFTER INSERT ON PC
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID = NEW.Game_ID AND Snapshot IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS PC_Update_Snapshot_Stale AFTER UPDATE ON PC
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID IN (OLD.Game_ID, NEW.Game_ID) AND Snapshot IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS PC_Delete_Snapshot_Stale AFTER DELETE ON PC
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID = OLD.Game_ID AND Snapshot IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS User_Game_Insert_Snapshot_Stale AFTER INSERT ON User_Game
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID = NEW.Game_ID AND Snapshot IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS User_Game_Update_Snapshot_Stale AFTER UPDATE ON User_Game
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID IN (OLD.Game_ID, NEW.Game_ID) AND Snapshot IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS User_Game_Delete_Snapshot_Stale AFTER DELETE ON User_Game
+BEGIN
+    UPDATE Game SET Snapshot = NULL WHERE Game_ID = OLD.Game_ID AND Snapshot IS NOT NULL;
+END;
@@ -0,0 +1,15 @@
+-- Every event written in the journal of a game is appended in its own row, with the phase and the score it happened
+-- in, instead of rewriting the whole html document in Game.Journal at each event. Game.Journal keeps only the document
+-- rendered the last time the journal has been read (NULL if it has never been read): the html is rebuilt replaying on
+-- it the entries written afterwards.
+CREATE TABLE IF NOT EXISTS Journal_Entry (
+    Entry_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Game_ID INTEGER NOT NULL,
+    Method TEXT NOT NULL,
+    Args_JSON TEXT NOT NULL,
+    Language TEXT NOT NULL,
+    Indentation INTEGER NOT NULL DEFAULT 0,
+    Phase INTEGER,
+    Score TEXT,
+    FOREIGN KEY (Game_ID) REFERENCES Game (Game_ID) ON DELETE CASCADE ON UPDATE CASCADE);
+CREATE INDEX IF NOT EXISTS Journal_Entry_Game_Index ON Journal_Entry (Game_ID, Entry_ID);
@@ -0,0 +1,3 @@
+-- Position of the current score in the html stored in Game.Journal, written with it, so that a game is loaded keeping
+-- its journal as a string: the html is parsed only when the journal is first read or written.
+ALTER TABLE Game ADD COLUMN Journal_Anchor_JSON TEXT;
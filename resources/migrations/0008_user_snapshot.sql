@@ -0,0 +1,8 @@
+-- The snapshot of a game stores the names of its players too: it is dropped when one of them changes name, as for the
+-- other data it is built from (see 0005_game_snapshot.sql).
+CREATE TRIGGER IF NOT EXISTS User_Update_Snapshot_Stale AFTER UPDATE OF Name ON User
+WHEN NEW.Name IS NOT OLD.Name
+BEGIN
+    UPDATE Game SET Snapshot = NULL
+    WHERE Game_ID IN (SELECT Game_ID FROM User_Game WHERE User_ID = NEW.Tel_ID) AND Snapshot IS NOT NULL;
+END;
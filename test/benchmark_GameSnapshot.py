@@ -0,0 +1,80 @@
+"""
+Compares the time spent by FilesLoader.setup to load a game from its binary snapshot and from its json columns.
+The game is written with the id -1 in the database of the bot and deleted at the end.
+Run it from the test folder with PYTHONPATH=../main:.. python benchmark_GameSnapshot.py
+"""
+import timeit
+
+from character.Action import Action
+from character.Attribute import Attribute
+from character.Human import Human
+from character.Item import Item
+from character.NPC import NPC
+from character.Playbook import Playbook
+from component.Clock import Clock
+from controller.DBreader import query_game_snapshot
+from controller.DBwriter import *
+from game.Game import Game
+from game.Player import Player
+from game.Score import Score
+from organization.Claim import Claim
+from organization.Crew import Crew
+from organization.Faction import Faction
+from organization.Lair import Lair
+from utility.FilesLoader import setup
+from utility.GameSnapshot import dump_snapshot, settings
+from utility.ISavable import save_to_json
+
+GAME_ID = -1
+USERS = (483691923, 1302180605, 1456903177)
+
+
+def build_game() -> Game:
+    factions = [Faction("Faction{}".format(i), i % 5, bool(i % 2), "Underworld", i % 3) for i in range(40)]
+    npcs = [NPC("NPC{}".format(i), "Role{}".format(i), factions[i % len(factions)], "Notes") for i in range(80)]
+    game = Game(identifier=GAME_ID, title="Benchmark", chat_id=GAME_ID, NPCs=npcs, factions=factions,
+                clocks=[Clock("Clock{}".format(i), 8, i % 8) for i in range(30)],
+                crafted_items=[Item("Item{}".format(i), "An item", 1) for i in range(20)])
+    game.crew = Crew("Crew", "Smugglers", "Reputation", Lair("Lair", "A lair", [Claim("Turf", "A turf")]),
+                     contact=npcs[0])
+    game.scores = [Score("Score{}".format(i), ["PC0"], 2, factions[i]) for i in range(3)]
+    for user_id in USERS:
+        player = Player("User{}".format(user_id), user_id)
+        for i in range(2):
+            human = Human("PC{}{}".format(user_id, i), friend=npcs[i], enemy=npcs[i + 1], healing=Clock("Healing"),
+                          playbook=Playbook(8), attributes=[Attribute("Insight", [Action("Hunt", 2)])])
+            player.add_character(human)
+        game.add_player(player)
+    return game
+
+
+def store_game(game: Game) -> None:
+    insert_game(GAME_ID, game.title, game.chat_id)
+    update_game_columns(GAME_ID, crew_json=save_to_json(game.crew), npc_json=save_to_json(game.NPCs),
+                        faction_json=save_to_json(game.factions), clock_json=save_to_json(game.clocks),
+                        score_json=save_to_json(game.scores), crafted_item_json=save_to_json(game.crafted_items))
+    for player in game.users:
+        insert_user_game(player.player_id, GAME_ID)
+        for pc in player.characters:
+            pc.char_id = insert_character(player.player_id, GAME_ID, save_to_json(pc))
+    update_game_columns(GAME_ID, snapshot=dump_snapshot(game))
+
+
+def main(number: int = 200) -> None:
+    store_game(build_game())
+    try:
+        times = {}
+        for enabled in (False, True):
+            settings["enabled"] = enabled
+            # the games are built beforehand, so only setup is timed
+            games = iter([Game(GAME_ID, "Benchmark", chat_id=GAME_ID) for _ in range(number)])
+            times[enabled] = timeit.timeit(lambda: setup(next(games)), number=number) / number
+        print("json     {:8.3f} ms".format(times[False] * 1000))
+        print("snapshot {:8.3f} ms  speedup x{:.1f}  size {} bytes".format(
+            times[True] * 1000, times[False] / times[True], len(query_game_snapshot(GAME_ID))))
+    finally:
+        delete_game(GAME_ID)
+
+
+if __name__ == '__main__':
+    main()
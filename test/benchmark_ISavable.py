@@ -0,0 +1,76 @@
+"""
+Compares the time spent to save a character sheet, a crew and a list of clocks with save_to_json and with the
+serialization used before it (deepcopy and json round trip of every object, indented output).
+Run it from the test folder with PYTHONPATH=../main:.. python benchmark_ISavable.py
+"""
+import copy
+import json
+import timeit
+
+from character.Action import Action
+from character.Attribute import Attribute
+from character.Human import Human
+from character.Item import Item
+from character.NPC import NPC
+from character.Playbook import Playbook
+from character.Vice import Vice
+from component.Clock import Clock
+from component.SpecialAbility import SpecialAbility
+from organization.Claim import Claim
+from organization.Crew import Crew
+from organization.Faction import Faction
+from organization.Lair import Lair
+from organization.Upgrade import Upgrade
+from utility.ISavable import ISavable, save_to_json
+
+
+def legacy_save_to_dict(self) -> dict:
+    return json.loads(json.dumps(copy.deepcopy(self), default=lambda o: o.__dict__, indent=5))
+
+
+def legacy_save_to_json(to_save) -> str:
+    """
+    Saves the passed object like save_to_json did before: the overrides of save_to_dict in the subclasses still run,
+    on top of the deepcopy and json round trip of ISavable.save_to_dict.
+    """
+    current_save_to_dict = ISavable.save_to_dict
+    ISavable.save_to_dict = legacy_save_to_dict
+    try:
+        if isinstance(to_save, ISavable):
+            return json.dumps(to_save.save_to_dict(), indent=5)
+        return json.dumps([elem.save_to_dict() for elem in to_save], indent=5)
+    finally:
+        ISavable.save_to_dict = current_save_to_dict
+
+
+def build_samples() -> dict:
+    attributes = [Attribute("Insight", [Action("Hunt", 3), Action("Study", 2), Action("Survey", 1)]),
+                  Attribute("Prowess", [Action("Skirmish", 3), Action("Finesse", 1)]),
+                  Attribute("Resolve", [Action("Attune", 3), Action("Consort", 2)])]
+    human = Human("Geralt", "White Wolf", items=[Item("Aerondight", "Silver Sword", 2),
+                                                 Item("Ekhidna Decoction", "More stamina, more life")],
+                  healing=Clock("Healing"), abilities=[SpecialAbility("Alchemist", "Great at making potions"),
+                                                       SpecialAbility("Venomous", "Immune to poison")],
+                  playbook=Playbook(5), attributes=attributes,
+                  vice=Vice("Pleasure", "Sometimes it gets lonely", "Passiflora"), pc_class="Whisper",
+                  friend=NPC("Dandelion", "The bard", Faction("Bards")), enemy=NPC("Dijkstra", "Spymaster"))
+    crew = Crew("Contrabbandieri", "smugglers", "honorables",
+                Lair("crow's foot", "a little barrack", [Claim("Turf", "a turf"), Claim("Tavern", "Hound Pits")]),
+                tier=2, contact=NPC("Rolan", "a drug-dealer"), description="a guild of smugglers",
+                upgrades=[Upgrade("Vehicle", 1, 2), Upgrade("Barge", 1, 2)])
+    clocks = [Clock("Clock{}".format(i), 8, i % 8) for i in range(20)]
+    return {"human": human, "crew": crew, "clocks": clocks}
+
+
+def main(number: int = 500) -> None:
+    for name, sample in build_samples().items():
+        assert json.loads(save_to_json(sample)) == json.loads(legacy_save_to_json(sample)), name
+        legacy = timeit.timeit(lambda: legacy_save_to_json(sample), number=number)
+        current = timeit.timeit(lambda: save_to_json(sample), number=number)
+        print("{:<8} legacy {:8.3f} ms  current {:8.3f} ms  speedup x{:.1f}  size {} -> {} bytes".format(
+            name, legacy * 1000 / number, current * 1000 / number, legacy / current,
+            len(legacy_save_to_json(sample)), len(save_to_json(sample))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import sqlite3
+from unittest import TestCase, mock
+
+from controller.Controller import *
+
+
+class TestController(TestCase):
+    def setUp(self) -> None:
+        self.controller = Controller()
+
+    def test_read_codex(self):
+        journal = Journal()
+        codex = self.controller.read_codex(journal, "The Knives of Doskvol")
+        self.assertEqual(journal.read_codex("The Knives of Doskvol", query_codex()), codex)
+
+        cached = self.controller.codex_cache[journal.language]
+        self.assertEqual(journal.read_codex("Doskvol", query_codex()), self.controller.read_codex(journal, "Doskvol"))
+        self.assertIs(cached, self.controller.codex_cache[journal.language])
+        self.assertIn(b"<h1>Codex - Knives &amp; Blades</h1>", self.controller.read_codex(journal, "Knives & Blades"))
+
+        reference_cache.invalidate("Claim")
+        self.controller.read_codex(journal, "Doskvol")
+        self.assertIsNot(cached, self.controller.codex_cache[journal.language])
+
+    def test_memberships(self):
+        self.assertEqual({}, self.controller.check_memberships())
+        insert_game(-1, "Game1", -10)
+        insert_user_game(483691923, -1)
+        self.assertEqual({(-10, 483691923): (None, -1)}, self.controller.check_memberships())
+
+        self.controller.add_membership(-10, 483691923, -1)
+        self.assertEqual(-1, self.controller.game_of_user(-10, 483691923))
+        self.assertEqual({}, self.controller.check_memberships())
+
+        with self.assertRaises(ValueError):
+            with transaction():
+                delete_game(-1)
+                self.controller.remove_memberships(-1)
+                raise ValueError
+        self.assertEqual(-1, self.controller.game_of_user(-10, 483691923))
+
+        delete_game(-1)
+        self.controller.remove_memberships(-1)
+        self.assertIsNone(self.controller.game_of_user(-10, 483691923))
+        self.assertEqual({}, self.controller.check_memberships())
+
+    def test_memberships_same_chat(self):
+        for game_id in (-1, -2):
+            insert_game(game_id, "Game{}".format(-game_id), -10)
+            self.addCleanup(delete_game, game_id)
+            insert_user_game(483691923, game_id)
+            self.controller.add_membership(-10, 483691923, game_id)
+        self.assertEqual(-1, self.controller.game_of_user(-10, 483691923))
+
+        delete_game(-1)
+        self.controller.remove_memberships(-1)
+        self.assertEqual(-2, self.controller.game_of_user(-10, 483691923))
+        self.assertEqual({}, self.controller.check_memberships())
+
+    def test_game_command(self):
+        insert_game(-1, "Game1", -10)
+        self.controller.games.add(Game(identifier=-1, title="Game1", chat_id=-10))
+        self.controller.change_state(-1, 1)
+        self.controller.change_journal_language(game_id=-1, lang="ENG.json")
+        self.assertEqual(2, self.controller.locks.stats()["acquisitions"])
+
+        with mock.patch.object(write_behind, "flush", side_effect=lambda: self.assertFalse(in_transaction())) as flush:
+            self.controller.end_game(-1, "The end")
+        flush.assert_called_once()
+        self.assertEqual(0, self.controller.locks.stats()["locks"])
+        self.assertIsNone(self.controller.games.get(-1))
+
+    def test_mark_dirty(self):
+        insert_game(-1, "Game1", -10)
+        self.addCleanup(delete_game, -1)
+        game = Game(identifier=-1, title="Game1", chat_id=-10)
+        self.controller.games.add(game)
+        self.controller.memberships[(-10, 483691923)] = -1
+
+        statements = []
+        with connect() as connection:
+            connection.set_trace_callback(statements.append)
+            try:
+                with transaction():
+                    game.journal.write_title("Game1")
+                    self.controller.mark_dirty(game, "journal")
+                    self.controller.add_clock_to_game(-10, 483691923, {"name": "Kill", "segments": 4})
+                    self.controller.mark_dirty(game, "journal", "clocks")
+            finally:
+                connection.set_trace_callback(None)
+        # the statements firing a trigger are traced again when the trigger starts
+        self.assertFalse([statement for statement in statements if "Journal = " in statement])
+        # one row for each entry, written once
+        self.assertEqual(2, len([statement for statement in statements if "INSERT INTO Journal_Entry" in statement]))
+        self.assertEqual(1, len({statement for statement in statements if "UPDATE Game" in statement and
+                                 "Snapshot = " in statement}))
+        self.assertEqual(save_to_json(game.clocks), query_game_json(-1)["Clock_JSON"])
+        self.assertEqual([], game.journal.entries)
+        self.assertEqual(["write_title", "write_clock"], [entry["method"] for entry in query_journal_entries(-1)])
+
+        loaded = Game(identifier=-1, title="Game1", chat_id=-10)
+        setup(loaded)
+        self.assertEqual(game.journal.get_log_string(), loaded.journal.get_log_string())
+
+        self.controller.get_journal_of_game(-1)
+        self.assertEqual([], query_journal_entries(-1))
+        self.assertEqual(game.journal.get_log_string(), query_game_json(-1)["Journal"])
+        self.assertEqual(game.journal.get_anchor(), json.loads(query_game_json(-1)["Journal_Anchor_JSON"]))
+        self.assertEqual(0, game.journal.stored_entries)
+
+    def test_add_game(self):
+        game_id = self.controller.add_game(-10, "Game1")
+        self.addCleanup(delete_game, game_id)
+        self.assertEqual("Game1", self.controller.games.get(game_id).title)
+        self.assertEqual(game_id, query_last_game_id())
+
+        with mock.patch("controller.Controller.insert_game", side_effect=sqlite3.OperationalError):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.controller.add_game(-10, "Game2")
+        self.assertIsNone(self.controller.games.get(game_id + 1))
+        self.assertTrue(self.controller.lock_add_game.acquire(timeout=1))
+        self.controller.lock_add_game.release()
+
+    def test_change_state(self):
+        insert_game(-1, "Game1", -10)
+        self.addCleanup(delete_game, -1)
+        insert_user_game(483691923, -1)
+        game = Game(identifier=-1, title="Game1", chat_id=-10)
+        pc = Human("Geralt", load=3)
+        pc.char_id = insert_character(483691923, -1, save_to_json(pc))
+        game.users.append(Player("Aldo", 483691923, characters=[pc]))
+        game.scores.append(Score("Steal Benny"))
+        update_game_columns(-1, score_json=save_to_json(game.scores))
+        self.controller.games.add(game)
+
+        self.controller.change_state(-1, 2)
+
+        loaded = Game(identifier=-1, title="Game1", chat_id=-10)
+        setup(loaded)
+        self.assertEqual(2, loaded.state)
+        self.assertEqual([], loaded.scores)
+        self.assertEqual(0, loaded.users[0].characters[0].load)
+
+    def test_preload_games(self):
+        factions = [Faction("Red Sashes", 2)]
+        for game_id in (-1, -2):
+            insert_game(game_id, "Game{}".format(-game_id), -10)
+            self.addCleanup(delete_game, game_id)
+            update_game_columns(game_id, faction_json=save_to_json(factions))
+            self.controller.games.add(Game(identifier=game_id, title="Game{}".format(-game_id), chat_id=-10))
+            self.controller.not_loaded.add(game_id)
+
+        self.assertEqual(2, self.controller.preload_games(5, 2))
+        for game_id in (-1, -2):
+            self.assertNotIn(game_id, self.controller.not_loaded)
+            self.assertEqual(factions, self.controller.games.get(game_id).factions)
+            self.assertIsNotNone(query_game_snapshot(game_id))
+        self.assertEqual({"headers", "fetch", "hydrate", "snapshots"}, set(hydration_stats.stats()["phases"]))
+
+    def test_load_evicted_game(self):
+        insert_game(-1, "Game1", -10)
+        self.addCleanup(delete_game, -1)
+        insert_user_game(483691923, -1)
+        self.controller.games.add(Game(identifier=-1, title="Game1", chat_id=-10))
+        self.controller.not_loaded.add(-1)
+        self.assertEqual(1, len(self.controller.get_game_by_id(-1).users))
+
+        # the game is evicted after a thread has read it from the registry, before it loads it
+        old = self.controller.games.get(-1)
+        self.assertTrue(self.controller.evict_game(-1))
+        loaded = self.controller.load_game(old)
+        self.assertIs(self.controller.games.get(-1), loaded)
+        self.assertNotIn(-1, self.controller.not_loaded)
+        self.assertEqual(1, len(loaded.users))
+        self.assertIs(loaded, self.controller.get_game_by_id(-1))
+
+    def test_evict_games(self):
+        insert_game(-1, "Game1", -10)
+        insert_game(-2, "Game2", -10)
+        for game_id in (-1, -2):
+            self.addCleanup(delete_game, game_id)
+            self.controller.games.add(Game(identifier=game_id, title="Game{}".format(-game_id), chat_id=-10))
+            self.controller.not_loaded.add(game_id)
+        self.controller.eviction = GameEvictionPolicy(max_games=1, idle_timeout=0)
+
+        game = self.controller.get_game_by_id(-1)
+        self.controller.change_journal_language(game_id=-1, lang="ITA.json")
+        insert_journal(-1, game.journal.get_log_string())
+        self.controller.get_game_by_id(-2)
+        self.assertEqual({"loaded": 1, "max_games": 1, "evicted": 1, "reloaded": 0}, self.controller.eviction.stats())
+        self.assertIn(-1, self.controller.not_loaded)
+        self.assertIsNot(game, self.controller.games.get(-1))
+        self.assertEqual("Game1", self.controller.games.get(-1).title)
+
+        with self.controller.locks.lock(-2):
+            thread = threading.Thread(target=self.controller.get_game_by_id, args=(-1,))
+            thread.start()
+            thread.join()
+        self.assertEqual({"loaded": 2, "max_games": 1, "evicted": 1, "reloaded": 1}, self.controller.eviction.stats())
+        self.assertEqual("ITA.json", self.controller.get_game_by_id(-1).journal.language)
+        self.assertEqual({"loaded": 1, "max_games": 1, "evicted": 2, "reloaded": 1}, self.controller.eviction.stats())
+        self.assertIn(-2, self.controller.not_loaded)
@@ -0,0 +1,95 @@
+import sqlite3
+from unittest import TestCase
+
+from controller.DBcache import CachedCursor, ReferenceCache, referenced_tables
+from controller.DBreader import query_claims
+from controller.DBwriter import *
+
+
+class TestReferenceCache(TestCase):
+    def setUp(self) -> None:
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE Claim (Name TEXT, Prison INTEGER)")
+        self.connection.execute("CREATE TABLE Game (Game_ID INTEGER)")
+        self.connection.execute("INSERT INTO Claim VALUES ('Turf', 0), ('Cell', 1)")
+        self.connection.commit()
+        self.cache = ReferenceCache()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+
+    def test_referenced_tables(self):
+        self.assertEqual({"SpecialAbility", "Crew_SA", "Char_SA"}, referenced_tables(
+            "SELECT Name FROM (SpecialAbility S LEFT JOIN Crew_SA C ON S.Name = C.SpecialAbility) LEFT JOIN Char_SA"))
+        self.assertEqual({"Item", "Char_Item"},
+                         referenced_tables("SELECT * FROM Item WHERE Name in (SELECT Item FROM Char_Item)"))
+        self.assertIsNone(referenced_tables("SELECT * FROM Game G JOIN User_Game UG ON G.Game_ID = UG.Game_ID"))
+        self.assertIsNone(referenced_tables("SELECT name FROM PRAGMA_TABLE_INFO('Game')"))
+        self.assertIsNone(referenced_tables("DELETE FROM Claim"))
+
+    def test_fetch(self):
+        query = "SELECT Name FROM Claim WHERE Prison = ?"
+        self.assertEqual([("Cell",)], self.cache.fetch(self.connection.cursor(), query, (1,)))
+
+        self.connection.execute("DELETE FROM Claim")
+        self.assertEqual([("Cell",)], self.cache.fetch(self.connection.cursor(), query, (1,)))
+        # the new parameters are read from the in-memory copy of the table
+        self.assertEqual([("Turf",)], self.cache.fetch(self.connection.cursor(), query, (0,)))
+        self.assertEqual({"tables": 1, "entries": 2, "hits": 1, "misses": 2}, self.cache.stats())
+
+        self.connection.execute("CREATE INDEX Claim_Prison ON Claim (Prison)")
+        self.cache.invalidate("Claim")
+        self.assertEqual([], self.cache.fetch(self.connection.cursor(), query, (0,)))
+        self.assertEqual({"tables": 1, "entries": 1, "hits": 1, "misses": 3}, self.cache.stats())
+
+    def test_invalidate(self):
+        query = "SELECT Name FROM Claim"
+        self.cache.fetch(self.connection.cursor(), query)
+        self.connection.execute("DELETE FROM Claim WHERE Prison = 1")
+
+        self.cache.invalidate("Faction")
+        self.assertEqual(2, len(self.cache.fetch(self.connection.cursor(), query)))
+        self.cache.invalidate("Claim")
+        self.assertEqual([("Turf",)], self.cache.fetch(self.connection.cursor(), query))
+        self.cache.invalidate()
+        self.assertEqual(0, self.cache.stats()["entries"])
+
+    def test_not_cached(self):
+        self.cache.fetch(self.connection.cursor(), "SELECT * FROM Game")
+        self.assertEqual({"tables": 0, "entries": 0, "hits": 0, "misses": 0}, self.cache.stats())
+
+    def test_cached_cursor(self):
+        cursor = CachedCursor(self.connection, self.cache)
+
+        cursor.execute("SELECT Name FROM Claim ORDER BY Name")
+        self.assertEqual(("Cell",), cursor.fetchone())
+        self.assertEqual([("Turf",)], cursor.fetchall())
+        self.assertIsNone(cursor.fetchone())
+
+        cursor.execute("SELECT Name FROM Claim ORDER BY Name")
+        rows = cursor.fetchall()
+        rows.clear()
+        self.assertEqual([("Cell",), ("Turf",)], cursor.execute("SELECT Name FROM Claim ORDER BY Name").fetchall())
+
+    def test_writer_invalidation(self):
+        claims = len(query_claims())
+        self.assertTrue(insert_claim("Corvo Bianco", "Richest Vineyard", False))
+        self.assertEqual(claims + 1, len(query_claims()))
+
+        with connect() as connection:
+            connection.execute("DELETE FROM Claim WHERE Name = 'Corvo Bianco'")
+            connection.commit()
+        reference_cache.invalidate("Claim")
+        self.assertEqual(claims, len(query_claims()))
+
+        # inside a transaction the cached rows are dropped only when it commits
+        with transaction():
+            generation = reference_cache.generation
+            self.assertTrue(insert_claim("Corvo Bianco", "Richest Vineyard", False))
+            self.assertEqual(generation, reference_cache.generation)
+        self.assertEqual(claims + 1, len(query_claims()))
+
+        with connect() as connection:
+            connection.execute("DELETE FROM Claim WHERE Name = 'Corvo Bianco'")
+            connection.commit()
+        reference_cache.invalidate("Claim")
@@ -0,0 +1,64 @@
+import json
+from unittest import TestCase
+
+from character.Human import Human
+from character.Item import Item
+from character.Vice import Vice
+from component.SpecialAbility import SpecialAbility
+from controller.DBcanon import canon_catalog
+from controller.DBreader import query_items, query_special_abilities, query_vice, query_xp_triggers
+from organization.Crew import Crew
+from utility.FilesLoader import pc_from_json
+from utility.ISavable import save_to_json
+
+
+class TestCanonCatalog(TestCase):
+    def setUp(self) -> None:
+        self.bodyguard = query_special_abilities(special_ability="Bodyguard")[0]
+        self.vice = query_vice("Faith")[0]
+        self.human = Human("Marg", abilities=[self.bodyguard, SpecialAbility("Custom", "Homebrew")],
+                           items=[Item("Fine lockpicks", "Custom lockpicks", 1),
+                                  query_items("Fine hand weapon")[0]],
+                           vice=Vice(self.vice.name, self.vice.description, "Temple"), pc_class="Cutter")
+
+    def test_pack(self):
+        data = json.loads(save_to_json(self.human))
+
+        self.assertEqual({"name": "Bodyguard"}, data["abilities"][0])
+        self.assertEqual("Homebrew", data["abilities"][1]["description"])
+        self.assertEqual("Custom lockpicks", data["items"][0]["description"])
+        self.assertNotIn("description", data["items"][1])
+        self.assertNotIn("description", data["vice"])
+        self.assertTrue(all(isinstance(trigger, int) for trigger in data["xp_triggers"]))
+
+    def test_unpack(self):
+        loaded = pc_from_json(save_to_json(self.human))
+
+        self.assertEqual(self.human, loaded)
+        self.assertIs(canon_catalog.ability_by_name("Bodyguard"), loaded.abilities[0])
+        self.assertEqual(query_xp_triggers("Cutter"), loaded.xp_triggers)
+
+        other = pc_from_json(save_to_json(self.human))
+        self.assertIs(loaded.abilities[0], other.abilities[0])
+        self.assertIsNot(loaded.items[1], other.items[1])
+        self.assertIs(loaded.items[1].description, other.items[1].description)
+        self.assertIs(loaded.vice.description, other.vice.description)
+
+    def test_legacy(self):
+        data = json.loads(save_to_json(self.human))
+        data["abilities"][0]["description"] = self.bodyguard.description
+        data["vice"]["description"] = self.vice.description
+        data["xp_triggers"] = query_xp_triggers("Cutter")
+        loaded = pc_from_json(json.dumps(data))
+
+        self.assertEqual(self.human, loaded)
+        self.assertIs(canon_catalog.ability_by_name("Bodyguard"), loaded.abilities[0])
+
+    def test_crew(self):
+        crew = Crew("Crew", "Assassins", abilities=query_special_abilities("Assassins", True))
+        data = json.loads(save_to_json(crew))
+        self.assertNotIn("description", data["abilities"][0])
+
+        loaded = Crew.from_json(data)
+        self.assertEqual(crew, loaded)
+        self.assertIs(canon_catalog.ability_by_name(crew.abilities[0].name), loaded.abilities[0])
@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from controller.DBcodec import MARKER, StorageCodec, stored_size
+
+
+class TestStorageCodec(TestCase):
+    def setUp(self) -> None:
+        self.text = "<div class=\"note\">Welcome to Blades in the Dark, àèìòù</div>\n" * 100
+
+    def test_round_trip(self):
+        for algorithm in ("zlib", "lzma"):
+            codec = StorageCodec(algorithm, threshold=64)
+            encoded = codec.encode(self.text)
+            self.assertIsInstance(encoded, bytes)
+            self.assertTrue(encoded.startswith(MARKER))
+            self.assertLess(len(encoded), stored_size(self.text))
+            self.assertEqual(self.text, codec.decode(encoded))
+            # the algorithm is read from the value
+            self.assertEqual(self.text, StorageCodec("none").decode(encoded))
+
+    def test_values_left_as_they_are(self):
+        codec = StorageCodec(threshold=64)
+        self.assertEqual("short", codec.encode("short"))
+        self.assertEqual(3, codec.encode(3))
+        self.assertIsNone(codec.encode(None))
+        self.assertEqual(self.text, StorageCodec("none").encode(self.text))
+
+        # values that do not shrink are not worth the marker
+        self.assertEqual("abcd", StorageCodec("zlib", level=9, threshold=0).encode("abcd"))
+
+        # legacy values are read as they are
+        self.assertEqual(self.text, codec.decode(self.text))
+        self.assertEqual(b"\x00\x01", codec.decode(b"\x00\x01"))
+
+    def test_invalid_settings(self):
+        self.assertRaises(ValueError, StorageCodec, "gzip")
+        self.assertRaises(ValueError, StorageCodec, "zlib", 10)
+        self.assertRaises(ValueError, StorageCodec, "zlib", 6, -1)
+        self.assertEqual(StorageCodec("lzma", 1, 0), StorageCodec.from_json({"algorithm": "LZMA", "level": 1,
+                                                                            "threshold": 0}))
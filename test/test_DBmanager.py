@@ -1,5 +1,6 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
+from controller.DBmigrations import MIGRATIONS_FOLDER, list_migrations
 from controller.DBwriter import *
 
 
@@ -25,6 +26,114 @@ class TestDBmanager(TestCase):
         self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
         self.connection.commit()
 
+    def test_check_db_profile(self):
+        self.assertEqual({}, check_db_profile())
+        self.assertFalse([key for key in report_db_profile() if key.startswith("expected_")])
+
+        with mock.patch.object(profile, "check", return_value={"journal_mode": ("wal", "delete")}):
+            self.assertEqual({"journal_mode": ("wal", "delete")}, check_db_profile())
+        self.addCleanup(check_db_profile)
+        self.assertEqual("wal", report_db_profile()["expected_journal_mode"])
+
+    def test_report_db_profile(self):
+        report = report_db_profile()
+
+        self.assertEqual(profile.journal_mode, report["journal_mode"])
+        self.assertEqual(profile.busy_timeout, report["busy_timeout"])
+        self.assertEqual(pool.max_size, report["pool_max_size"])
+        self.assertEqual(list_migrations(MIGRATIONS_FOLDER)[-1][0], report["schema_version"])
+        self.assertIn("queue_depth", report)
+
+    def test_transaction_commit(self):
+        with transaction():
+            self.assertTrue(in_transaction())
+            insert_game(1, "Game1", 1)
+            with transaction():
+                insert_journal(1, "Welcome to Blades in the Dark")
+            self.cursor.execute("SELECT * FROM Game WHERE Game_ID = 1")
+            self.assertEqual([], self.cursor.fetchall())
+        self.assertFalse(in_transaction())
+
+        self.cursor.execute("SELECT Journal FROM Game WHERE Game_ID = 1")
+        self.assertEqual([("Welcome to Blades in the Dark",)], self.cursor.fetchall())
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+        self.connection.commit()
+
+    def test_transaction_rollback(self):
+        @atomic
+        def failing_command():
+            insert_game(1, "Game1", 1)
+            insert_journal(1, "Welcome to Blades in the Dark")
+            raise ValueError
+
+        self.assertRaises(ValueError, failing_command)
+        self.assertFalse(exists_game(1))
+
+    def test_transaction_failed_write(self):
+        @atomic
+        def failing_command():
+            insert_game(1, "Game1", 1)
+            # Game_ID not present
+            insert_journal(2, "Welcome to Blades in the Dark")
+
+        self.assertRaises(DatabaseError, failing_command)
+        self.assertFalse(exists_game(1))
+        self.assertFalse(insert_journal(2, "Welcome to Blades in the Dark"))
+
+    def test_after_commit(self):
+        called = []
+        after_commit(lambda: called.append(0))
+        with self.assertRaises(ValueError):
+            with transaction():
+                after_commit(lambda: called.append(1))
+                raise ValueError
+        with transaction():
+            after_commit(lambda: called.append(2))
+            self.assertEqual([0], called)
+        self.assertEqual([0, 2], called)
+
+    def test_mark_dirty(self):
+        flushed = []
+        mark_dirty("a", flushed.append, "x")
+        self.assertEqual([{"x"}], flushed)
+
+        with transaction():
+            mark_dirty("a", flushed.append, "x")
+            mark_dirty("b", lambda fields: mark_dirty("c", flushed.append, "z"))
+            mark_dirty("a", lambda fields: flushed.append(None), "y")
+            self.assertEqual([{"x"}], flushed)
+        self.assertEqual([{"x"}, {"x", "y"}, {"z"}], flushed)
+
+        with self.assertRaises(ValueError):
+            with transaction():
+                mark_dirty("a", flushed.append, "x")
+                raise ValueError
+        with transaction():
+            pass
+        self.assertEqual(3, len(flushed))
+
+    def test_deferred_write(self):
+        insert_game(1, "Game1", 1)
+        write_behind.enabled = True
+        try:
+            with self.assertRaises(ValueError):
+                with transaction():
+                    insert_journal(1, "Discarded")
+                    raise ValueError
+            self.assertEqual(0, write_behind.stats()["depth"])
+
+            with transaction():
+                insert_journal(1, "Welcome to Blades in the Dark")
+                self.assertEqual(0, write_behind.stats()["depth"])
+            self.assertEqual(1, write_behind.stats()["depth"])
+            write_behind.flush()
+        finally:
+            write_behind.enabled = False
+            self.cursor.execute("SELECT Journal FROM Game WHERE Game_ID = 1")
+            self.assertEqual([("Welcome to Blades in the Dark",)], self.cursor.fetchall())
+            self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+            self.connection.commit()
+
     def test_is_json(self):
         self.assertTrue(is_json('{"Assassins": "Hit man"}'))
         self.assertFalse(is_json('Assassins: Hit man'))
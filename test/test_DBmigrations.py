@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import tempfile
+from sqlite3 import OperationalError
+from unittest import TestCase
+
+from controller.DBmanager import connect
+from controller.DBmigrations import MIGRATIONS_FOLDER, list_migrations, migrate, schema_version
+
+
+class TestDBmigrations(TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.connection = sqlite3.connect(":memory:")
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.folder.cleanup()
+
+    def write_migration(self, file_name: str, script: str) -> None:
+        with open(os.path.join(self.folder.name, file_name), 'w') as f:
+            f.write(script)
+
+    def test_list_migrations(self):
+        self.write_migration("0010_later.sql", "")
+        self.write_migration("0002_first.sql", "")
+        self.write_migration("notes.txt", "")
+
+        self.assertEqual([2, 10], [version for version, _, _ in list_migrations(self.folder.name)])
+        self.assertEqual("first", list_migrations(self.folder.name)[0][1])
+
+        self.write_migration("10_duplicated.sql", "")
+        self.assertRaises(ValueError, list_migrations, self.folder.name)
+
+    def test_migrate(self):
+        self.write_migration("0001_table.sql", "CREATE TABLE T (A INTEGER);")
+        self.write_migration("0002_index.sql", "CREATE INDEX T_Index ON T (A);")
+
+        self.assertEqual(0, schema_version(self.connection))
+        self.assertEqual([1, 2], migrate(self.connection, self.folder.name))
+        self.assertEqual(2, schema_version(self.connection))
+        self.assertEqual([], migrate(self.connection, self.folder.name))
+
+        self.write_migration("0003_rows.sql", "INSERT INTO T VALUES (1);")
+        self.assertEqual([3], migrate(self.connection, self.folder.name))
+        self.assertEqual(1, self.connection.execute("SELECT COUNT(*) FROM T").fetchone()[0])
+
+    def test_failing_migration_is_rolled_back(self):
+        self.write_migration("0001_table.sql", "CREATE TABLE T (A INTEGER);")
+        self.write_migration("0002_broken.sql", "INSERT INTO T VALUES (1); INSERT INTO Missing VALUES (1);")
+
+        self.assertRaises(OperationalError, migrate, self.connection, self.folder.name)
+        self.assertEqual(1, schema_version(self.connection))
+        self.assertEqual(0, self.connection.execute("SELECT COUNT(*) FROM T").fetchone()[0])
+
+    def test_pc_table_migration(self):
+        self.connection.executescript("""
+            CREATE TABLE User_Game (User_ID INTEGER, Game_ID INTEGER, Char_JSON TEXT, Master BOOLEAN,
+                                    PRIMARY KEY (User_ID, Game_ID));
+            INSERT INTO User_Game VALUES (1, 1, '[{"name": "A"}, {"name": "B"}]', FALSE);
+            INSERT INTO User_Game VALUES (2, 1, '[]', TRUE);
+            INSERT INTO User_Game VALUES (1, 2, NULL, FALSE);""")
+        with open(os.path.join(MIGRATIONS_FOLDER, "0003_pc_table.sql"), 'r') as f:
+            self.connection.executescript(f.read())
+
+        self.assertEqual([(1, 1, 1, '{"name":"A"}'), (2, 1, 1, '{"name":"B"}')],
+                         self.connection.execute("SELECT * FROM PC ORDER BY Char_ID").fetchall())
+        self.assertEqual([(None,), (None,), (None,)],
+                         self.connection.execute("SELECT Char_JSON FROM User_Game").fetchall())
+
+    def assertUsesIndex(self, index: str, query: str):
+        with connect() as connection:
+            plan = connection.execute("EXPLAIN QUERY PLAN " + query).fetchall()
+        self.assertTrue(any(index in step[3] for step in plan), plan)
+
+    def test_game_indexes(self):
+        self.assertUsesIndex("Game_Chat_Index", "SELECT Game_ID FROM Game WHERE Tel_Chat_ID = 1")
+        self.assertUsesIndex("Game_Chat_Index", """
+            SELECT G.Game_ID
+            FROM Game G JOIN User_Game UG ON G.Game_ID = UG.Game_ID
+            WHERE G.Tel_Chat_ID = 1 AND UG.User_ID = 1""")
+        self.assertUsesIndex("User_Game_Game_Index", """
+            SELECT Name, Tel_ID, Master
+            FROM User JOIN User_Game ON Tel_ID = User_ID
+            WHERE Game_ID = 1""")
+        self.assertUsesIndex("User_Game_Game_Index", "SELECT User_ID, Char_JSON FROM User_Game WHERE Game_ID = 1")
+        self.assertUsesIndex("Game_Header_Index", "SELECT Game_ID, Title, Tel_Chat_ID, State FROM Game "
+                                                  "INDEXED BY Game_Header_Index ORDER BY Game_ID")
+
+    def test_sheet_indexes(self):
+        self.assertUsesIndex("Char_SA_Character_Index", """
+            SELECT Name, Description FROM SpecialAbility JOIN Char_SA ON Name = SpecialAbility
+            WHERE Character = 'Hound' AND Peculiar is 1""")
+        self.assertUsesIndex("Crew_SA_Crew_Index", """
+            SELECT Name, Description FROM SpecialAbility JOIN Crew_SA ON Name = SpecialAbility
+            WHERE Crew = 'Cult'""")
+        self.assertUsesIndex("Char_Xp_Character_Index", """
+            SELECT Description FROM XpTrigger NATURAL JOIN Char_Xp
+            WHERE Character = 'Hound' and Peculiar is True""")
+        self.assertUsesIndex("Crew_Xp_Crew_Index", """
+            SELECT Description FROM XpTrigger NATURAL JOIN Crew_Xp
+            WHERE Crew = 'Cult' and Peculiar is True""")
+        self.assertUsesIndex("Crew_Upgrade_Upgrade_Index", """
+            SELECT Crew FROM Crew_Upgrade WHERE Upgrade = 'Hidden'""")
+
+    def test_pc_index(self):
+        self.assertUsesIndex("PC_Game_Index", """
+            SELECT UG.User_ID, P.Char_ID, P.Char_JSON
+            FROM User_Game UG LEFT JOIN PC P ON P.Game_ID = UG.Game_ID AND P.User_ID = UG.User_ID
+            WHERE UG.Game_ID = 1""")
@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+from sqlite3 import OperationalError
+from unittest import TestCase
+
+from controller.DBpool import ConnectionPool
+
+
+class TestConnectionPool(TestCase):
+    def setUp(self) -> None:
+        self.pool = ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False), max_size=2,
+                                   idle_timeout=60, acquire_timeout=0.2)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_nested_acquisitions_share_connection(self):
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+                self.assertIs(outer, self.pool.current())
+            self.assertEqual(1, self.pool.stats()["in_use"])
+        self.assertIsNone(self.pool.current())
+        self.assertEqual({"in_use": 0, "idle": 1, "created": 1, "evicted": 0, "max_size": 2}, self.pool.stats())
+
+    def test_connection_is_reused(self):
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            self.assertIs(first, second)
+        self.assertEqual(1, self.pool.stats()["created"])
+
+    def test_threads_get_different_connections(self):
+        connections = []
+        barrier = threading.Barrier(2)
+
+        def worker():
+            with self.pool.connection() as connection:
+                connections.append(connection)
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertIsNot(connections[0], connections[1])
+        self.assertEqual(2, self.pool.stats()["idle"])
+
+    def test_bounded_size(self):
+        holding = threading.Event()
+        done = threading.Event()
+
+        def worker():
+            with self.pool.connection():
+                holding.set()
+                done.wait()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        holding.wait()
+        errors = []
+
+        def acquire():
+            try:
+                self.pool.acquire()
+            except OperationalError as e:
+                errors.append(e)
+
+        with self.pool.connection():
+            other = threading.Thread(target=acquire)
+            other.start()
+            other.join()
+        done.set()
+        t.join()
+        # the assertion is made by the test thread, where a failure fails the test
+        self.assertEqual(1, len(errors))
+
+    def test_open_transaction_is_rolled_back(self):
+        with self.pool.connection() as connection:
+            connection.execute("CREATE TABLE T (A INTEGER)")
+            connection.commit()
+            connection.execute("INSERT INTO T VALUES (1)")
+
+        with self.pool.connection() as connection:
+            self.assertEqual(0, connection.execute("SELECT COUNT(*) FROM T").fetchone()[0])
+
+    def test_idle_eviction(self):
+        self.pool.idle_timeout = 0.01
+        with self.pool.connection() as connection:
+            pass
+        time.sleep(0.02)
+
+        self.assertEqual(1, self.pool.close_idle())
+        self.assertRaises(sqlite3.ProgrammingError, connection.execute, "SELECT 1")
+        self.assertEqual(0, self.pool.stats()["idle"])
+
+    def test_close(self):
+        with self.pool.connection() as connection:
+            self.pool.close()
+        self.assertRaises(sqlite3.ProgrammingError, connection.execute, "SELECT 1")
+        self.assertRaises(OperationalError, self.pool.acquire)
@@ -0,0 +1,37 @@
+import os
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from controller.DBprofile import DBProfile, read_settings
+
+
+class TestDBProfile(TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.connection = sqlite3.connect(os.path.join(self.folder.name, "test.db"), timeout=0)
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.folder.cleanup()
+
+    def test_apply(self):
+        profile = DBProfile(synchronous="full", cache_size=-2000, mmap_size=0, temp_store="file", busy_timeout=100)
+        profile.apply(self.connection)
+
+        self.assertEqual({"journal_mode": "wal", "synchronous": "full", "cache_size": -2000, "mmap_size": 0,
+                          "temp_store": "file", "busy_timeout": 100}, read_settings(self.connection))
+        self.assertEqual({}, profile.check(self.connection))
+
+    def test_check(self):
+        profile = DBProfile(mmap_size=0)
+
+        self.assertEqual({"journal_mode": ("wal", "delete"), "synchronous": ("normal", "full"),
+                          "cache_size": (-16000, -2000), "temp_store": ("memory", "default"),
+                          "busy_timeout": (5000, 0)}, profile.check(self.connection))
+
+    def test_from_json(self):
+        self.assertEqual(DBProfile(journal_mode="delete"), DBProfile.from_json({"journal_mode": "DELETE"}))
+        self.assertRaises(ValueError, DBProfile.from_json, {"journal_mode": "fast"})
+        self.assertRaises(ValueError, DBProfile.from_json, {"cache_size": "big"})
+        self.assertRaises(TypeError, DBProfile.from_json, {"page_size": 4096})
@@ -0,0 +1,82 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from unittest import TestCase
+
+from controller.DBqueue import WriteBehindQueue
+
+
+class TestWriteBehindQueue(TestCase):
+    def setUp(self) -> None:
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.connection.execute("CREATE TABLE Game (Game_ID INTEGER PRIMARY KEY, Crew_JSON TEXT, Journal TEXT)")
+        self.connection.executemany("INSERT INTO Game (Game_ID) VALUES (?)", [(1,), (2,)])
+        self.connection.commit()
+        self.statements = []
+        self.connection.set_trace_callback(self.statements.append)
+        self.lock = threading.Lock()
+
+        @contextmanager
+        def connect():
+            with self.lock:
+                yield self.connection
+
+        self.queue = WriteBehindQueue(connect, enabled=True, interval=60)
+
+    def tearDown(self) -> None:
+        self.queue.stop()
+        self.connection.close()
+
+    def read(self, game_id: int):
+        with self.lock:
+            return self.connection.execute("SELECT Crew_JSON, Journal FROM Game WHERE Game_ID = ?",
+                                           (game_id,)).fetchone()
+
+    def test_disabled(self):
+        self.queue.enabled = False
+        self.assertFalse(self.queue.enqueue(1, "Crew_JSON", "{}"))
+        self.assertEqual(0, self.queue.stats()["depth"])
+
+    def test_coalescing(self):
+        self.assertTrue(self.queue.enqueue(1, "Journal", "first"))
+        self.queue.enqueue(1, "Journal", "second")
+        self.queue.enqueue(1, "Crew_JSON", "{}")
+        self.queue.enqueue(2, "Journal", "other")
+        self.assertEqual((None, None), self.read(1))
+
+        self.assertEqual(3, self.queue.flush())
+        self.assertEqual(("{}", "second"), self.read(1))
+        self.assertEqual((None, "other"), self.read(2))
+        self.assertEqual(2, len([s for s in self.statements if s.startswith("UPDATE Game")]))
+        self.assertEqual(1, len([s for s in self.statements if s == "COMMIT"]))
+        self.assertEqual({"depth": 0, "max_depth": 3, "enqueued": 4, "coalesced": 1, "flushed": 3, "flushes": 1,
+                          "errors": 0}, self.queue.stats())
+        self.assertEqual(0, self.queue.flush())
+
+    def test_background_flush(self):
+        self.queue.interval = 0.01
+        self.queue.enqueue(1, "Journal", "log")
+        deadline = time.time() + 5
+        while self.queue.stats()["flushes"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual((None, "log"), self.read(1))
+
+    def test_discard(self):
+        self.queue.enqueue(1, "Journal", "log")
+        self.queue.enqueue(2, "Journal", "log")
+        self.assertEqual(1, self.queue.discard(1))
+        self.queue.flush()
+        self.assertEqual((None, None), self.read(1))
+        self.assertEqual((None, "log"), self.read(2))
+
+    def test_failed_flush_is_retried(self):
+        self.queue.enqueue(1, "Journal", "log")
+        self.connection.execute("ALTER TABLE Game RENAME TO Old_Game")
+        self.assertEqual(0, self.queue.flush())
+        self.assertEqual(1, self.queue.stats()["depth"])
+        self.assertEqual(1, self.queue.stats()["errors"])
+
+        self.connection.execute("ALTER TABLE Old_Game RENAME TO Game")
+        self.assertEqual(1, self.queue.flush())
+        self.assertEqual((None, "log"), self.read(1))
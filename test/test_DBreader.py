@@ -130,7 +130,7 @@ class TestDBReader(TestCase):
                  'Faction_JSON': '{"The Unseen": "One you see them you can not unsee them"}',
                  'Score_JSON': '{"Jenny o the Woods": "Love can make you become a nightwraith"}',
                  'Clock_JSON': '{"Healing": "How long will it take?"}', 'Journal': 'Welcome to Blades in the Dark',
-                 'State': 1}
+                 'Journal_Anchor_JSON': None, 'State': 1}
 
         dict2 = {'NPC_JSON': '{"Dandelion": "An humble bard"}',
                  'Faction_JSON': '{"The Unseen": "One you see them you can not unsee them"}',
@@ -190,19 +190,56 @@ class TestDBReader(TestCase):
                 INSERT INTO Game (Game_ID, Title, Tel_Chat_ID)
                 VALUES (1, "Game1", 1)""")
         self.cursor.execute("""
-                INSERT INTO User_Game 
-                VALUES (1, 1, "{'Character': 'JSON'}", TRUE)""")
+                INSERT INTO User_Game (User_ID, Game_ID, Master)
+                VALUES (1, 1, TRUE)""")
         self.cursor.execute("""
-                INSERT INTO User_Game 
-                VALUES (2, 1, "{'Character': 'JSON'}", TRUE)""")
+                INSERT INTO User_Game (User_ID, Game_ID, Master)
+                VALUES (2, 1, FALSE)""")
+        self.cursor.execute("""
+                INSERT INTO PC (Char_ID, User_ID, Game_ID, Char_JSON)
+                VALUES (-2, 1, 1, '{"name": "Second"}'), (-3, 1, 1, '{"name": "First"}')""")
         self.connection.commit()
 
-        self.assertEqual({1: "{'Character': 'JSON'}", 2: "{'Character': 'JSON'}"}, query_pc_json(1))
+        self.assertEqual({1: [(-3, '{"name": "First"}'), (-2, '{"name": "Second"}')], 2: []}, query_pc_json(1))
+        self.assertEqual({}, query_pc_json(2))
 
         self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
         self.cursor.execute("DELETE FROM User WHERE Tel_ID = 1 OR Tel_ID = 2")
         self.connection.commit()
 
+    def test_query_games_bulk(self):
+        self.cursor.execute("""
+                INSERT INTO User
+                VALUES (1, "Aldo"), (2, "Giovanni")""")
+        self.cursor.execute("""
+                INSERT INTO Game (Game_ID, Title, Tel_Chat_ID, Clock_JSON)
+                VALUES (1, "Game1", 1, '[]'), (2, "Game2", 1, NULL), (3, "Game3", 1, NULL)""")
+        self.cursor.execute("""
+                INSERT INTO User_Game (User_ID, Game_ID, Master)
+                VALUES (2, 1, FALSE), (1, 1, TRUE), (1, 2, FALSE)""")
+        self.cursor.execute("""
+                INSERT INTO PC (Char_ID, User_ID, Game_ID, Char_JSON)
+                VALUES (-2, 1, 1, '{"name": "Second"}'), (-3, 1, 1, '{"name": "First"}')""")
+        self.cursor.execute("UPDATE Game SET Snapshot = x'00' WHERE Game_ID = 2")
+        self.connection.commit()
+
+        rows = query_games_rows([1, 2, 4])
+        self.assertEqual([1, 2], sorted(rows))
+        self.assertEqual("[]", rows[1]["Clock_JSON"])
+        self.assertEqual(b"\x00", rows[2]["Snapshot"])
+        self.assertEqual({key: query_game_json(1)[key] for key in query_game_json(1)},
+                         {key: rows[1][key] for key in query_game_json(1)})
+
+        self.assertEqual([1, 3], sorted(query_games_without_snapshot([1, 2, 3])))
+        self.assertEqual({1: [("Giovanni", 2, 0), ("Aldo", 1, 1)], 2: [("Aldo", 1, 0)]},
+                         query_games_users([1, 2, 3]))
+        self.assertEqual({1: query_pc_json(1), 2: query_pc_json(2)}, query_games_pc_json([1, 2, 3]))
+        self.assertEqual({}, query_games_pc_json([]))
+
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID IN (1, 2, 3)")
+        self.cursor.execute("DELETE FROM User WHERE Tel_ID = 1 OR Tel_ID = 2")
+        self.connection.commit()
+
     def test_query_games_info(self):
         self.cursor.execute("""
                 INSERT INTO Game (Game_ID, Title, Tel_Chat_ID)
@@ -1,4 +1,6 @@
 from unittest import TestCase
+from main.controller.DBreader import query_game_json, query_game_snapshot, query_games_journal_entries, \
+    query_journal_entries, query_pc_json, query_storage_report
 from main.controller.DBwriter import *
 
 
@@ -13,6 +15,46 @@ class TestDBwriter(TestCase):
         self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
         self.connection.commit()
 
+    def test_update_game_columns(self):
+        insert_game(1, "Game1", 1)
+        self.assertTrue(update_game_columns(1, crew_json='{"Assassins": "Hit man"}', journal="Welcome", state=2))
+        self.cursor.execute("SELECT Crew_JSON, Journal, State FROM Game WHERE Game_ID = 1")
+        self.assertEqual(('{"Assassins": "Hit man"}', "Welcome", 2), self.cursor.fetchone())
+
+        # Game_ID not present
+        self.assertFalse(update_game_columns(2, journal="Welcome"))
+
+        # invalid values and unknown columns
+        self.assertFalse(update_game_columns(1, crew_json="Assassins", journal="Ignored"))
+        self.assertFalse(update_game_columns(1, title="Game2"))
+        self.assertFalse(update_game_columns(1))
+        self.cursor.execute("SELECT Journal FROM Game WHERE Game_ID = 1")
+        self.assertEqual(("Welcome",), self.cursor.fetchone())
+
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+        self.connection.commit()
+
+    def test_compressed_columns(self):
+        journal = "<p>Welcome to Blades in the Dark</p>" * 100
+        insert_game(1, "Game1", 1)
+        self.cursor.execute("UPDATE Game SET Journal = ?, Crew_JSON = ? WHERE Game_ID = 1", (journal, "{}"))
+        self.connection.commit()
+        self.assertEqual(journal, query_game_json(1, ["Journal"])["Journal"])
+
+        self.assertGreaterEqual(compact_storage(vacuum=False), 1)
+        self.cursor.execute("SELECT Journal, Crew_JSON FROM Game WHERE Game_ID = 1")
+        stored, crew = self.cursor.fetchone()
+        self.assertIsInstance(stored, bytes)
+        self.assertEqual("{}", crew)
+        self.assertEqual({"Journal": journal, "Crew_JSON": "{}"}, query_game_json(1, ["Journal", "Crew_JSON"]))
+        self.assertGreater(query_storage_report()["Game.Journal"]["saved"], 0)
+
+        self.assertTrue(update_game_columns(1, journal=journal + "<p>End</p>"))
+        self.assertEqual(journal + "<p>End</p>", query_game_json(1, ["Journal"])["Journal"])
+
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+        self.connection.commit()
+
     def test_insert_crew_json(self):
         insert_game(1, "Game1", 1)
         self.assertTrue(insert_crew_json(1, '{"Assassins": "Hit man"}'))
@@ -101,6 +143,61 @@ class TestDBwriter(TestCase):
         self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
         self.connection.commit()
 
+    def test_insert_journal_entries(self):
+        insert_game(1, "Game1", 1)
+        entries = [{"method": "write_title", "args": {"game_name": "Game1"}, "language": "ENG.json",
+                    "indentation": 0, "phase": None, "score": None},
+                   {"method": "write_note", "args": {"title": "Note", "text": "Text"}, "language": "ITA.json",
+                    "indentation": 1, "phase": 1, "score": "Score1"}]
+        self.assertTrue(insert_journal_entries(1, entries[:1]))
+        self.assertTrue(insert_journal_entries(1, entries[1:]))
+        self.assertEqual(entries, query_journal_entries(1))
+        self.assertEqual({1: entries}, query_games_journal_entries([1, 2]))
+
+        # an entry that cannot be encoded is skipped
+        self.assertTrue(insert_journal_entries(1, [{**entries[0], "args": {"game_name": object()}}]))
+        self.assertEqual(entries, query_journal_entries(1))
+
+        # Game_ID not present
+        self.assertFalse(insert_journal_entries(2, entries))
+        self.assertFalse(compact_journal(2, "<html></html>"))
+
+        self.assertFalse(compact_journal(1, "<html></html>", entries=-1))
+        # the entry appended after the html has been rendered is kept
+        self.assertTrue(compact_journal(1, "<html></html>", entries=1))
+        self.assertEqual(entries[1:], query_journal_entries(1))
+
+        self.assertTrue(compact_journal(1, "<html></html>"))
+        self.assertEqual([], query_journal_entries(1))
+        self.assertEqual("<html></html>", query_game_json(1)["Journal"])
+
+        insert_journal_entries(1, entries)
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+        self.connection.commit()
+        self.assertEqual([], query_journal_entries(1))
+
+    def test_write_behind(self):
+        insert_game(1, "Game1", 1)
+        write_behind.enabled = True
+        try:
+            self.assertTrue(insert_journal(1, "first"))
+            self.assertTrue(insert_journal(1, "second"))
+            self.assertTrue(insert_state(1, 2))
+            self.assertFalse(insert_journal(2, "Welcome to Blades in the Dark"))
+            self.assertEqual(2, write_behind.stats()["depth"])
+
+            self.assertEqual(2, write_behind.flush())
+            self.cursor.execute("SELECT Journal, State FROM Game WHERE Game_ID = 1")
+            self.assertEqual(("second", 2), self.cursor.fetchone())
+
+            insert_journal(1, "third")
+            self.assertTrue(delete_game(1))
+            self.assertEqual(0, write_behind.stats()["depth"])
+        finally:
+            write_behind.enabled = False
+            self.cursor.execute("DELETE FROM Game WHERE Game_ID = 1")
+            self.connection.commit()
+
     def test_insert_state(self):
         insert_game(1, "Game1", 1)
         self.assertTrue(insert_state(1, 1))
@@ -127,6 +224,16 @@ class TestDBwriter(TestCase):
         # Tel_ID already present
         self.assertTrue(insert_user(1, "Giacomo"))
 
+        # the snapshots store the names of the players
+        insert_game(-1, "Game1", 1)
+        insert_user_game(1, -1)
+        update_game_columns(-1, snapshot=b"snapshot")
+        self.assertTrue(insert_user(1, "Giacomo"))
+        self.assertEqual(b"snapshot", query_game_snapshot(-1))
+        self.assertTrue(insert_user(1, "Aldo"))
+        self.assertIsNone(query_game_snapshot(-1))
+
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = -1")
         self.cursor.execute("DELETE FROM User WHERE Tel_ID = 1")
         self.connection.commit()
 
@@ -267,6 +374,15 @@ class TestDBwriter(TestCase):
         self.cursor.execute("DELETE FROM Char_Friend WHERE Character = 'Whisper' and NPC = 18")
         self.connection.commit()
 
+        # inside a transaction the cache is invalidated only when it commits
+        with transaction():
+            generation = reference_cache.generation
+            insert_simple_relation("Char_Friend", "Whisper", 18)
+            self.assertEqual(generation, reference_cache.generation)
+        self.assertNotEqual(generation, reference_cache.generation)
+        self.cursor.execute("DELETE FROM Char_Friend WHERE Character = 'Whisper' and NPC = 18")
+        self.connection.commit()
+
     def test_insert_complex_relation(self):
         self.assertTrue(insert_complex_relation("Char_Action", "Hull", "Prowl", True))
 
@@ -312,21 +428,49 @@ class TestDBwriter(TestCase):
         insert_game(-1, "Game1", -1)
         insert_user(-1, "Aldo")
 
-        insert_user_game(-1, -1, '{"Jonny": "A whisper"}', False)
+        insert_user_game(-1, -1, '[{"name": "Jonny"}, {"name": "Jack"}]', False)
+        self.assertEqual(2, len(query_pc_json(-1)[-1]))
 
-        update_user_characters(-1, -1, '{"Jack": "A leech"}')
+        self.assertTrue(update_user_characters(-1, -1, '{"name": "Jack"}'))
+        self.assertEqual(['{"name": "Jack"}'], [char_json for _, char_json in query_pc_json(-1)[-1]])
 
-        connection = establish_connection()
-        cursor = connection.cursor()
+        # Master changed, PCs untouched
+        self.assertTrue(insert_user_game(-1, -1, master=True))
+        self.assertEqual(1, len(query_pc_json(-1)[-1]))
 
-        cursor.execute("""
-                SELECT Char_JSON
-                FROM User_Game
-                WHERE User_ID = -1 AND Game_ID = -1""")
+        self.cursor.execute("DELETE FROM Game WHERE Game_ID = -1")
+        self.cursor.execute("DELETE FROM User WHERE Tel_ID = -1")
 
-        self.assertEqual('{"Jack": "A leech"}', cursor.fetchone()[0])
+        self.connection.commit()
+
+    def test_insert_update_delete_character(self):
+        insert_game(-1, "Game1", -1)
+        insert_user(-1, "Aldo")
+        insert_user_game(-1, -1)
+
+        first = insert_character(-1, -1, '{"name": "Jonny"}')
+        second = insert_character(-1, -1, '{"name": "Jack"}')
+        self.assertIsNotNone(first)
+        self.assertLess(first, second)
+        # User not in the game
+        self.assertIsNone(insert_character(-2, -1, '{"name": "Jim"}'))
+
+        self.assertTrue(update_character(first, '{"name": "Jonny", "stress_level": 2}'))
+        self.assertFalse(update_character(first, "Not a json"))
+        self.assertEqual({-1: [(first, '{"name": "Jonny", "stress_level": 2}'), (second, '{"name": "Jack"}')]},
+                         query_pc_json(-1))
+
+        self.assertTrue(delete_character(second))
+        self.assertFalse(delete_character(second))
+        self.assertFalse(update_character(second, '{"name": "Jack"}'))
+        self.assertEqual([first], [char_id for char_id, _ in query_pc_json(-1)[-1]])
+
+        # Removing the user from the game removes its PCs too
+        delete_user_game(-1, -1)
+        self.cursor.execute("SELECT COUNT(*) FROM PC WHERE Char_ID = ?", (first,))
+        self.assertEqual(0, self.cursor.fetchone()[0])
 
         self.cursor.execute("DELETE FROM Game WHERE Game_ID = -1")
         self.cursor.execute("DELETE FROM User WHERE Tel_ID = -1")
 
-        self.connection.commit()
\ No newline at end of file
+        self.connection.commit()
@@ -1,12 +1,14 @@
 from unittest import TestCase
 
 from character.Playbook import Playbook
-from controller.DBwriter import insert_game
+from controller.DBwriter import delete_game, insert_character, insert_clock_json, insert_game, insert_journal, \
+    insert_state, insert_user_game, update_game_columns
 from organization.Claim import Claim
 from organization.Lair import Lair
 from organization.Upgrade import Upgrade
 from utility.ISavable import save_to_json
 from utility.FilesLoader import *
+from utility.GameSnapshot import dump_snapshot
 
 
 class TestFilesLoader(TestCase):
@@ -85,6 +87,15 @@ class TestFilesLoader(TestCase):
         crew = crew_from_json(crew_str)
         self.assertEqual(self.smugglers, crew)
 
+    def test_pc_from_json(self):
+        self.jeeg.char_id = 7
+        pc_str = save_to_json(self.jeeg)
+        self.assertNotIn("char_id", pc_str)
+
+        pc = pc_from_json(pc_str, 7)
+        self.assertEqual(self.jeeg, pc)
+        self.assertIsNone(pc_from_json(save_to_json(self.longlocks)).char_id)
+
     def test_factions_from_json(self):
         factions_str = save_to_json(self.factions)
         factions = factions_from_json(factions_str)
@@ -143,3 +154,70 @@ class TestFilesLoader(TestCase):
 
         cursor.execute("DELETE FROM Game WHERE Game_ID = -1 OR Game_ID = -2")
         connection.commit()
+
+    def test_load_games_lazy(self):
+        insert_game(-1, "Game1", 1)
+        insert_state(-1, 3)
+        insert_journal(-1, "<div class=\"score\">Score</div>")
+
+        game = [g for g in load_games(lazy=True) if g.identifier == -1][0]
+        expected = Game(identifier=-1, title="Game1", chat_id=1)
+        expected.state = 3
+        self.assertEqual(expected, game)
+        self.assertIsNone(game.journal.score_tag)
+
+        setup(game)
+        self.assertFalse(game.journal.is_parsed())
+        self.assertEqual("Score", game.journal.score_tag.text)
+
+        connection = establish_connection()
+        connection.execute("DELETE FROM Game WHERE Game_ID = -1")
+        connection.commit()
+
+    def test_setup_snapshot(self):
+        insert_game(-1, "Game1", 1)
+        self.addCleanup(delete_game, -1)
+        game = Game(identifier=-1, title="Game1", chat_id=1, NPCs=self.npcs, crew=self.smugglers,
+                    factions=self.factions, clocks=self.clocks)
+        update_game_columns(-1, faction_json=save_to_json(self.factions), snapshot=dump_snapshot(game))
+
+        loaded = Game(identifier=-1, title="Game1", chat_id=1)
+        self.assertTrue(setup(loaded))
+        self.assertEqual(game, loaded)
+        self.assertIs(loaded.factions[1], loaded.NPCs[0].faction)
+
+        insert_clock_json(-1, save_to_json(self.clocks))
+        self.assertIsNone(query_game_snapshot(-1))
+        loaded = Game(identifier=-1, title="Game1", chat_id=1)
+        self.assertFalse(setup(loaded))
+        self.assertEqual(self.clocks, loaded.clocks)
+
+    def test_setup_links(self):
+        insert_game(-1, "Game1", 1)
+        self.addCleanup(delete_game, -1)
+        update_game_columns(-1, faction_json=save_to_json(self.factions), npc_json=save_to_json(self.npcs),
+                            crew_json=save_to_json(self.smugglers), score_json=save_to_json(self.scores),
+                            snapshot=None)
+        insert_user_game(483691923, -1)
+        insert_character(483691923, -1, save_to_json(self.regis))
+
+        game = Game(identifier=-1, title="Game1", chat_id=1)
+        self.assertFalse(setup(game))
+
+        self.assertIs(game.factions[1], game.NPCs[0].faction)
+        self.assertIs(game.NPCs[2], game.scores[0].target)
+        self.assertIs(game.factions[1], game.scores[1].target)
+        self.assertEqual(self.regis.name, game.users[0].characters[0].name)
+        self.assertIsNotNone(hydration_stats.last(-1))
+
+        bulk = Game(identifier=-1, title="Game1", chat_id=1)
+        self.assertEqual({-1: False}, hydrate_games([bulk], 2))
+        self.assertEqual(game, bulk)
+        self.assertIs(bulk.factions[1], bulk.scores[1].target)
+
+    def test_find_obj(self):
+        sashes = Faction("Red Sashes")
+        for to_search in ([sashes], index_by_name([sashes])):
+            self.assertIs(sashes, find_obj("Red Sashes", to_search))
+            self.assertEqual("red sashes", find_obj("red sashes", to_search))
+        self.assertIs(sashes, find_obj(sashes, [sashes]))
@@ -23,6 +23,9 @@ class TestGame(TestCase):
         self.assertEqual(Clock("Clock102", 7, 0), self.game.create_clock(segments=7))
         self.assertEqual([Clock("Clock101", 4, 0), Clock("Clock102", 7, 0)], self.game.clocks)
 
+    def test_journal_not_shared(self):
+        self.assertIsNot(self.game.journal, Game().journal)
+
     def test_get_project_clocks(self):
         c1 = Clock("[Project]: discover", 7, 3)
         c2 = Clock("Kill", 10, 8)
@@ -106,3 +109,27 @@ class TestGame(TestCase):
         self.game.NPCs.append(NPC("Irimina", "A vicious noble"))
         self.assertEqual(NPC("Irimina", "A vicious noble"),
                          self.game.get_npc_by_name_and_role("Irimina", "A vicious noble"))
+
+    def test_add_remove_player(self):
+        player = Player("D", 4, False)
+        self.game.add_player(player)
+        self.assertIs(player, self.game.get_player_by_id(4))
+
+        self.game.remove_player(self.game.get_player_by_id(2))
+        self.assertIsNone(self.game.get_player_by_id(2))
+        self.assertEqual([1, 3, 4], [p.player_id for p in self.game.users])
+
+    def test_add_npc(self):
+        self.game.add_npc(NPC("Irimina", "A vicious noble"))
+        self.game.add_npc(NPC("Irimina", "A spy"))
+        self.assertEqual("A spy", self.game.get_npc_by_name_and_role("IRIMINA", "a spy").role)
+        self.assertEqual("A vicious noble", self.game.get_npc_by_name("irimina").role)
+
+    def test_get_clock(self):
+        self.game.clocks.append(Clock("Kill", 10, 8))
+        self.game.clocks.append(Clock("kill", 4, 1))
+        self.assertIs(self.game.clocks[1], self.game.get_clock(Clock("kill", 4, 1)))
+        self.assertIsNone(self.game.get_clock(Clock("Kill", 4, 2)))
+
+        self.game.tick_clock(Clock("Kill", 10, 8), 2)
+        self.assertIs(self.game.clocks[0], self.game.get_clock(Clock("kill", 4, 1)))
@@ -0,0 +1,38 @@
+import time
+from unittest import TestCase
+
+from controller.GameEviction import GameEvictionPolicy
+
+
+class TestGameEvictionPolicy(TestCase):
+    def test_budget(self):
+        policy = GameEvictionPolicy(max_games=2, idle_timeout=0)
+        for game_id in (1, 2, 3):
+            policy.touch(game_id)
+        policy.touch(1)
+        self.assertTrue(policy.due())
+        self.assertEqual([2], policy.candidates())
+
+        policy.record_eviction(2)
+        self.assertFalse(policy.due())
+        policy.record_load(2)
+        policy.record_load(3)
+        self.assertEqual({"loaded": 2, "max_games": 2, "evicted": 1, "reloaded": 1}, policy.stats())
+
+    def test_idle_timeout(self):
+        policy = GameEvictionPolicy(max_games=0, idle_timeout=0.01, interval=0)
+        policy.touch(1)
+        policy.touch(2)
+        time.sleep(0.02)
+        policy.touch(2)
+        self.assertTrue(policy.due())
+        self.assertEqual([1], policy.candidates())
+
+        policy.forget(1)
+        self.assertEqual([], policy.candidates())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            GameEvictionPolicy(max_games=-1)
+        with self.assertRaises(ValueError):
+            GameEvictionPolicy.from_json({"idle_timeout": "1h"})
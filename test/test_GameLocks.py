@@ -0,0 +1,62 @@
+import threading
+import time
+from unittest import TestCase
+
+from controller.GameLocks import GameLockManager
+
+
+class TestGameLockManager(TestCase):
+    def setUp(self) -> None:
+        self.locks = GameLockManager()
+
+    def test_reentrant(self):
+        with self.locks.lock(1):
+            with self.locks.lock(1):
+                pass
+        self.assertEqual({"locks": 1, "acquisitions": 2, "contended": 0, "wait_total_ms": 0, "wait_max_ms": 0},
+                         self.locks.stats())
+
+    def test_same_game_serialized(self):
+        holding = threading.Event()
+        waited = []
+
+        def worker():
+            with self.locks.lock(1):
+                holding.set()
+                time.sleep(0.05)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        holding.wait()
+        with self.locks.lock(1):
+            waited.append(True)
+        t.join()
+
+        stats = self.locks.stats()
+        self.assertEqual(1, stats["contended"])
+        self.assertGreater(stats["wait_max_ms"], 0)
+        self.assertEqual(stats["wait_max_ms"], stats["wait_total_ms"])
+
+    def test_different_games_parallel(self):
+        holding = threading.Event()
+        done = threading.Event()
+
+        def worker():
+            with self.locks.lock(1):
+                holding.set()
+                done.wait()
+
+        t = threading.Thread(target=worker)
+        t.start()
+        holding.wait()
+        with self.locks.lock(2):
+            pass
+        done.set()
+        t.join()
+        self.assertEqual(0, self.locks.stats()["contended"])
+
+    def test_discard(self):
+        lock = self.locks.get(1)
+        self.locks.discard(1)
+        self.assertEqual(0, self.locks.stats()["locks"])
+        self.assertIsNot(lock, self.locks.get(1))
@@ -0,0 +1,52 @@
+import threading
+from unittest import TestCase
+
+from game.Game import Game
+from game.GameRegistry import GameRegistry
+
+
+class TestGameRegistry(TestCase):
+    def setUp(self) -> None:
+        self.game1 = Game(identifier=1, title="Game1", chat_id=10)
+        self.game2 = Game(identifier=2, title="Game2", chat_id=10)
+        self.game3 = Game(identifier=3, title="Game3", chat_id=20)
+        self.registry = GameRegistry([self.game3, self.game1, self.game2])
+
+    def test_get(self):
+        self.assertIs(self.game2, self.registry.get(2))
+        self.assertIsNone(self.registry.get(4))
+        self.assertIn(self.game1, self.registry)
+        self.assertIn(3, self.registry)
+        self.assertEqual(3, len(self.registry))
+
+    def test_by_chat(self):
+        self.assertEqual([self.game1, self.game2], self.registry.by_chat(10))
+        self.assertEqual([self.game3], self.registry.by_chat(20))
+        self.assertEqual([], self.registry.by_chat(30))
+
+    def test_add_remove(self):
+        replacement = Game(identifier=2, title="Game2", chat_id=20)
+        self.registry.add(replacement)
+        self.assertEqual([self.game1], self.registry.by_chat(10))
+        self.assertEqual([replacement, self.game3], self.registry.by_chat(20))
+
+        self.assertIs(self.game1, self.registry.remove(self.game1))
+        self.assertIsNone(self.registry.remove(1))
+        self.assertEqual([], self.registry.by_chat(10))
+        self.assertEqual([replacement, self.game3], sorted(self.registry, key=lambda g: g.identifier))
+
+    def test_concurrent_changes(self):
+        def worker(offset: int):
+            for i in range(offset, offset + 50):
+                self.registry.add(Game(identifier=i, title="Game", chat_id=i % 3))
+                for _ in self.registry:
+                    pass
+                self.registry.remove(i)
+
+        threads = [threading.Thread(target=worker, args=(100 + 1000 * n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(3, len(self.registry))
+        self.assertEqual(3, sum(len(self.registry.by_chat(chat)) for chat in (0, 1, 2, 10, 20)))
@@ -0,0 +1,46 @@
+import pickle
+from unittest import TestCase
+
+from character.Human import Human
+from character.NPC import NPC
+from component.Clock import Clock
+from controller.DBcanon import canon_catalog
+from game.Game import Game
+from game.Player import Player
+from organization.Faction import Faction
+from utility.GameSnapshot import HEADER, MAGIC, SNAPSHOT_VERSION, dump_snapshot, load_snapshot
+
+
+class TestGameSnapshot(TestCase):
+    def setUp(self) -> None:
+        faction = Faction("Red Sashes", 2)
+        npc = NPC("Mylera", "A swordsman", faction)
+        human = Human("Marg", friend=npc, enemy=NPC("Baszo", "A boss"),
+                      abilities=[canon_catalog.ability_by_name("Bodyguard")])
+        human.char_id = 3
+        self.game = Game(identifier=-1, title="Game1", chat_id=-10, users=[Player("A", 1, True, [human])],
+                         NPCs=[npc], factions=[faction], clocks=[Clock("Kill", 8, 3)])
+
+    def test_round_trip(self):
+        attributes = load_snapshot(dump_snapshot(self.game))
+        loaded = Game(identifier=-1, title="Game1", chat_id=-10)
+        for name, value in attributes.items():
+            setattr(loaded, name, value)
+
+        self.assertEqual(self.game, loaded)
+        self.assertIs(loaded.NPCs[0], loaded.users[0].characters[0].friend)
+        self.assertIs(loaded.factions[0], loaded.NPCs[0].faction)
+        self.assertEqual(3, loaded.get_player_by_id(1).get_character_by_name("marg").char_id)
+        self.assertIs(canon_catalog.ability_by_name("bodyguard"), loaded.users[0].characters[0].abilities[0])
+
+    def test_invalid(self):
+        self.assertIsNone(load_snapshot(None))
+        self.assertIsNone(load_snapshot(b"BitD"))
+
+        data = dump_snapshot(self.game)
+        self.assertIsNone(load_snapshot(HEADER.pack(MAGIC, SNAPSHOT_VERSION + 1) + data[HEADER.size:]))
+        self.assertIsNone(load_snapshot(data[:-10]))
+
+    def test_allow_list(self):
+        forbidden = HEADER.pack(MAGIC, SNAPSHOT_VERSION) + pickle.dumps({"users": print}, protocol=5)
+        self.assertIsNone(load_snapshot(forbidden))
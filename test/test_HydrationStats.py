@@ -0,0 +1,22 @@
+from unittest import TestCase
+
+from utility.HydrationStats import HydrationStats
+
+
+class TestHydrationStats(TestCase):
+    def test_record(self):
+        stats = HydrationStats()
+        self.assertEqual({"games": 0, "from_snapshot": 0, "total_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0,
+                          "slowest": None, "phases": {}}, stats.stats())
+
+        stats.record(-1, 0.002, False)
+        stats.record(-2, 0.001, True)
+        stats.record(-1, 0.003, True)
+        stats.record_phase("fetch", 0.004)
+
+        self.assertEqual(0.003, stats.last(-1))
+        self.assertEqual({"games": 3, "from_snapshot": 2, "total_ms": 6.0, "mean_ms": 2.0, "max_ms": 3.0,
+                          "slowest": -1, "phases": {"fetch": 4.0}}, stats.stats())
+
+        stats.forget(-1)
+        self.assertIsNone(stats.last(-1))
@@ -1,5 +1,6 @@
+import copy
 import json
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from character.Action import Action
 from character.Attribute import Attribute
@@ -19,7 +20,11 @@ from organization.Crew import Crew
 from organization.Faction import Faction
 from organization.Lair import Lair
 from organization.Upgrade import Upgrade
-from utility.ISavable import pop_dict_items
+from utility.ISavable import ISavable, pop_dict_items, save_to_json, to_plain
+
+
+def legacy(obj):
+    return json.loads(json.dumps(copy.deepcopy(obj), default=lambda o: o.__dict__, indent=5))
 
 
 class Test(TestCase):
@@ -97,4 +102,23 @@ class Test(TestCase):
         self.assertEqual(dictionary, {"Eleanor": "Spider", "Drako": "Leech"})
 
         pop_dict_items(dictionary, ["Eleanor", "Drako"])
-        self.assertEqual(dictionary, {})
\ No newline at end of file
+        self.assertEqual(dictionary, {})
+
+    def test_to_plain(self):
+
+        for obj in [self.smugglers, self.caesar, self.geralt, self.regis, self.jeeg, self.longlocks, self.score_npc,
+                    self.clocks, {1: (self.unseen, None), True: 2.5}]:
+            self.assertEqual(legacy(obj), to_plain(obj))
+
+    def test_save_to_json(self):
+        objects = [self.smugglers, self.geralt, self.regis, self.jeeg, self.longlocks, self.score_npc, self.factions,
+                   self.clocks]
+        # the dictionaries the subclasses start from are built with the legacy deepcopy and json round trip
+        with mock.patch.object(ISavable, "save_to_dict", legacy):
+            expected = [json.loads(save_to_json(obj)) for obj in objects]
+
+        for obj, legacy_saved in zip(objects, expected):
+            saved = save_to_json(obj)
+            self.assertNotIn("\n", saved)
+            self.assertEqual(legacy_saved, json.loads(saved))
+        self.assertEqual(self.smugglers, Crew.from_json(json.loads(save_to_json(self.smugglers))))
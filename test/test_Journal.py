@@ -1,5 +1,9 @@
+import json
+from decimal import Decimal
 from unittest import TestCase
 
+from bs4 import BeautifulSoup
+
 import game.Journal
 from component.Clock import Clock
 from game.Journal import Journal
@@ -62,6 +66,67 @@ class TestJournal(TestCase):
         with open("resources_test/journalTest.html", 'w+') as f:
             f.write(temp.get_log_string())
 
+    def test_replay(self):
+        journal = Journal()
+        journal.write_title("The Knives of Doskvol")
+        journal.write_phase(1)
+        journal.write_score("scoring", "category", "plan type", "target", "detail", [("user1", 5)], "controlled", "notes")
+        journal.write_clock("User1", Clock("project clock", 6, 3), Clock("project clock", 4, 0))
+        journal.change_lang("ITA.json")
+        journal.write_note("General note title", "This is a general note")
+        journal.write_end_score("best outcome", "extra notes")
+        journal.write_activity({"activity": "long_term_project", "pc": "user", "clock": Clock("[project] clock", 6, 6),
+                                "notes": "notes", "tick": 4, "action": "action: prowess"})
+        journal.edit_note("Edited note", 1)
+
+        self.assertEqual(["write_title", "write_phase", "write_score", "write_clock", "write_note", "write_end_score",
+                          "write_activity", "edit_note"], [entry["method"] for entry in journal.entries])
+        self.assertEqual({"method": "write_note", "args": {"title": "General note title",
+                                                           "text": "This is a general note"},
+                          "language": "ITA.json", "indentation": 1, "phase": 1, "score": "scoring"},
+                         journal.entries[4])
+        self.assertIsNone(journal.entries[5]["score"])
+        self.assertEqual(json.loads(json.dumps(journal.entries)), journal.entries)
+
+        replayed = Journal()
+        replayed.replay(json.loads(json.dumps(journal.entries)))
+        self.assertEqual(journal.get_log_string(), replayed.get_log_string())
+        self.assertEqual([], replayed.entries)
+        self.assertEqual("ENG.json", replayed.language)
+
+        journal.entries_stored(3)
+        self.assertEqual(3, journal.stored_entries)
+        self.assertEqual("write_clock", journal.entries[0]["method"])
+
+    def test_entry_not_encodable(self):
+        journal = Journal()
+        journal.write_payoff(Decimal(10), "extra notes", True)
+        journal.write_note("General note title", "This is a general note")
+        self.assertIn("payoff", journal.get_log_string())
+        self.assertEqual(["write_note"], [entry["method"] for entry in journal.entries])
+
+    def test_load(self):
+        journal = Journal()
+        self.assertFalse(journal.is_parsed())
+        journal.write_score("first", "category", "plan type", "target", "detail", [("user1", 5)], "controlled", "notes")
+        journal.write_score("second", "category", "plan type", "target", "detail", [("user1", 5)], "risky", "notes")
+        journal.write_end_score("best outcome", "extra notes")
+        self.assertTrue(journal.is_parsed())
+
+        loaded = Journal()
+        loaded.load(journal.get_log_string(), journal.get_anchor())
+        self.assertFalse(loaded.is_parsed())
+        self.assertEqual(1, loaded.indentation)
+        self.assertIs(loaded.log.find_all("div", attrs={"class": "score"})[0], loaded.score_tag)
+        self.assertEqual(str(BeautifulSoup(journal.get_log_string(), 'html.parser')), loaded.get_log_string())
+        self.assertEqual(["first"], loaded.open_scores)
+
+        # without anchor the current score is the last one
+        legacy = Journal()
+        legacy.load(journal.get_log_string(), entries=journal.entries[-1:], indentation=1)
+        self.assertEqual(journal.get_log_string().count("endScore") + 1, legacy.get_log_string().count("endScore"))
+        self.assertEqual(1, legacy.stored_entries)
+
     def test_get_codex(self):
         temp = Journal()
         codex = temp.get_codex("The Knives of Doskvol",
@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from organization.Faction import Faction
+from utility.NameIndex import NameIndex, name_key
+
+
+class TestNameIndex(TestCase):
+    def setUp(self) -> None:
+        self.factions = [Faction("Red Sashes"), Faction("Lampblacks"), Faction("red sashes")]
+        self.index = NameIndex(name_key)
+
+    def test_find(self):
+        self.assertIs(self.factions[0], self.index.find(self.factions, "red sashes"))
+        self.assertIsNone(self.index.find(self.factions, "Bluecoats"))
+
+        self.factions.append(Faction("Bluecoats"))
+        self.assertIs(self.factions[3], self.index.find(self.factions, "bluecoats"))
+
+    def test_remove_replace(self):
+        self.index.find(self.factions, "lampblacks")
+        removed = self.factions.pop(0)
+        self.index.remove(self.factions, removed)
+        self.assertIs(self.factions[1], self.index.find(self.factions, "red sashes"))
+
+        new = Faction("LAMPBLACKS")
+        old, self.factions[0] = self.factions[0], new
+        self.index.replace(self.factions, old, new)
+        self.assertIs(new, self.index.find(self.factions, "lampblacks"))
+
+    def test_rename(self):
+        self.index.find(self.factions, "lampblacks")
+        self.factions[1].name = "Crows"
+        self.assertIsNone(self.index.find(self.factions, "lampblacks"))
+        self.index.invalidate()
+        self.assertIs(self.factions[1], self.index.find(self.factions, "crows"))
@@ -30,8 +30,10 @@ class TestPlayer(TestCase):
 
 
     def test_migrate_character_type(self):
+        self.human.char_id = 3
         self.player.migrate_character_type("marg", "Ghost")
         self.assertIsInstance(self.player.characters[0], Ghost)
+        self.assertEqual(3, self.player.characters[0].char_id)
         self.assertEqual(Vice("Need of Life Essence", "You have an intense need: life essence. To satisfy this need, "
                                                       "possess a living victim and consume their spirit energy (this "
                                                       "may be a downtime action). When you do so, clear half your "
@@ -72,3 +74,12 @@ class TestPlayer(TestCase):
                          self.player.characters[1].xp_triggers)
 
         self.assertFalse(self.player.migrate_character_type(self.player.name, "Hunter"))
+
+    def test_add_remove_character(self):
+        hull = Hull("Robot")
+        self.player.add_character(hull)
+        self.assertIs(hull, self.player.get_character_by_name("robot"))
+
+        self.player.remove_character(self.human)
+        self.assertIsNone(self.player.get_character_by_name("Marg"))
+        self.assertIs(self.ghost, self.player.get_character_by_name("CASPER"))